@@ -0,0 +1,56 @@
+"""
+Measures the analyzer next to the conversion it estimates, on a large generated collection and plan: the time
+and peak memory of the streaming scan and of the conversion, and the estimated output size and time next to
+the actual ones.
+
+Each step runs in its own process, which reports its own peak resident set size.
+
+Run from the project root:
+    python -m benchmarks.bench_analyzer [--samplers 100000]
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from benchmarks.bench_file_conversion import WRITE_COLLECTION
+from benchmarks.bench_jmx_to_k6 import GENERATE, REPORT_PEAK, measure
+from src.analyzer import analyze_source
+
+ANALYZE = "from src.analyzer import analyze_source; analyze_source({!r})" + REPORT_PEAK
+POSTMAN_TO_JMX = ("from src.converter import postman_file_to_jmx; "
+                  "open({!r}, 'wb').write(postman_file_to_jmx({!r}))" + REPORT_PEAK)
+JMX_TO_POSTMAN = ("import json; from src.converter import jmx_file_to_postman; "
+                  "open({!r}, 'w').write(json.dumps(jmx_file_to_postman({!r}), indent=4))" + REPORT_PEAK)
+
+
+def compare(source_path: str, output_path: str, conversion: str) -> None:
+    stats = analyze_source(source_path)
+    measure("analyze", ANALYZE.format(source_path))
+    start = time.perf_counter()
+    measure("conversion", conversion.format(output_path, source_path))
+    elapsed = time.perf_counter() - start
+    print(f"{stats.requests} requests, {stats.assertions} assertions, {stats.body_bytes / 1024 / 1024:.1f} MB of "
+          f"bodies: estimated {stats.estimated_output_bytes / 1024 / 1024:.1f} MB in {stats.estimated_seconds:.1f} s, "
+          f"actual {os.path.getsize(output_path) / 1024 / 1024:.1f} MB in {elapsed:.1f} s (with interpreter start)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--samplers", type=int, default=100000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        json_path = os.path.join(directory, "large.json")
+        jmx_path = os.path.join(directory, "large.jmx")
+        measure("collection generation", WRITE_COLLECTION.format(args.samplers, json_path))
+        measure("plan generation", GENERATE.format(jmx_path, args.samplers))
+
+        print(f"Postman collection, {os.path.getsize(json_path) / 1024 / 1024:.1f} MB")
+        compare(json_path, os.path.join(directory, "converted.jmx"), POSTMAN_TO_JMX)
+        print(f"JMX plan, {os.path.getsize(jmx_path) / 1024 / 1024:.1f} MB")
+        compare(jmx_path, os.path.join(directory, "converted.json"), JMX_TO_POSTMAN)
+
+
+if __name__ == '__main__':
+    main()
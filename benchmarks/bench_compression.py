@@ -0,0 +1,70 @@
+"""
+Measures converting a large compressed JMX plan to a k6 script, decompressing it on the fly, next to
+decompressing it to disk first and converting the plain copy. The k6 conversion streams the plan, so
+the direct conversion never holds the decompressed plan, in memory or on disk.
+
+Each step runs in its own process, which reports the bytes it wrote (wchar of /proc/self/io) and its peak
+resident set size. zstd is measured when zstandard is installed.
+
+Run from the project root:
+    python -m benchmarks.bench_compression [--samplers 50000]
+"""
+import argparse
+import importlib.util
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.bench_jmx_to_k6 import GENERATE
+
+REPORT = ("\nimport resource\nprint(open('/proc/self/io').read().split()[3], "
+          "resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)")
+COMPRESS = """import shutil
+from src.helper.compression import open_output
+with open({!r}, 'rb') as source, open_output({!r}) as output:
+    shutil.copyfileobj(source, output, 1 << 20)"""
+DECOMPRESS_THEN_CONVERT = """import shutil
+from src.helper.compression import open_input
+from src.k6.k6_jmx_creator import create_k6_script_from_jmx
+with open_input({!r}) as source, open({!r}, 'wb') as output:
+    shutil.copyfileobj(source, output, 1 << 20)
+create_k6_script_from_jmx({!r}, {!r})""" + REPORT
+CONVERT = """from src.k6.k6_jmx_creator import create_k6_script_from_jmx
+create_k6_script_from_jmx({!r}, {!r})""" + REPORT
+
+def measure(label: str, code: str) -> None:
+    start = time.perf_counter()
+    process = subprocess.run([sys.executable, "-c", code], check=True, capture_output=True, text=True)
+    elapsed = time.perf_counter() - start
+    written, peak = (int(value) for value in process.stdout.split()[-2:])
+    print(f"{label:<32} {elapsed:8.2f} s {written / 1024 / 1024:10.1f} MB written {peak / 1024:8.1f} MB peak RSS")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--samplers", type=int, default=50000)
+    args = parser.parse_args()
+
+    extensions = [".gz", ".xz"] + ([".zst"] if importlib.util.find_spec("zstandard") else [])
+    with tempfile.TemporaryDirectory() as directory:
+        jmx_path = os.path.join(directory, "large.jmx")
+        subprocess.run([sys.executable, "-c", GENERATE.format(jmx_path, args.samplers)], check=True,
+                       capture_output=True)
+        print(f"{args.samplers} samplers, {os.path.getsize(jmx_path) / 1024 / 1024:.1f} MB JMX")
+
+        for extension in extensions:
+            compressed_path = jmx_path + extension
+            subprocess.run([sys.executable, "-c", COMPRESS.format(jmx_path, compressed_path)], check=True)
+            print(f"{extension} plan: {os.path.getsize(compressed_path) / 1024 / 1024:.1f} MB")
+            plain_copy = os.path.join(directory, "copy.jmx")
+            script_path = os.path.join(directory, "large.js")
+            measure(f"{extension} decompress, then convert",
+                    DECOMPRESS_THEN_CONVERT.format(compressed_path, plain_copy, plain_copy, script_path))
+            os.remove(plain_copy)
+            measure(f"{extension} direct conversion", CONVERT.format(compressed_path, script_path))
+
+
+if __name__ == '__main__':
+    main()
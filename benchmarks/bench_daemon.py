@@ -0,0 +1,76 @@
+"""
+Compares per-job latency of the conversion daemon with starting one process per conversion.
+
+Run from the project root:
+    python -m benchmarks.bench_daemon [--jobs 20] [--workers 4]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from src.daemon import POSTMAN_TO_JMX, convert_with_daemon
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+SAMPLE_COLLECTION = os.path.join(PROJECT_ROOT, "file_to_convert", "sample_collection.json")
+ONE_SHOT_SCRIPT = ("import sys; from src.converter import postman_to_jmx; "
+                   "sys.stdout.buffer.write(postman_to_jmx(sys.stdin.buffer.read()))")
+
+
+def time_one_shot(payload: bytes) -> float:
+    start = time.perf_counter()
+    subprocess.run([sys.executable, "-c", ONE_SHOT_SCRIPT], input=payload, cwd=PROJECT_ROOT,
+                   stdout=subprocess.DEVNULL, check=True)
+    return time.perf_counter() - start
+
+
+def time_daemon(payload: bytes, socket_path: str) -> float:
+    start = time.perf_counter()
+    for _ in convert_with_daemon(POSTMAN_TO_JMX, payload, socket_path=socket_path):
+        pass
+    return time.perf_counter() - start
+
+
+def report(label: str, latencies, wall_time: float) -> None:
+    print(f"{label:<28} mean {statistics.mean(latencies) * 1000:8.1f} ms   "
+          f"p95 {sorted(latencies)[int(len(latencies) * 0.95) - 1] * 1000:8.1f} ms   "
+          f"throughput {len(latencies) / wall_time:7.1f} jobs/s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--jobs", type=int, default=20)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    with open(SAMPLE_COLLECTION, 'rb') as collection_file:
+        payload = collection_file.read()
+    socket_path = os.path.join(tempfile.mkdtemp(), "bench.sock")
+
+    daemon = subprocess.Popen([sys.executable, "-m", "src.daemon", "--socket", socket_path, "serve",
+                               "--workers", str(args.workers)], cwd=PROJECT_ROOT)
+    try:
+        while not os.path.exists(socket_path):
+            time.sleep(0.05)
+        time_daemon(payload, socket_path)  # let the workers start
+
+        for concurrency in (1, args.workers):
+            with ThreadPoolExecutor(max_workers=concurrency) as clients:
+                start = time.perf_counter()
+                latencies = list(clients.map(lambda _: time_one_shot(payload), range(args.jobs)))
+                report(f"process per job (x{concurrency})", latencies, time.perf_counter() - start)
+
+                start = time.perf_counter()
+                latencies = list(clients.map(lambda _: time_daemon(payload, socket_path), range(args.jobs)))
+                report(f"daemon (x{concurrency})", latencies, time.perf_counter() - start)
+    finally:
+        daemon.terminate()
+        daemon.wait()
+
+
+if __name__ == '__main__':
+    main()
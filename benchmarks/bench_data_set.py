@@ -0,0 +1,49 @@
+"""
+Measures the time and peak memory of writing a large Postman iteration data file as the CSV file of a CSV Data
+Set, next to loading it whole with json.load. The JSON array is streamed twice, once for the column names and
+once for the rows, so memory stays flat whatever the number of rows.
+
+Each step runs in its own process, which reports its own peak resident set size.
+
+Run from the project root:
+    python -m benchmarks.bench_data_set [--rows 1000000]
+"""
+import argparse
+import json
+import os
+import tempfile
+
+from benchmarks.bench_jmx_to_k6 import REPORT_PEAK, measure
+
+WRITE = "from src.jmx.jmx_variables import write_data_set; write_data_set({!r}, {!r})" + REPORT_PEAK
+LOAD = "import json; json.load(open({!r}, encoding='utf-8'))" + REPORT_PEAK
+
+
+def write_data_file(path: str, rows: int) -> None:
+    with open(path, 'w', encoding='utf-8') as data_file:
+        data_file.write("[")
+        for index in range(rows):
+            row = {"user": f"user{index}@example.com", "password": f"secret-{index:08d}", "item": index % 997,
+                   "quantity": index % 5 + 1, "address": {"city": "Paris", "zip": f"{75000 + index % 20}"}}
+            data_file.write(("," if index else "") + json.dumps(row))
+        data_file.write("]")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1000000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        data_path = os.path.join(directory, "users.json")
+        write_data_file(data_path, args.rows)
+        print(f"{args.rows} rows, {os.path.getsize(data_path) / 1024 / 1024:.1f} MB JSON")
+
+        csv_path = os.path.join(directory, "plan_data.csv")
+        measure("streaming CSV data set", WRITE.format(data_path, csv_path))
+        measure("json.load", LOAD.format(data_path))
+        print(f"{os.path.getsize(csv_path) / 1024 / 1024:.1f} MB CSV")
+
+
+if __name__ == '__main__':
+    main()
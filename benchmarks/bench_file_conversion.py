@@ -0,0 +1,50 @@
+"""
+Measures the peak memory of converting large files through the in-memory converter API, which is given the
+whole file as bytes, next to the file variants, which parse the file as they read it.
+
+The bytes stay referenced by the caller until the conversion returns, so they add the size of the file to
+the peak of the whole conversion. Mapping the file with mmap does not help: mapped pages count in the
+resident set as they are read, and json and lxml copy the buffer they are given anyway.
+
+Each step runs in its own process, which reports its own peak resident set size.
+
+Run from the project root:
+    python -m benchmarks.bench_file_conversion [--samplers 100000]
+"""
+import argparse
+import os
+import tempfile
+
+from benchmarks.bench_jmx_to_k6 import GENERATE, REPORT_PEAK, measure
+
+WRITE_COLLECTION = ("import json; from benchmarks.bench_jmx_to_k6 import build_collection; "
+                    "json.dump(build_collection({!r}), open({!r}, 'w'))" + REPORT_PEAK)
+POSTMAN_BYTES = ("from src.converter import postman_to_jmx; data = open({!r}, 'rb').read(); "
+                 "content = postman_to_jmx(data)" + REPORT_PEAK)
+POSTMAN_FILE = "from src.converter import postman_file_to_jmx; content = postman_file_to_jmx({!r})" + REPORT_PEAK
+JMX_BYTES = ("from src.converter import jmx_to_postman; data = open({!r}, 'rb').read(); "
+             "collection = jmx_to_postman(data)" + REPORT_PEAK)
+JMX_FILE = "from src.converter import jmx_file_to_postman; collection = jmx_file_to_postman({!r})" + REPORT_PEAK
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--samplers", type=int, default=100000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        json_path = os.path.join(directory, "large.json")
+        jmx_path = os.path.join(directory, "large.jmx")
+        measure("collection generation", WRITE_COLLECTION.format(args.samplers, json_path))
+        measure("plan generation", GENERATE.format(jmx_path, args.samplers))
+        print(f"{args.samplers} requests, {os.path.getsize(json_path) / 1024 / 1024:.1f} MB collection, "
+              f"{os.path.getsize(jmx_path) / 1024 / 1024:.1f} MB JMX")
+
+        measure("postman_to_jmx bytes", POSTMAN_BYTES.format(json_path))
+        measure("postman_file_to_jmx", POSTMAN_FILE.format(json_path))
+        measure("jmx_to_postman bytes", JMX_BYTES.format(jmx_path))
+        measure("jmx_file_to_postman", JMX_FILE.format(jmx_path))
+
+
+if __name__ == '__main__':
+    main()
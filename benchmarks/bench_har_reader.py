@@ -0,0 +1,74 @@
+"""
+Measures the time and peak memory of reading a large generated HAR recording, next to loading it whole with
+json.load. Most of the file is made of recorded responses, which the streaming reader decodes one entry at a
+time and drops.
+
+Each step runs in its own process, which reports its own peak resident set size.
+
+Run from the project root:
+    python -m benchmarks.bench_har_reader [--megabytes 500]
+"""
+import argparse
+import json
+import os
+import tempfile
+
+from benchmarks.bench_jmx_to_k6 import REPORT_PEAK, measure
+
+READ = "from src.har.har_reader import read_har; read_har({!r})" + REPORT_PEAK
+LOAD = "import json; json.load(open({!r}, encoding='utf-8'))" + REPORT_PEAK
+
+RESPONSE_SIZE = 8192
+
+
+def build_entry(index: int) -> dict:
+    static = index % 3 == 0
+    return {
+        "pageref": f"page_{index // 100}",
+        "startedDateTime": f"2024-05-01T10:{index // 6000 % 60:02d}:{index // 100 % 60:02d}.{index % 100:03d}Z",
+        "time": 35.5,
+        "_resourceType": "image" if static else "xhr",
+        "request": {
+            "method": "POST" if index % 2 else "GET",
+            "url": f"https://shop.example.com/api/items/{index}?page={index % 7}",
+            "headers": [{"name": ":authority", "value": "shop.example.com"},
+                        {"name": "Accept", "value": "application/json"},
+                        {"name": "Cookie", "value": f"session={index:032d}"}],
+            "postData": {"mimeType": "application/json", "text": json.dumps({"item": index, "quantity": 2})}
+        },
+        "response": {"status": 200, "headers": [{"name": "Content-Type", "value": "application/json"}],
+                     "content": {"size": RESPONSE_SIZE, "mimeType": "image/png" if static else "application/json",
+                                 "text": "x" * RESPONSE_SIZE}},
+        "timings": {"send": 0.1, "wait": 30.2, "receive": 5.2}
+    }
+
+
+def write_har(har_path: str, megabytes: int) -> int:
+    count = 0
+    with open(har_path, "w", encoding="utf-8") as har_file:
+        har_file.write('{"log": {"version": "1.2", "creator": {"name": "bench"}, "pages": [], "entries": [\n')
+        while har_file.tell() < megabytes * 1024 * 1024:
+            if count:
+                har_file.write(",\n")
+            json.dump(build_entry(count), har_file)
+            count += 1
+        har_file.write("\n]}}\n")
+    return count
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--megabytes", type=int, default=500)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        har_path = os.path.join(directory, "large.har")
+        count = write_har(har_path, args.megabytes)
+        print(f"{count} entries, {os.path.getsize(har_path) / 1024 / 1024:.1f} MB HAR")
+
+        measure("streaming HAR reader", READ.format(har_path))
+        measure("json.load", LOAD.format(har_path))
+
+
+if __name__ == '__main__':
+    main()
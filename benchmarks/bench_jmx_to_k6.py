@@ -0,0 +1,78 @@
+"""
+Measures the time and peak memory of the streaming JMX to k6 conversion on a large generated plan, next to
+parsing the same plan into a full lxml tree (what get_test_plan does before extracting anything).
+
+Each step runs in its own process, which reports its own peak resident set size. The plan is generated in
+a process too: Linux carries the peak of the parent over to its children.
+
+Run from the project root:
+    python -m benchmarks.bench_jmx_to_k6 [--samplers 100000]
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from src.jmx.jmx_creator import LoadProfile, iter_jmx_content
+from src.postman.postman_json_reader import parse_postman_collection
+
+SCHEMA = "https://schema.getpostman.com/json/collection/v2.1.0/collection.json"
+REQUESTS_PER_FOLDER = 100
+
+REPORT_PEAK = "; import resource; print(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)"
+CONVERT = "from src.k6.k6_jmx_creator import create_k6_script_from_jmx; create_k6_script_from_jmx({!r}, {!r})" + REPORT_PEAK
+GENERATE = "from benchmarks.bench_jmx_to_k6 import write_plan; write_plan({!r}, {!r})" + REPORT_PEAK
+PARSE = "from lxml import etree; etree.parse({!r})" + REPORT_PEAK
+
+
+def build_collection(sampler_count: int) -> dict:
+    folders = []
+    for folder in range(max(1, sampler_count // REQUESTS_PER_FOLDER)):
+        folders.append({"name": f"Folder {folder}", "item": [{
+            "name": f"Request {folder}-{index}",
+            "event": [{"listen": "test", "script": {"exec": [
+                'pm.test("Status code is 200", function () {', "pm.response.to.have.status(200);", "});"]}}],
+            "request": {
+                "method": "POST",
+                "header": [{"key": "Content-Type", "value": "application/json"},
+                           {"key": "X-Request", "value": f"{folder}-{index}"}],
+                "body": {"mode": "raw", "raw": f'{{"folder": {folder}, "index": {index}, "user": "{{{{user}}}}"}}'},
+                "url": {"raw": f"https://api.example.com/folders/{folder}/items/{index}"}
+            }
+        } for index in range(REQUESTS_PER_FOLDER)]})
+    return {"info": {"name": "Large", "schema": SCHEMA}, "item": folders}
+
+
+def write_plan(jmx_path: str, sampler_count: int) -> None:
+    data = parse_postman_collection(build_collection(sampler_count))
+    with open(jmx_path, "w", encoding="utf-8") as jmx_file:
+        jmx_file.writelines(iter_jmx_content(data, load_profile=LoadProfile(threads=50, duration=600)))
+
+
+def measure(label: str, code: str) -> None:
+    start = time.perf_counter()
+    process = subprocess.run([sys.executable, "-c", code], check=True, capture_output=True, text=True)
+    elapsed = time.perf_counter() - start
+    peak = int(process.stdout.split()[-1])
+    print(f"{label:<24} {elapsed:8.2f} s {peak / 1024:10.1f} MB peak RSS")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--samplers", type=int, default=100000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        jmx_path = os.path.join(directory, "large.jmx")
+        measure("plan generation", GENERATE.format(jmx_path, args.samplers))
+        print(f"{args.samplers} samplers, {os.path.getsize(jmx_path) / 1024 / 1024:.1f} MB JMX")
+
+        measure("streaming k6 conversion", CONVERT.format(jmx_path, os.path.join(directory, "large.js")))
+        measure("full lxml tree", PARSE.format(jmx_path))
+        print(f"{os.path.getsize(os.path.join(directory, 'large.js')) / 1024 / 1024:.1f} MB k6 script")
+
+
+if __name__ == '__main__':
+    main()
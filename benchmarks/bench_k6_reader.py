@@ -0,0 +1,40 @@
+"""
+Measures how the k6 script reader scales with the script size, on scripts generated from collections of
+growing size. A linear reader keeps the time per request constant.
+
+Run from the project root:
+    python -m benchmarks.bench_k6_reader [--requests 100000]
+"""
+import argparse
+import time
+from typing import List, Tuple
+
+from benchmarks.bench_jmx_to_k6 import build_collection
+from src.k6.k6_creator import iter_k6_script
+from src.k6.k6_reader import parse_k6_script
+from src.postman.postman_json_reader import parse_postman_collection
+
+
+def build_script(request_count: int) -> Tuple[str, List[str]]:
+    data = parse_postman_collection(build_collection(request_count))
+    bodies: List[str] = []
+    script = "".join(iter_k6_script(data, lambda body: bodies.append(body) or len(bodies) - 1, "large.bodies.json"))
+    return script, bodies
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=100000)
+    args = parser.parse_args()
+
+    for request_count in (args.requests // 4, args.requests // 2, args.requests):
+        script, bodies = build_script(request_count)
+        start = time.perf_counter()
+        parse_k6_script(script, bodies=bodies)
+        elapsed = time.perf_counter() - start
+        print(f"{request_count:>8} requests {len(script) / 1024 / 1024:8.1f} MB script {elapsed:8.2f} s "
+              f"{elapsed / request_count * 1e6:8.1f} us/request")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,42 @@
+"""
+Measures the locustfile generation time on a large generated collection, and the time Python takes to
+compile the generated locustfile (what locust does when it imports it).
+
+Run from the project root:
+    python -m benchmarks.bench_locust_creator [--requests 50000]
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from benchmarks.bench_jmx_to_k6 import build_collection
+from src.jmx.jmx_creator import LoadProfile
+from src.locust.locust_creator import write_locustfile
+from src.postman.postman_json_reader import parse_postman_collection
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=50000)
+    args = parser.parse_args()
+
+    data = parse_postman_collection(build_collection(args.requests))
+    with tempfile.TemporaryDirectory() as directory:
+        start = time.perf_counter()
+        write_locustfile(data, directory, "large.py", LoadProfile(threads=50, duration=600))
+        elapsed = time.perf_counter() - start
+        locustfile = os.path.join(directory, "large.py")
+        print(f"{args.requests} requests generated in {elapsed:.2f} s ({elapsed / args.requests * 1e6:.1f} us/request), "
+              f"{os.path.getsize(locustfile) / 1024 / 1024:.1f} MB locustfile, "
+              f"{os.path.getsize(os.path.join(directory, 'large.bodies.json')) / 1024 / 1024:.1f} MB bodies")
+
+        with open(locustfile, encoding="utf-8") as generated:
+            source = generated.read()
+        start = time.perf_counter()
+        compile(source, locustfile, "exec")
+        print(f"locustfile compiled in {time.perf_counter() - start:.2f} s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+"""
+Compares the generated JMX size and load time with and without Module Controller deduplication on a
+collection where every folder repeats the same login and token refresh requests.
+
+JMeter is not available here, parsing the document with lxml (as JMeter parses it before building the
+test tree) stands in for the load time.
+
+Run from the project root:
+    python -m benchmarks.bench_module_dedupe [--folders 200]
+"""
+import argparse
+import json
+import time
+
+from lxml import etree
+
+from src.jmx.jmx_creator import generate_jmx_content
+from src.postman.postman_json_reader import parse_postman_collection
+
+SCHEMA = "https://schema.getpostman.com/json/collection/v2.1.0/collection.json"
+
+
+def build_request(name: str, url: str, body: dict) -> dict:
+    return {
+        "name": name,
+        "request": {
+            "method": "POST",
+            "header": [{"key": "Content-Type", "value": "application/json"}],
+            "body": {"mode": "raw", "raw": json.dumps(body, indent=2)},
+            "url": {"raw": url}
+        }
+    }
+
+
+def build_collection(folder_count: int) -> dict:
+    login = build_request("Login", "https://api.example.com/login",
+                          {"user": "{{user}}", "password": "{{password}}", "scopes": ["read", "write"] * 20})
+    refresh = {"name": "Auth", "item": [
+        build_request("Refresh Token", "https://api.example.com/token", {"refresh_token": "{{refresh_token}}"}),
+        build_request("Profile", "https://api.example.com/me", {"fields": ["name", "email"] * 20})
+    ]}
+    folders = [{"name": f"Scenario {index}", "item": [
+        login, refresh, build_request(f"Order {index}", f"https://api.example.com/orders/{index}", {"id": index})
+    ]} for index in range(folder_count)]
+    return {"info": {"name": "Duplicated", "schema": SCHEMA}, "item": folders}
+
+
+def measure(label: str, data: dict, deduplicate: bool, repeat: int = 5) -> None:
+    content = generate_jmx_content(data, deduplicate=deduplicate).encode("utf-8")
+    start = time.perf_counter()
+    for _ in range(repeat):
+        etree.fromstring(content)
+    elapsed = (time.perf_counter() - start) / repeat
+    print(f"{label:<16} {len(content) / 1024:10.1f} KB {elapsed * 1000:10.1f} ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--folders", type=int, default=200)
+    args = parser.parse_args()
+
+    data = parse_postman_collection(build_collection(args.folders))
+    print(f"{args.folders} folders, each repeating Login and Auth")
+    measure("inline", data, False)
+    measure("deduplicated", data, True)
+
+
+if __name__ == '__main__':
+    main()
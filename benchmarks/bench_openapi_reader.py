@@ -0,0 +1,80 @@
+"""
+Measures the OpenAPI import on a generated document with thousands of operations sharing layered schemas,
+each schema referencing two schemas of the next layer, with and without the memoised examples of the
+SpecResolver. Without memoisation, building and serialising the body of an operation doubles with every layer.
+
+Run from the project root:
+    python -m benchmarks.bench_openapi_reader [--operations 2000] [--layers 10]
+"""
+import argparse
+import time
+from unittest import mock
+
+from src.openapi import openapi_reader
+from src.openapi.openapi_reader import SpecResolver, parse_openapi
+
+SCHEMAS_PER_LAYER = 20
+
+
+class NoMemo(dict):
+    def __setitem__(self, key, value):
+        pass
+
+
+class UnmemoisedResolver(SpecResolver):
+    def __init__(self, spec):
+        super().__init__(spec)
+        self.examples = NoMemo()
+
+
+def build_spec(operation_count: int, layers: int) -> dict:
+    schemas = {}
+    for layer in range(layers):
+        for index in range(SCHEMAS_PER_LAYER):
+            properties = {"id": {"type": "integer"}, "name": {"type": "string"},
+                          "created": {"type": "string", "format": "date-time"}}
+            if layer + 1 < layers:
+                properties["left"] = {"$ref": f"#/components/schemas/S{layer + 1}_{index}"}
+                properties["right"] = {"type": "array", "items": {
+                    "$ref": f"#/components/schemas/S{layer + 1}_{(index + 1) % SCHEMAS_PER_LAYER}"}}
+            schemas[f"S{layer}_{index}"] = {"type": "object", "properties": properties}
+
+    paths = {}
+    for index in range(operation_count // 2):
+        schema_ref = {"$ref": f"#/components/schemas/S0_{index % SCHEMAS_PER_LAYER}"}
+        paths[f"/resources{index % 50}/{{id}}/items{index}"] = {
+            "parameters": [{"$ref": "#/components/parameters/Id"}],
+            "get": {"operationId": f"get{index}", "tags": [f"tag{index % 50}"],
+                    "parameters": [{"name": "limit", "in": "query"}],
+                    "responses": {"200": {"content": {"application/json": {"schema": schema_ref}}}}},
+            "post": {"operationId": f"create{index}", "tags": [f"tag{index % 50}"],
+                     "requestBody": {"content": {"application/json": {"schema": schema_ref}}},
+                     "responses": {"201": {}}}
+        }
+    return {"openapi": "3.0.3", "info": {"title": "Large", "version": "1"},
+            "servers": [{"url": "https://api.example.com"}], "paths": paths,
+            "components": {"schemas": schemas, "parameters": {"Id": {"name": "id", "in": "path"}}}}
+
+
+def measure(label: str, spec: dict) -> None:
+    start = time.perf_counter()
+    data = parse_openapi(spec)
+    elapsed = time.perf_counter() - start
+    requests = sum(len(controller["children"]) for controller in data["test_fragment_controller"]["generic_controllers"])
+    print(f"{label:<24} {requests:>6} requests {elapsed:8.2f} s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--operations", type=int, default=2000)
+    parser.add_argument("--layers", type=int, default=10)
+    args = parser.parse_args()
+
+    spec = build_spec(args.operations, args.layers)
+    measure("memoised resolver", spec)
+    with mock.patch.object(openapi_reader, "SpecResolver", UnmemoisedResolver):
+        measure("without memoisation", spec)
+
+
+if __name__ == '__main__':
+    main()
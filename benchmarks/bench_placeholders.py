@@ -0,0 +1,57 @@
+"""
+Measures placeholder translation throughput on multi-MB JSON bodies.
+
+Compares the chained str.replace approach previously used by replace_placeholders (which also
+corrupted every "}") with the single-pass regex translation.
+
+Run from the project root:
+    python -m benchmarks.bench_placeholders [--size-mb 8]
+"""
+import argparse
+import json
+import time
+
+from src.helper.placeholder_utils import to_jmeter_placeholders, to_postman_placeholders
+
+
+def chained_replace(value: str) -> str:
+    return value.replace("${", "{{").replace("}", "}}")
+
+
+def build_body(size_mb: int) -> str:
+    records = []
+    size = 0
+    index = 0
+    while size < size_mb * 1024 * 1024:
+        record = {"id": "${id_%d}" % index, "name": "user ${name}", "meta": {"score": index, "tags": ["a", "b"]}}
+        records.append(record)
+        size += len(json.dumps(record))
+        index += 1
+    return json.dumps(records)
+
+
+def measure(label: str, func, value, size: int, repeat: int = 5) -> None:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func(value)
+    elapsed = (time.perf_counter() - start) / repeat
+    print(f"{label:<36} {elapsed * 1000:8.1f} ms   {size / elapsed / 1024 / 1024:8.1f} MB/s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--size-mb", type=int, default=8)
+    args = parser.parse_args()
+
+    body = build_body(args.size_mb)
+    size = len(body)
+    print(f"body size: {size / 1024 / 1024:.1f} MB")
+
+    measure("chained str.replace (string)", chained_replace, body, size)
+    measure("single pass regex (string)", to_postman_placeholders, body, size)
+    measure("single pass regex (reverse)", to_jmeter_placeholders, to_postman_placeholders(body), size)
+    measure("single pass regex (decoded list)", to_postman_placeholders, json.loads(body), size)
+
+
+if __name__ == '__main__':
+    main()
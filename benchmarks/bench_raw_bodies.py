@@ -0,0 +1,55 @@
+"""
+Compares raw body pass-through with parse/re-dump normalisation when building Postman collections.
+
+Run from the project root:
+    python -m benchmarks.bench_raw_bodies [--requests 500] [--body-kb 100]
+"""
+import argparse
+import json
+import time
+
+from src.postman.postman_json_creator import build_postman_collection
+
+
+def build_body(size_kb: int) -> str:
+    records = []
+    size = 0
+    while size < size_kb * 1024:
+        record = {"id": "${user_id}", "name": "doggie", "tags": [{"id": len(records), "name": "string"}]}
+        records.append(record)
+        size += len(json.dumps(record))
+    return json.dumps({"items": records})
+
+
+def build_test_plan(request_count: int, body_kb: int) -> dict:
+    body = build_body(body_kb)
+    return {
+        "name": "Bodies",
+        "items": [{"item": {"name": "Controller", "requests": [
+            {"name": f"Request {index}", "method": "POST", "path": "/pets", "arguments": {"body": body}}
+            for index in range(request_count)
+        ]}}]
+    }
+
+
+def measure(label: str, test_plan: dict, normalize_bodies: bool) -> None:
+    start = time.perf_counter()
+    build_postman_collection(test_plan, normalize_bodies=normalize_bodies)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<24} {elapsed:8.2f} s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--body-kb", type=int, default=100)
+    args = parser.parse_args()
+
+    test_plan = build_test_plan(args.requests, args.body_kb)
+    print(f"{args.requests} requests with {args.body_kb} KB bodies")
+    measure("normalize (parse/dump)", test_plan, True)
+    measure("pass-through", test_plan, False)
+
+
+if __name__ == '__main__':
+    main()
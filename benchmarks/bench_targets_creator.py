@@ -0,0 +1,43 @@
+"""
+Measures the time and peak memory of the vegeta and wrk target list exports of a large generated JMX plan,
+at two plan sizes: the plan is streamed, so the peak should not grow with the number of samplers.
+
+Each step runs in its own process, which reports its own peak resident set size. Every request of the plan
+has its own body, written to its own file.
+
+Run from the project root:
+    python -m benchmarks.bench_targets_creator [--samplers 100000]
+"""
+import argparse
+import json
+import os
+import tempfile
+
+from benchmarks.bench_jmx_to_k6 import GENERATE, REPORT_PEAK, measure
+
+CONVERT = ("from src.targets.targets_creator import create_targets_file; "
+           "create_targets_file({!r}, {!r}, environment_file={!r})") + REPORT_PEAK
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--samplers", type=int, default=100000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        environment_path = os.path.join(directory, "environment.json")
+        with open(environment_path, "w", encoding="utf-8") as environment_file:
+            json.dump({"tests_url": "https://api.example.com", "user": "alice"}, environment_file)
+
+        for sampler_count in (args.samplers // 4, args.samplers):
+            jmx_path = os.path.join(directory, f"large_{sampler_count}.jmx")
+            measure("plan generation", GENERATE.format(jmx_path, sampler_count))
+            print(f"{sampler_count} samplers, {os.path.getsize(jmx_path) / 1024 / 1024:.1f} MB JMX")
+            for extension in ("targets", "lua"):
+                output_path = os.path.join(directory, f"large_{sampler_count}.{extension}")
+                measure(f"{extension} export", CONVERT.format(jmx_path, output_path, environment_path))
+                print(f"{os.path.getsize(output_path) / 1024 / 1024:.1f} MB {extension} file")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,261 @@
+import os
+from typing import Any, Dict, List, NamedTuple
+
+from lxml import etree
+
+from src.helper.compression import open_input, strip_compression_extension
+from src.helper.json_stream import JsonStream
+from src.jmx.jmx_stream_reader import CLOSE, ELEMENT, OPEN, get_hash_tree, is_enabled, iter_plan_elements
+from src.postman.postman_json_reader import extract_tests
+
+
+class CostModel(NamedTuple):
+    """
+    Linear estimate of the output size and conversion time of a source.
+
+    Attributes:
+        folder_bytes (int): Output bytes of a folder or controller.
+        request_bytes (int): Output bytes of a request, its body aside.
+        assertion_bytes (int): Output bytes of an assertion.
+        folder_seconds (float): Conversion seconds per folder or controller.
+        request_seconds (float): Conversion seconds per request.
+        assertion_seconds (float): Conversion seconds per assertion.
+        body_seconds (float): Conversion seconds per MB of body, bodies are copied to the output as they are.
+    """
+    folder_bytes: int
+    request_bytes: int
+    assertion_bytes: int
+    folder_seconds: float
+    request_seconds: float
+    assertion_seconds: float
+    body_seconds: float
+
+
+# Conversion of each source type, fitted on generated sources varying one count at a time (see
+# benchmarks/bench_analyzer.py). The times are those of the machine they were fitted on. A JMX plan converted
+# to a collection keeps the status tests only, which add next to nothing to its size.
+COST_MODELS = {
+    "postman": CostModel(folder_bytes=133, request_bytes=1588, assertion_bytes=736, folder_seconds=0.00026,
+                         request_seconds=0.000107, assertion_seconds=0.000045, body_seconds=0.0),
+    "jmx": CostModel(folder_bytes=85, request_bytes=1699, assertion_bytes=0, folder_seconds=0.00043,
+                     request_seconds=0.000147, assertion_seconds=0.00002, body_seconds=0.019),
+}
+
+# Output type of each source type, the conversion watch and batch modes run
+OUTPUT_TYPES = {
+    "postman": "JMX",
+    "jmx": "Postman collection",
+}
+
+
+class SourceStats(NamedTuple):
+    """
+    Statistics of a Postman collection or JMX plan, with the estimated cost of converting it.
+
+    Attributes:
+        source_type (str): "postman" or "jmx".
+        source_bytes (int): Size of the source file, compressed or not.
+        folders (int): Folders of the collection, or controllers of the plan.
+        requests (int): Requests, or HTTP samplers.
+        assertions (int): Tests of the requests, or assertions of the plan.
+        body_bytes (int): UTF-8 size of the request bodies, raw or form fields.
+        estimated_output_bytes (int): Estimated size of the converted file.
+        estimated_seconds (float): Estimated conversion time.
+    """
+    source_type: str
+    source_bytes: int
+    folders: int
+    requests: int
+    assertions: int
+    body_bytes: int
+    estimated_output_bytes: int
+    estimated_seconds: float
+
+
+def get_body_size(request: Any) -> int:
+    """Returns the UTF-8 size of the body of a Postman request, raw text or form fields."""
+    body = request.get("body") if isinstance(request, dict) else None
+    if not isinstance(body, dict):
+        return 0
+    data = body.get(body.get("mode") or "")
+    if isinstance(data, str):
+        return len(data.encode("utf-8"))
+    if isinstance(data, list):
+        return sum(len(str(field.get("key", "")).encode("utf-8")) + len(str(field.get("value", "")).encode("utf-8"))
+                   for field in data if isinstance(field, dict))
+    return 0
+
+
+def count_postman_request(item: Dict[str, Any], counts: Dict[str, int]) -> None:
+    """Counts a request of a Postman collection, with its tests and body."""
+    counts["requests"] += 1
+    events = item.get("event")
+    if isinstance(events, list):
+        counts["assertions"] += len(extract_tests([event for event in events if isinstance(event, dict)]))
+    counts["body_bytes"] += get_body_size(item["request"])
+
+
+def count_postman_item(item: Any, counts: Dict[str, int]) -> None:
+    """Counts a decoded item of a Postman collection, a folder with everything it holds or a request."""
+    if not isinstance(item, dict):
+        return
+    if isinstance(item.get("item"), list):
+        counts["folders"] += 1
+        for child in item["item"]:
+            count_postman_item(child, counts)
+    elif "request" in item:
+        count_postman_request(item, counts)
+
+
+def scan_postman_items(stream: JsonStream, counts: Dict[str, int]) -> None:
+    """
+    Walks the item array of a Postman collection or folder.
+
+    Items complete in the text already read are decoded at once, the others, large folders and the items cut
+    by the end of the buffer, are walked a key at a time.
+    """
+    for _ in stream.iter_items():
+        decoded, item = stream.read_buffered_value()
+        if decoded:
+            count_postman_item(item, counts)
+            continue
+        if stream.peek() != "{":
+            stream.read_value()
+            continue
+        is_folder = False
+        item = {}
+        for key in stream.iter_object():
+            if key == "item" and stream.peek() == "[":
+                is_folder = True
+                counts["folders"] += 1
+                scan_postman_items(stream, counts)
+            elif key in ("request", "event"):
+                item[key] = stream.read_value()
+            else:
+                stream.read_value()
+        if not is_folder and "request" in item:
+            count_postman_request(item, counts)
+
+
+def scan_postman(file_path: str) -> Dict[str, int]:
+    """
+    Counts the folders, requests, tests and body bytes of a Postman collection in a single streaming pass.
+
+    Memory is bounded by the read buffer and the largest request, and the collection is not validated against
+    the schema.
+
+    Args:
+        file_path (str): Path to the collection, gzip, zstd or xz compressed or not.
+
+    Returns:
+        Dict[str, int]: "folders", "requests", "assertions" and "body_bytes".
+
+    Raises:
+        ValueError: If the file is not a JSON object.
+    """
+    counts = {"folders": 0, "requests": 0, "assertions": 0, "body_bytes": 0}
+    with open_input(file_path, 'r', encoding='utf-8-sig') as json_file:
+        stream = JsonStream(json_file)
+        for key in stream.iter_object():
+            if key == "item" and stream.peek() == "[":
+                scan_postman_items(stream, counts)
+            else:
+                stream.read_value()
+    return counts
+
+
+def get_sampler_body_size(sampler: etree._Element) -> int:
+    """Returns the UTF-8 size of the arguments of an HTTP sampler, its raw body or form fields."""
+    return sum(len(argument.get("name", "").encode("utf-8")) +
+               len(argument.findtext("stringProp[@name='Argument.value']", "").encode("utf-8"))
+               for argument in sampler.iterfind(".//elementProp[@elementType='HTTPArgument']"))
+
+
+def scan_jmx(file_path: str) -> Dict[str, int]:
+    """
+    Counts the controllers, HTTP samplers, assertions and body bytes of a JMX plan in a single streaming pass.
+
+    The plan is streamed by iter_plan_elements, never built as a whole tree. Disabled elements and everything
+    they hold are skipped, like the conversions do.
+
+    Args:
+        file_path (str): Path to the JMX file, gzip, zstd or xz compressed or not.
+
+    Returns:
+        Dict[str, int]: "folders", "requests", "assertions" and "body_bytes".
+
+    Raises:
+        etree.XMLSyntaxError: If the file is not valid XML.
+    """
+    counts = {"folders": 0, "requests": 0, "assertions": 0, "body_bytes": 0}
+    skip_depth = None
+    for event, element, depth in iter_plan_elements(file_path):
+        if skip_depth is not None:
+            if event == CLOSE and depth == skip_depth:
+                skip_depth = None
+            continue
+        if not is_enabled(element):
+            if event == OPEN:
+                skip_depth = depth
+            continue
+        if event == OPEN and element.tag.endswith("Controller") and element.tag != "TestFragmentController":
+            counts["folders"] += 1
+        elif event == ELEMENT and element.tag == "HTTPSamplerProxy":
+            counts["requests"] += 1
+            counts["body_bytes"] += get_sampler_body_size(element)
+            hash_tree = get_hash_tree(element)
+            counts["assertions"] += sum(1 for child in (hash_tree if hash_tree is not None else [])
+                                        if isinstance(child.tag, str) and child.tag.endswith("Assertion")
+                                        and is_enabled(child))
+        elif event == ELEMENT and element.tag.endswith("Assertion"):
+            counts["assertions"] += 1
+    return counts
+
+
+def get_source_type(file_path: str) -> str:
+    """Returns "jmx" for JMX plans and "postman" for any other source, compression extensions aside."""
+    return "jmx" if strip_compression_extension(file_path).lower().endswith(".jmx") else "postman"
+
+
+def analyze_source(file_path: str) -> SourceStats:
+    """
+    Scans a Postman collection or JMX plan and estimates the cost of converting it.
+
+    The estimates are those of the conversion watch and batch modes run, a collection to a JMX plan and a plan
+    to a collection. They come from a linear model of the counts and the source size, see COST_MODELS.
+
+    Args:
+        file_path (str): Path to the collection or plan, gzip, zstd or xz compressed or not.
+
+    Returns:
+        SourceStats: The statistics and estimates.
+
+    Raises:
+        FileNotFoundError: If the file does not exist.
+        ValueError: If a collection is not a JSON object.
+        etree.XMLSyntaxError: If a plan is not valid XML.
+    """
+    source_type = get_source_type(file_path)
+    source_bytes = os.path.getsize(file_path)
+    counts = scan_jmx(file_path) if source_type == "jmx" else scan_postman(file_path)
+    model = COST_MODELS[source_type]
+    output_bytes = (counts["folders"] * model.folder_bytes + counts["requests"] * model.request_bytes +
+                    counts["assertions"] * model.assertion_bytes + counts["body_bytes"])
+    seconds = (counts["folders"] * model.folder_seconds + counts["requests"] * model.request_seconds +
+               counts["assertions"] * model.assertion_seconds + counts["body_bytes"] / 1024 / 1024 * model.body_seconds)
+    return SourceStats(source_type, source_bytes, counts["folders"], counts["requests"], counts["assertions"],
+                       counts["body_bytes"], output_bytes, seconds)
+
+
+def format_stats(file_path: str, stats: SourceStats) -> List[str]:
+    """Formats the statistics of a source as the lines printed by the analyze command."""
+    return [
+        f"{file_path} ({'JMX plan' if stats.source_type == 'jmx' else 'Postman collection'}, "
+        f"{stats.source_bytes / 1024 / 1024:.1f} MB)",
+        f"  folders:     {stats.folders}",
+        f"  requests:    {stats.requests}",
+        f"  assertions:  {stats.assertions}",
+        f"  body bytes:  {stats.body_bytes}",
+        f"  estimated {OUTPUT_TYPES[stats.source_type]} output: {stats.estimated_output_bytes / 1024 / 1024:.1f} MB "
+        f"in {stats.estimated_seconds:.1f} s",
+    ]
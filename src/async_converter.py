@@ -0,0 +1,137 @@
+import asyncio
+import os
+from concurrent.futures import Executor
+from typing import Any, Callable, Dict, Optional, Union
+
+from src.converter import jmx_file_to_postman, jmx_to_postman, postman_file_to_jmx, postman_to_jmx
+from src.helper.file_utils import file_write
+from src.jmx.jmx_creator import resolve_jmx_output, resolve_postman_path
+
+# Default number of conversions allowed to run at the same time
+DEFAULT_MAX_CONCURRENCY = os.cpu_count() or 1
+
+
+async def run_blocking(executor: Optional[Executor], func: Callable, *args) -> Any:
+    """
+    Runs a blocking function in an executor without blocking the event loop.
+
+    Cancelling the awaiting task cancels the job if the executor has not started it yet.
+
+    Args:
+        executor (Optional[Executor]): The executor, None uses the loop's default thread pool.
+        func (Callable): The blocking function.
+        *args: Positional arguments for the function.
+
+    Returns:
+        Any: The function's result.
+    """
+    return await asyncio.get_running_loop().run_in_executor(executor, func, *args)
+
+
+async def postman_to_jmx_async(data: Union[Dict[str, Any], bytes, str],
+                               executor: Optional[Executor] = None) -> bytes:
+    """
+    Converts a Postman collection into a JMX document in the given executor.
+
+    Args:
+        data (Union[Dict[str, Any], bytes, str]): The Postman collection as a dict or JSON text.
+        executor (Optional[Executor]): Executor for the CPU-bound conversion, a ProcessPoolExecutor
+                                       keeps the event loop free of GIL contention.
+
+    Returns:
+        bytes: The UTF-8 encoded JMX document.
+    """
+    return await run_blocking(executor, postman_to_jmx, data)
+
+
+async def jmx_to_postman_async(data: bytes, executor: Optional[Executor] = None,
+                               deterministic_ids: bool = False) -> dict:
+    """
+    Converts a JMX document into a Postman collection in the given executor.
+
+    Args:
+        data (bytes): The JMX document.
+        executor (Optional[Executor]): Executor for the CPU-bound conversion.
+        deterministic_ids (bool): Derive the collection IDs from its content instead of generating random ones.
+
+    Returns:
+        dict: A dictionary representing the Postman collection.
+    """
+    return await run_blocking(executor, jmx_to_postman, data, deterministic_ids)
+
+
+async def create_jmx_file_async(source_file: str, jmx_file: str, executor: Optional[Executor] = None) -> None:
+    """
+    Async counterpart of create_jmx_file: the collection is read and converted in the given executor, so
+    its content is never copied to a worker process, and the JMX file is written in the loop's default
+    thread pool.
+
+    Args:
+        source_file (str): The source file (Postman collection) to read from.
+        jmx_file (str): The file path where the JMX file should be saved.
+        executor (Optional[Executor]): Executor for the CPU-bound conversion.
+    """
+    jmx_content = await run_blocking(executor, postman_file_to_jmx, resolve_postman_path(source_file))
+    output_path, file_name = resolve_jmx_output(jmx_file)
+    await run_blocking(None, file_write, output_path, file_name, jmx_content)
+
+
+async def generate_postman_collection_async(file_path: str, executor: Optional[Executor] = None,
+                                            deterministic_ids: bool = False) -> dict:
+    """
+    Async counterpart of generate_postman_collection, the JMX file is parsed in the given executor.
+
+    Args:
+        file_path (str): The path to the JMX file.
+        executor (Optional[Executor]): Executor for the CPU-bound conversion.
+        deterministic_ids (bool): Derive the collection IDs from its content instead of generating random ones.
+
+    Returns:
+        dict: A dictionary representing the Postman collection.
+    """
+    return await run_blocking(executor, jmx_file_to_postman, file_path, deterministic_ids)
+
+
+async def save_json_async(file_path: str, data: dict) -> None:
+    """
+    Async counterpart of save_json.
+
+    Args:
+        file_path (str): The path where the JSON file will be saved.
+        data (dict): The data to save in JSON format.
+    """
+    await run_blocking(None, file_write, os.path.dirname(file_path), os.path.basename(file_path), data)
+
+
+class AsyncConverter:
+    """
+    Runs conversions from an event loop, sharing one executor and limiting how many run at once.
+
+    Conversions waiting for a free slot hold no resources other than their task, so thousands can be
+    scheduled with asyncio.gather. Create it from a running event loop.
+    """
+
+    def __init__(self, executor: Optional[Executor] = None, max_concurrency: int = DEFAULT_MAX_CONCURRENCY):
+        """
+        Args:
+            executor (Optional[Executor]): Executor for the CPU-bound conversions.
+            max_concurrency (int): Maximum number of conversions running at the same time.
+        """
+        self.executor = executor
+        self.semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def postman_to_jmx(self, data: Union[Dict[str, Any], bytes, str]) -> bytes:
+        async with self.semaphore:
+            return await postman_to_jmx_async(data, self.executor)
+
+    async def jmx_to_postman(self, data: bytes, deterministic_ids: bool = False) -> dict:
+        async with self.semaphore:
+            return await jmx_to_postman_async(data, self.executor, deterministic_ids)
+
+    async def create_jmx_file(self, source_file: str, jmx_file: str) -> None:
+        async with self.semaphore:
+            await create_jmx_file_async(source_file, jmx_file, self.executor)
+
+    async def generate_postman_collection(self, file_path: str, deterministic_ids: bool = False) -> dict:
+        async with self.semaphore:
+            return await generate_postman_collection_async(file_path, self.executor, deterministic_ids)
@@ -0,0 +1,267 @@
+import heapq
+import json
+import logging
+import multiprocessing
+import os
+import time
+from multiprocessing.connection import Connection, wait
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from src.analyzer import analyze_source
+from src.watch import DEFAULT_OUTPUT_DIR, DEFAULT_WATCH_DIR, DEFAULT_WORKERS, convert_file, is_convertible
+
+logging.basicConfig(level=logging.ERROR)
+
+# Completed and failed conversions, one JSON record per line, kept in the output directory
+JOURNAL_FILE_NAME = ".batch_journal.jsonl"
+DEFAULT_RETRIES = 2
+# Seconds before the first retry of a failed file, doubled for every further retry
+DEFAULT_BACKOFF = 1.0
+
+DONE = "done"
+FAILED = "failed"
+
+
+class RunningJob(NamedTuple):
+    """
+    A conversion running in its own worker process.
+
+    Attributes:
+        process (multiprocessing.Process): The worker process.
+        connection (Connection): Receives the outcome sent by the worker.
+        deadline (Optional[float]): time.monotonic() after which the worker is killed, None for no limit.
+    """
+    process: Any
+    connection: Connection
+    deadline: Optional[float]
+
+
+def list_sources(directory: str) -> List[str]:
+    """
+    Lists the Postman collections and JMX plans of a directory.
+
+    Args:
+        directory (str): The source directory.
+
+    Returns:
+        List[str]: The source paths, sorted.
+    """
+    with os.scandir(directory) as entries:
+        return sorted(entry.path for entry in entries if entry.is_file() and is_convertible(entry.name))
+
+
+def load_journal(journal_path: str) -> Dict[str, Dict[str, Any]]:
+    """
+    Loads the last record of every source from a batch journal.
+
+    A line cut by a crash while it was written is ignored.
+
+    Args:
+        journal_path (str): Path of the journal.
+
+    Returns:
+        Dict[str, Dict[str, Any]]: Source path -> last record, empty when there is no journal.
+    """
+    records: Dict[str, Dict[str, Any]] = {}
+    try:
+        with open(journal_path, 'r', encoding='utf-8') as journal_file:
+            for line in journal_file:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                records[record["source"]] = record
+    except FileNotFoundError:
+        pass
+    return records
+
+
+def append_journal(journal_file: Any, record: Dict[str, Any]) -> None:
+    """Appends a record to the journal and flushes it to the disk, so it survives a crash of the batch."""
+    journal_file.write(json.dumps(record) + "\n")
+    journal_file.flush()
+    os.fsync(journal_file.fileno())
+
+
+def is_completed(source_path: str, record: Optional[Dict[str, Any]]) -> bool:
+    """Checks whether the journal records a conversion of the source as it is, from its size and mtime."""
+    if not record or record["status"] != DONE:
+        return False
+    try:
+        stat = os.stat(source_path)
+    except FileNotFoundError:
+        return False  # removed since it was listed, its conversion reports it
+    return record.get("size") == stat.st_size and record.get("mtime_ns") == stat.st_mtime_ns
+
+
+def estimate_seconds(source_path: str) -> float:
+    """Estimates the conversion time of a source with the analyzer, 0 when it cannot be scanned."""
+    try:
+        return analyze_source(source_path).estimated_seconds
+    except Exception:
+        return 0.0  # the conversion reports the error
+
+
+def run_job(connection: Connection, source_path: str, output_dir: str, known_hash: Optional[str],
+            memory_limit: Optional[int]) -> None:
+    """
+    Converts a single file in a worker process and sends the outcome to the batch.
+
+    Args:
+        connection (Connection): Sends ("done", content hash, output name) or ("failed", error).
+        source_path (str): The source file.
+        output_dir (str): The directory the converted file is written to.
+        known_hash (Optional[str]): The content hash of the last conversion, the file is skipped when unchanged.
+        memory_limit (Optional[int]): Address space limit of the worker in MB, a MemoryError fails the file
+            instead of the kernel killing the process.
+    """
+    try:
+        if memory_limit:
+            import resource
+            limit = memory_limit * 1024 * 1024
+            resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+        content_hash, output_name = convert_file(source_path, output_dir, known_hash)
+        connection.send((DONE, content_hash, output_name))
+    except MemoryError:
+        connection.send((FAILED, f"exceeded the memory limit of {memory_limit} MB"))
+    except Exception as e:
+        connection.send((FAILED, f"{type(e).__name__}: {e}"))
+    finally:
+        connection.close()
+
+
+def start_job(source_path: str, output_dir: str, known_hash: Optional[str], timeout: Optional[float],
+              memory_limit: Optional[int]) -> RunningJob:
+    """Starts the conversion of a file in a new worker process."""
+    receiver, sender = multiprocessing.Pipe(duplex=False)
+    process = multiprocessing.Process(target=run_job, args=(sender, source_path, output_dir, known_hash, memory_limit),
+                                      daemon=True)
+    process.start()
+    sender.close()
+    return RunningJob(process, receiver, time.monotonic() + timeout if timeout else None)
+
+
+def finish_job(job: RunningJob, timed_out: bool) -> Tuple[str, ...]:
+    """
+    Collects the outcome of a worker, killing it when it timed out.
+
+    Args:
+        job (RunningJob): The finished or timed out job.
+        timed_out (bool): Whether the deadline of the job passed.
+
+    Returns:
+        Tuple[str, ...]: The outcome sent by the worker, or a failure when it crashed or timed out.
+    """
+    outcome: Tuple[str, ...] = ()
+    if job.connection.poll():
+        try:
+            outcome = job.connection.recv()
+        except EOFError:
+            pass
+    if not outcome and timed_out:
+        job.process.kill()
+    job.process.join()
+    job.connection.close()
+    if outcome:
+        return outcome
+    if timed_out:
+        return FAILED, "timed out"
+    return FAILED, f"worker exited with code {job.process.exitcode}"
+
+
+def convert_batch(directory: str = DEFAULT_WATCH_DIR, output_dir: str = DEFAULT_OUTPUT_DIR,
+                  workers: int = DEFAULT_WORKERS, retries: int = DEFAULT_RETRIES, backoff: float = DEFAULT_BACKOFF,
+                  timeout: Optional[float] = None, memory_limit: Optional[int] = None,
+                  largest_first: bool = False) -> Dict[str, int]:
+    """
+    Converts all Postman collections and JMX plans of a directory, resuming an interrupted batch.
+
+    Every conversion runs in its own worker process, so a file crashing or exhausting its worker only fails
+    that file. Each completed or failed file is appended to a journal in the output directory, which a
+    restarted batch reads to skip the files already converted, unless they changed since. A failed file is
+    retried after a backoff doubling with every attempt.
+
+    Files are started in name order, or, with largest_first, in decreasing order of the conversion time the
+    analyzer estimates from a streaming scan of each file: the longest conversions start first instead of
+    being left running alone at the end of the batch.
+
+    Args:
+        directory (str): The directory of the source files.
+        output_dir (str): The directory converted files and the journal are written to.
+        workers (int): Number of conversions running at the same time.
+        retries (int): Retries of a failed file.
+        backoff (float): Seconds before the first retry.
+        timeout (Optional[float]): Seconds a conversion may run before its worker is killed, None for no limit.
+        memory_limit (Optional[int]): Address space limit of each worker in MB, None for no limit.
+        largest_first (bool): Start the files with the longest estimated conversion first.
+
+    Returns:
+        Dict[str, int]: Number of "converted", "skipped" and "failed" files.
+    """
+    if os.path.abspath(directory) == os.path.abspath(output_dir):
+        raise ValueError("The output directory must differ from the source directory")
+    os.makedirs(output_dir, exist_ok=True)
+    journal_path = os.path.join(output_dir, JOURNAL_FILE_NAME)
+    records = load_journal(journal_path)
+    summary = {"converted": 0, "skipped": 0, "failed": 0}
+
+    # (time.monotonic() before which the file is not started, negated estimated seconds, attempt, source path)
+    queue: List[Tuple[float, float, int, str]] = []
+    for source_path in list_sources(directory):
+        if is_completed(source_path, records.get(source_path)):
+            summary["skipped"] += 1
+        else:
+            queue.append((0.0, -estimate_seconds(source_path) if largest_first else 0.0, 1, source_path))
+    heapq.heapify(queue)
+    running: Dict[str, Tuple[float, int, RunningJob]] = {}
+
+    with open(journal_path, 'a', encoding='utf-8') as journal_file:
+        while queue or running:
+            now = time.monotonic()
+            while queue and queue[0][0] <= now and len(running) < workers:
+                _, rank, attempt, source_path = heapq.heappop(queue)
+                record = records.get(source_path) or {}
+                job = start_job(source_path, output_dir, record.get("hash"), timeout, memory_limit)
+                running[source_path] = (rank, attempt, job)
+
+            deadlines = [job.deadline for _, _, job in running.values() if job.deadline is not None]
+            if queue and len(running) < workers:
+                deadlines.append(queue[0][0])
+            wait([job.process.sentinel for _, _, job in running.values()],
+                 max(min(deadlines) - time.monotonic(), 0) if deadlines else None)
+
+            now = time.monotonic()
+            for source_path, (rank, attempt, job) in list(running.items()):
+                timed_out = job.deadline is not None and job.deadline <= now
+                if job.process.is_alive() and not timed_out:
+                    continue
+                del running[source_path]
+                outcome = finish_job(job, timed_out)
+                try:
+                    stat: Optional[os.stat_result] = os.stat(source_path)
+                except FileNotFoundError:
+                    # Removed or renamed during the batch, there is nothing left to convert or retry
+                    stat = None
+                    outcome = (FAILED, "source file removed")
+                # A failed record keeps the hash and output of the last conversion
+                previous = records.get(source_path) or {}
+                record = {"source": source_path, "status": outcome[0], "attempt": attempt,
+                          "size": stat.st_size if stat else None, "mtime_ns": stat.st_mtime_ns if stat else None,
+                          "hash": previous.get("hash"), "output": previous.get("output")}
+                if outcome[0] == DONE:
+                    _, content_hash, output_name = outcome
+                    record["hash"] = content_hash
+                    record["output"] = output_name or record["output"]
+                    summary["converted" if output_name else "skipped"] += 1
+                    if output_name:
+                        print(f"Converted {os.path.basename(source_path)} -> {output_name}")
+                else:
+                    record["error"] = outcome[1]
+                    if stat and attempt <= retries:
+                        heapq.heappush(queue, (now + backoff * 2 ** (attempt - 1), rank, attempt + 1, source_path))
+                    else:
+                        summary["failed"] += 1
+                        logging.error(f"Conversion of {source_path} failed after {attempt} attempts: {outcome[1]}")
+                records[source_path] = record
+                append_journal(journal_file, record)
+    return summary
@@ -0,0 +1,208 @@
+import json
+from typing import Any, Dict, Iterable, Iterator, Union
+
+from src.jmx.jmx_creator import create_plan_options, generate_jmx_content, iter_jmx_content
+from src.helper.compression import open_input
+from src.jmx.jmx_reader import build_test_plan, parse_jmx_bytes, parse_jmx_file
+from src.postman.postman_json_creator import build_postman_collection
+from src.postman.postman_json_reader import parse_postman_collection
+
+# Size of the byte chunks produced by the iterator variants
+CHUNK_SIZE = 64 * 1024
+# Options of write_jmx_file writing files next to the JMX file, which the conversions in memory have nowhere to put
+FILE_OPTIONS = ("body_threshold", "data_file", "split", "split_size")
+
+
+def load_postman_data(data: Union[Dict[str, Any], bytes, str]) -> Dict[str, Any]:
+    """
+    Returns the decoded Postman collection, decoding it first when it is given as JSON text.
+
+    Args:
+        data (Union[Dict[str, Any], bytes, str]): The Postman collection as a dict or JSON text.
+
+    Returns:
+        Dict[str, Any]: The decoded Postman collection.
+
+    Raises:
+        json.JSONDecodeError: If the JSON text is invalid.
+    """
+    if isinstance(data, dict):
+        return data
+    return json.loads(data)
+
+
+def load_postman_file(file_path: str) -> Dict[str, Any]:
+    """
+    Decodes a Postman collection file, gzip, zstd or xz compressed or not.
+
+    The file is read as text, its bytes are released as they are decoded, and the text once the collection
+    is decoded, so neither stays alive through the conversion as the bytes given to load_postman_data do.
+
+    Args:
+        file_path (str): Path to the Postman collection.
+
+    Returns:
+        Dict[str, Any]: The decoded Postman collection.
+
+    Raises:
+        FileNotFoundError: If the file does not exist.
+        json.JSONDecodeError: If the file is not valid JSON.
+    """
+    with open_input(file_path, 'r', encoding='utf-8-sig') as json_file:
+        return json.load(json_file)
+
+
+def buffer_chunks(pieces: Iterable[str], chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+    """
+    Joins small text pieces into UTF-8 encoded chunks of at least chunk_size characters.
+
+    Args:
+        pieces (Iterable[str]): The text pieces to join.
+        chunk_size (int): The minimum chunk size, only the last chunk may be smaller.
+
+    Yields:
+        bytes: The encoded chunks.
+    """
+    buffer = []
+    buffered = 0
+    for piece in pieces:
+        buffer.append(piece)
+        buffered += len(piece)
+        if buffered >= chunk_size:
+            yield "".join(buffer).encode("utf-8")
+            buffer = []
+            buffered = 0
+    if buffer:
+        yield "".join(buffer).encode("utf-8")
+
+
+def get_plan_options(options: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Checks the JMX options given to a conversion in memory and builds the options of iter_jmx_content.
+
+    Args:
+        options (Dict[str, Any]): shared_defaults, load_profile, deduplicate, environment_file and globals_file,
+            as taken by write_jmx_file.
+
+    Returns:
+        Dict[str, Any]: The options of iter_jmx_content.
+
+    Raises:
+        ValueError: If an option writes files next to the JMX file, use write_jmx_file for those.
+        TypeError: If an option is unknown.
+    """
+    unsupported = [name for name in FILE_OPTIONS if name in options]
+    if unsupported:
+        raise ValueError(f"{', '.join(unsupported)} write files next to the JMX file and are only supported by "
+                         f"write_jmx_file")
+    return create_plan_options(**options)
+
+
+def postman_to_jmx(data: Union[Dict[str, Any], bytes, str], validator: Any = None, **options: Any) -> bytes:
+    """
+    Converts a Postman collection into a JMX document without touching the disk.
+
+    Args:
+        data (Union[Dict[str, Any], bytes, str]): The Postman collection as a dict or JSON text.
+        validator (Any): An optional schema validator built by create_schema_validator.
+        **options: shared_defaults, load_profile, deduplicate, environment_file and globals_file, see
+            write_jmx_file.
+
+    Returns:
+        bytes: The UTF-8 encoded JMX document.
+
+    Raises:
+        ValueError: If an option writes files next to the JMX file.
+    """
+    plan_options = get_plan_options(options)
+    test_plan = parse_postman_collection(load_postman_data(data), validator=validator)
+    return generate_jmx_content(test_plan, **plan_options).encode("utf-8")
+
+
+def postman_file_to_jmx(file_path: str, validator: Any = None, **options: Any) -> bytes:
+    """
+    Converts a Postman collection file into a JMX document, without holding the file content in memory.
+
+    Args:
+        file_path (str): Path to the Postman collection.
+        validator (Any): An optional schema validator built by create_schema_validator.
+        **options: The JMX options of postman_to_jmx.
+
+    Returns:
+        bytes: The UTF-8 encoded JMX document.
+    """
+    return postman_to_jmx(load_postman_file(file_path), validator, **options)
+
+
+def iter_postman_to_jmx(data: Union[Dict[str, Any], bytes, str], chunk_size: int = CHUNK_SIZE,
+                        validator: Any = None, **options: Any) -> Iterator[bytes]:
+    """
+    Converts a Postman collection into a JMX document produced in chunks.
+
+    Args:
+        data (Union[Dict[str, Any], bytes, str]): The Postman collection as a dict or JSON text.
+        chunk_size (int): The minimum size of the produced chunks.
+        validator (Any): An optional schema validator built by create_schema_validator.
+        **options: The JMX options of postman_to_jmx.
+
+    Yields:
+        bytes: Consecutive UTF-8 encoded chunks of the JMX document.
+    """
+    plan_options = get_plan_options(options)
+    test_plan = parse_postman_collection(load_postman_data(data), validator=validator)
+    yield from buffer_chunks(iter_jmx_content(test_plan, **plan_options), chunk_size)
+
+
+def jmx_to_postman(data: bytes, deterministic_ids: bool = False, normalize_bodies: bool = False) -> dict:
+    """
+    Converts a JMX document into a Postman collection without touching the disk.
+
+    Args:
+        data (bytes): The JMX document.
+        deterministic_ids (bool): Derive the collection IDs from its content instead of generating random ones.
+        normalize_bodies (bool): Parse and re-format JSON request bodies instead of passing them through.
+
+    Returns:
+        dict: A dictionary representing the Postman collection.
+    """
+    return build_postman_collection(build_test_plan(parse_jmx_bytes(data)), deterministic_ids, normalize_bodies)
+
+
+def jmx_file_to_postman(file_path: str, deterministic_ids: bool = False, normalize_bodies: bool = False) -> dict:
+    """
+    Converts a JMX file into a Postman collection, without holding the file content in memory.
+
+    lxml parses the file as it reads it, so only the element tree is built, never a copy of the document.
+
+    Args:
+        file_path (str): Path to the JMX file, gzip, zstd or xz compressed or not.
+        deterministic_ids (bool): Derive the collection IDs from its content instead of generating random ones.
+        normalize_bodies (bool): Parse and re-format JSON request bodies instead of passing them through.
+
+    Returns:
+        dict: A dictionary representing the Postman collection.
+
+    Raises:
+        etree.XMLSyntaxError: If the file is not valid XML.
+    """
+    return build_postman_collection(build_test_plan(parse_jmx_file(file_path)), deterministic_ids, normalize_bodies)
+
+
+def iter_jmx_to_postman(data: bytes, chunk_size: int = CHUNK_SIZE, deterministic_ids: bool = False,
+                        normalize_bodies: bool = False) -> Iterator[bytes]:
+    """
+    Converts a JMX document into a Postman collection serialized as JSON in chunks.
+
+    The output is identical to the file written by save_json.
+
+    Args:
+        data (bytes): The JMX document.
+        chunk_size (int): The minimum size of the produced chunks.
+        deterministic_ids (bool): Derive the collection IDs from its content instead of generating random ones.
+        normalize_bodies (bool): Parse and re-format JSON request bodies instead of passing them through.
+
+    Yields:
+        bytes: Consecutive UTF-8 encoded chunks of the Postman collection JSON.
+    """
+    collection = jmx_to_postman(data, deterministic_ids, normalize_bodies)
+    yield from buffer_chunks(json.JSONEncoder(indent=4).iterencode(collection), chunk_size)
@@ -0,0 +1,334 @@
+import argparse
+import asyncio
+import functools
+import json
+import logging
+import os
+import socket
+import tempfile
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional
+
+from src.converter import iter_jmx_to_postman, iter_postman_to_jmx
+from src.postman.postman_json_reader import create_schema_validator
+
+logging.basicConfig(level=logging.ERROR)
+
+DEFAULT_SOCKET_PATH = os.path.join(tempfile.gettempdir(), "test_flow_x.sock")
+LOCALHOST = "127.0.0.1"
+DEFAULT_WORKERS = os.cpu_count() or 1
+# Jobs accepted per worker before new requests wait, bounds the payloads and results held in memory
+JOBS_PER_WORKER = 2
+# Largest payload accepted, larger jobs are rejected before their payload is read
+MAX_PAYLOAD_SIZE = 1 << 30
+
+POSTMAN_TO_JMX = "postman_to_jmx"
+JMX_TO_POSTMAN = "jmx_to_postman"
+CONVERSIONS = (POSTMAN_TO_JMX, JMX_TO_POSTMAN)
+
+# Schema validator of the current worker, built once by warm_up_worker
+worker_validator = None
+
+
+def warm_up_worker() -> None:
+    """
+    Initializes a worker: the schema is loaded and checked once instead of once per job.
+    """
+    global worker_validator
+    worker_validator = create_schema_validator()
+
+
+def run_conversion(conversion: str, payload: bytes, deterministic_ids: bool = False) -> List[bytes]:
+    """
+    Runs a single conversion job inside a worker.
+
+    Args:
+        conversion (str): One of CONVERSIONS.
+        payload (bytes): The source document.
+        deterministic_ids (bool): Derive generated IDs from the content instead of generating random ones.
+
+    Returns:
+        List[bytes]: The converted document in chunks.
+    """
+    if conversion == POSTMAN_TO_JMX:
+        return list(iter_postman_to_jmx(payload, validator=worker_validator))
+    return list(iter_jmx_to_postman(payload, deterministic_ids=deterministic_ids))
+
+
+def encode_header(header: Dict[str, Any]) -> bytes:
+    """
+    Encodes a protocol header as a single JSON line.
+
+    Args:
+        header (Dict[str, Any]): The header fields.
+
+    Returns:
+        bytes: The encoded header line.
+    """
+    return json.dumps(header).encode("utf-8") + b"\n"
+
+
+def read_payload_size(header: Dict[str, Any]) -> int:
+    """
+    Reads the payload size of a job header.
+
+    Args:
+        header (Dict[str, Any]): The decoded job header.
+
+    Returns:
+        int: The payload size in bytes.
+
+    Raises:
+        ValueError: If the size is not an integer between 0 and MAX_PAYLOAD_SIZE.
+    """
+    size = header.get("size", 0)
+    if isinstance(size, bool) or not isinstance(size, int):
+        raise ValueError(f"Invalid payload size: {size!r}")
+    if not 0 <= size <= MAX_PAYLOAD_SIZE:
+        raise ValueError(f"Payload size {size} is not between 0 and {MAX_PAYLOAD_SIZE} bytes")
+    return size
+
+
+async def handle_job(reader: asyncio.StreamReader, writer: asyncio.StreamWriter, header: Dict[str, Any],
+                     executor: Executor, semaphore: asyncio.Semaphore) -> bool:
+    """
+    Reads the payload of a job, converts it in the worker pool and streams the result back.
+
+    The response is a header line followed, on success, by chunks framed as "<size>\\n<bytes>" and
+    terminated by a zero size. The payload is read and the result written while the job holds the semaphore,
+    so only a bounded number of payloads and results are in memory whatever the number of clients.
+
+    Args:
+        reader (asyncio.StreamReader): The client stream to read the payload from.
+        writer (asyncio.StreamWriter): The client stream to write the response to.
+        header (Dict[str, Any]): The decoded job header with the conversion, payload size and options.
+        executor (Executor): The worker pool.
+        semaphore (asyncio.Semaphore): Limits the number of jobs in progress.
+
+    Returns:
+        bool: False when the payload size is invalid: the payload is not read, so the connection cannot
+            be used for further jobs.
+    """
+    try:
+        size = read_payload_size(header)
+    except ValueError as e:
+        writer.write(encode_header({"status": "error", "message": str(e)}))
+        return False
+
+    async with semaphore:
+        payload = await reader.readexactly(size)
+        conversion = header.get("conversion")
+        if conversion not in CONVERSIONS:
+            writer.write(encode_header({"status": "error", "message": f"Unsupported conversion: {conversion}"}))
+            return True
+
+        try:
+            chunks = await asyncio.get_running_loop().run_in_executor(
+                executor, run_conversion, conversion, payload, bool(header.get("deterministic_ids")))
+        except Exception as e:
+            logging.error(f"Conversion {conversion} failed: {e}")
+            writer.write(encode_header({"status": "error", "message": str(e)}))
+            return True
+        del payload
+
+        writer.write(encode_header({"status": "ok"}))
+        for chunk in chunks:
+            writer.write(b"%d\n" % len(chunk))
+            writer.write(chunk)
+            await writer.drain()
+        writer.write(b"0\n")
+        await writer.drain()
+    return True
+
+
+async def handle_client(reader: asyncio.StreamReader, writer: asyncio.StreamWriter,
+                        executor: Executor, semaphore: asyncio.Semaphore) -> None:
+    """
+    Serves the jobs sent on a client connection until the client closes it.
+
+    Args:
+        reader (asyncio.StreamReader): The client stream to read jobs from.
+        writer (asyncio.StreamWriter): The client stream to write responses to.
+        executor (Executor): The worker pool.
+        semaphore (asyncio.Semaphore): Limits the number of jobs in progress.
+    """
+    try:
+        while True:
+            header_line = await reader.readline()
+            if not header_line:
+                break
+            try:
+                header = json.loads(header_line)
+            except json.JSONDecodeError:
+                writer.write(encode_header({"status": "error", "message": "Invalid job header"}))
+                break
+            if not await handle_job(reader, writer, header, executor, semaphore):
+                break
+            await writer.drain()
+    except (asyncio.IncompleteReadError, ConnectionError) as e:
+        logging.error(f"Client connection lost: {e}")
+    finally:
+        writer.close()
+
+
+async def start_server(executor: Executor, max_jobs: int, socket_path: Optional[str] = DEFAULT_SOCKET_PATH,
+                       port: Optional[int] = None) -> asyncio.AbstractServer:
+    """
+    Starts listening for conversion jobs on a Unix socket, or on localhost when a port is given.
+
+    Args:
+        executor (Executor): The worker pool running the conversions.
+        max_jobs (int): Maximum number of jobs in progress at the same time.
+        socket_path (Optional[str]): Path of the Unix socket.
+        port (Optional[int]): TCP port on localhost, 0 picks a free port.
+
+    Returns:
+        asyncio.AbstractServer: The started server.
+    """
+    handler = functools.partial(handle_client, executor=executor, semaphore=asyncio.Semaphore(max_jobs))
+    if port is not None:
+        return await asyncio.start_server(handler, LOCALHOST, port)
+    if os.path.exists(socket_path):
+        os.remove(socket_path)
+    return await asyncio.start_unix_server(handler, socket_path)
+
+
+async def run_server(executor: Executor, max_jobs: int, socket_path: Optional[str] = DEFAULT_SOCKET_PATH,
+                     port: Optional[int] = None) -> None:
+    """
+    Runs the conversion server until it is cancelled.
+
+    Args:
+        executor (Executor): The worker pool running the conversions.
+        max_jobs (int): Maximum number of jobs in progress at the same time.
+        socket_path (Optional[str]): Path of the Unix socket.
+        port (Optional[int]): TCP port on localhost.
+    """
+    server = await start_server(executor, max_jobs, socket_path, port)
+    async with server:
+        await server.serve_forever()
+
+
+def serve(socket_path: Optional[str] = DEFAULT_SOCKET_PATH, port: Optional[int] = None,
+          workers: int = DEFAULT_WORKERS) -> None:
+    """
+    Runs the conversion daemon with a warmed-up process pool.
+
+    Args:
+        socket_path (Optional[str]): Path of the Unix socket.
+        port (Optional[int]): TCP port on localhost, used instead of the Unix socket when given.
+        workers (int): Number of worker processes.
+    """
+    with ProcessPoolExecutor(max_workers=workers, initializer=warm_up_worker) as executor:
+        try:
+            asyncio.run(run_server(executor, workers * JOBS_PER_WORKER, socket_path, port))
+        except KeyboardInterrupt:
+            pass
+        finally:
+            if port is None and os.path.exists(socket_path):
+                os.remove(socket_path)
+
+
+def connect(socket_path: Optional[str] = DEFAULT_SOCKET_PATH, port: Optional[int] = None) -> socket.socket:
+    """
+    Connects to a running conversion daemon.
+
+    Args:
+        socket_path (Optional[str]): Path of the Unix socket.
+        port (Optional[int]): TCP port on localhost, used instead of the Unix socket when given.
+
+    Returns:
+        socket.socket: The connected socket.
+    """
+    if port is not None:
+        return socket.create_connection((LOCALHOST, port))
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    client.connect(socket_path)
+    return client
+
+
+def request_conversion(stream: BinaryIO, conversion: str, payload: bytes,
+                       deterministic_ids: bool = False) -> Iterator[bytes]:
+    """
+    Sends a job over an open daemon connection and yields the converted chunks as they arrive.
+
+    Args:
+        stream (BinaryIO): A binary read/write file object of the connection.
+        conversion (str): One of CONVERSIONS.
+        payload (bytes): The source document.
+        deterministic_ids (bool): Derive generated IDs from the content instead of generating random ones.
+
+    Yields:
+        bytes: Chunks of the converted document.
+
+    Raises:
+        RuntimeError: If the daemon reports an error or closes the connection.
+    """
+    stream.write(encode_header({"conversion": conversion, "size": len(payload), "deterministic_ids": deterministic_ids}))
+    stream.write(payload)
+    stream.flush()
+
+    header_line = stream.readline()
+    if not header_line:
+        raise RuntimeError("The conversion daemon closed the connection")
+    header = json.loads(header_line)
+    if header.get("status") != "ok":
+        raise RuntimeError(f"Conversion failed: {header.get('message')}")
+
+    while True:
+        size = int(stream.readline())
+        if size == 0:
+            break
+        yield stream.read(size)
+
+
+def convert_with_daemon(conversion: str, payload: bytes, socket_path: Optional[str] = DEFAULT_SOCKET_PATH,
+                        port: Optional[int] = None, deterministic_ids: bool = False) -> Iterator[bytes]:
+    """
+    Runs a single conversion on the daemon.
+
+    Args:
+        conversion (str): One of CONVERSIONS.
+        payload (bytes): The source document.
+        socket_path (Optional[str]): Path of the Unix socket.
+        port (Optional[int]): TCP port on localhost, used instead of the Unix socket when given.
+        deterministic_ids (bool): Derive generated IDs from the content instead of generating random ones.
+
+    Yields:
+        bytes: Chunks of the converted document.
+    """
+    with connect(socket_path, port) as client, client.makefile("rwb") as stream:
+        yield from request_conversion(stream, conversion, payload, deterministic_ids)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Command line entry point for the daemon and its client."""
+    parser = argparse.ArgumentParser(prog="python -m src.daemon", description="Test Flow X conversion daemon")
+    parser.add_argument("--socket", default=DEFAULT_SOCKET_PATH, help="Unix socket path")
+    parser.add_argument("--port", type=int, help="localhost TCP port, used instead of the Unix socket")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    serve_parser = commands.add_parser("serve", help="run the conversion daemon")
+    serve_parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="number of worker processes")
+
+    convert_parser = commands.add_parser("convert", help="convert a file with a running daemon")
+    convert_parser.add_argument("conversion", choices=CONVERSIONS)
+    convert_parser.add_argument("source", help="source file")
+    convert_parser.add_argument("destination", help="destination file")
+    convert_parser.add_argument("--deterministic-ids", action="store_true",
+                                help="derive collection IDs from the content for reproducible output")
+
+    args = parser.parse_args(argv)
+    if args.command == "serve":
+        serve(args.socket, args.port, args.workers)
+        return
+
+    with open(args.source, 'rb') as source_file:
+        payload = source_file.read()
+    with open(args.destination, 'wb') as destination_file:
+        for chunk in convert_with_daemon(args.conversion, payload, args.socket, args.port, args.deterministic_ids):
+            destination_file.write(chunk)
+
+
+if __name__ == '__main__':
+    main()
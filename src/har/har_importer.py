@@ -0,0 +1,60 @@
+from typing import Any, Dict
+
+from src.har.har_reader import DEFAULT_GAP, read_har
+from src.helper.importer import load_source, save_postman_collection
+from src.jmx.jmx_creator import write_jmx_file
+
+
+def load_har(source_file: str, gap: float = DEFAULT_GAP, keep_static: bool = False) -> Dict[str, Any]:
+    """
+    Reads the test plan structure of a HAR file.
+
+    Args:
+        source_file (str): An existing file path, or a recording name (without .har) in file_to_convert.
+        gap (float): Seconds without traffic from which the entries are put in separate controllers.
+        keep_static (bool): Keep the requests of static assets.
+
+    Returns:
+        Dict[str, Any]: The test plan structure returned by read_har.
+
+    Raises:
+        FileNotFoundError: If the file does not exist.
+        ValueError: If the file is not valid JSON.
+    """
+    return load_source(source_file, ".har", read_har, gap=gap, keep_static=keep_static)
+
+
+def create_jmx_file_from_har(source_file: str, jmx_file: str, gap: float = DEFAULT_GAP, keep_static: bool = False,
+                             **options: Any) -> None:
+    """
+    Creates a JMeter .jmx file from the requests recorded in a HAR file.
+
+    See read_har for the grouping of the requests.
+
+    Args:
+        source_file (str): The HAR file, a path or a recording name (without .har) in file_to_convert.
+        jmx_file (str): The file path where the JMX file should be saved.
+        gap (float): Seconds without traffic from which the entries are put in separate controllers.
+        keep_static (bool): Keep the requests of static assets.
+        **options: The options of write_jmx_file.
+    """
+    write_jmx_file(load_har(source_file, gap=gap, keep_static=keep_static), jmx_file, **options)
+
+
+def create_postman_collection_from_har(source_file: str, output_path: str, gap: float = DEFAULT_GAP,
+                                       keep_static: bool = False, deterministic_ids: bool = False,
+                                       normalize_bodies: bool = False) -> None:
+    """
+    Creates a Postman collection from the requests recorded in a HAR file.
+
+    Args:
+        source_file (str): The HAR file, a path or a recording name (without .har) in file_to_convert.
+        output_path (str): The path where the Postman collection will be saved, a name without .json is
+            saved in the out directory.
+        gap (float): Seconds without traffic from which the entries are put in separate controllers.
+        keep_static (bool): Keep the requests of static assets.
+        deterministic_ids (bool): Derive the collection IDs from its content instead of generating random ones.
+        normalize_bodies (bool): Parse and re-format JSON request bodies instead of passing them through.
+    """
+    save_postman_collection(load_har(source_file, gap=gap, keep_static=keep_static), output_path,
+                            deterministic_ids, normalize_bodies)
@@ -0,0 +1,222 @@
+import os
+import posixpath
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from src.helper.compression import open_input, strip_compression_extension
+from src.helper.json_stream import JsonStream
+from src.jmx.jmx_creator import FORMDATA_BODY, RAW_BODY, URLENCODED_BODY
+from src.postman.postman_json_reader import NO_BODY_CONTENT, extract_query_params
+
+# Seconds without traffic after which the following entries go to a new controller
+DEFAULT_GAP = 5.0
+
+# Static assets, recognised by the resource type browsers record, the response type or the file extension
+STATIC_RESOURCE_TYPES = frozenset(("image", "stylesheet", "script", "font", "media", "manifest", "texttrack"))
+STATIC_MIME_PREFIXES = ("image/", "font/", "audio/", "video/", "text/css", "text/javascript",
+                        "application/javascript", "application/x-javascript", "application/font",
+                        "application/x-font", "application/vnd.ms-fontobject")
+STATIC_EXTENSIONS = frozenset((".js", ".mjs", ".css", ".map", ".png", ".jpg", ".jpeg", ".gif", ".svg", ".ico",
+                               ".webp", ".avif", ".bmp", ".woff", ".woff2", ".ttf", ".otf", ".eot", ".mp3", ".mp4",
+                               ".webm", ".ogg", ".wav"))
+
+# Headers the client computes for every request, or HTTP/2 pseudo-headers (:authority, :path...)
+SKIPPED_HEADERS = frozenset(("host", "content-length", "connection"))
+
+
+def iter_har_entries(file_path: str, pages: Dict[str, str]) -> Iterator[Dict[str, Any]]:
+    """
+    Streams the entries of a HAR file, decoding one entry at a time.
+
+    Args:
+        file_path (str): Path to the HAR file.
+        pages (Dict[str, str]): Receives the title of every page by id, as soon as log.pages is read. Browsers
+            write the pages before the entries.
+
+    Yields:
+        Dict[str, Any]: The entries, in file order.
+
+    Raises:
+        ValueError: If the file is not valid JSON.
+    """
+    with open_input(file_path, 'r', encoding='utf-8-sig') as har_file:
+        stream = JsonStream(har_file)
+        for key in stream.iter_object():
+            if key != "log":
+                stream.read_value()
+                continue
+            for log_key in stream.iter_object():
+                if log_key == "entries":
+                    yield from stream.iter_array()
+                elif log_key == "pages":
+                    pages.update((page.get("id", ""), page.get("title") or page.get("id", ""))
+                                 for page in stream.iter_array() if isinstance(page, dict))
+                else:
+                    stream.read_value()
+
+
+def is_static(entry: Dict[str, Any]) -> bool:
+    """
+    Tells whether an entry fetched a static asset (script, stylesheet, image, font or media).
+
+    Args:
+        entry (Dict[str, Any]): A HAR entry.
+
+    Returns:
+        bool: True for static assets.
+    """
+    if entry.get("_resourceType") in STATIC_RESOURCE_TYPES:
+        return True
+    mime_type = entry.get("response", {}).get("content", {}).get("mimeType", "").lower()
+    if mime_type.startswith(STATIC_MIME_PREFIXES):
+        return True
+    path = urlsplit(entry.get("request", {}).get("url", "")).path
+    return posixpath.splitext(path)[1].lower() in STATIC_EXTENSIONS
+
+
+def parse_time(started: str) -> Optional[float]:
+    """
+    Reads the startedDateTime of an entry.
+
+    Args:
+        started (str): An ISO 8601 date, "Z" for UTC included.
+
+    Returns:
+        Optional[float]: The POSIX timestamp, None when the date cannot be read.
+    """
+    try:
+        return datetime.fromisoformat(started.replace("Z", "+00:00")).timestamp()
+    except (AttributeError, ValueError):
+        return None
+
+
+def read_body(post_data: Optional[Dict[str, Any]]) -> Tuple[Any, Optional[str]]:
+    """
+    Reads the body of a request, form parameters as form fields and any other text as a raw body.
+
+    Args:
+        post_data (Optional[Dict[str, Any]]): The postData of the HAR request.
+
+    Returns:
+        Tuple[Any, Optional[str]]: The body and the body mode, NO_BODY_CONTENT and None without a body.
+    """
+    if not post_data:
+        return NO_BODY_CONTENT, None
+    mime_type = post_data.get("mimeType", "").lower()
+    params = post_data.get("params") or []
+    if params and mime_type.startswith(("application/x-www-form-urlencoded", "multipart/form-data")):
+        body_mode = FORMDATA_BODY if mime_type.startswith("multipart/") else URLENCODED_BODY
+        return [{"key": param.get("name", ""), "value": param.get("value", "")} for param in params], body_mode
+    text = post_data.get("text")
+    if text:
+        return text, RAW_BODY
+    return NO_BODY_CONTENT, None
+
+
+def to_request_node(entry: Dict[str, Any], node_id: str, parent_id: str) -> Dict[str, Any]:
+    """
+    Converts a HAR entry into a request of the test plan structure.
+
+    Only the request is kept. A successful response becomes a status test, redirects are left out as the
+    load testing tools follow them.
+
+    Args:
+        entry (Dict[str, Any]): The HAR entry.
+        node_id (str): The id of the request.
+        parent_id (str): The id of its controller.
+
+    Returns:
+        Dict[str, Any]: The request, as read by read_postman_collection.
+    """
+    request = entry.get("request", {})
+    method = request.get("method", "GET").upper()
+    raw_url = request.get("url", "")
+    body, body_mode = read_body(request.get("postData"))
+    headers = [{"key": header.get("name", ""), "value": header.get("value", "")}
+               for header in request.get("headers", [])
+               if not header.get("name", ":").startswith(":") and header["name"].lower() not in SKIPPED_HEADERS]
+    status = entry.get("response", {}).get("status", 0)
+    tests = [{"name": f"Status code is {status}", "script": f"pm.response.to.have.status({status});"}] \
+        if isinstance(status, int) and 200 <= status < 300 else []
+    return {
+        "id": node_id,
+        "name": f"{method} {urlsplit(raw_url).path or '/'}".replace("&", "and"),
+        "type": "request",
+        "parent": parent_id,
+        "method": method,
+        "raw_url": raw_url,
+        "queryParams": extract_query_params(raw_url),
+        "body": body,
+        "body_mode": body_mode,
+        "headers": headers,
+        "tests": tests,
+        "variables": []
+    }
+
+
+def read_har(file_path: str, gap: float = DEFAULT_GAP, keep_static: bool = False) -> Dict[str, Any]:
+    """
+    Reads the requests recorded in a HAR file into the test plan structure consumed by the JMX creator.
+
+    Consecutive entries of the same page, or of the same host for entries outside any page, are grouped into
+    a controller named after the page title or the host. A pause longer than gap starts a new controller.
+    The file is streamed and only the requests are kept, so memory is bounded by the largest entry and the
+    requests read, whatever the size of the recorded responses.
+
+    Args:
+        file_path (str): Path to the HAR file.
+        gap (float): Seconds between two entries from which they are put in separate controllers.
+        keep_static (bool): Keep the requests of scripts, stylesheets, images, fonts and media.
+
+    Returns:
+        Dict[str, Any]: The test plan structure returned by read_postman_collection, without a load profile.
+
+    Raises:
+        FileNotFoundError: If the file does not exist.
+        ValueError: If the file is not valid JSON.
+    """
+    pages: Dict[str, str] = {}
+    controllers: List[Dict[str, Any]] = []
+    name_counts: Dict[str, int] = {}
+    controller: Optional[Dict[str, Any]] = None
+    group_key = None
+    last_time: Optional[float] = None
+    node_count = 0
+
+    for entry in iter_har_entries(file_path, pages):
+        if not isinstance(entry, dict) or (not keep_static and is_static(entry)):
+            continue
+        url = urlsplit(entry.get("request", {}).get("url", ""))
+        # data:, blob: and websocket entries are not HTTP requests
+        if url.scheme not in ("http", "https"):
+            continue
+        page = entry.get("pageref")
+        key = ("page", page) if page else ("host", url.netloc)
+        started = parse_time(entry.get("startedDateTime"))
+        if controller is None or key != group_key or (
+                started is not None and last_time is not None and started - last_time > gap):
+            name = (pages.get(page) or page) if page else url.netloc
+            name_counts[name] = name_counts.get(name, 0) + 1
+            if name_counts[name] > 1:
+                name = f"{name} ({name_counts[name]})"
+            node_count += 1
+            controller = {"id": f"controller_{node_count}", "name": name.replace("&", "and"),
+                          "type": "generic_controller", "parent": None, "children": []}
+            controllers.append(controller)
+            group_key = key
+        if started is not None:
+            duration = entry.get("time")
+            last_time = max(last_time or started, started + (duration / 1000 if isinstance(duration, (int, float))
+                                                               and duration > 0 else 0))
+        node_count += 1
+        controller["children"].append(to_request_node(entry, f"controller_{node_count}", controller["id"]))
+
+    return {
+        "test_plan_name": os.path.splitext(os.path.basename(strip_compression_extension(file_path)))[0].replace("&", "and"),
+        "test_plan_comments": "Converted from a HAR recording",
+        "test_fragment_controller": {
+            "name": "Test Fragment",
+            "generic_controllers": controllers
+        }
+    }
@@ -0,0 +1,148 @@
+import gzip
+import lzma
+import os
+from typing import IO, Any, Optional
+
+GZIP = "gzip"
+ZSTD = "zstd"
+XZ = "xz"
+
+# Leading bytes of each format, compressed input is recognised by its content whatever its name
+MAGIC_NUMBERS = {
+    GZIP: b"\x1f\x8b",
+    ZSTD: b"\x28\xb5\x2f\xfd",
+    XZ: b"\xfd7zXZ\x00",
+}
+MAGIC_LENGTH = max(len(magic) for magic in MAGIC_NUMBERS.values())
+
+# Compressed output is picked from the extension of the file name
+COMPRESSION_EXTENSIONS = {
+    ".gz": GZIP,
+    ".zst": ZSTD,
+    ".xz": XZ,
+}
+
+# zlib level 9 is several times slower than 6 for a few percent smaller JMX and JSON files, 6 is the gzip default
+GZIP_LEVEL = 6
+
+
+def detect_compression(file_path: str) -> Optional[str]:
+    """
+    Detects the compression of a file from its magic number.
+
+    Args:
+        file_path (str): Path to the file.
+
+    Returns:
+        Optional[str]: GZIP, ZSTD or XZ, None for an uncompressed file or a file that cannot be read, whose error
+            is left to the reader opening it.
+    """
+    # Read without a buffered file object, only the magic number is needed
+    try:
+        descriptor = os.open(file_path, os.O_RDONLY)
+        try:
+            header = os.read(descriptor, MAGIC_LENGTH)
+        finally:
+            os.close(descriptor)
+    except OSError:
+        return None
+    return next((compression for compression, magic in MAGIC_NUMBERS.items() if header[:len(magic)] == magic), None)
+
+
+def get_output_compression(file_name: str) -> Optional[str]:
+    """Returns the compression of an output file from its extension, None for an uncompressed file."""
+    lowered = file_name.lower()
+    return next((compression for extension, compression in COMPRESSION_EXTENSIONS.items()
+                 if lowered.endswith(extension)), None)
+
+
+def strip_compression_extension(file_name: str) -> str:
+    """
+    Removes the compression extension of a file name, so "plan.jmx.gz" is handled as "plan.jmx".
+
+    Args:
+        file_name (str): A file name or path.
+
+    Returns:
+        str: The file name without its compression extension.
+    """
+    lowered = file_name.lower()
+    extension = next((extension for extension in COMPRESSION_EXTENSIONS if lowered.endswith(extension)), "")
+    return file_name[:len(file_name) - len(extension)]
+
+
+def import_zstandard() -> Any:
+    try:
+        import zstandard
+    except ImportError:
+        raise ValueError("zstd compressed files require zstandard (pip install zstandard)") from None
+    return zstandard
+
+
+def open_compressed(file_path: str, compression: Optional[str], mode: str, **kwargs: Any) -> IO:
+    """
+    Opens a file through the decompressor or compressor of its format, or directly when uncompressed.
+
+    The data is decompressed or compressed as it is read or written, so it is never held whole in memory or
+    written to a temporary file.
+
+    Args:
+        file_path (str): Path to the file.
+        compression (Optional[str]): GZIP, ZSTD, XZ or None.
+        mode (str): An open() mode, text unless it contains "b".
+        **kwargs: encoding, errors and newline of text modes.
+
+    Returns:
+        IO: The file object.
+
+    Raises:
+        ValueError: If the file is zstd compressed and zstandard is not installed.
+    """
+    if compression is None:
+        return open(file_path, mode, **kwargs)
+    if "b" not in mode and "t" not in mode:
+        mode += "t"
+    if compression == GZIP:
+        if "r" in mode:
+            return gzip.open(file_path, mode, **kwargs)
+        return gzip.open(file_path, mode, compresslevel=GZIP_LEVEL, **kwargs)
+    if compression == XZ:
+        return lzma.open(file_path, mode, **kwargs)
+    return import_zstandard().open(file_path, mode, **kwargs)
+
+
+def open_input(file_path: str, mode: str = 'rb', **kwargs: Any) -> IO:
+    """
+    Opens a file for reading, decompressing it on the fly when it is gzip, zstd or xz compressed.
+
+    Args:
+        file_path (str): Path to the file.
+        mode (str): 'rb', or 'r' for text.
+        **kwargs: encoding, errors and newline of the text mode.
+
+    Returns:
+        IO: The file object.
+
+    Raises:
+        FileNotFoundError: If the file does not exist.
+        ValueError: If the file is zstd compressed and zstandard is not installed.
+    """
+    return open_compressed(file_path, detect_compression(file_path), mode, **kwargs)
+
+
+def open_output(file_path: str, mode: str = 'wb', **kwargs: Any) -> IO:
+    """
+    Opens a file for writing, compressing it on the fly when its name ends with .gz, .zst or .xz.
+
+    Args:
+        file_path (str): Path to the file.
+        mode (str): 'wb', or 'w' for text.
+        **kwargs: encoding, errors and newline of the text mode.
+
+    Returns:
+        IO: The file object.
+
+    Raises:
+        ValueError: If zstd output is requested and zstandard is not installed.
+    """
+    return open_compressed(file_path, get_output_compression(file_path), mode, **kwargs)
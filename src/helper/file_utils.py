@@ -1,10 +1,12 @@
 import os
 import json
 
+from src.helper.compression import open_input, open_output
+
 
 def file_load(file_path):
     if os.path.exists(file_path):
-        with open(file_path, 'r') as schema:
+        with open_input(file_path, 'r') as schema:
             return schema.read()
     else:
         raise FileNotFoundError('File not found')
@@ -18,7 +20,8 @@ def file_write(file_path, file_name, file_content=None):
     This function ensures that the directory exists and removes the file if it
     already exists (unless loading). If the content is not a string, it attempts
     to convert it to a string using JSON serialization. If serialization fails,
-    it uses the built-in `str()` function as a fallback.
+    it uses the built-in `str()` function as a fallback. Bytes are written as is.
+    A file name ending with .gz, .zst or .xz is compressed as it is written.
 
     Parameters:
         file_path (str): The directory path where the file will be created.
@@ -52,18 +55,22 @@ def file_write(file_path, file_name, file_content=None):
     if os.path.exists(full_file_path):
         os.remove(full_file_path)
 
+    # Already encoded content is written as is
+    if isinstance(file_content, bytes):
+        with open_output(full_file_path, 'wb') as binary_file:
+            binary_file.write(file_content)
     # Check if the content is a string, if not, convert it to string
-    if not isinstance(file_content, str):
+    elif not isinstance(file_content, str):
         try:
             # Attempt to convert to JSON string if the content is a list or dict
-            with open(full_file_path, 'w') as json_file:
+            with open_output(full_file_path, 'w') as json_file:
                 json.dump(file_content, json_file, indent=4)
         except (TypeError, ValueError):
             # Fallback to using str() for other types
             file_content = str(file_content)
     else:
         # Write the content to the file
-        with open(full_file_path, 'w') as jmx_file:
+        with open_output(full_file_path, 'w') as jmx_file:
             jmx_file.write(file_content)
 
 
@@ -1,10 +1,55 @@
+import hashlib
+import json
 import secrets
 import uuid
+from typing import Optional
 
+# Namespace for the name-based (uuid5) IDs derived from collection content
+ID_NAMESPACE = uuid.UUID("5f1c2a9e-8b7d-4c3e-9a61-0d2f4b8e7c15")
+ID_MIN = 10000000
+ID_MAX = 99999999
 
-def generate_uuid():
-    return str(uuid.uuid4())
 
+def generate_uuid(seed: Optional[str] = None) -> str:
+    """
+    Generates a random UUID, or a deterministic one derived from the seed.
 
-def generate_id():
-    return f"{secrets.randbelow(99999999 - 10000000 + 1) + 10000000}"
+    Args:
+        seed (Optional[str]): Content the UUID is derived from, a random UUID is generated when omitted.
+
+    Returns:
+        str: The UUID.
+    """
+    if seed is None:
+        return str(uuid.uuid4())
+    return str(uuid.uuid5(ID_NAMESPACE, seed))
+
+
+def generate_id(seed: Optional[str] = None) -> str:
+    """
+    Generates a random 8 digit ID, or a deterministic one derived from the seed.
+
+    Args:
+        seed (Optional[str]): Content the ID is derived from, a random ID is generated when omitted.
+
+    Returns:
+        str: The ID.
+    """
+    if seed is None:
+        return f"{secrets.randbelow(ID_MAX - ID_MIN + 1) + ID_MIN}"
+    digest = hashlib.blake2b(seed.encode("utf-8"), digest_size=8).digest()
+    return f"{int.from_bytes(digest, 'big') % (ID_MAX - ID_MIN + 1) + ID_MIN}"
+
+
+def content_seed(data) -> str:
+    """
+    Derives a stable seed from JSON-serializable content.
+
+    Args:
+        data: The content, dict keys are sorted so equal content always gives the same seed.
+
+    Returns:
+        str: The hex digest of the canonical JSON form of the content.
+    """
+    canonical = json.dumps(data, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.blake2b(canonical.encode("utf-8")).hexdigest()
@@ -0,0 +1,134 @@
+import logging
+import os
+from typing import Any, Callable, Dict
+from urllib.parse import parse_qsl, urlsplit
+
+from src.helper.compression import strip_compression_extension
+from src.jmx.jmx_creator import RAW_BODY
+from src.postman.postman_json_creator import build_postman_collection, save_json
+
+logging.basicConfig(level=logging.ERROR)
+
+PROJECT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir, os.pardir))
+
+
+def resolve_source_path(source_file: str, extension: str) -> str:
+    """
+    Resolves the path of a source to import, falling back to the file_to_convert directory.
+
+    Args:
+        source_file (str): An existing file path, or a source name (without its extension) in file_to_convert.
+        extension (str): The extension of the source type, with its dot.
+
+    Returns:
+        str: The path of the source.
+    """
+    if os.path.exists(source_file):
+        return source_file
+    return os.path.join(PROJECT_DIR, "file_to_convert", f"{source_file}{extension}")
+
+
+def load_source(source_file: str, extension: str, read: Callable[..., Dict[str, Any]],
+                **read_options: Any) -> Dict[str, Any]:
+    """
+    Reads the test plan structure of a source with the reader of its type, logging the sources that cannot be read.
+
+    Args:
+        source_file (str): An existing file path, or a source name (without its extension) in file_to_convert.
+        extension (str): The extension of the source type, with its dot.
+        read (Callable[..., Dict[str, Any]]): The reader of the source type, such as read_har or read_openapi.
+        **read_options: Options passed to the reader.
+
+    Returns:
+        Dict[str, Any]: The test plan structure returned by the reader.
+
+    Raises:
+        FileNotFoundError: If the source does not exist.
+        ValueError: If the reader cannot parse the source.
+    """
+    source_path = resolve_source_path(source_file, extension)
+    try:
+        return read(source_path, **read_options)
+    except FileNotFoundError:
+        logging.error(f"File {source_path} not found.")
+        raise
+    except ValueError as e:
+        logging.error(f"Could not read {source_path}: {e}")
+        raise
+
+
+def to_jmx_request(request: Dict[str, Any]) -> Dict[str, object]:
+    """
+    Converts a request to the structure extracted from JMX samplers.
+
+    Args:
+        request (Dict[str, Any]): A request of the test plan structure.
+
+    Returns:
+        Dict[str, object]: The name, path, method and arguments (query parameters and body) of the request.
+    """
+    url = urlsplit(request["raw_url"])
+    arguments: Dict[str, str] = dict(parse_qsl(url.query, keep_blank_values=True))
+    body = request["body"]
+    if request["body_mode"] == RAW_BODY:
+        arguments["body"] = body
+    elif request["body_mode"]:
+        arguments["body"] = "&".join(f"{field['key']}={field['value']}" for field in body)
+    return {
+        "name": request["name"],
+        "path": request["raw_url"].split("?", 1)[0],
+        "method": request["method"],
+        "arguments": arguments
+    }
+
+
+def to_test_plan(data: Dict[str, Any]) -> Dict[str, object]:
+    """
+    Converts the test plan structure read from an imported source to the structure read from JMX files,
+    which the Postman collection creator consumes.
+
+    Like the JMX reader, every controller becomes an item with its own requests, whatever its depth, and
+    requests outside any controller become items of their own.
+
+    Args:
+        data (Dict[str, Any]): The test plan structure returned by the reader of the source.
+
+    Returns:
+        Dict[str, object]: The test plan name and items, as returned by get_test_plan.
+    """
+    items = []
+    stack = list(reversed(data["test_fragment_controller"]["generic_controllers"]))
+    while stack:
+        node = stack.pop()
+        if node["type"] == "request":
+            items.append({"item": {"name": node["name"], "requests": [to_jmx_request(node)], "sub_controller": []}})
+            continue
+        children = node.get("children", [])
+        items.append({"item": {
+            "name": node["name"],
+            "requests": [to_jmx_request(child) for child in children if child["type"] == "request"],
+            "sub_controller": [{"item": {
+                "name": child["name"],
+                "requests": [to_jmx_request(request) for request in child.get("children", [])
+                             if request["type"] == "request"]
+            }} for child in children if child["type"] != "request"]
+        }})
+        stack.extend(reversed([child for child in children if child["type"] != "request"]))
+    return {"name": data["test_plan_name"], "items": items}
+
+
+def save_postman_collection(data: Dict[str, Any], output_path: str, deterministic_ids: bool = False,
+                            normalize_bodies: bool = False) -> None:
+    """
+    Saves the test plan structure of an imported source as a Postman collection.
+
+    Args:
+        data (Dict[str, Any]): The test plan structure returned by the reader of the source.
+        output_path (str): The path where the Postman collection will be saved, a name without .json is
+            saved in the out directory.
+        deterministic_ids (bool): Derive the collection IDs from its content instead of generating random ones.
+        normalize_bodies (bool): Parse and re-format JSON request bodies instead of passing them through.
+    """
+    if not strip_compression_extension(output_path).endswith(".json"):
+        output_path = os.path.join(PROJECT_DIR, "out", f"{output_path}.json")
+    save_json(output_path, build_postman_collection(to_test_plan(data), deterministic_ids, normalize_bodies))
@@ -0,0 +1,156 @@
+import json
+from typing import Any, Iterator, TextIO, Tuple
+
+# Characters read from the file at a time, the buffer grows to hold the largest value being decoded
+CHUNK_SIZE = 1 << 20
+
+WHITESPACE = " \t\n\r"
+
+DECODER = json.JSONDecoder()
+
+
+class JsonStream:
+    """
+    Reads a JSON document incrementally, so arrays of large documents can be iterated without loading them.
+
+    The containers to walk are entered with iter_object() and iter_array(), every other value is decoded
+    whole by read_value() with the C decoder of the json module. Memory is bounded by the largest value read
+    at once. A value cut by the end of the buffer fails to decode and is read again once more text was read,
+    the read size doubles with the buffer so the retries stay linear in the size of the value.
+    """
+
+    def __init__(self, file: TextIO):
+        self.file = file
+        self.buffer = ""
+        self.position = 0
+        self.eof = False
+
+    def fill(self) -> bool:
+        """Reads more text, dropping what was consumed. Returns False at the end of the file."""
+        if self.eof:
+            return False
+        self.buffer = self.buffer[self.position:]
+        self.position = 0
+        chunk = self.file.read(max(CHUNK_SIZE, len(self.buffer)))
+        if not chunk:
+            self.eof = True
+            return False
+        self.buffer += chunk
+        return True
+
+    def peek(self) -> str:
+        """Skips whitespace and returns the next character, an empty string at the end of the file."""
+        while True:
+            while self.position < len(self.buffer) and self.buffer[self.position] in WHITESPACE:
+                self.position += 1
+            if self.position < len(self.buffer) or not self.fill():
+                return self.buffer[self.position:self.position + 1]
+
+    def expect(self, character: str) -> None:
+        """Consumes the next character, which must be the given one."""
+        found = self.peek()
+        if found != character:
+            raise ValueError(f"Expected {character!r} but found {found or 'the end of the file'!r}")
+        self.position += 1
+
+    def read_value(self) -> Any:
+        """
+        Decodes the next value.
+
+        Returns:
+            Any: The value.
+
+        Raises:
+            ValueError: If the value is not valid JSON.
+        """
+        self.peek()
+        while True:
+            try:
+                value, end = DECODER.raw_decode(self.buffer, self.position)
+            except json.JSONDecodeError:
+                if self.fill():
+                    continue
+                raise
+            # A number ending with the buffer may go on in the file
+            if end == len(self.buffer) and self.fill():
+                continue
+            self.position = end
+            return value
+
+    def read_buffered_value(self) -> Tuple[bool, Any]:
+        """
+        Decodes the next value only if it is complete in the text already read, so a walk can decode small
+        containers at once and enter the large ones.
+
+        Returns:
+            Tuple[bool, Any]: (True, value), or (False, None) with the position unchanged when the value goes
+                on past the buffer or is invalid.
+        """
+        self.peek()
+        try:
+            value, end = DECODER.raw_decode(self.buffer, self.position)
+        except json.JSONDecodeError:
+            return False, None
+        if end == len(self.buffer) and not self.eof:
+            return False, None
+        self.position = end
+        return True, value
+
+    def iter_object(self) -> Iterator[str]:
+        """
+        Enters an object and yields its keys. The value of each key must be consumed before the next one.
+
+        Yields:
+            str: The keys, in document order.
+        """
+        self.expect("{")
+        if self.peek() == "}":
+            self.position += 1
+            return
+        while True:
+            key = self.read_value()
+            if not isinstance(key, str):
+                raise ValueError(f"Expected an object key but found {key!r}")
+            self.expect(":")
+            yield key
+            if self.peek() == ",":
+                self.position += 1
+            else:
+                self.expect("}")
+                return
+
+    def iter_items(self) -> Iterator[None]:
+        """
+        Enters an array and yields before each item, which must be consumed before the next one, so items
+        can be walked with iter_object() instead of being decoded.
+        """
+        self.expect("[")
+        if self.peek() == "]":
+            self.position += 1
+            return
+        while True:
+            yield None
+            if self.peek() == ",":
+                self.position += 1
+            else:
+                self.expect("]")
+                return
+
+    def iter_array(self) -> Iterator[Any]:
+        """
+        Enters an array and decodes its items one at a time.
+
+        Yields:
+            Any: The items, in document order.
+        """
+        self.expect("[")
+        if self.peek() == "]":
+            self.position += 1
+            return
+        while True:
+            yield self.read_value()
+            if self.peek() == ",":
+                self.position += 1
+            else:
+                self.expect("]")
+                return
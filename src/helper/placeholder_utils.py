@@ -0,0 +1,135 @@
+import re
+from typing import Any, Iterable, Pattern, Tuple
+from urllib.parse import quote
+
+# ${name} in JMeter and {{name}} in Postman, the name may not contain braces or whitespace so JSON
+# objects such as {"a":1} and unrelated braces are never touched.
+JMETER_PLACEHOLDER = re.compile(r"\$\{([^{}\s]+)\}")
+POSTMAN_PLACEHOLDER = re.compile(r"\{\{([^{}\s]+)\}\}")
+
+# (source pattern, source opening, target opening, target closing); strings without the source
+# opening are skipped without running the pattern.
+Translation = Tuple[Pattern, str, str, str]
+JMETER_TO_POSTMAN: Translation = (JMETER_PLACEHOLDER, "${", "{{", "}}")
+POSTMAN_TO_JMETER: Translation = (POSTMAN_PLACEHOLDER, "{{", "${", "}")
+
+# Characters encodeURIComponent leaves as they are, besides letters, digits and "_.-~"
+URI_COMPONENT_SAFE = "!*'()"
+
+
+def translate_string(value: str, translation: Translation) -> str:
+    """
+    Rewrites the placeholders of a string.
+
+    Splitting on the pattern and joining the pieces is about twice as fast as re.sub with a
+    replacement template on bodies with many placeholders.
+
+    Args:
+        value (str): The string to rewrite.
+        translation (Translation): JMETER_TO_POSTMAN or POSTMAN_TO_JMETER.
+
+    Returns:
+        str: The string with its placeholders rewritten.
+    """
+    pattern, marker, prefix, suffix = translation
+    if marker not in value:
+        return value
+    parts = pattern.split(value)
+    if len(parts) == 1:
+        return value
+    parts[1::2] = [prefix + name + suffix for name in parts[1::2]]
+    return "".join(parts)
+
+
+def translate_placeholders(value: Any, translation: Translation) -> Any:
+    """
+    Rewrites the placeholders matched by pattern in a string, or in every string of nested dicts and lists.
+
+    Containers are copied and walked with an explicit stack, so arbitrarily deep bodies cannot exhaust
+    the recursion limit. Dict keys and non-string values are kept as they are.
+
+    Args:
+        value (Any): A string, dict or list (other values are returned unchanged).
+        translation (Translation): JMETER_TO_POSTMAN or POSTMAN_TO_JMETER.
+
+    Returns:
+        Any: The value with its placeholders rewritten.
+    """
+    if isinstance(value, str):
+        return translate_string(value, translation)
+    if not isinstance(value, (dict, list)):
+        return value
+
+    root = dict(value) if isinstance(value, dict) else list(value)
+    stack = [root]
+    while stack:
+        container = stack.pop()
+        entries = container.items() if isinstance(container, dict) else enumerate(container)
+        for key, item in entries:
+            if isinstance(item, str):
+                container[key] = translate_string(item, translation)
+            elif isinstance(item, dict):
+                container[key] = dict(item)
+                stack.append(container[key])
+            elif isinstance(item, list):
+                container[key] = list(item)
+                stack.append(container[key])
+    return root
+
+
+def to_postman_placeholders(value: Any) -> Any:
+    """
+    Converts JMeter placeholders (${key}) into Postman placeholders ({{key}}) in a single pass.
+
+    Args:
+        value (Any): A string, dict or list.
+
+    Returns:
+        Any: The value with Postman placeholders.
+    """
+    return translate_placeholders(value, JMETER_TO_POSTMAN)
+
+
+def to_jmeter_placeholders(value: Any) -> Any:
+    """
+    Converts Postman placeholders ({{key}}) into JMeter placeholders (${key}) in a single pass.
+
+    Args:
+        value (Any): A string, dict or list.
+
+    Returns:
+        Any: The value with JMeter placeholders.
+    """
+    return translate_placeholders(value, POSTMAN_TO_JMETER)
+
+
+def quote_component(value: str, pattern: Pattern = JMETER_PLACEHOLDER) -> str:
+    """
+    Percent-encodes a URL component like encodeURIComponent, keeping its placeholders as they are.
+
+    Args:
+        value (str): The name or value to encode.
+        pattern (Pattern): The placeholders left unencoded, substituted when the request is sent.
+
+    Returns:
+        str: The encoded component.
+    """
+    parts = pattern.split(value)
+    parts[::2] = [quote(part, safe=URI_COMPONENT_SAFE) for part in parts[::2]]
+    parts[1::2] = [match.group(0) for match in pattern.finditer(value)]
+    return "".join(parts)
+
+
+def encode_query(arguments: Iterable[Tuple[str, str]], pattern: Pattern = JMETER_PLACEHOLDER) -> str:
+    """
+    Encodes query arguments as a "name=value&..." query string, keeping their placeholders as they are.
+
+    Args:
+        arguments (Iterable[Tuple[str, str]]): The argument names and values.
+        pattern (Pattern): The placeholders left unencoded.
+
+    Returns:
+        str: The query string, without the leading "?".
+    """
+    return "&".join(f"{quote_component(name, pattern)}={quote_component(value, pattern)}"
+                    for name, value in arguments)
@@ -1,51 +1,416 @@
+import hashlib
 import json
 import os
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from xml.sax.saxutils import escape
+from src.helper.compression import strip_compression_extension
 from src.helper.file_utils import file_write
-from src.postman.postman_json_reader import read_postman_collection
+from src.jmx.jmx_modules import MODULE_CONTROLLER, SHARED_MODULES_NAME, deduplicate_test_plan, java_string_hash
+from src.jmx.jmx_variables import (
+    create_csv_data_set_xml,
+    create_data_set,
+    create_user_defined_variables_xml,
+    load_variables
+)
+from src.postman.postman_json_reader import read_postman_collection, NO_BODY_CONTENT
 from urllib.parse import urlparse, parse_qs
-from typing import Dict, Any
+from typing import AbstractSet, Dict, Any, Iterator, List, NamedTuple, Optional, Tuple
 
+RAW_BODY = "raw"
+FORMDATA_BODY = "formdata"
+URLENCODED_BODY = "urlencoded"
 
-def create_generic_controller_xml(controller: Dict[str, Any]) -> str:
+# (name, value) of a request header
+Header = Tuple[str, str]
+# (protocol, domain, port) of a request URL, port is empty for the scheme default
+Origin = Tuple[str, str, str]
+
+INCLUDE_CONTROLLER = "include_controller"
+
+# ConstantThroughputTimer calcMode: the target applies to all active threads of the thread group
+THROUGHPUT_ALL_THREADS_IN_GROUP = 2
+
+
+class LoadProfile(NamedTuple):
+    """
+    Load generated by the ThreadGroup wrapping the requests.
+
+    Attributes:
+        threads (int): Number of concurrent virtual users.
+        ramp_up (int): Seconds taken to start all threads.
+        duration (Optional[int]): Seconds the test runs for, None runs the requests loops times instead.
+        loops (int): Iterations per thread, ignored when a duration is set.
+        target_rps (Optional[float]): Requests per second across all threads, paced by a ConstantThroughputTimer.
+        reuse_connections (bool): Keep connections alive between requests and across iterations of a thread.
+    """
+    threads: int = 1
+    ramp_up: int = 1
+    duration: Optional[int] = None
+    loops: int = 1
+    target_rps: Optional[float] = None
+    reuse_connections: bool = True
+
+
+def create_generic_controller_xml(controller: Dict[str, Any], **options: Any) -> str:
     """
     Recursively creates XML for a Generic Controller and its child controllers or requests.
 
     Args:
         controller (Dict[str, Any]): The controller containing information such as its type and children.
+        **options: Sampler options forwarded to create_http_sampler (body_dir, body_threshold, default_origin, inherited_headers).
 
     Returns:
         str: XML string for the controller.
     """
     if controller['type'] == 'request':
-        return create_http_sampler(controller)
+        return create_http_sampler(controller, **options)
+    if controller['type'] == MODULE_CONTROLLER:
+        return create_module_controller_xml(controller)
+    if controller['type'] == INCLUDE_CONTROLLER:
+        return create_include_controller_xml(controller)
 
     controller_xml = f"""
     <GenericController guiclass="LogicControllerGui" testclass="GenericController" testname="{controller['name']}"/>
     <hashTree>
     """
 
+    # Headers every request of the controller sends are set once for the whole controller
+    inherited_headers = options.get('inherited_headers', frozenset())
+    shared_headers = [header for header in find_common_headers([controller]) if header not in inherited_headers]
+    if shared_headers:
+        controller_xml += create_header_manager_xml(shared_headers)
+        options = dict(options, inherited_headers=inherited_headers | set(shared_headers))
+
     # Recursively process child controllers or requests
     child_creators = {
         'generic_controller': create_generic_controller_xml,
         'child_generic_controller': create_generic_controller_xml,
-        'request': create_http_sampler
+        'request': create_http_sampler,
+        MODULE_CONTROLLER: create_generic_controller_xml
     }
 
     for child in controller.get('children', []):
         create_child_xml = child_creators.get(child['type'])
         if create_child_xml:
-            controller_xml += create_child_xml(child)
+            controller_xml += create_child_xml(child, **options)
 
     controller_xml += "</hashTree>"
     return controller_xml
 
 
-def create_http_sampler(request: Dict[str, Any]) -> str:
+def create_module_controller_xml(controller: Dict[str, Any]) -> str:
+    """
+    Creates XML for a ModuleController running the shared module at its node path.
+
+    Args:
+        controller (Dict[str, Any]): The reference created by deduplicate_test_plan, with its name and node_path.
+
+    Returns:
+        str: XML string representing the ModuleController element.
+    """
+    node_path_xml = "".join(f"""
+            <stringProp name="{java_string_hash(name)}">{escape(name)}</stringProp>"""
+                            for name in controller['node_path'])
+    return f"""
+    <ModuleController guiclass="ModuleControllerGui" testclass="ModuleController" testname="{controller['name']}" enabled="true">
+        <collectionProp name="ModuleController.node_path">{node_path_xml}
+        </collectionProp>
+    </ModuleController>
+    <hashTree/>
+    """
+
+
+def create_include_controller_xml(controller: Dict[str, Any]) -> str:
+    """
+    Creates XML for an IncludeController running the test fragment of another JMX file.
+
+    Args:
+        controller (Dict[str, Any]): The reference created for a split plan, with its name and include_path.
+
+    Returns:
+        str: XML string representing the IncludeController element.
+    """
+    return f"""
+    <IncludeController guiclass="IncludeControllerGui" testclass="IncludeController" testname="{controller['name']}" enabled="true">
+        <stringProp name="IncludeController.includepath">{escape(controller['include_path'])}</stringProp>
+    </IncludeController>
+    <hashTree/>
+    """
+
+
+def iter_requests(controller: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    """
+    Yields the requests of a controller and all its child controllers.
+
+    Args:
+        controller (Dict[str, Any]): A controller or a request.
+
+    Yields:
+        Dict[str, Any]: The requests, in document order.
+    """
+    stack = [controller]
+    while stack:
+        node = stack.pop()
+        if node['type'] == 'request':
+            yield node
+        else:
+            stack.extend(reversed(node.get('children', [])))
+
+
+def get_request_headers(request: Dict[str, Any]) -> List[Header]:
+    """
+    Returns the headers of a request as (name, value) pairs.
+
+    Args:
+        request (Dict[str, Any]): The request information read from the Postman collection.
+
+    Returns:
+        List[Header]: The headers, in the order of the collection.
+    """
+    return [(header['key'], header['value']) for header in request.get('headers', [])]
+
+
+def find_common_headers(controllers: List[Dict[str, Any]]) -> List[Header]:
+    """
+    Finds the headers sent with the same value by every request of the controllers.
+
+    Args:
+        controllers (List[Dict[str, Any]]): The controllers to analyse.
+
+    Returns:
+        List[Header]: The common headers in the order of the first request, empty if any request lacks them.
+    """
+    first_headers: List[Header] = []
+    common: Optional[set] = None
+    for controller in controllers:
+        for request in iter_requests(controller):
+            headers = get_request_headers(request)
+            if common is None:
+                first_headers, common = headers, set(headers)
+            else:
+                common &= set(headers)
+            if not common:
+                return []
+    return [header for header in first_headers if header in common] if common else []
+
+
+def get_request_origin(request: Dict[str, Any]) -> Optional[Origin]:
+    """
+    Extracts the protocol, domain and port of a request URL.
+
+    Args:
+        request (Dict[str, Any]): The request information read from the Postman collection.
+
+    Returns:
+        Optional[Origin]: The origin, None when the URL has no literal host (e.g. a ${variable}).
+    """
+    parsed_url = urlparse(request.get('raw_url', ''))
+    if not parsed_url.scheme or "${" in parsed_url.netloc or not parsed_url.hostname:
+        return None
+    try:
+        port = parsed_url.port
+    except ValueError:
+        return None
+    return parsed_url.scheme, parsed_url.hostname, str(port or "")
+
+
+def find_common_origin(controllers: List[Dict[str, Any]]) -> Optional[Origin]:
+    """
+    Finds the origin used by most requests of the controllers.
+
+    Args:
+        controllers (List[Dict[str, Any]]): The controllers to analyse.
+
+    Returns:
+        Optional[Origin]: The most common origin, None when no request has a literal host.
+    """
+    origins: Counter = Counter()
+    for controller in controllers:
+        for request in iter_requests(controller):
+            origin = get_request_origin(request)
+            if origin:
+                origins[origin] += 1
+    return origins.most_common(1)[0][0] if origins else None
+
+
+def create_origin_xml(origin: Origin) -> str:
+    """
+    Creates the domain, port and protocol properties of an HTTP sampler or of the HTTP Request Defaults.
+
+    Args:
+        origin (Origin): The protocol, domain and port.
+
+    Returns:
+        str: XML string of the properties.
+    """
+    protocol, domain, port = origin
+    return f"""
+        <stringProp name="HTTPSampler.domain">{escape(domain)}</stringProp>
+        <stringProp name="HTTPSampler.port">{port}</stringProp>
+        <stringProp name="HTTPSampler.protocol">{escape(protocol)}</stringProp>"""
+
+
+def create_request_defaults_xml(origin: Origin) -> str:
+    """
+    Creates XML for an HTTP Request Defaults element holding the origin shared by the samplers in its scope.
+
+    Args:
+        origin (Origin): The protocol, domain and port.
+
+    Returns:
+        str: XML string representing the ConfigTestElement element.
+    """
+    return f"""
+    <ConfigTestElement guiclass="HttpDefaultsGui" testclass="ConfigTestElement" testname="HTTP Request Defaults" enabled="true">
+        <elementProp name="HTTPsampler.Arguments" elementType="Arguments" guiclass="HTTPArgumentsPanel" testclass="Arguments" testname="User Defined Variables">
+          <collectionProp name="Arguments.arguments"/>
+        </elementProp>{create_origin_xml(origin)}
+    </ConfigTestElement>
+    <hashTree/>
+    """
+
+
+def create_header_manager_xml(headers: List[Header]) -> str:
+    """
+    Creates XML for a HeaderManager element, applied to every sampler in its scope.
+
+    Args:
+        headers (List[Header]): The (name, value) pairs of the headers.
+
+    Returns:
+        str: XML string representing the HeaderManager element.
+    """
+    headers_xml = "".join(f"""
+            <elementProp name="" elementType="Header">
+              <stringProp name="Header.name">{escape(name)}</stringProp>
+              <stringProp name="Header.value">{escape(value)}</stringProp>
+            </elementProp>""" for name, value in headers)
+    return f"""
+    <HeaderManager guiclass="HeaderPanel" testclass="HeaderManager" testname="HTTP Header Manager" enabled="true">
+        <collectionProp name="HeaderManager.headers">{headers_xml}
+        </collectionProp>
+    </HeaderManager>
+    <hashTree/>
+    """
+
+
+def get_body_mode(request: Dict[str, Any]) -> Optional[str]:
+    """
+    Determines how the body of a request is sent.
+
+    Args:
+        request (Dict[str, Any]): The request information read from the Postman collection.
+
+    Returns:
+        Optional[str]: RAW_BODY, FORMDATA_BODY or URLENCODED_BODY, None when the request has no body to send.
+    """
+    body = request.get('body')
+    mode = request.get('body_mode')
+    if isinstance(body, list) and body:
+        return mode if mode in (FORMDATA_BODY, URLENCODED_BODY) else URLENCODED_BODY
+    if isinstance(body, str) and body and body != NO_BODY_CONTENT and mode in (None, RAW_BODY):
+        return RAW_BODY
+    return None
+
+
+def externalize_body(body: str, body_dir: str) -> str:
+    """
+    Writes a body to its own file and returns the JMeter function reading it back.
+
+    Files are named after the content hash, so identical bodies share a file. The reference is relative
+    to the JMX file, which body_dir must sit next to. Bodies with ${...} placeholders are wrapped in __eval
+    so JMeter still substitutes the variables.
+
+    Args:
+        body (str): The request body.
+        body_dir (str): The directory the body file is written to.
+
+    Returns:
+        str: The ${__FileToString()} reference to the body file.
+    """
+    content = body.encode('utf-8')
+    file_name = f"body_{hashlib.blake2b(content, digest_size=8).hexdigest()}.txt"
+    # The name is derived from the content, an existing file (e.g. written by another part) is the same body
+    if not os.path.exists(os.path.join(body_dir, file_name)):
+        file_write(body_dir, file_name, content)
+
+    # Commas separate the function arguments in JMeter and have to be escaped in the path
+    reference = f"{os.path.basename(os.path.normpath(body_dir))}/{file_name}".replace(",", "\\,")
+    function = f"${{__FileToString({reference},UTF-8,)}}"
+    return f"${{__eval({function})}}" if "${" in body else function
+
+
+def create_raw_body_xml(body: str, body_dir: Optional[str] = None, body_threshold: Optional[int] = None) -> str:
+    """
+    Creates the XML of a raw request body, sent as the single unnamed argument of the sampler.
+
+    Args:
+        body (str): The request body.
+        body_dir (Optional[str]): The directory large bodies are written to, bodies stay inline when None.
+        body_threshold (Optional[int]): Size in bytes above which bodies are written to body_dir.
+
+    Returns:
+        str: XML string of the body argument.
+    """
+    if body_dir and body_threshold is not None and len(body.encode('utf-8')) > body_threshold:
+        body = externalize_body(body, body_dir)
+
+    return f"""
+                <elementProp name="" elementType="HTTPArgument">
+                  <boolProp name="HTTPArgument.always_encode">false</boolProp>
+                  <stringProp name="Argument.value">{escape(body)}</stringProp>
+                  <stringProp name="Argument.metadata">=</stringProp>
+                </elementProp>
+            """
+
+
+def create_form_body_xml(fields: List[Dict[str, Any]], mode: str) -> str:
+    """
+    Creates the XML of form-data or urlencoded body fields, one HTTPArgument per field.
+
+    Args:
+        fields (List[Dict[str, Any]]): The key/value pairs of the body.
+        mode (str): FORMDATA_BODY or URLENCODED_BODY, urlencoded values are encoded by JMeter.
+
+    Returns:
+        str: XML string of the body arguments.
+    """
+    always_encode = "true" if mode == URLENCODED_BODY else "false"
+    arguments_xml = ""
+    for field in fields:
+        key = escape(str(field.get('key', '')), {'"': "&quot;"})
+        value = escape(str(field.get('value', '')))
+        arguments_xml += f"""
+                <elementProp name="{key}" elementType="HTTPArgument">
+                  <boolProp name="HTTPArgument.always_encode">{always_encode}</boolProp>
+                  <stringProp name="Argument.value">{value}</stringProp>
+                  <stringProp name="Argument.metadata">=</stringProp>
+                  <boolProp name="HTTPArgument.use_equals">true</boolProp>
+                  <stringProp name="Argument.name">{key}</stringProp>
+                </elementProp>
+            """
+    return arguments_xml
+
+
+def create_http_sampler(request: Dict[str, Any], body_dir: Optional[str] = None,
+                        body_threshold: Optional[int] = None, default_origin: Optional[Origin] = None,
+                        inherited_headers: AbstractSet[Header] = frozenset(), keepalive: bool = True) -> str:
     """
-    Creates XML for an HTTPSamplerProxy element, handling URL, method, and query parameters.
+    Creates XML for an HTTPSamplerProxy element, handling URL, method, query parameters and the request body.
+
+    Raw bodies are sent as the raw post body. Form-data and urlencoded bodies become HTTPArguments, in which
+    case the query string stays in the path so it is not mixed with the form fields.
 
     Args:
         request (Dict[str, Any]): A dictionary representing the request information such as URL, method, and name.
+        body_dir (Optional[str]): The directory raw bodies larger than body_threshold are written to.
+        body_threshold (Optional[int]): Size in bytes above which raw bodies are externalised, None keeps all inline.
+        default_origin (Optional[Origin]): The origin set by the HTTP Request Defaults, requests with a literal
+            host use it instead of ${tests_url} and only a different origin is written on the sampler.
+        inherited_headers (AbstractSet[Header]): Headers already set by an enclosing HeaderManager.
+        keepalive (bool): Reuse the connection for the following requests of the thread.
 
     Returns:
         str: XML string representing the HTTPSamplerProxy element.
@@ -59,6 +424,21 @@ def create_http_sampler(request: Dict[str, Any]) -> str:
     base_path = parsed_url.path
     query_params = parse_qs(parsed_url.query)
 
+    # Requests without a literal host keep the ${tests_url} prefix
+    path_prefix = "${tests_url}"
+    origin_xml = ""
+    origin = get_request_origin(request) if default_origin else None
+    if origin:
+        path_prefix = ""
+        if origin != default_origin:
+            origin_xml = create_origin_xml(origin)
+
+    body_mode = get_body_mode(request)
+    if body_mode:
+        if parsed_url.query:
+            base_path = f"{base_path}?{escape(parsed_url.query)}"
+        query_params = {}
+
     # Create the XML for query parameters
     arguments_xml = ""
     for key, values in query_params.items():
@@ -73,14 +453,26 @@ def create_http_sampler(request: Dict[str, Any]) -> str:
                 </elementProp>
             """
 
+    # Create the XML for the request body
+    post_body_raw = "false"
+    multipart_xml = ""
+    if body_mode == RAW_BODY:
+        post_body_raw = "true"
+        arguments_xml += create_raw_body_xml(request['body'], body_dir, body_threshold)
+    elif body_mode:
+        arguments_xml += create_form_body_xml(request['body'], body_mode)
+        if body_mode == FORMDATA_BODY:
+            multipart_xml = """
+        <boolProp name="HTTPSampler.DO_MULTIPART_POST">true</boolProp>"""
+
     # Create the final XML output
     sampler_xml = f"""
-    <HTTPSamplerProxy guiclass="HttpTestSampleGui" testclass="HTTPSamplerProxy" testname="{test_name}" enabled="true">
-        <stringProp name="HTTPSampler.path">${{tests_url}}{base_path}</stringProp>
+    <HTTPSamplerProxy guiclass="HttpTestSampleGui" testclass="HTTPSamplerProxy" testname="{test_name}" enabled="true">{origin_xml}
+        <stringProp name="HTTPSampler.path">{path_prefix}{base_path}</stringProp>
         <boolProp name="HTTPSampler.follow_redirects">true</boolProp>
         <stringProp name="HTTPSampler.method">{method}</stringProp>
-        <boolProp name="HTTPSampler.use_keepalive">true</boolProp>
-        <boolProp name="HTTPSampler.postBodyRaw">false</boolProp>
+        <boolProp name="HTTPSampler.use_keepalive">{str(keepalive).lower()}</boolProp>{multipart_xml}
+        <boolProp name="HTTPSampler.postBodyRaw">{post_body_raw}</boolProp>
         <elementProp name="HTTPsampler.Arguments" elementType="Arguments" guiclass="HTTPArgumentsPanel" testclass="Arguments" testname="User Defined Variables">
           <collectionProp name="Arguments.arguments">
             {arguments_xml}
@@ -90,6 +482,11 @@ def create_http_sampler(request: Dict[str, Any]) -> str:
     <hashTree>
     """
 
+    # Only the headers not set by an enclosing HeaderManager are set on the sampler
+    own_headers = [header for header in get_request_headers(request) if header not in inherited_headers]
+    if own_headers:
+        sampler_xml += create_header_manager_xml(own_headers)
+
     # Add response assertion for status code 200 if defined in tests
     if 'tests' in request:
         for test in request['tests']:
@@ -128,26 +525,130 @@ def create_response_assertion(test_name: str, expected_status: str) -> str:
     """
 
 
-def create_jmx_file(source_file: str, jmx_file: str) -> None:
+def create_thread_group_xml(name: str, load_profile: LoadProfile) -> str:
     """
-    Creates a JMeter .jmx file based on a Postman collection by converting it into a test plan structure.
+    Creates XML for a ThreadGroup running its requests with the given load profile.
 
     Args:
-        source_file (str): The source file (Postman collection) to read from.
-        jmx_file (str): The file path where the JMX file should be saved.
+        name (str): The name of the thread group.
+        load_profile (LoadProfile): The threads, ramp-up, duration and iterations.
 
     Returns:
-        None
+        str: XML string representing the ThreadGroup element (without its hashTree).
+    """
+    # A scheduled thread group loops forever and is stopped by its duration
+    loops = -1 if load_profile.duration else load_profile.loops
+    scheduler = "true" if load_profile.duration else "false"
+    duration = load_profile.duration or ""
+    same_user = "true" if load_profile.reuse_connections else "false"
+    return f"""<ThreadGroup guiclass="ThreadGroupGui" testclass="ThreadGroup" testname="{name}" enabled="true">
+            <stringProp name="ThreadGroup.on_sample_error">continue</stringProp>
+            <elementProp name="ThreadGroup.main_controller" elementType="LoopController" guiclass="LoopControlPanel" testclass="LoopController" testname="Loop Controller">
+              <boolProp name="LoopController.continue_forever">false</boolProp>
+              <stringProp name="LoopController.loops">{loops}</stringProp>
+            </elementProp>
+            <stringProp name="ThreadGroup.num_threads">{load_profile.threads}</stringProp>
+            <stringProp name="ThreadGroup.ramp_time">{load_profile.ramp_up}</stringProp>
+            <boolProp name="ThreadGroup.scheduler">{scheduler}</boolProp>
+            <stringProp name="ThreadGroup.duration">{duration}</stringProp>
+            <stringProp name="ThreadGroup.delay"></stringProp>
+            <boolProp name="ThreadGroup.same_user_on_next_iteration">{same_user}</boolProp>
+          </ThreadGroup>"""
+
+
+def create_throughput_timer_xml(target_rps: float) -> str:
+    """
+    Creates XML for a ConstantThroughputTimer pacing all threads of the thread group to the target rate.
+
+    Args:
+        target_rps (float): Requests per second across all threads.
+
+    Returns:
+        str: XML string representing the ConstantThroughputTimer element.
+    """
+    return f"""
+    <ConstantThroughputTimer guiclass="TestBeanGUI" testclass="ConstantThroughputTimer" testname="Constant Throughput Timer" enabled="true">
+        <intProp name="calcMode">{THROUGHPUT_ALL_THREADS_IN_GROUP}</intProp>
+        <doubleProp>
+          <name>throughput</name>
+          <value>{float(target_rps) * 60}</value>
+          <savedValue>0.0</savedValue>
+        </doubleProp>
+    </ConstantThroughputTimer>
+    <hashTree/>
+    """
+
+
+def resolve_postman_path(source_file: str) -> str:
+    """
+    Resolves the Postman collection path, falling back to the file_to_convert directory.
+
+    Args:
+        source_file (str): An existing file path, or a collection name (without .json) in file_to_convert.
+
+    Returns:
+        str: The path of the Postman collection.
     """
-    postman_json_path_final = ""
     current_file_dir = os.path.dirname(__file__)
     parent_folder_path = os.path.abspath(os.path.join(current_file_dir, '..', '..'))  # Move up two levels
 
     # Determine the final path of the Postman collection
     if not os.path.exists(source_file):
-        postman_json_path_final = os.path.join(parent_folder_path, "file_to_convert", f"{source_file}.json")
+        return os.path.join(parent_folder_path, "file_to_convert", f"{source_file}.json")
+    return source_file
+
+
+def resolve_jmx_output(jmx_file: str) -> Tuple[str, str]:
+    """
+    Determines the output directory and file name of the JMX file.
+
+    Args:
+        jmx_file (str): A .jmx file path, or a plan name (without .jmx) written to the out directory.
+
+    Returns:
+        Tuple[str, str]: The output directory and the file name.
+    """
+    current_file_dir = os.path.dirname(__file__)
+    if 'jmx' in jmx_file:
+        output_path = os.path.abspath(os.path.join(jmx_file, os.pardir))
+        file_name = os.path.basename(jmx_file)
     else:
-        postman_json_path_final = source_file
+        file_name = f"{jmx_file}.jmx"
+        output_path = os.path.join( os.path.abspath(os.path.join(current_file_dir, '..', '..')), "out")
+    return output_path, file_name
+
+
+def create_jmx_file(source_file: str, jmx_file: str, body_threshold: Optional[int] = None,
+                    shared_defaults: bool = False, load_profile: Optional[LoadProfile] = None,
+                    deduplicate: bool = False, split: bool = False, split_size: Optional[int] = None,
+                    workers: Optional[int] = None, environment_file: Optional[str] = None,
+                    globals_file: Optional[str] = None, data_file: Optional[str] = None) -> None:
+    """
+    Creates a JMeter .jmx file based on a Postman collection by converting it into a test plan structure.
+
+    Args:
+        source_file (str): The source file (Postman collection) to read from.
+        jmx_file (str): The file path where the JMX file should be saved.
+        body_threshold (Optional[int]): Size in bytes above which request bodies are written to a
+            "<name>_bodies" directory next to the JMX file instead of inline, None keeps all bodies inline.
+        shared_defaults (bool): Move the most common protocol, host and port into HTTP Request Defaults.
+        load_profile (Optional[LoadProfile]): Wrap the requests in a runnable ThreadGroup instead of a TestFragment.
+        deduplicate (bool): Generate repeated requests and folders once and reference them with Module Controllers.
+        split (bool): Write the controllers to separate JMX files in a "<name>_parts" directory and make the JMX
+            file a master plan including them.
+        split_size (Optional[int]): Maximum number of samplers per part when splitting, None writes one part per
+            top-level folder. Setting it implies split.
+        workers (Optional[int]): Number of processes writing the parts, defaults to the CPU count.
+        environment_file (Optional[str]): Postman environment whose variables become User Defined Variables.
+        globals_file (Optional[str]): Postman globals whose variables become User Defined Variables, the
+            environment taking precedence.
+        data_file (Optional[str]): Postman iteration data file, CSV or a JSON array of objects, written to
+            "<name>_data.csv" next to the JMX file and read by a CSV Data Set, one row per iteration.
+
+    Returns:
+        None
+    """
+    postman_json_path_final = resolve_postman_path(source_file)
 
     try:
         # Read the Postman collection data
@@ -159,41 +660,321 @@ def create_jmx_file(source_file: str, jmx_file: str) -> None:
         print("Error: Invalid JSON format in the Postman collection.")
         raise
 
-    # Initialize the JMX file with the test plan and fragment controller
-    jmx_content = f"""<?xml version="1.0" encoding="UTF-8"?>
+    write_jmx_file(data, jmx_file, body_threshold=body_threshold, shared_defaults=shared_defaults,
+                   load_profile=load_profile, deduplicate=deduplicate, split=split, split_size=split_size,
+                   workers=workers, environment_file=environment_file, globals_file=globals_file,
+                   data_file=data_file)
+
+
+def create_plan_options(shared_defaults: bool = False, load_profile: Optional[LoadProfile] = None,
+                        deduplicate: bool = False, environment_file: Optional[str] = None,
+                        globals_file: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Builds the options of iter_jmx_content that do not write files next to the JMX file.
+
+    Args:
+        shared_defaults (bool): Move the most common protocol, host and port into HTTP Request Defaults.
+        load_profile (Optional[LoadProfile]): Wrap the requests in a runnable ThreadGroup instead of a TestFragment.
+        deduplicate (bool): Generate repeated requests and folders once and reference them with Module Controllers.
+        environment_file (Optional[str]): Postman environment whose variables become User Defined Variables.
+        globals_file (Optional[str]): Postman globals whose variables become User Defined Variables.
+
+    Returns:
+        Dict[str, Any]: The options, without the ones left at their default.
+    """
+    options: Dict[str, Any] = {}
+    if shared_defaults:
+        options['shared_defaults'] = True
+    if load_profile:
+        options['load_profile'] = load_profile
+    if deduplicate:
+        options['deduplicate'] = True
+    variables = load_variables(environment_file, globals_file)
+    if variables:
+        options['variables'] = variables
+    return options
+
+
+def write_jmx_file(data: Dict[str, Any], jmx_file: str, body_threshold: Optional[int] = None,
+                   shared_defaults: bool = False, load_profile: Optional[LoadProfile] = None,
+                   deduplicate: bool = False, split: bool = False, split_size: Optional[int] = None,
+                   workers: Optional[int] = None, environment_file: Optional[str] = None,
+                   globals_file: Optional[str] = None, data_file: Optional[str] = None) -> None:
+    """
+    Writes a test plan structure to a JMeter .jmx file.
+
+    Args:
+        data (Dict[str, Any]): The test plan structure returned by read_postman_collection.
+        jmx_file (str): The file path where the JMX file should be saved.
+        body_threshold (Optional[int]): Size in bytes above which request bodies are written to a
+            "<name>_bodies" directory next to the JMX file instead of inline, None keeps all bodies inline.
+        shared_defaults (bool): Move the most common protocol, host and port into HTTP Request Defaults.
+        load_profile (Optional[LoadProfile]): Wrap the requests in a runnable ThreadGroup instead of a TestFragment.
+        deduplicate (bool): Generate repeated requests and folders once and reference them with Module Controllers.
+        split (bool): Write the controllers to separate JMX files and make the JMX file a master plan including them.
+        split_size (Optional[int]): Maximum number of samplers per part when splitting. Setting it implies split.
+        workers (Optional[int]): Number of processes writing the parts, defaults to the CPU count.
+        environment_file (Optional[str]): Postman environment whose variables become User Defined Variables.
+        globals_file (Optional[str]): Postman globals whose variables become User Defined Variables.
+        data_file (Optional[str]): Postman iteration data file read by a CSV Data Set.
+
+    Returns:
+        None
+    """
+    # Determine output path and file name for the JMX file
+    output_path, file_name = resolve_jmx_output(jmx_file)
+
+    options = create_plan_options(shared_defaults=shared_defaults, load_profile=load_profile,
+                                  deduplicate=deduplicate, environment_file=environment_file,
+                                  globals_file=globals_file)
+    if body_threshold is not None:
+        stem = os.path.splitext(strip_compression_extension(file_name))[0]
+        options.update(body_dir=os.path.join(output_path, f"{stem}_bodies"),
+                       body_threshold=body_threshold)
+    if data_file:
+        options['data_set'] = create_data_set(data_file, output_path, file_name)
+
+    if split or split_size is not None:
+        jmx_content = create_split_jmx_files(data, output_path, file_name, split_size, workers, **options)
+    else:
+        jmx_content = generate_jmx_content(data, **options)
+
+    # Write the generated JMX content to the file
+    file_write(output_path, file_name, jmx_content)
+
+
+def create_shared_config(controllers: List[Dict[str, Any]], options: Dict[str, Any]) -> Tuple[str, Dict[str, Any]]:
+    """
+    Creates the configuration elements applying to all controllers of a test plan.
+
+    Args:
+        controllers (List[Dict[str, Any]]): The top-level controllers.
+        options (Dict[str, Any]): The options of iter_jmx_content.
+
+    Returns:
+        Tuple[str, Dict[str, Any]]: The XML of the configuration elements and the sampler options for the
+            controllers in their scope.
+    """
+    options = dict(options)
+    config_xml = ""
+
+    data_set = options.pop('data_set', None)
+    if data_set:
+        config_xml += create_csv_data_set_xml(*data_set)
+
+    load_profile = options.pop('load_profile', None)
+    if load_profile:
+        if load_profile.target_rps:
+            config_xml += create_throughput_timer_xml(load_profile.target_rps)
+        if not load_profile.reuse_connections:
+            options['keepalive'] = False
+
+    if options.pop('shared_defaults', False):
+        default_origin = find_common_origin(controllers)
+        if default_origin:
+            config_xml += create_request_defaults_xml(default_origin)
+            options['default_origin'] = default_origin
+
+    inherited_headers = options.get('inherited_headers', frozenset())
+    shared_headers = [header for header in find_common_headers(controllers) if header not in inherited_headers]
+    if shared_headers:
+        config_xml += create_header_manager_xml(shared_headers)
+        options['inherited_headers'] = inherited_headers | set(shared_headers)
+    return config_xml, options
+
+
+def split_controllers(controllers: List[Dict[str, Any]], split_size: Optional[int] = None) -> List[List[Dict[str, Any]]]:
+    """
+    Groups consecutive top-level controllers into the parts of a split plan.
+
+    Args:
+        controllers (List[Dict[str, Any]]): The top-level controllers.
+        split_size (Optional[int]): Maximum number of samplers per part, None makes one part per controller.
+            A controller with more samplers than split_size is never divided and becomes a part of its own.
+
+    Returns:
+        List[List[Dict[str, Any]]]: The controllers of each part.
+    """
+    if split_size is None:
+        return [[controller] for controller in controllers]
+
+    parts: List[List[Dict[str, Any]]] = []
+    part_size = 0
+    for controller in controllers:
+        sampler_count = sum(1 for _ in iter_requests(controller))
+        if not parts or part_size + sampler_count > split_size:
+            parts.append([])
+            part_size = 0
+        parts[-1].append(controller)
+        part_size += sampler_count
+    return parts
+
+
+def write_jmx_part(output_path: str, file_name: str, data: Dict[str, Any], options: Dict[str, Any]) -> None:
+    """
+    Streams the JMX document of a part of a split plan to disk, runs in a worker process.
+
+    Args:
+        output_path (str): The directory of the parts.
+        file_name (str): The file name of the part.
+        data (Dict[str, Any]): The test plan structure of the part.
+        options (Dict[str, Any]): The sampler options resolved for the master plan.
+    """
+    with open(os.path.join(output_path, file_name), 'w', encoding='utf-8') as part_file:
+        part_file.writelines(iter_jmx_content(data, **options))
+
+
+def create_split_jmx_files(data: Dict[str, Any], output_path: str, file_name: str, split_size: Optional[int] = None,
+                           workers: Optional[int] = None, **options: Any) -> str:
+    """
+    Writes the controllers of a test plan to separate JMX files and generates the master plan including them.
+
+    The parts are written in parallel to a "<name>_parts" directory next to the master plan. Each part is a
+    test fragment run by an IncludeController of the master, so the thread group, shared defaults and headers
+    stay in the master and apply to all parts.
+
+    Args:
+        data (Dict[str, Any]): The test plan structure returned by read_postman_collection.
+        output_path (str): The directory of the master plan.
+        file_name (str): The file name of the master plan.
+        split_size (Optional[int]): Maximum number of samplers per part, None writes one part per top-level folder.
+        workers (Optional[int]): Number of processes writing the parts, defaults to the CPU count.
+        **options: The options of iter_jmx_content.
+
+    Returns:
+        str: The JMX document of the master plan.
+
+    Raises:
+        ValueError: If deduplicate is requested, Module Controllers cannot reference another file.
+    """
+    if options.get('deduplicate'):
+        raise ValueError("Split output cannot be combined with deduplication")
+
+    controllers = data['test_fragment_controller'].get('generic_controllers', [])
+    stem = os.path.splitext(strip_compression_extension(file_name))[0]
+    parts_dir_name = f"{stem}_parts"
+    parts_dir = os.path.join(output_path, parts_dir_name)
+    os.makedirs(parts_dir, exist_ok=True)
+
+    includes = []
+    part_file_names = []
+    part_data = []
+    for index, part in enumerate(split_controllers(controllers, split_size), start=1):
+        part_name = part[0]['name'] if len(part) == 1 else f"Part {index}"
+        part_file_name = f"part_{index:03d}.jmx"
+        # The include path is resolved against the directory of the master plan
+        includes.append({'type': INCLUDE_CONTROLLER, 'name': part_name,
+                         'include_path': f"{parts_dir_name}/{part_file_name}", 'children': part})
+        part_file_names.append(part_file_name)
+        part_data.append({'test_plan_name': f"{data['test_plan_name']} - {part_name}",
+                          'test_fragment_controller': {'name': part_name, 'generic_controllers': part}})
+
+    _, part_options = create_shared_config(controllers, options)
+    # The User Defined Variables of the master plan apply to the included parts
+    part_options.pop('variables', None)
+    workers = min(workers or os.cpu_count() or 1, len(part_data))
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            list(executor.map(write_jmx_part, repeat(parts_dir), part_file_names, part_data, repeat(part_options)))
+    else:
+        for part_file_name, part in zip(part_file_names, part_data):
+            write_jmx_part(parts_dir, part_file_name, part, part_options)
+
+    master = dict(data, test_fragment_controller=dict(data['test_fragment_controller'], generic_controllers=includes))
+    return generate_jmx_content(master, **options)
+
+
+def generate_jmx_content(data: Dict[str, Any], **options: Any) -> str:
+    """
+    Generates the complete JMX document for a test plan structure read from a Postman collection.
+
+    Args:
+        data (Dict[str, Any]): The test plan structure returned by read_postman_collection.
+        **options: shared_defaults, load_profile, deduplicate and the sampler options of create_http_sampler.
+
+    Returns:
+        str: The JMX document.
+    """
+    return "".join(iter_jmx_content(data, **options))
+
+
+def iter_jmx_content(data: Dict[str, Any], **options: Any) -> Iterator[str]:
+    """
+    Generates the JMX document piece by piece, one top-level controller at a time.
+
+    Headers sent by every request are set once in a HeaderManager at the highest controller level they are
+    common to. With shared_defaults, the most common origin is set once in HTTP Request Defaults. With a
+    load_profile, the requests run in a ThreadGroup instead of a TestFragment that has to be included elsewhere.
+    With deduplicate, repeated requests and folders are generated once in a separate "Shared Modules" fragment
+    and run through Module Controllers.
+
+    Args:
+        data (Dict[str, Any]): The test plan structure returned by read_postman_collection.
+        **options: shared_defaults, load_profile (LoadProfile), deduplicate, variables (the User Defined
+            Variables of the plan), data_set (the CSV file and columns of a CSV Data Set) and the sampler
+            options of create_http_sampler.
+
+    Yields:
+        str: Consecutive fragments of the JMX document.
+    """
+    if options.pop('deduplicate', False):
+        data = deduplicate_test_plan(data)
+    variables_xml = create_user_defined_variables_xml(options.pop('variables', {}))
+
+    container_name = data['test_fragment_controller']['name']
+    load_profile = options.get('load_profile')
+    if load_profile:
+        container_xml = create_thread_group_xml(container_name, load_profile)
+    else:
+        container_xml = f"""<TestFragmentController guiclass="TestFragmentControllerGui" testclass="TestFragmentController" testname="{container_name}" enabled="true"/>"""
+
+    # Initialize the JMX file with the test plan and the thread group or fragment controller
+    yield f"""<?xml version="1.0" encoding="UTF-8"?>
     <jmeterTestPlan version="1.2" properties="5.0" jmeter="5.6.3">
       <hashTree>
         <TestPlan guiclass="TestPlanGui" testclass="TestPlan" testname="{data['test_plan_name']}">
           <elementProp name="TestPlan.user_defined_variables" elementType="Arguments" guiclass="ArgumentsPanel" testclass="Arguments" testname="User Defined Variables">
-            <collectionProp name="Arguments.arguments"/>
+            {variables_xml}
           </elementProp>
           <boolProp name="TestPlan.functional_mode">false</boolProp>
           <boolProp name="TestPlan.serialize_threadgroups">false</boolProp>
         </TestPlan>
         <hashTree>
-          <TestFragmentController guiclass="TestFragmentControllerGui" testclass="TestFragmentController" testname="{data['test_fragment_controller']['name']}" enabled="true"/>
+          {container_xml}
           <hashTree>
     """
 
+    controllers = data['test_fragment_controller'].get('generic_controllers', [])
+
+    # Generate the configuration shared by all controllers
+    config_xml, options = create_shared_config(controllers, options)
+    if config_xml:
+        yield config_xml
+
     # Generate the XML for all controllers
-    for controller in data['test_fragment_controller'].get('generic_controllers', []):
-        jmx_content += create_generic_controller_xml(controller)
+    for controller in controllers:
+        yield create_generic_controller_xml(controller, **options)
+
+    yield """
+          </hashTree>"""
+
+    # Generate the modules referenced by Module Controllers, they run in the scope of the referencing
+    # controller so headers inherited there are not assumed here
+    shared_modules = data.get('shared_modules', [])
+    if shared_modules:
+        options.pop('inherited_headers', None)
+        yield f"""
+          <TestFragmentController guiclass="TestFragmentControllerGui" testclass="TestFragmentController" testname="{SHARED_MODULES_NAME}" enabled="true"/>
+          <hashTree>
+    """
+        for module in shared_modules:
+            yield create_generic_controller_xml(module, **options)
+        yield """
+          </hashTree>"""
 
     # Close the XML tags
-    jmx_content += """
-          </hashTree>
+    yield """
         </hashTree>
       </hashTree>
     </jmeterTestPlan>
     """
-
-    # Determine output path and file name for the JMX file
-    if 'jmx' in jmx_file:
-        output_path = os.path.abspath(os.path.join(jmx_file, os.pardir))
-        file_name = os.path.basename(jmx_file)
-    else:
-        file_name = f"{jmx_file}.jmx"
-        output_path = os.path.join( os.path.abspath(os.path.join(current_file_dir, '..', '..')), "out")
-
-    # Write the generated JMX content to the file
-    file_write(output_path, file_name, jmx_content)
\ No newline at end of file
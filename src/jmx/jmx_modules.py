@@ -0,0 +1,152 @@
+import hashlib
+import json
+from collections import Counter
+from typing import Any, Dict, List
+
+# Name of the TestFragment holding the samplers and controllers referenced by Module Controllers
+SHARED_MODULES_NAME = "Shared Modules"
+# Name of the root node JMeter starts every Module Controller path with
+ROOT_NODE_NAME = "Test Plan"
+MODULE_CONTROLLER = "module_controller"
+
+# Request fields that make two samplers identical
+SAMPLER_FIELDS = ("name", "method", "raw_url", "body", "body_mode", "headers", "tests")
+
+
+def compute_structure_keys(node: Dict[str, Any], keys: Dict[int, str]) -> str:
+    """
+    Computes the structural hash of a request or controller and of all its children.
+
+    Two nodes get the same key when they generate the same XML: requests are compared on SAMPLER_FIELDS,
+    controllers on their name and the keys of their children.
+
+    Args:
+        node (Dict[str, Any]): A controller or a request.
+        keys (Dict[int, str]): id(node) -> key, filled in for the node and its children.
+
+    Returns:
+        str: The key of the node.
+    """
+    if node['type'] == 'request':
+        content = json.dumps([node.get(field) for field in SAMPLER_FIELDS], sort_keys=True)
+    else:
+        child_keys = [compute_structure_keys(child, keys) for child in node.get('children', [])]
+        content = json.dumps([node['name'], child_keys])
+    key = hashlib.blake2b(content.encode('utf-8'), digest_size=16).hexdigest()
+    keys[id(node)] = key
+    return key
+
+
+def count_structures(node: Dict[str, Any], keys: Dict[int, str], counts: Counter) -> None:
+    """
+    Counts the occurrences of every structure, descending only into the first occurrence of each.
+
+    Repeated structures are replaced by references, so their children are emitted once and must only be
+    counted once: a request that only repeats inside a repeated folder does not need a module of its own.
+
+    Args:
+        node (Dict[str, Any]): A controller or a request.
+        keys (Dict[int, str]): id(node) -> key, from compute_structure_keys.
+        counts (Counter): key -> occurrences, updated in place.
+    """
+    key = keys[id(node)]
+    counts[key] += 1
+    if counts[key] == 1:
+        for child in node.get('children', []):
+            count_structures(child, keys, counts)
+
+
+def java_string_hash(value: str) -> int:
+    """
+    Computes Java's String.hashCode, which JMeter uses as the name of the stringProp elements of a collection.
+
+    Args:
+        value (str): The string.
+
+    Returns:
+        int: The signed 32-bit hash.
+    """
+    encoded = value.encode('utf-16-be')
+    result = 0
+    for index in range(0, len(encoded), 2):
+        result = (31 * result + (encoded[index] << 8 | encoded[index + 1])) & 0xFFFFFFFF
+    return result - (1 << 32) if result >= 1 << 31 else result
+
+
+class ModuleBuilder:
+    """
+    Rewrites a controller tree so that repeated samplers and controllers are generated once, in the
+    SHARED_MODULES_NAME fragment, and referenced by Module Controllers everywhere they occur.
+    """
+
+    def __init__(self, test_plan_name: str, keys: Dict[int, str], counts: Counter):
+        self.test_plan_name = test_plan_name
+        self.keys = keys
+        self.counts = counts
+        self.modules: List[Dict[str, Any]] = []
+        self.references: Dict[str, Dict[str, Any]] = {}
+        self.module_names: set = set()
+
+    def unique_name(self, name: str) -> str:
+        # Module Controllers find their target by name, so every module needs a distinct one
+        candidate, index = name, 2
+        while candidate in self.module_names:
+            candidate, index = f"{name} ({index})", index + 1
+        self.module_names.add(candidate)
+        return candidate
+
+    def rewrite(self, node: Dict[str, Any]) -> Dict[str, Any]:
+        key = self.keys[id(node)]
+        if self.counts[key] > 1:
+            if key not in self.references:
+                self.references[key] = self.build_module(node)
+            return dict(self.references[key], name=node['name'])
+        if node['type'] == 'request':
+            return node
+        return dict(node, children=[self.rewrite(child) for child in node.get('children', [])])
+
+    def build_module(self, node: Dict[str, Any]) -> Dict[str, Any]:
+        module_name = self.unique_name(node['name'])
+        if node['type'] == 'request':
+            # Module Controllers can only target controllers, a repeated sampler gets a controller of its own
+            module = {'type': 'generic_controller', 'name': module_name, 'children': [node]}
+        else:
+            module = dict(node, type='generic_controller', name=module_name,
+                          children=[self.rewrite(child) for child in node.get('children', [])])
+        self.modules.append(module)
+        # The children are the requests the reference runs, they are only read when analysing the tree
+        # (shared headers and origin), the reference itself is generated as a ModuleController
+        return {
+            'type': MODULE_CONTROLLER,
+            'node_path': [ROOT_NODE_NAME, self.test_plan_name, SHARED_MODULES_NAME, module_name],
+            'children': module['children']
+        }
+
+
+def deduplicate_test_plan(data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Replaces the repeated samplers and controllers of a test plan structure with Module Controllers.
+
+    The test plan structure is not modified, the returned copy lists the referenced modules under
+    'shared_modules'. Plans without repetitions are returned unchanged.
+
+    Args:
+        data (Dict[str, Any]): The test plan structure returned by read_postman_collection.
+
+    Returns:
+        Dict[str, Any]: The deduplicated test plan structure.
+    """
+    controllers = data['test_fragment_controller'].get('generic_controllers', [])
+    keys: Dict[int, str] = {}
+    counts: Counter = Counter()
+    for controller in controllers:
+        compute_structure_keys(controller, keys)
+    for controller in controllers:
+        count_structures(controller, keys, counts)
+    if not any(count > 1 for count in counts.values()):
+        return data
+
+    builder = ModuleBuilder(data['test_plan_name'], keys, counts)
+    fragment = dict(data['test_fragment_controller'],
+                    generic_controllers=[builder.rewrite(controller) for controller in controllers])
+    return dict(data, test_fragment_controller=fragment, shared_modules=builder.modules)
@@ -0,0 +1,230 @@
+import mmap
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from typing import Dict, List, Optional, Tuple
+
+from lxml import etree
+
+from src.helper.compression import detect_compression
+from src.jmx.jmx_reader import (
+    extract_controller_item,
+    extract_http_request_details,
+    extract_test_plan_name,
+    get_test_plan
+)
+
+# Files smaller than this are parsed sequentially, the process pool start-up costs more than it saves.
+MIN_PARALLEL_SIZE = 16 * 1024 * 1024
+
+# Depth (counted in nested hashTree elements) of the hashTree holding the top-level controllers:
+# jmeterTestPlan > hashTree(1) > TestPlan hashTree(2) > ThreadGroup/TestFragment hashTree(3) > controllers
+CONTAINER_DEPTH = 3
+
+# Comments and CDATA sections are matched first so a "<hashTree" inside them is never counted.
+HASH_TREE_PATTERN = re.compile(
+    rb'<!--.*?-->|<!\[CDATA\[.*?\]\]>|<(/?)hashTree\s*(/?)>',
+    re.DOTALL
+)
+ENCODING_PATTERN = re.compile(rb'<\?xml[^>]*encoding=["\']([A-Za-z0-9._\-]+)["\']')
+
+
+def scan_controller_boundaries(data) -> List[List[Tuple[int, int]]]:
+    """
+    Scans the raw JMX bytes for the byte ranges of the top-level controllers inside the test plan's hashTree.
+
+    Every controller is a test element followed by its own hashTree, so only hashTree tags are tracked: a
+    controller ends where its hashTree closes and the next one starts right after it.
+
+    Args:
+        data: The JMX content as bytes or an mmap object.
+
+    Returns:
+        List[List[Tuple[int, int]]]: One list of (start, end) ranges per container hashTree, in document order.
+    """
+    containers: List[List[Tuple[int, int]]] = []
+    depth = 0
+    chunk_start = 0
+
+    for match in HASH_TREE_PATTERN.finditer(data):
+        if match.group(1) is None:
+            continue  # comment or CDATA section
+        closing, self_closing = match.group(1), match.group(2)
+
+        if self_closing:
+            if depth == CONTAINER_DEPTH:
+                containers[-1].append((chunk_start, match.end()))
+                chunk_start = match.end()
+        elif not closing:
+            depth += 1
+            if depth == CONTAINER_DEPTH:
+                containers.append([])
+                chunk_start = match.end()
+        else:
+            depth -= 1
+            if depth == CONTAINER_DEPTH:
+                containers[-1].append((chunk_start, match.end()))
+                chunk_start = match.end()
+
+    return containers
+
+
+def group_ranges(containers: List[List[Tuple[int, int]]], batch_count: int) -> List[Tuple[int, int]]:
+    """
+    Joins adjacent controller ranges into roughly equally sized batches to keep inter-process traffic low.
+
+    Args:
+        containers (List[List[Tuple[int, int]]]): Controller ranges per container, as returned by
+                                                  scan_controller_boundaries.
+        batch_count (int): The desired number of batches.
+
+    Returns:
+        List[Tuple[int, int]]: Contiguous (start, end) byte ranges in document order.
+    """
+    total_size = sum(end - start for ranges in containers for start, end in ranges)
+    target_size = max(1, total_size // max(1, batch_count))
+
+    batches = []
+    for ranges in containers:
+        batch_start = None
+        for start, end in ranges:
+            if batch_start is None:
+                batch_start = start
+            if end - batch_start >= target_size:
+                batches.append((batch_start, end))
+                batch_start = None
+        if batch_start is not None:
+            batches.append((batch_start, ranges[-1][1]))
+    return batches
+
+
+def detect_encoding(header: bytes) -> str:
+    """
+    Reads the encoding from the XML declaration, defaulting to UTF-8.
+
+    Args:
+        header (bytes): The first bytes of the JMX file.
+
+    Returns:
+        str: The declared encoding.
+    """
+    match = ENCODING_PATTERN.search(header)
+    return match.group(1).decode('ascii') if match else 'UTF-8'
+
+
+def parse_chunk(file_path: str, start: int, end: int, encoding: str = 'UTF-8') -> Dict[str, object]:
+    """
+    Parses a byte range of top-level controllers and extracts them the same way extract_controllers does.
+
+    Direct requests are returned as candidates, because whether they are kept depends on the request names
+    found in all the other chunks.
+
+    Args:
+        file_path (str): Path to the JMX file.
+        start (int): Offset of the first byte of the range.
+        end (int): Offset after the last byte of the range.
+        encoding (str): The encoding declared by the JMX file.
+
+    Returns:
+        Dict[str, object]: The controller items, the candidate direct requests and the request names seen.
+    """
+    with open(file_path, 'rb') as jmx_file:
+        jmx_file.seek(start)
+        chunk = jmx_file.read(end - start)
+
+    declaration = f'<?xml version="1.0" encoding="{encoding}"?>'.encode('ascii')
+    root = etree.fromstring(declaration + b'<hashTree>' + chunk + b'</hashTree>')
+
+    sub_controller_names = set()
+    controllers = [extract_controller_item(controller, sub_controller_names)
+                   for controller in root.iter('GenericController')]
+    direct_requests = [extract_http_request_details(sampler) for sampler in root.xpath('.//HTTPSamplerProxy')
+                       if sampler.attrib.get("testname", "Unnamed Request") not in sub_controller_names]
+
+    return {
+        "controllers": controllers,
+        "direct_requests": direct_requests,
+        "sub_controller_names": sub_controller_names
+    }
+
+
+def merge_chunks(test_plan_name: str, chunks: List[Dict[str, object]]) -> Dict[str, object]:
+    """
+    Merges parsed chunks into the structure returned by get_test_plan, preserving document order.
+
+    Args:
+        test_plan_name (str): The name of the test plan.
+        chunks (List[Dict[str, object]]): Parsed chunks in document order.
+
+    Returns:
+        Dict[str, object]: The test plan name and its items.
+    """
+    sub_controller_names = set()
+    controllers = []
+    for chunk in chunks:
+        controllers.extend(chunk["controllers"])
+        sub_controller_names.update(chunk["sub_controller_names"])
+
+    for chunk in chunks:
+        for request in chunk["direct_requests"]:
+            if request["name"] not in sub_controller_names:
+                controllers.append({
+                    "item": {
+                        "name": request["name"],
+                        "requests": [request],
+                        "sub_controller": []
+                    }
+                })
+
+    return {
+        "name": test_plan_name,
+        "items": controllers
+    }
+
+
+def get_test_plan_parallel(file_path: str, max_workers: Optional[int] = None,
+                           min_parallel_size: int = MIN_PARALLEL_SIZE) -> Optional[Dict[str, object]]:
+    """
+    Retrieves the test plan structure like get_test_plan, parsing the top-level controllers in a process pool.
+
+    Falls back to get_test_plan for files smaller than min_parallel_size, compressed files, which cannot be
+    mapped, plans including other files or when the plan cannot be split.
+
+    Args:
+        file_path (str): Path to the JMX file.
+        max_workers (Optional[int]): Number of worker processes, defaults to the CPU count.
+        min_parallel_size (int): Minimum file size in bytes for the parallel path.
+
+    Returns:
+        Optional[Dict[str, object]]: A dictionary containing the test plan name and a list of items.
+    """
+    if os.path.getsize(file_path) < min_parallel_size or detect_compression(file_path):
+        return get_test_plan(file_path)
+
+    workers = max_workers or os.cpu_count() or 1
+    with open(file_path, 'rb') as jmx_file, \
+            mmap.mmap(jmx_file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        if data.find(b'<IncludeController') != -1:
+            return get_test_plan(file_path)
+        encoding = detect_encoding(data[:256])
+        containers = [ranges for ranges in scan_controller_boundaries(data) if ranges]
+        batches = group_ranges(containers, workers * 4)
+        if len(batches) < 2:
+            return get_test_plan(file_path)
+
+        # Everything outside the batches is the plan skeleton, small enough to parse directly
+        skeleton = []
+        position = 0
+        for start, end in batches:
+            skeleton.append(data[position:start])
+            position = end
+        skeleton.append(data[position:])
+
+    test_plan_name = extract_test_plan_name(etree.fromstring(b''.join(skeleton)))
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        starts, ends = zip(*batches)
+        chunks = list(executor.map(parse_chunk, repeat(file_path), starts, ends, repeat(encoding)))
+
+    return merge_chunks(test_plan_name, chunks)
@@ -1,6 +1,11 @@
 import logging
+import os
 from lxml import etree
-from typing import Optional, Dict, List
+from typing import Any, Optional, Dict, FrozenSet, List
+
+from src.helper.compression import detect_compression, open_compressed
+from src.helper.placeholder_utils import encode_query
+from src.postman.postman_json_reader import NO_BODY_CONTENT
 
 # Set up logging
 logging.basicConfig(level=logging.ERROR)
@@ -11,19 +16,98 @@ def parse_jmx_file(file_path: str) -> Optional[etree._Element]:
     Parses the JMX file and returns the root element.
 
     Args:
-        file_path (str): Path to the JMX file.
+        file_path (str): Path to the JMX file, gzip, zstd and xz compressed files are decompressed as they are parsed.
 
     Returns:
         Optional[etree._Element]: Root element of the parsed JMX file or None if parsing fails.
     """
     try:
-        tree = etree.parse(file_path)
+        compression = detect_compression(file_path)
+        if compression:
+            with open_compressed(file_path, compression, 'rb') as jmx_file:
+                tree = etree.parse(jmx_file)
+        else:
+            tree = etree.parse(file_path)
         return tree.getroot()
     except etree.XMLSyntaxError as e:
         logging.error(f"Error parsing the JMX file: {e}")
         raise
 
 
+def parse_jmx_bytes(data: bytes) -> etree._Element:
+    """
+    Parses JMX content held in memory and returns the root element.
+
+    Args:
+        data (bytes): The JMX content.
+
+    Returns:
+        etree._Element: Root element of the parsed JMX content.
+    """
+    try:
+        return etree.fromstring(data)
+    except etree.XMLSyntaxError as e:
+        logging.error(f"Error parsing the JMX content: {e}")
+        raise
+
+
+def find_fragment_hash_tree(root: etree._Element) -> Optional[etree._Element]:
+    """
+    Finds the hashTree holding the elements an IncludeController runs from an included JMX file.
+
+    Args:
+        root (etree._Element): Root element of the included JMX file.
+
+    Returns:
+        Optional[etree._Element]: The hashTree of the first test fragment, or of the test plan when it has none.
+    """
+    for tag in ('TestFragmentController', 'TestPlan'):
+        element = root.find(f".//{tag}")
+        if element is not None and element.getnext() is not None and element.getnext().tag == 'hashTree':
+            return element.getnext()
+    return None
+
+
+def resolve_includes(root: Optional[etree._Element], base_dir: str,
+                     visited: FrozenSet[str] = frozenset()) -> Optional[etree._Element]:
+    """
+    Replaces every IncludeController with the elements of the JMX file it includes, recursively.
+
+    Like JMeter, relative include paths are resolved against the directory of the main plan, also for the
+    includes found in included files.
+
+    Args:
+        root (Optional[etree._Element]): Root element of the JMX file, modified in place.
+        base_dir (str): The directory of the main plan.
+        visited (FrozenSet[str]): The files being included, to stop include cycles.
+
+    Returns:
+        Optional[etree._Element]: The root element with the includes resolved.
+    """
+    if root is None:
+        return None
+
+    for include in list(root.iter('IncludeController')):
+        include_path = include.findtext(".//stringProp[@name='IncludeController.includepath']", "")
+        file_path = os.path.abspath(os.path.join(base_dir, include_path))
+        if not include_path or file_path in visited:
+            logging.error(f"Skipping include of '{include_path}': missing path or include cycle")
+            continue
+
+        included = resolve_includes(parse_jmx_file(file_path), base_dir, visited | {file_path})
+        fragment_hash_tree = find_fragment_hash_tree(included)
+
+        parent = include.getparent()
+        position = parent.index(include)
+        include_hash_tree = include.getnext()
+        if include_hash_tree is not None and include_hash_tree.tag == 'hashTree':
+            parent.remove(include_hash_tree)
+        parent.remove(include)
+        if fragment_hash_tree is not None:
+            parent[position:position] = list(fragment_hash_tree)
+    return root
+
+
 def extract_http_arguments(test_element: etree._Element) -> Dict[str, str]:
     """
     Extracts HTTP arguments from a test element.
@@ -193,6 +277,8 @@ def get_test_plan(file_path: str) -> Optional[Dict[str, object]]:
     """
     Retrieves the test plan structure, including the test plan name and controllers with requests.
 
+    The files included by IncludeControllers are read as part of the plan.
+
     Args:
         file_path (str): Path to the JMX file.
 
@@ -200,7 +286,20 @@ def get_test_plan(file_path: str) -> Optional[Dict[str, object]]:
         Optional[Dict[str, object]]: A dictionary containing the test plan name and a list of items (controllers and requests),
                                      or None if the JMX file cannot be parsed.
     """
-    root = parse_jmx_file(file_path)
+    return build_test_plan(resolve_includes(parse_jmx_file(file_path), os.path.dirname(os.path.abspath(file_path))))
+
+
+def build_test_plan(root: Optional[etree._Element]) -> Dict[str, object]:
+    """
+    Builds the test plan structure from a parsed JMX root element.
+
+    Args:
+        root (Optional[etree._Element]): Root element of the JMX content.
+
+    Returns:
+        Dict[str, object]: A dictionary containing the test plan name and a list of items (controllers and requests),
+                           or an error entry if the root element is missing.
+    """
     if root is not None:
         # Extract the name of the test plan
         test_plan_name = extract_test_plan_name(root)
@@ -211,4 +310,82 @@ def get_test_plan(file_path: str) -> Optional[Dict[str, object]]:
         }
     return {
         "error": "Failed to parse JMX file"
-    }
\ No newline at end of file
+    }
+
+
+def to_request_node(request: Dict[str, Any], node_id: str, parent_id: Optional[str]) -> Dict[str, Any]:
+    """
+    Converts a request of the test plan to the request structure of read_postman_collection.
+
+    The "body" argument is the raw body, the other arguments are appended to the URL as query parameters,
+    percent-encoded apart from their placeholders, and kept decoded in queryParams.
+
+    Args:
+        request (Dict[str, Any]): A request from extract_http_request_details.
+        node_id (str): The ID of the request.
+        parent_id (Optional[str]): The ID of its controller, None at the top level.
+
+    Returns:
+        Dict[str, Any]: The request.
+    """
+    arguments = dict(request.get("arguments") or {})
+    body = arguments.pop("body", None)
+    raw_url = request.get("path", "")
+    if arguments:
+        raw_url = f"{raw_url}{'&' if '?' in raw_url else '?'}{encode_query(arguments.items())}"
+    return {
+        "id": node_id,
+        "name": request.get("name", "Unnamed Request").replace("&", "and"),
+        "type": "request",
+        "parent": parent_id,
+        "method": request.get("method", "GET"),
+        "raw_url": raw_url,
+        "queryParams": [{name: value} for name, value in arguments.items()] or [{"No query parameters": ""}],
+        "body": body if body else NO_BODY_CONTENT,
+        "body_mode": "raw" if body else None,
+        "headers": [],
+        "tests": [],
+        "variables": []
+    }
+
+
+def to_generic_controllers(test_plan: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Converts the items of a test plan to the controllers and requests of read_postman_collection, so the
+    generators written for Postman collections also read JMX plans.
+
+    The plan has no headers, tests or variables, an item holding a single request of its own name is a
+    request outside of any controller. Entries without a path are skipped: the sub-controllers list the
+    config elements and hashTrees next to their samplers as requests.
+
+    Args:
+        test_plan (Dict[str, Any]): The test plan returned by get_test_plan.
+
+    Returns:
+        List[Dict[str, Any]]: The top-level controllers and requests.
+    """
+    counter = 0
+
+    def next_id() -> str:
+        nonlocal counter
+        counter += 1
+        return f"controller_{counter}"
+
+    def convert(item: Dict[str, Any], parent_id: Optional[str]) -> Dict[str, Any]:
+        requests = item.get("requests", [])
+        if parent_id is None and not item.get("sub_controller") and len(requests) == 1 and \
+                requests[0].get("name") == item.get("name"):
+            return to_request_node(requests[0], next_id(), None)
+        controller_id = next_id()
+        children = [to_request_node(request, next_id(), controller_id) for request in requests if request.get("path")]
+        children.extend(convert(sub_controller["item"], controller_id)
+                        for sub_controller in item.get("sub_controller", []))
+        return {
+            "id": controller_id,
+            "name": item.get("name", "Unnamed Controller").replace("&", "and"),
+            "type": "generic_controller" if parent_id is None else "child_generic_controller",
+            "parent": parent_id,
+            "children": children
+        }
+
+    return [convert(entry["item"], None) for entry in test_plan.get("items", [])]
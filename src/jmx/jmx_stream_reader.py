@@ -0,0 +1,124 @@
+from typing import Iterator, Optional, Tuple
+
+from lxml import etree
+
+from src.helper.compression import open_input
+
+# Events of iter_plan_elements
+OPEN = "open"
+CLOSE = "close"
+ELEMENT = "element"
+
+# Test elements that hold other test elements and are reported as OPEN ... CLOSE, including every
+# controller except the two that reference other parts of the plan.
+CONTAINER_SUFFIXES = ("Controller", "ThreadGroup")
+CONTAINER_TAGS = ("TestPlan",)
+REFERENCE_TAGS = ("IncludeController", "ModuleController")
+
+
+def is_container(element: Optional[etree._Element]) -> bool:
+    """
+    Tells whether a test element holds other test elements (test plan, thread groups and controllers).
+
+    Args:
+        element (Optional[etree._Element]): A test element, None for the root hashTree.
+
+    Returns:
+        bool: True for containers and the root hashTree.
+    """
+    if element is None:
+        return True
+    if element.tag in REFERENCE_TAGS:
+        return False
+    return element.tag in CONTAINER_TAGS or element.tag.endswith(CONTAINER_SUFFIXES)
+
+
+def is_enabled(element: etree._Element) -> bool:
+    """
+    Tells whether a test element is enabled, JMeter skips disabled elements and everything they hold.
+
+    Args:
+        element (etree._Element): A test element.
+
+    Returns:
+        bool: False when the element is marked enabled="false".
+    """
+    return element.attrib.get("enabled", "true") != "false"
+
+
+def get_owner(hash_tree: etree._Element) -> Optional[etree._Element]:
+    """
+    Finds the test element a hashTree holds the children of, its previous sibling skipping comments.
+
+    Args:
+        hash_tree (etree._Element): A hashTree element.
+
+    Returns:
+        Optional[etree._Element]: The test element, None for the root hashTree.
+    """
+    owner = hash_tree.getprevious()
+    while owner is not None and not isinstance(owner.tag, str):
+        owner = owner.getprevious()
+    return owner
+
+
+def get_hash_tree(element: etree._Element) -> Optional[etree._Element]:
+    """
+    Finds the hashTree holding the children of a test element, its next sibling skipping comments.
+
+    Args:
+        element (etree._Element): A test element.
+
+    Returns:
+        Optional[etree._Element]: The hashTree, None when the element has none.
+    """
+    hash_tree = element.getnext()
+    while hash_tree is not None and not isinstance(hash_tree.tag, str):
+        hash_tree = hash_tree.getnext()
+    return hash_tree if hash_tree is not None and hash_tree.tag == "hashTree" else None
+
+
+def iter_plan_elements(file_path: str) -> Iterator[Tuple[str, etree._Element, int]]:
+    """
+    Streams the test elements of a JMX file without building the whole tree.
+
+    Every test element is followed by the hashTree of its children. Containers are reported twice: OPEN once
+    their own properties are parsed, before their children, and CLOSE after their hashTree. Other elements
+    (samplers, config elements, assertions, timers...) are reported once as ELEMENT after their hashTree,
+    which the consumer reads with get_hash_tree(). Elements are removed from the tree once reported, so
+    memory is bounded by the largest sampler and the containers being read.
+
+    Args:
+        file_path (str): Path to the JMX file, gzip, zstd and xz compressed files are decompressed as they are read.
+
+    Yields:
+        Tuple[str, etree._Element, int]: The event (OPEN, CLOSE or ELEMENT), the test element and its depth,
+            counted in enclosing hashTree elements (1 for the TestPlan, 2 for thread groups and fragments).
+    """
+    owners = []  # owner of every open hashTree, None for the root one
+    leaf_depth = None  # depth of the non-container whose children are being read
+
+    with open_input(file_path) as jmx_file:
+        # Only hashTree events are needed: when one starts, the test element it belongs to is complete
+        for event, hash_tree in etree.iterparse(jmx_file, events=("start", "end"), tag="hashTree", huge_tree=True):
+            if event == "start":
+                owner = get_owner(hash_tree) if owners else None
+                if leaf_depth is None:
+                    if not is_container(owner):
+                        leaf_depth = len(owners)
+                    elif owner is not None:
+                        yield OPEN, owner, len(owners)
+                owners.append(owner)
+                continue
+
+            owner = owners.pop()
+            if owner is None or (leaf_depth is not None and leaf_depth < len(owners)):
+                continue
+            if leaf_depth == len(owners):
+                leaf_depth = None
+                yield ELEMENT, owner, len(owners)
+            else:
+                yield CLOSE, owner, len(owners)
+            parent = hash_tree.getparent()
+            parent.remove(owner)
+            parent.remove(hash_tree)
@@ -0,0 +1,184 @@
+import csv
+import json
+import os
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from xml.sax.saxutils import escape
+
+from src.helper.compression import open_input, strip_compression_extension
+from src.helper.json_stream import JsonStream
+from src.helper.placeholder_utils import to_jmeter_placeholders
+
+# Suffix of the CSV file written next to the JMX file from an iteration data file
+DATA_SET_SUFFIX = "_data.csv"
+
+# Name of the CSVDataSet reading the iteration data
+DATA_SET_NAME = "Iteration Data"
+
+
+def load_environment(environment_file: str) -> Dict[str, str]:
+    """
+    Reads the variables of a Postman environment or globals export, or of a flat JSON object.
+
+    Args:
+        environment_file (str): Path to the JSON file.
+
+    Returns:
+        Dict[str, str]: The enabled variables, their {{placeholders}} converted to ${placeholders}.
+
+    Raises:
+        FileNotFoundError: If the file does not exist.
+        ValueError: If the file is not a JSON object.
+    """
+    with open_input(environment_file, 'r', encoding='utf-8') as file:
+        data = json.load(file)
+    if not isinstance(data, dict):
+        raise ValueError(f"{environment_file} is not a Postman environment or a JSON object")
+    if isinstance(data.get('values'), list):
+        variables = {value['key']: value.get('value', '') for value in data['values']
+                     if isinstance(value, dict) and 'key' in value and value.get('enabled', True)}
+    else:
+        variables = data
+    return {str(name): to_jmeter_placeholders(value if isinstance(value, str) else json.dumps(value))
+            for name, value in variables.items()}
+
+
+def load_variables(environment_file: Optional[str] = None, globals_file: Optional[str] = None) -> Dict[str, str]:
+    """
+    Merges the variables of a Postman globals and environment export, the environment taking precedence.
+
+    Args:
+        environment_file (Optional[str]): A Postman environment export or a flat JSON object.
+        globals_file (Optional[str]): A Postman globals export or a flat JSON object.
+
+    Returns:
+        Dict[str, str]: The variables, empty when no file is given.
+    """
+    variables: Dict[str, str] = {}
+    for variables_file in (globals_file, environment_file):
+        if variables_file:
+            variables.update(load_environment(variables_file))
+    return variables
+
+
+def to_csv_value(value: Any) -> str:
+    """Formats a value of a JSON data file as a CSV field, nested values are kept as JSON."""
+    kind = type(value)
+    if kind is str:
+        return value
+    # Numbers are written as json.dumps would, without going through the encoder
+    if kind is int or kind is float:
+        return repr(value)
+    return "" if value is None else json.dumps(value)
+
+
+def iter_json_rows(data_file: str) -> Iterator[Dict[str, Any]]:
+    """Streams the objects of a JSON array data file, other items are skipped."""
+    with open_input(data_file, 'r', encoding='utf-8-sig') as file:
+        for row in JsonStream(file).iter_array():
+            if isinstance(row, dict):
+                yield row
+
+
+def write_data_set(data_file: str, csv_path: str) -> List[str]:
+    """
+    Writes a Postman iteration data file, a CSV file or a JSON array of objects, as the CSV file of a CSVDataSet.
+
+    Both are streamed a row at a time, and decompressed as they are read when gzip, zstd or xz compressed. A
+    JSON file is read twice, once to collect the names of all its columns and once to write the rows, so
+    objects may have different keys. The first line of the CSV file holds the column names.
+
+    Args:
+        data_file (str): The iteration data file, read as CSV unless it ends with .json.
+        csv_path (str): The CSV file to write.
+
+    Returns:
+        List[str]: The column names, the variables set by the CSVDataSet.
+
+    Raises:
+        FileNotFoundError: If the data file does not exist.
+        ValueError: If the data file has no columns, or a JSON data file is not an array.
+    """
+    with open(csv_path, 'w', encoding='utf-8', newline='') as csv_file:
+        writer = csv.writer(csv_file)
+        if strip_compression_extension(data_file).endswith(".json"):
+            columns = list(dict.fromkeys(key for row in iter_json_rows(data_file) for key in row))
+            writer.writerow(columns)
+            writer.writerows([to_csv_value(row.get(column)) for column in columns]
+                             for row in iter_json_rows(data_file))
+        else:
+            with open_input(data_file, 'r', encoding='utf-8-sig', newline='') as source:
+                reader = csv.reader(source)
+                columns = next(reader, [])
+                writer.writerow(columns)
+                writer.writerows(reader)
+    if not columns:
+        raise ValueError(f"{data_file} has no columns")
+    return columns
+
+
+def create_data_set(data_file: str, output_path: str, file_name: str) -> Tuple[str, List[str]]:
+    """
+    Writes the CSV file of an iteration data file next to a JMX file.
+
+    Args:
+        data_file (str): The iteration data file.
+        output_path (str): The directory of the JMX file.
+        file_name (str): The file name of the JMX file.
+
+    Returns:
+        Tuple[str, List[str]]: The CSV file name, relative to the JMX file, and its column names.
+    """
+    csv_name = f"{os.path.splitext(strip_compression_extension(file_name))[0]}{DATA_SET_SUFFIX}"
+    os.makedirs(output_path, exist_ok=True)
+    return csv_name, write_data_set(data_file, os.path.join(output_path, csv_name))
+
+
+def create_user_defined_variables_xml(variables: Dict[str, str]) -> str:
+    """
+    Creates the arguments of the User Defined Variables of a TestPlan.
+
+    Args:
+        variables (Dict[str, str]): The variables, by name.
+
+    Returns:
+        str: XML string for the Arguments.arguments collection.
+    """
+    if not variables:
+        return """<collectionProp name="Arguments.arguments"/>"""
+    arguments_xml = "".join(f"""
+              <elementProp name="{escape(name, {'"': '&quot;'})}" elementType="Argument">
+                <stringProp name="Argument.name">{escape(name)}</stringProp>
+                <stringProp name="Argument.value">{escape(value)}</stringProp>
+                <stringProp name="Argument.metadata">=</stringProp>
+              </elementProp>""" for name, value in variables.items())
+    return f"""<collectionProp name="Arguments.arguments">{arguments_xml}
+            </collectionProp>"""
+
+
+def create_csv_data_set_xml(csv_name: str, columns: List[str]) -> str:
+    """
+    Creates a CSVDataSet reading one row per iteration, shared by all threads and recycled at the end of the file.
+
+    JMeter reads the file lazily, one line per iteration, so the size of the data does not grow the plan.
+
+    Args:
+        csv_name (str): The CSV file, relative to the JMX file.
+        columns (List[str]): The variable names, the first line of the file is skipped.
+
+    Returns:
+        str: XML string for the CSVDataSet.
+    """
+    return f"""
+    <CSVDataSet guiclass="TestBeanGUI" testclass="CSVDataSet" testname="{DATA_SET_NAME}" enabled="true">
+      <stringProp name="filename">{escape(csv_name)}</stringProp>
+      <stringProp name="fileEncoding">UTF-8</stringProp>
+      <stringProp name="variableNames">{escape(",".join(columns))}</stringProp>
+      <boolProp name="ignoreFirstLine">true</boolProp>
+      <stringProp name="delimiter">,</stringProp>
+      <boolProp name="quotedData">true</boolProp>
+      <boolProp name="recycle">true</boolProp>
+      <boolProp name="stopThread">false</boolProp>
+      <stringProp name="shareMode">shareMode.all</stringProp>
+    </CSVDataSet>
+    <hashTree/>
+    """
@@ -0,0 +1,500 @@
+import json
+import os
+from collections import Counter
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set, Tuple
+
+from src.helper.placeholder_utils import JMETER_PLACEHOLDER
+from src.jmx.jmx_creator import (
+    RAW_BODY,
+    Header,
+    LoadProfile,
+    get_body_mode,
+    get_request_headers,
+    iter_requests,
+    resolve_postman_path
+)
+from src.postman.postman_json_reader import read_postman_collection
+
+# Stores a raw body in the data file and returns its index in the BODIES SharedArray
+BodyStore = Callable[[str], int]
+
+INDENT = "    "
+STATUS_CHECK = "pm.response.to.have.status("
+
+# Runtime helpers: placeholders are filled from the variables of the VU, which start as the
+# environment variables (k6 run -e tests_url=...) and are updated from the responses.
+HELPERS_JS = r"""const vars = Object.assign({}, __ENV);
+
+function fill(text) {
+    return text.replace(/\$\{([^{}\s]+)\}/g, (placeholder, name) => (name in vars ? String(vars[name]) : placeholder));
+}
+
+function fillHeaders(headers) {
+    const filled = {};
+    for (const name in headers) {
+        filled[name] = fill(headers[name]);
+    }
+    return filled;
+}
+"""
+
+
+def resolve_k6_output(k6_file: str) -> Tuple[str, str]:
+    """
+    Determines the output directory and file name of the k6 script.
+
+    Args:
+        k6_file (str): A .js file path, or a script name (without .js) written to the out directory.
+
+    Returns:
+        Tuple[str, str]: The output directory and the file name.
+    """
+    if k6_file.endswith('.js'):
+        return os.path.abspath(os.path.join(k6_file, os.pardir)), os.path.basename(k6_file)
+    current_file_dir = os.path.dirname(__file__)
+    return os.path.join(os.path.abspath(os.path.join(current_file_dir, '..', '..')), "out"), f"{k6_file}.js"
+
+
+def js_string(value: str) -> str:
+    """
+    Creates a JavaScript string literal, calling fill() at runtime when the string has placeholders.
+
+    Args:
+        value (str): The string, with ${name} placeholders.
+
+    Returns:
+        str: The JavaScript expression.
+    """
+    literal = json.dumps(value)
+    return f"fill({literal})" if JMETER_PLACEHOLDER.search(value) else literal
+
+
+def js_object(pairs: List[Tuple[str, str]]) -> str:
+    """
+    Creates a JavaScript object literal from (name, value) pairs, later pairs win on duplicate names.
+
+    Args:
+        pairs (List[Tuple[str, str]]): The names and values.
+
+    Returns:
+        str: The JavaScript expression.
+    """
+    return "{" + ", ".join(f"{json.dumps(name)}: {js_string(value)}" for name, value in pairs) + "}"
+
+
+def find_request_variables(request: Dict[str, Any]) -> Set[str]:
+    """
+    Finds the variables a request reads in its URL, headers and body.
+
+    Args:
+        request (Dict[str, Any]): The request information read from the Postman collection.
+
+    Returns:
+        Set[str]: The variable names.
+    """
+    texts = [request.get('raw_url', '')]
+    texts.extend(value for _, value in get_request_headers(request))
+    body = request.get('body')
+    if isinstance(body, str):
+        texts.append(body)
+    elif isinstance(body, list):
+        texts.extend(f"{field.get('key', '')} {field.get('value', '')}" for field in body)
+    return {name for text in texts if '${' in text for name in JMETER_PLACEHOLDER.findall(text)}
+
+
+def split_batches(requests: List[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
+    """
+    Groups consecutive requests into batches sent in parallel with http.batch().
+
+    A new batch starts at the first request reading a variable set from the response of a request of the
+    current batch, so every request still sees the variables of the requests it depends on.
+
+    Args:
+        requests (List[Dict[str, Any]]): Consecutive requests of a folder.
+
+    Returns:
+        List[List[Dict[str, Any]]]: The batches, in order.
+    """
+    batches: List[List[Dict[str, Any]]] = []
+    current: List[Dict[str, Any]] = []
+    produced: Set[str] = set()
+    for request in requests:
+        if current and find_request_variables(request) & produced:
+            batches.append(current)
+            current, produced = [], set()
+        current.append(request)
+        produced.update(variable['name'] for variable in request.get('variables', []))
+    if current:
+        batches.append(current)
+    return batches
+
+
+def find_header_constants(controllers: List[Dict[str, Any]]) -> Dict[Tuple[Header, ...], str]:
+    """
+    Names the header sets sent by more than one request, they are declared once as constants.
+
+    Args:
+        controllers (List[Dict[str, Any]]): The top-level controllers and requests.
+
+    Returns:
+        Dict[Tuple[Header, ...], str]: header set -> constant name, numbered in order of first use.
+    """
+    counts: Counter = Counter()
+    for controller in controllers:
+        for request in iter_requests(controller):
+            headers = tuple(get_request_headers(request))
+            if headers:
+                counts[headers] += 1
+    shared = [headers for headers, count in counts.items() if count > 1]
+    return {headers: f"HEADERS_{index}" for index, headers in enumerate(shared, start=1)}
+
+
+def create_scenario(load_profile: LoadProfile, requests_per_iteration: int = 1) -> Dict[str, Any]:
+    """
+    Creates the k6 scenario generating the load of a load profile.
+
+    A target_rps runs the iterations with the constant-arrival-rate executor and needs a duration, without
+    one the threads run their loops unpaced. The arrival rate counts iterations, each sending every request
+    of the script, so the target is divided by the requests of an iteration to send target_rps requests per
+    second like the ConstantThroughputTimer of the JMX plan. A duration without target ramps the VUs up with
+    the ramping-vus executor and holds them until the end.
+
+    Args:
+        load_profile (LoadProfile): The load to generate.
+        requests_per_iteration (int): Requests sent by an iteration of the scenario.
+
+    Returns:
+        Dict[str, Any]: The scenario.
+    """
+    if load_profile.duration and load_profile.target_rps:
+        iterations_per_second = load_profile.target_rps / max(requests_per_iteration, 1)
+        # The arrival rate is an integer, fractional rates are given per minute, or per hour below one a minute
+        if float(iterations_per_second).is_integer():
+            rate, time_unit = int(iterations_per_second), '1s'
+        elif iterations_per_second * 60 >= 1:
+            rate, time_unit = round(iterations_per_second * 60), '1m'
+        else:
+            rate, time_unit = max(round(iterations_per_second * 3600), 1), '1h'
+        return {
+            'executor': 'constant-arrival-rate',
+            'rate': rate,
+            'timeUnit': time_unit,
+            'duration': f"{load_profile.duration}s",
+            'preAllocatedVUs': load_profile.threads
+        }
+    if load_profile.duration:
+        ramp_up = min(load_profile.ramp_up, load_profile.duration)
+        return {
+            'executor': 'ramping-vus',
+            'startVUs': 0,
+            'stages': [
+                {'duration': f"{ramp_up}s", 'target': load_profile.threads},
+                {'duration': f"{load_profile.duration - ramp_up}s", 'target': load_profile.threads}
+            ]
+        }
+    return {
+        'executor': 'per-vu-iterations',
+        'vus': load_profile.threads,
+        'iterations': load_profile.loops
+    }
+
+
+def create_options_js(scenarios: Dict[str, Dict[str, Any]], reuse_connections: bool = True) -> str:
+    """
+    Creates the exported k6 options running the script scenarios.
+
+    Args:
+        scenarios (Dict[str, Dict[str, Any]]): name -> scenario, from create_scenario.
+        reuse_connections (bool): Keep connections alive between requests and across iterations of a VU.
+
+    Returns:
+        str: The options declaration.
+    """
+    options: Dict[str, Any] = {'scenarios': scenarios}
+    if not reuse_connections:
+        options.update(noConnectionReuse=True, noVUConnectionReuse=True)
+    return f"export const options = {json.dumps(options, indent=4)};\n"
+
+
+def create_request_args_js(request: Dict[str, Any], header_constants: Dict[Tuple[Header, ...], str],
+                           store_body: BodyStore) -> str:
+    """
+    Creates the method, URL, body and params arguments of a request.
+
+    Raw bodies are read from the BODIES SharedArray, form bodies are sent as objects (urlencoded by k6).
+
+    Args:
+        request (Dict[str, Any]): The request information read from the Postman collection.
+        header_constants (Dict[Tuple[Header, ...], str]): The shared header sets, from find_header_constants.
+        store_body (BodyStore): Stores a raw body in the data file.
+
+    Returns:
+        str: The comma-separated JavaScript arguments of http.request().
+    """
+    body_mode = get_body_mode(request)
+    if body_mode == RAW_BODY:
+        body_js = f"BODIES[{store_body(request['body'])}]"
+        if JMETER_PLACEHOLDER.search(request['body']):
+            body_js = f"fill({body_js})"
+    elif body_mode:
+        body_js = js_object([(field['key'], field.get('value', '')) for field in request['body']])
+    else:
+        body_js = "null"
+
+    params = []
+    headers = tuple(get_request_headers(request))
+    if headers in header_constants:
+        constant = header_constants[headers]
+        has_placeholders = any(JMETER_PLACEHOLDER.search(value) for _, value in headers)
+        params.append(f"headers: fillHeaders({constant})" if has_placeholders else f"headers: {constant}")
+    elif headers:
+        params.append(f"headers: {js_object(list(headers))}")
+    params.append(f"tags: {{ name: {json.dumps(request['name'])} }}")
+
+    return f"{json.dumps(request['method'])}, {js_string(request['raw_url'])}, {body_js}, {{ {', '.join(params)} }}"
+
+
+def get_expected_status(script: str) -> Optional[str]:
+    """
+    Reads the status code a Postman test expects with pm.response.to.have.status().
+
+    Args:
+        script (str): The test script.
+
+    Returns:
+        Optional[str]: The status code, None when the test checks anything else.
+    """
+    if STATUS_CHECK not in script:
+        return None
+    status = script.split(STATUS_CHECK, 1)[1].split(")", 1)[0].strip()
+    return status if status.isdigit() else None
+
+
+def create_response_js(request: Dict[str, Any], response_js: str, indent: str) -> str:
+    """
+    Creates the status checks and variable updates of a request response.
+
+    Args:
+        request (Dict[str, Any]): The request information read from the Postman collection.
+        response_js (str): The JavaScript expression of the response.
+        indent (str): The indentation of the statements.
+
+    Returns:
+        str: The statements, empty when the request has no status test and sets no variable.
+    """
+    js = ""
+    for test in request.get('tests', []):
+        status = get_expected_status(test.get('script', ''))
+        if status:
+            js += f"{indent}check({response_js}, {{ {json.dumps(test['name'])}: (r) => r.status === {status} }});\n"
+    for variable in request.get('variables', []):
+        # Variables set from anything else than the response JSON are left to the environment
+        if variable.get('path'):
+            js += f"{indent}vars[{json.dumps(variable['name'])}] = {response_js}.json({json.dumps(variable['path'])});\n"
+    return js
+
+
+def create_batch_js(batch: List[Dict[str, Any]], header_constants: Dict[Tuple[Header, ...], str],
+                    store_body: BodyStore, indent: str) -> str:
+    """
+    Creates the statements sending a batch of requests, a single request is sent without http.batch().
+
+    Args:
+        batch (List[Dict[str, Any]]): The requests, from split_batches.
+        header_constants (Dict[Tuple[Header, ...], str]): The shared header sets.
+        store_body (BodyStore): Stores a raw body in the data file.
+        indent (str): The indentation of the statements.
+
+    Returns:
+        str: The statements.
+    """
+    requests_js = [create_request_args_js(request, header_constants, store_body) for request in batch]
+    if len(batch) == 1:
+        js = f"{indent}responses = [http.request({requests_js[0]})];\n"
+    else:
+        js = f"{indent}responses = http.batch([\n"
+        js += "".join(f"{indent}{INDENT}[{request_js}],\n" for request_js in requests_js)
+        js += f"{indent}]);\n"
+    for index, request in enumerate(batch):
+        js += create_response_js(request, f"responses[{index}]", indent)
+    return js
+
+
+def iter_block_js(nodes: List[Dict[str, Any]], header_constants: Dict[Tuple[Header, ...], str],
+                  store_body: BodyStore, indent: str) -> Iterator[str]:
+    """
+    Generates the statements of a function body running requests and folders in order.
+
+    Consecutive requests are batched, each folder becomes a group().
+
+    Args:
+        nodes (List[Dict[str, Any]]): The requests and controllers.
+        header_constants (Dict[Tuple[Header, ...], str]): The shared header sets.
+        store_body (BodyStore): Stores a raw body in the data file.
+        indent (str): The indentation of the statements.
+
+    Yields:
+        str: The statements, one batch or group at a time.
+    """
+    if any(node['type'] == 'request' for node in nodes):
+        yield f"{indent}let responses;\n"
+
+    pending: List[Dict[str, Any]] = []
+    for node in nodes + [None]:
+        if node is not None and node['type'] == 'request':
+            pending.append(node)
+            continue
+        for batch in split_batches(pending):
+            yield create_batch_js(batch, header_constants, store_body, indent)
+        pending = []
+        if node is not None:
+            yield f"{indent}group({json.dumps(node['name'])}, function () {{\n"
+            yield from iter_block_js(node.get('children', []), header_constants, store_body, indent + INDENT)
+            yield f"{indent}}});\n"
+
+
+def iter_k6_script(data: Dict[str, Any], store_body: BodyStore, data_file_name: Optional[str] = None,
+                   load_profile: Optional[LoadProfile] = None) -> Iterator[str]:
+    """
+    Generates a k6 ES module script piece by piece, one top-level folder at a time.
+
+    Every folder runs in a group(). Consecutive requests that do not read variables set by each other are
+    sent in parallel with http.batch(). Header sets used by several requests are declared once as constants.
+    Raw bodies are stored with store_body and read from a SharedArray, which all VUs share instead of
+    holding their own copy.
+
+    Args:
+        data (Dict[str, Any]): The test plan structure returned by read_postman_collection.
+        store_body (BodyStore): Stores a raw body in the data file and returns its index.
+        data_file_name (Optional[str]): Path of the data file relative to the script, None when the plan has
+            no raw bodies.
+        load_profile (Optional[LoadProfile]): Exported as the k6 options, None leaves them to the command line.
+
+    Yields:
+        str: Consecutive fragments of the script.
+    """
+    controllers = data['test_fragment_controller'].get('generic_controllers', [])
+    header_constants = find_header_constants(controllers)
+
+    yield f"// {data['test_plan_name']}\n"
+    yield "import http from 'k6/http';\nimport { check, group } from 'k6';\n"
+    if data_file_name:
+        yield "import { SharedArray } from 'k6/data';\n"
+    yield "\n"
+    if load_profile:
+        requests = sum(1 for controller in controllers for _ in iter_requests(controller))
+        yield create_options_js({'default': create_scenario(load_profile, requests)},
+                                load_profile.reuse_connections) + "\n"
+    if data_file_name:
+        yield (f"const BODIES = new SharedArray('bodies', function () {{\n"
+               f"{INDENT}return JSON.parse(open({json.dumps('./' + data_file_name)}));\n"
+               f"}});\n\n")
+    for headers, constant in header_constants.items():
+        yield f"const {constant} = {json.dumps(dict(headers))};\n"
+    if header_constants:
+        yield "\n"
+    yield HELPERS_JS
+    yield "\nexport default function () {\n"
+    yield from iter_block_js(controllers, header_constants, store_body, INDENT)
+    yield "}\n"
+
+
+def has_raw_bodies(data: Dict[str, Any]) -> bool:
+    """
+    Tells whether any request of a test plan sends a raw body.
+
+    Args:
+        data (Dict[str, Any]): The test plan structure returned by read_postman_collection.
+
+    Returns:
+        bool: True when the script needs a data file.
+    """
+    return any(get_body_mode(request) == RAW_BODY
+               for controller in data['test_fragment_controller'].get('generic_controllers', [])
+               for request in iter_requests(controller))
+
+
+class BodyFile:
+    """
+    Writes raw bodies to the JSON array loaded by the BODIES SharedArray, the file is created with the first body.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.count = 0
+        self.file = None
+
+    def store(self, body: str) -> int:
+        if self.file is None:
+            self.file = open(self.path, 'w', encoding='utf-8')
+            self.file.write("[\n")
+        else:
+            self.file.write(",\n")
+        self.file.write(json.dumps(body))
+        self.count += 1
+        return self.count - 1
+
+    def close(self) -> None:
+        if self.file is not None:
+            self.file.write("\n]\n")
+            self.file.close()
+            self.file = None
+
+
+def get_data_file_name(file_name: str) -> str:
+    """
+    Names the data file holding the raw bodies of a script.
+
+    Args:
+        file_name (str): The file name of the script.
+
+    Returns:
+        str: "<name>.bodies.json".
+    """
+    return f"{os.path.splitext(file_name)[0]}.bodies.json"
+
+
+def write_k6_script(data: Dict[str, Any], output_path: str, file_name: str,
+                    load_profile: Optional[LoadProfile] = None) -> None:
+    """
+    Streams the k6 script of a test plan to disk, with its raw bodies in a "<name>.bodies.json" data file.
+
+    Args:
+        data (Dict[str, Any]): The test plan structure returned by read_postman_collection.
+        output_path (str): The directory of the script.
+        file_name (str): The file name of the script.
+        load_profile (Optional[LoadProfile]): Exported as the k6 options.
+    """
+    os.makedirs(output_path, exist_ok=True)
+    data_file_name = get_data_file_name(file_name) if has_raw_bodies(data) else None
+    body_file = BodyFile(os.path.join(output_path, get_data_file_name(file_name)))
+    try:
+        with open(os.path.join(output_path, file_name), 'w', encoding='utf-8') as script_file:
+            script_file.writelines(iter_k6_script(data, body_file.store, data_file_name, load_profile))
+    finally:
+        body_file.close()
+
+
+def create_k6_script(source_file: str, k6_file: str, load_profile: Optional[LoadProfile] = None) -> None:
+    """
+    Creates a k6 script based on a Postman collection.
+
+    Args:
+        source_file (str): The source file (Postman collection) to read from.
+        k6_file (str): The file path where the script should be saved.
+        load_profile (Optional[LoadProfile]): Exported as the k6 options, None leaves the VUs, duration and
+            iterations to the k6 command line.
+    """
+    postman_json_path_final = resolve_postman_path(source_file)
+
+    try:
+        data = read_postman_collection(postman_json_path_final)
+    except FileNotFoundError:
+        print(f"Error: File {postman_json_path_final} not found.")
+        raise
+    except json.JSONDecodeError:
+        print("Error: Invalid JSON format in the Postman collection.")
+        raise
+
+    output_path, file_name = resolve_k6_output(k6_file)
+    write_k6_script(data, output_path, file_name, load_profile)
@@ -0,0 +1,53 @@
+from typing import Any, Dict
+
+from src.helper.importer import load_source, save_postman_collection
+from src.jmx.jmx_creator import write_jmx_file
+from src.k6.k6_reader import read_k6_script
+
+
+def load_k6_script(source_file: str) -> Dict[str, Any]:
+    """
+    Reads the test plan structure of a k6 script.
+
+    Args:
+        source_file (str): An existing file path, or a script name (without .js) in file_to_convert.
+
+    Returns:
+        Dict[str, Any]: The test plan structure returned by read_k6_script.
+
+    Raises:
+        FileNotFoundError: If the script does not exist.
+        ValueError: If the script cannot be tokenized or its structure is broken.
+    """
+    return load_source(source_file, ".js", read_k6_script)
+
+
+def create_jmx_file_from_k6(source_file: str, jmx_file: str, **options: Any) -> None:
+    """
+    Creates a JMeter .jmx file from the requests of a k6 script.
+
+    The requests run in a ThreadGroup with the load profile of the script options, unless one is given.
+
+    Args:
+        source_file (str): The k6 script, a path or a script name (without .js) in file_to_convert.
+        jmx_file (str): The file path where the JMX file should be saved.
+        **options: The options of write_jmx_file, a load_profile overrides the one of the script options.
+    """
+    data = load_k6_script(source_file)
+    options['load_profile'] = options.get('load_profile') or data['load_profile']
+    write_jmx_file(data, jmx_file, **options)
+
+
+def create_postman_collection_from_k6(source_file: str, output_path: str, deterministic_ids: bool = False,
+                                      normalize_bodies: bool = False) -> None:
+    """
+    Creates a Postman collection from the requests of a k6 script.
+
+    Args:
+        source_file (str): The k6 script, a path or a script name (without .js) in file_to_convert.
+        output_path (str): The path where the Postman collection will be saved, a name without .json is
+            saved in the out directory.
+        deterministic_ids (bool): Derive the collection IDs from its content instead of generating random ones.
+        normalize_bodies (bool): Parse and re-format JSON request bodies instead of passing them through.
+    """
+    save_postman_collection(load_k6_script(source_file), output_path, deterministic_ids, normalize_bodies)
@@ -0,0 +1,506 @@
+import json
+import logging
+import os
+import re
+from typing import Any, Dict, FrozenSet, Iterator, List, Optional, Tuple
+
+from lxml import etree
+
+from src.helper.placeholder_utils import encode_query
+from src.jmx.jmx_creator import Header, LoadProfile, Origin
+from src.jmx.jmx_reader import extract_http_request_details
+from src.jmx.jmx_stream_reader import CLOSE, OPEN, get_hash_tree, is_enabled, iter_plan_elements
+from src.k6.k6_creator import (
+    HELPERS_JS,
+    INDENT,
+    BodyFile,
+    create_options_js,
+    create_scenario,
+    get_data_file_name,
+    js_object,
+    js_string,
+    resolve_k6_output
+)
+
+logging.basicConfig(level=logging.ERROR)
+
+# Depth of the thread groups and test fragments, counted in enclosing hashTree elements
+CONTAINER_DEPTH = 2
+
+# ConstantThroughputTimer calcMode: the target applies to each thread on its own
+THROUGHPUT_THIS_THREAD_ONLY = 0
+
+# ResponseAssertion test_type bits
+ASSERTION_MATCH = 1
+ASSERTION_CONTAINS = 2
+ASSERTION_NOT = 4
+ASSERTION_EQUALS = 8
+ASSERTION_SUBSTRING = 16
+ASSERTION_OR = 32
+
+# Response field checked by a ResponseAssertion -> JavaScript expression of the field
+ASSERTION_FIELDS = {
+    "Assertion.response_code": "String(r.status)",
+    "Assertion.response_data": "r.body",
+    "Assertion.response_message": "r.status_text"
+}
+
+# Methods whose arguments JMeter sends in the request body instead of the query string
+BODY_METHODS = ("POST", "PUT", "PATCH")
+
+ASSERTION_PATTERNS = etree.XPath("collectionProp[@name='Assertion.test_strings']/stringProp")
+
+# Bodies written to files by create_jmx_file, optionally wrapped in __eval when they hold placeholders
+FILE_TO_STRING = re.compile(r"(\$\{__eval\()?\$\{__FileToString\(((?:[^,\\]|\\.)*),[^)]*\)\}(?(1)\)\})")
+
+
+def resolve_jmx_path(source_file: str) -> str:
+    """
+    Resolves the JMX path, falling back to the file_to_convert directory.
+
+    Args:
+        source_file (str): An existing file path, or a plan name (without .jmx) in file_to_convert.
+
+    Returns:
+        str: The path of the JMX file.
+    """
+    if os.path.exists(source_file):
+        return source_file
+    current_file_dir = os.path.dirname(__file__)
+    return os.path.join(os.path.abspath(os.path.join(current_file_dir, '..', '..')), "file_to_convert",
+                        f"{source_file}.jmx")
+
+
+def parse_number(text: Optional[str], default: int) -> int:
+    """
+    Reads an integer property, properties set with JMeter functions or variables fall back to the default.
+
+    Args:
+        text (Optional[str]): The property value.
+        default (int): The value used when the property is missing or not a number.
+
+    Returns:
+        int: The property value.
+    """
+    try:
+        return int(float(text))
+    except (TypeError, ValueError):
+        return default
+
+
+def read_load_profile(thread_group: etree._Element) -> LoadProfile:
+    """
+    Reads the load generated by a thread group.
+
+    Thread groups looping forever without a duration have no k6 equivalent, they run a single iteration.
+
+    Args:
+        thread_group (etree._Element): The ThreadGroup element.
+
+    Returns:
+        LoadProfile: The threads, ramp-up, duration and loops of the thread group.
+    """
+    threads = parse_number(thread_group.findtext(".//stringProp[@name='ThreadGroup.num_threads']")
+                           or thread_group.findtext(".//intProp[@name='ThreadGroup.num_threads']"), 1)
+    ramp_up = parse_number(thread_group.findtext(".//stringProp[@name='ThreadGroup.ramp_time']")
+                           or thread_group.findtext(".//intProp[@name='ThreadGroup.ramp_time']"), 0)
+    duration = None
+    if thread_group.findtext(".//boolProp[@name='ThreadGroup.scheduler']") == "true":
+        duration = parse_number(thread_group.findtext(".//stringProp[@name='ThreadGroup.duration']"), 0) or None
+    loops = parse_number(thread_group.findtext(".//stringProp[@name='LoopController.loops']")
+                         or thread_group.findtext(".//intProp[@name='LoopController.loops']"), 1)
+    if loops < 0 and duration is None:
+        logging.error(f"Thread group '{thread_group.attrib.get('testname')}' loops forever without a duration, "
+                      f"it runs a single iteration")
+    return LoadProfile(threads=max(threads, 1), ramp_up=ramp_up, duration=duration, loops=max(loops, 1))
+
+
+def read_target_rps(timer: etree._Element, threads: int) -> Optional[float]:
+    """
+    Reads the requests per second targeted by a ConstantThroughputTimer, across all threads.
+
+    Args:
+        timer (etree._Element): The ConstantThroughputTimer element.
+        threads (int): The number of threads of its thread group.
+
+    Returns:
+        Optional[float]: The target, None when it is not a number.
+    """
+    throughput = timer.findtext(".//doubleProp[name='throughput']/value") or \
+        timer.findtext(".//stringProp[@name='throughput']")
+    try:
+        per_minute = float(throughput)
+    except (TypeError, ValueError):
+        return None
+    if parse_number(timer.findtext(".//intProp[@name='calcMode']"), 0) == THROUGHPUT_THIS_THREAD_ONLY:
+        per_minute *= threads
+    return per_minute / 60 if per_minute > 0 else None
+
+
+def read_headers(header_manager: etree._Element) -> List[Header]:
+    """
+    Reads the headers of a HeaderManager.
+
+    Args:
+        header_manager (etree._Element): The HeaderManager element.
+
+    Returns:
+        List[Header]: The (name, value) pairs.
+    """
+    return [(header.findtext("stringProp[@name='Header.name']", ""),
+             header.findtext("stringProp[@name='Header.value']", ""))
+            for header in header_manager.iterfind(".//elementProp[@elementType='Header']")]
+
+
+def read_origin(element: etree._Element) -> Origin:
+    """
+    Reads the protocol, domain and port of a sampler or of HTTP Request Defaults.
+
+    Args:
+        element (etree._Element): An HTTPSamplerProxy or ConfigTestElement element.
+
+    Returns:
+        Origin: The (protocol, domain, port), empty when not set.
+    """
+    return tuple(element.findtext(f"stringProp[@name='HTTPSampler.{name}']", "").strip()
+                 for name in ("protocol", "domain", "port"))
+
+
+def merge_origin(inherited: Origin, own: Origin) -> Origin:
+    """
+    Overrides the inherited origin with the parts set on an element, like JMeter does with its defaults.
+
+    Args:
+        inherited (Origin): The origin of the enclosing HTTP Request Defaults.
+        own (Origin): The origin set on the element.
+
+    Returns:
+        Origin: The merged origin.
+    """
+    return tuple(own_part or inherited_part for inherited_part, own_part in zip(inherited, own))
+
+
+def build_url(path: str, origin: Origin) -> str:
+    """
+    Builds the URL of a sampler from its path and origin.
+
+    Args:
+        path (str): The sampler path, possibly a full URL or starting with a variable such as ${tests_url}.
+        origin (Origin): The (protocol, domain, port) of the sampler.
+
+    Returns:
+        str: The URL.
+    """
+    protocol, domain, port = origin
+    if not domain or path.startswith(("http://", "https://")):
+        return path
+    host = f"{domain}:{port}" if port else domain
+    return f"{protocol or 'http'}://{host}{path if path.startswith('/') else '/' + path}"
+
+
+def read_check(assertion: etree._Element) -> Optional[Tuple[str, str]]:
+    """
+    Converts a ResponseAssertion on the response code, body or message into a k6 check.
+
+    Args:
+        assertion (etree._Element): The ResponseAssertion element.
+
+    Returns:
+        Optional[Tuple[str, str]]: The check name and its JavaScript condition on the response r, None for
+            assertions on other fields.
+    """
+    field = ASSERTION_FIELDS.get(assertion.findtext("stringProp[@name='Assertion.test_field']", ""))
+    patterns = [pattern.text or "" for pattern in ASSERTION_PATTERNS(assertion)]
+    if field is None or not patterns:
+        return None
+
+    test_type = parse_number(assertion.findtext("intProp[@name='Assertion.test_type']"), ASSERTION_SUBSTRING)
+    conditions = []
+    for pattern in patterns:
+        literal = json.dumps(pattern)
+        if test_type & ASSERTION_EQUALS:
+            conditions.append(f"{field} === {literal}")
+        elif test_type & ASSERTION_SUBSTRING:
+            conditions.append(f"{field}.includes({literal})")
+        elif test_type & ASSERTION_MATCH:
+            conditions.append(f"new RegExp({json.dumps('^(?:' + pattern + ')$')}).test({field})")
+        else:  # ASSERTION_CONTAINS, a regular expression found anywhere in the field
+            conditions.append(f"new RegExp({literal}).test({field})")
+    condition = (" || " if test_type & ASSERTION_OR else " && ").join(conditions)
+    if test_type & ASSERTION_NOT:
+        condition = f"!({condition})"
+    return assertion.attrib.get("testname", "Response Assertion"), condition
+
+
+def read_external_body(body: str, base_dir: str) -> Optional[str]:
+    """
+    Reads a body written to its own file by create_jmx_file and referenced with ${__FileToString()}.
+
+    Args:
+        body (str): The body of the sampler.
+        base_dir (str): The directory of the JMX file, file names are relative to it.
+
+    Returns:
+        Optional[str]: The content of the file, None when the body is not a file reference.
+    """
+    match = FILE_TO_STRING.fullmatch(body.strip())
+    if not match:
+        return None
+    file_path = os.path.join(base_dir, re.sub(r"\\(.)", r"\1", match.group(2)))
+    with open(file_path, 'r', encoding='utf-8') as body_file:
+        return body_file.read()
+
+
+class JmxScriptWriter:
+    """
+    Converts the elements streamed by iter_plan_elements into a k6 script.
+
+    Thread groups become exported functions run by their own scenario, test fragments become functions run
+    by the default function when the plan has no thread group, and controllers become group() blocks. Like
+    in JMeter, headers, HTTP Request Defaults and response assertions apply to their whole scope, but as the
+    plan is read in a single pass, only to the elements that follow them.
+    """
+
+    def __init__(self, body_file: BodyFile, base_dir: str):
+        self.body_file = body_file
+        self.base_dir = base_dir
+        self.scopes: List[Dict[str, Any]] = [{
+            'headers': [], 'headers_js': None, 'origin': ("", "", ""), 'checks': [], 'indent': "", 'close': ""
+        }]
+        self.scenarios: Dict[str, Dict[str, Any]] = {}
+        self.fragments: List[str] = []
+        self.header_count = 0
+
+    def iter_script(self, file_path: str) -> Iterator[str]:
+        yield "import http from 'k6/http';\nimport { check, group } from 'k6';\nimport { SharedArray } from 'k6/data';\n\n"
+        yield HELPERS_JS
+        yield from self.iter_file(file_path, frozenset({os.path.abspath(file_path)}))
+        yield from self.iter_footer()
+
+    def iter_file(self, file_path: str, visited: FrozenSet[str], included: bool = False) -> Iterator[str]:
+        # Elements of an included file are read as children of the IncludeController, without its test plan
+        # and test fragment
+        skip_depth = None
+        for event, element, depth in iter_plan_elements(file_path):
+            if skip_depth is not None:
+                if event == CLOSE and depth == skip_depth:
+                    skip_depth = None
+                continue
+            if included and depth <= CONTAINER_DEPTH:
+                continue
+            if not is_enabled(element):
+                if event == OPEN:
+                    skip_depth = depth
+                continue
+            if event == OPEN:
+                yield self.open_container(element, depth)
+            elif event == CLOSE:
+                yield self.close_container(element, depth)
+            else:
+                yield from self.add_element(element, visited)
+
+    def open_scope(self, close: str, indent: Optional[str] = None, **values: Any) -> None:
+        # Headers, defaults and assertions are inherited, the thread group settings are not
+        parent = self.scopes[-1]
+        values.setdefault('repeat', parent.get('repeat', 1))
+        self.scopes.append(dict(values, headers=parent['headers'], headers_js=parent['headers_js'],
+                                origin=parent['origin'], checks=list(parent['checks']), close=close,
+                                indent=parent['indent'] + INDENT if indent is None else indent))
+
+    def open_container(self, element: etree._Element, depth: int) -> str:
+        if element.tag == "TestPlan":
+            return ""
+        name = element.attrib.get("testname", "")
+        if depth == CONTAINER_DEPTH and element.tag.endswith("ThreadGroup"):
+            function_name = f"thread_group_{len(self.scenarios) + 1}"
+            self.scenarios[function_name] = {}
+            self.open_scope("}\n", indent=INDENT, function_name=function_name,
+                            load_profile=read_load_profile(element), samplers=0, repeat=1)
+            return f"\n// {name}\nexport function {function_name}() {{\n"
+        if depth == CONTAINER_DEPTH:
+            function_name = f"test_fragment_{len(self.fragments) + 1}"
+            self.fragments.append(function_name)
+            self.open_scope("}\n", indent=INDENT, repeat=1)
+            return f"\n// {name}\nfunction {function_name}() {{\n"
+
+        indent = self.scopes[-1]['indent']
+        loops = parse_number(element.findtext("stringProp[@name='LoopController.loops']"), -1)
+        if element.tag == "LoopController" and loops >= 0:
+            self.open_scope(f"{indent}}}\n", repeat=self.scopes[-1]['repeat'] * loops)
+            return f"{indent}for (let iteration = 0; iteration < {loops}; iteration++) {{\n"
+        self.open_scope(f"{indent}}});\n")
+        return f"{indent}group({json.dumps(name)}, function () {{\n"
+
+    def close_container(self, element: etree._Element, depth: int) -> str:
+        if element.tag == "TestPlan":
+            return ""
+        scope = self.scopes.pop()
+        if 'load_profile' in scope:
+            # The ConstantThroughputTimer paces samples, the k6 arrival rate iterations of the thread group
+            self.scenarios[scope['function_name']] = dict(create_scenario(scope['load_profile'], scope['samplers']),
+                                                          exec=scope['function_name'])
+        return scope['close']
+
+    def add_element(self, element: etree._Element, visited: FrozenSet[str]) -> Iterator[str]:
+        scope = self.scopes[-1]
+        if element.tag == "HTTPSamplerProxy":
+            for enclosing in reversed(self.scopes):
+                if 'load_profile' in enclosing:
+                    enclosing['samplers'] += scope['repeat']
+                    break
+            yield self.create_sampler_js(element)
+        elif element.tag == "HeaderManager":
+            yield self.add_headers(read_headers(element))
+        elif element.tag == "ConfigTestElement":
+            scope['origin'] = merge_origin(scope['origin'], read_origin(element))
+        elif element.tag == "ResponseAssertion":
+            response_check = read_check(element)
+            if response_check:
+                scope['checks'].append(response_check)
+        elif element.tag == "ConstantThroughputTimer":
+            for enclosing in reversed(self.scopes):
+                if 'load_profile' in enclosing:
+                    target_rps = read_target_rps(element, enclosing['load_profile'].threads)
+                    enclosing['load_profile'] = enclosing['load_profile']._replace(target_rps=target_rps)
+                    break
+        elif element.tag == "IncludeController":
+            yield from self.include(element, visited)
+        elif element.tag == "ModuleController":
+            logging.error(f"Skipping Module Controller '{element.attrib.get('testname')}', convert the plan "
+                          f"without deduplication")
+
+    def add_headers(self, headers: List[Header]) -> str:
+        scope = self.scopes[-1]
+        names = {name.lower() for name, _ in headers}
+        scope['headers'] = [header for header in scope['headers'] if header[0].lower() not in names] + headers
+        self.header_count += 1
+        scope['headers_js'] = f"headers{self.header_count}"
+        return f"{scope['indent']}const {scope['headers_js']} = {json.dumps(dict(scope['headers']))};\n"
+
+    def include(self, include: etree._Element, visited: FrozenSet[str]) -> Iterator[str]:
+        include_path = include.findtext(".//stringProp[@name='IncludeController.includepath']", "")
+        file_path = os.path.abspath(os.path.join(self.base_dir, include_path))
+        if not include_path or file_path in visited:
+            logging.error(f"Skipping include of '{include_path}': missing path or include cycle")
+            return
+        # The included elements run in place, in a scope of their own for their headers and defaults
+        self.open_scope("", indent=self.scopes[-1]['indent'])
+        yield from self.iter_file(file_path, visited | {file_path}, included=True)
+        self.scopes.pop()
+
+    def create_body_js(self, sampler: etree._Element, arguments: Dict[str, str], method: str) -> Tuple[str, str]:
+        if not arguments:
+            return "null", ""
+        if sampler.findtext(".//boolProp[@name='HTTPSampler.postBodyRaw']") == "true":
+            body = next(iter(arguments.values()))
+            external_body = read_external_body(body, self.base_dir)
+            if external_body is not None:
+                body = external_body
+            body_js = f"BODIES[{self.body_file.store(body)}]"
+            return (f"fill({body_js})" if "${" in body else body_js), ""
+        if method.upper() in BODY_METHODS:
+            return js_object(list(arguments.items())), ""
+        return "null", encode_query(arguments.items())
+
+    def create_sampler_js(self, sampler: etree._Element) -> str:
+        scope = self.scopes[-1]
+        details = extract_http_request_details(sampler)
+        hash_tree = get_hash_tree(sampler)
+        children = [child for child in hash_tree if isinstance(child.tag, str) and is_enabled(child)] \
+            if hash_tree is not None else []
+
+        body_js, query = self.create_body_js(sampler, details['arguments'], details['method'])
+        url = build_url(details['path'], merge_origin(scope['origin'], read_origin(sampler)))
+        if query:
+            url += ("&" if "?" in url else "?") + query
+
+        own_headers = [header for child in children if child.tag == "HeaderManager" for header in read_headers(child)]
+        own_names = {name.lower() for name, _ in own_headers}
+        headers = [header for header in scope['headers'] if header[0].lower() not in own_names] + own_headers
+        params = []
+        if own_headers:
+            headers_js = json.dumps(dict(own_headers))
+            if scope['headers_js']:
+                headers_js = f"Object.assign({{}}, {scope['headers_js']}, {headers_js})"
+            params.append(f"headers: {wrap_headers(headers_js, headers)}")
+        elif scope['headers_js']:
+            params.append(f"headers: {wrap_headers(scope['headers_js'], headers)}")
+        params.append(f"tags: {{ name: {json.dumps(details['name'])} }}")
+
+        request_js = (f"http.request({json.dumps(details['method'])}, {js_string(url)}, {body_js}, "
+                      f"{{ {', '.join(params)} }})")
+        checks = scope['checks'] + [response_check for child in children if child.tag == "ResponseAssertion"
+                                    for response_check in [read_check(child)] if response_check]
+        if not checks:
+            return f"{scope['indent']}{request_js};\n"
+        checks_js = ", ".join(f"{json.dumps(name)}: (r) => {condition}" for name, condition in checks)
+        return f"{scope['indent']}check({request_js}, {{ {checks_js} }});\n"
+
+    def iter_footer(self) -> Iterator[str]:
+        scenarios = {name: scenario for name, scenario in self.scenarios.items() if scenario}
+        if scenarios:
+            yield "\n" + create_options_js(scenarios)
+        else:
+            calls = "".join(f"{INDENT}{function_name}();\n" for function_name in self.fragments)
+            yield f"\nexport default function () {{\n{calls}}}\n"
+        if self.body_file.count:
+            yield (f"\nconst BODIES = new SharedArray('bodies', function () {{\n"
+                   f"{INDENT}return JSON.parse(open({json.dumps('./' + os.path.basename(self.body_file.path))}));\n"
+                   f"}});\n")
+
+
+def wrap_headers(headers_js: str, headers: List[Header]) -> str:
+    """
+    Fills the placeholders of the headers at runtime when any of them has one.
+
+    Args:
+        headers_js (str): The JavaScript expression of the headers.
+        headers (List[Header]): The headers it evaluates to.
+
+    Returns:
+        str: The JavaScript expression.
+    """
+    return f"fillHeaders({headers_js})" if any("${" in value for _, value in headers) else headers_js
+
+
+def iter_jmx_k6_script(file_path: str, body_file: BodyFile) -> Iterator[str]:
+    """
+    Generates a k6 ES module script from a JMX plan in a single streaming pass.
+
+    Thread groups map to scenarios (ramping-vus, or constant-arrival-rate with a Constant Throughput Timer),
+    samplers to http.request() calls and response assertions to check()s. The plan is never held in memory
+    as a whole, so the options and the BODIES SharedArray, only known at the end, are declared after the
+    functions using them, which only run once the script is loaded.
+
+    Args:
+        file_path (str): Path to the JMX file, IncludeControllers are followed.
+        body_file (BodyFile): Receives the raw bodies, loaded into the BODIES SharedArray.
+
+    Yields:
+        str: Consecutive fragments of the script.
+    """
+    base_dir = os.path.dirname(os.path.abspath(file_path))
+    yield from JmxScriptWriter(body_file, base_dir).iter_script(file_path)
+
+
+def create_k6_script_from_jmx(source_file: str, k6_file: str) -> None:
+    """
+    Creates a k6 script based on a JMX plan, with its raw bodies in a "<name>.bodies.json" data file.
+
+    Args:
+        source_file (str): The source file (JMX plan) to read from.
+        k6_file (str): The file path where the script should be saved.
+    """
+    jmx_path = resolve_jmx_path(source_file)
+    output_path, file_name = resolve_k6_output(k6_file)
+    os.makedirs(output_path, exist_ok=True)
+
+    body_file = BodyFile(os.path.join(output_path, get_data_file_name(file_name)))
+    try:
+        with open(os.path.join(output_path, file_name), 'w', encoding='utf-8') as script_file:
+            script_file.writelines(iter_jmx_k6_script(jmx_path, body_file))
+    except etree.XMLSyntaxError as e:
+        logging.error(f"Error parsing the JMX file: {e}")
+        raise
+    finally:
+        body_file.close()
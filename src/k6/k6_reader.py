@@ -0,0 +1,764 @@
+import json
+import logging
+import math
+import os
+import re
+from collections import deque
+from typing import Any, Deque, Dict, Iterator, List, NamedTuple, Optional, Set
+
+from src.helper.compression import open_input, strip_compression_extension
+from src.jmx.jmx_creator import RAW_BODY, URLENCODED_BODY, LoadProfile
+from src.k6.k6_creator import get_data_file_name
+from src.k6.k6_tokenizer import NAME, NUMBER, PUNCTUATOR, STRING, TEMPLATE, Token, get_line, iter_tokens
+from src.postman.postman_json_reader import NO_BODY_CONTENT, extract_query_params
+
+logging.basicConfig(level=logging.ERROR)
+
+# k6/http functions sending a single request -> HTTP method, None when it is their first argument
+HTTP_FUNCTIONS = {
+    "http.get": "GET",
+    "http.head": "HEAD",
+    "http.post": "POST",
+    "http.put": "PUT",
+    "http.patch": "PATCH",
+    "http.del": "DELETE",
+    "http.options": "OPTIONS",
+    "http.request": None,
+    "http.asyncRequest": None
+}
+# http functions without a body argument
+BODILESS_FUNCTIONS = ("http.get", "http.head")
+
+# Placeholder helpers of the scripts written by the k6 creators, they return their first argument as far as the
+# request structure is concerned
+PASS_THROUGH_FUNCTIONS = ("fill", "fillHeaders")
+# The array the k6 creators load the raw bodies into, from the "<name>.bodies.json" data file of the script
+BODIES_ARRAY = "BODIES"
+
+LITERAL_NAMES = {"true": True, "false": False, "null": None, "undefined": None}
+BRACKETS = {"(": ")", "[": "]", "{": "}"}
+# Punctuators following a complete argument, array element or property value
+VALUE_ENDS = frozenset((",", ")", "]", "}", ";"))
+# Returned by the readers when the tokens are not a literal or a call they know
+NOT_READ = object()
+
+# A response of a batch held in a variable, such as responses[0]
+RESPONSE_INDEX_PATTERN = re.compile(r"^[\w$]+\s*\[\s*(\d+)\s*\]$")
+# Template substitution of an environment variable, kept as a variable of the same name
+ENV_PATTERN = re.compile(r"^__ENV\.([\w$]+)$")
+# check() condition comparing the response status
+STATUS_CHECK_PATTERN = re.compile(r"\.status\)?\s*===?\s*[\"']?(\d{3})\b")
+# k6 duration string such as "1m30s"
+DURATION_PATTERN = re.compile(r"(\d+(?:\.\d+)?)(ms|s|m|h|d)")
+DURATION_UNITS = {"ms": 0.001, "s": 1, "m": 60, "h": 3600, "d": 86400}
+
+
+class Expression(NamedTuple):
+    """A JavaScript expression the reader does not evaluate, kept as its source text."""
+    text: str
+
+
+class Responses(NamedTuple):
+    """The requests sent by an http call, several for http.batch."""
+    requests: List[Dict[str, Any]]
+
+
+def to_text(value: Any) -> str:
+    """
+    Converts a value read from the script to the text used in the test plan, expressions become ${...} placeholders.
+
+    Args:
+        value (Any): A JavaScript value read from the script.
+
+    Returns:
+        str: The text of the value.
+    """
+    if isinstance(value, str):
+        return value
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (int, float)):
+        return format_number(value)
+    if value is None:
+        return ""
+    if isinstance(value, (dict, list)):
+        return json.dumps(to_json(value))
+    if isinstance(value, Expression):
+        return f"${{{value.text}}}"
+    return ""
+
+
+def to_json(value: Any) -> Any:
+    """
+    Converts a value read from the script to the value serialized by JSON.stringify, expressions become placeholders.
+
+    Args:
+        value (Any): A JavaScript value read from the script.
+
+    Returns:
+        Any: A value json.dumps can serialize.
+    """
+    if isinstance(value, dict):
+        return {str(key): to_json(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [to_json(item) for item in value]
+    if value is None or isinstance(value, (str, bool, int, float)):
+        return value
+    return to_text(value)
+
+
+def is_number(value: Any) -> bool:
+    """
+    Tells whether a value read from the script is a number, booleans excluded.
+
+    Args:
+        value (Any): A JavaScript value read from the script.
+
+    Returns:
+        bool: True for ints and floats.
+    """
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def format_number(value: float) -> str:
+    """
+    Formats a number the way JavaScript converts it to a string, without a trailing .0.
+
+    Args:
+        value (float): The number.
+
+    Returns:
+        str: The number text.
+    """
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+def parse_number(text: str) -> Any:
+    """
+    Converts a JavaScript number literal.
+
+    Args:
+        text (str): The literal, in any of the JavaScript notations.
+
+    Returns:
+        Any: An int or a float, an Expression for BigInt literals.
+    """
+    text = text.replace("_", "")
+    try:
+        return int(text, 0)
+    except ValueError:
+        pass
+    try:
+        return float(text)
+    except ValueError:
+        return Expression(text)
+
+
+def parse_duration(value: Any) -> Optional[int]:
+    """
+    Converts a k6 duration to whole seconds, rounded up.
+
+    Args:
+        value (Any): A duration string such as "1m30s", or a number of milliseconds.
+
+    Returns:
+        Optional[int]: The number of seconds, None when the value is not a duration.
+    """
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return math.ceil(value / 1000)
+    if isinstance(value, str) and value and DURATION_PATTERN.sub("", value) == "":
+        seconds = sum(float(amount) * DURATION_UNITS[unit] for amount, unit in DURATION_PATTERN.findall(value))
+        return math.ceil(seconds)
+    return None
+
+
+def get_count(value: Any, default: int) -> int:
+    """
+    Reads a number of virtual users or iterations, values set from expressions fall back to the default.
+
+    Args:
+        value (Any): The option value.
+        default (int): The value used when the option is missing or not a number.
+
+    Returns:
+        int: The count.
+    """
+    if is_number(value):
+        return int(value)
+    return default
+
+
+def read_load_profile(options: Any) -> Optional[LoadProfile]:
+    """
+    Converts the options of a k6 script to the load profile of a ThreadGroup.
+
+    The first scenario is converted, a ThreadGroup runs a single load profile. Without scenarios, the vus,
+    duration, iterations and stages shortcuts are read the way k6 reads them.
+
+    Args:
+        options (Any): The options object of the script.
+
+    Returns:
+        Optional[LoadProfile]: The load profile, None when the options set none.
+    """
+    if not isinstance(options, dict):
+        return None
+    reuse_connections = options.get("noConnectionReuse") is not True and options.get("noVUConnectionReuse") is not True
+
+    scenarios = options.get("scenarios")
+    if isinstance(scenarios, dict) and scenarios:
+        name, scenario = next(iter(scenarios.items()))
+        if len(scenarios) > 1:
+            logging.warning(f"The k6 script has {len(scenarios)} scenarios, only '{name}' is converted.")
+        if not isinstance(scenario, dict):
+            return None
+        executor = scenario.get("executor")
+    elif any(key in options for key in ("vus", "duration", "iterations", "stages")):
+        scenario = options
+        if "stages" in options:
+            executor = "ramping-vus"
+        elif "iterations" in options:
+            executor = "shared-iterations"
+        else:
+            executor = "constant-vus"
+    else:
+        return None
+
+    vus = get_count(scenario.get("vus"), 1)
+    duration = parse_duration(scenario.get("duration"))
+    stages = [stage for stage in scenario.get("stages") or [] if isinstance(stage, dict)]
+    stage_durations = [parse_duration(stage.get("duration")) or 0 for stage in stages]
+    time_unit = parse_duration(scenario.get("timeUnit")) or 1
+
+    if executor in ("constant-vus", "externally-controlled"):
+        profile = LoadProfile(threads=vus, ramp_up=0, duration=duration)
+    elif executor == "ramping-vus":
+        targets = [get_count(stage.get("target"), 0) for stage in stages]
+        threads = max(targets + [get_count(scenario.get("startVUs"), 1)])
+        # The threads are ramped up over the stages leading to the highest target
+        ramp_up = sum(stage_durations[:targets.index(threads) + 1]) if threads in targets else 0
+        profile = LoadProfile(threads=threads, ramp_up=ramp_up, duration=sum(stage_durations) or None)
+    elif executor in ("constant-arrival-rate", "ramping-arrival-rate"):
+        if executor == "constant-arrival-rate":
+            rate = get_count(scenario.get("rate"), 1)
+        else:
+            rate = max([get_count(stage.get("target"), 0) for stage in stages] +
+                       [get_count(scenario.get("startRate"), 0)])
+            duration = sum(stage_durations) or None
+        threads = get_count(scenario.get("maxVUs"), get_count(scenario.get("preAllocatedVUs"), 1))
+        profile = LoadProfile(threads=threads, ramp_up=0, duration=duration, target_rps=rate / time_unit)
+    elif executor == "per-vu-iterations":
+        profile = LoadProfile(threads=vus, ramp_up=0, loops=get_count(scenario.get("iterations"), 1))
+    elif executor == "shared-iterations":
+        iterations = get_count(scenario.get("iterations"), 1)
+        profile = LoadProfile(threads=vus, ramp_up=0, loops=max(1, math.ceil(iterations / max(vus, 1))))
+    else:
+        logging.error(f"Unsupported k6 executor '{executor}', the requests are converted without a load profile.")
+        return None
+    return profile._replace(reuse_connections=reuse_connections)
+
+
+def get_check_script(condition: Any) -> str:
+    """
+    Converts a check() condition to the script of a Postman test.
+
+    Args:
+        condition (Any): The condition, usually a function of the response kept as an Expression.
+
+    Returns:
+        str: pm.response.to.have.status(...) for a status comparison, the JavaScript source otherwise.
+    """
+    text = condition.text if isinstance(condition, Expression) else to_text(condition)
+    status = STATUS_CHECK_PATTERN.search(text)
+    if status:
+        return f"pm.response.to.have.status({status.group(1)});"
+    return text
+
+
+class K6ScriptReader:
+    """
+    Extracts the requests of a k6 script into the test plan structure read from Postman collections.
+
+    The script is read token by token in a single pass without running it: group() calls become controllers,
+    http calls requests and check() conditions tests, and the options object gives the load profile. Only the
+    literal arguments of these calls are read, strings, numbers, templates and the arrays and objects of them.
+    Anything else, such as a variable, an operator or the call of another function, is not followed and is kept
+    as a ${...} placeholder of its source text, logged once. The raw bodies the k6 creators store in the BODIES
+    array are taken from the data file of the script.
+    """
+
+    def __init__(self, source: str, bodies: Optional[List[Any]] = None):
+        """
+        Args:
+            source (str): The JavaScript source.
+            bodies (Optional[List[Any]]): The content of the data file loaded into the BODIES array.
+        """
+        self.source = source
+        self.bodies = bodies or []
+        self.tokens: Iterator[Token] = iter_tokens(source)
+        # The next token, the tokens read ahead of it and the last token read
+        self.token: Optional[Token] = None
+        self.buffer: Deque[Token] = deque()
+        self.previous: Optional[Token] = None
+        self.root: Dict[str, Any] = {"id": None, "children": []}
+        self.controllers: List[Dict[str, Any]] = [self.root]
+        self.last_requests: List[Dict[str, Any]] = []
+        self.request_count = 0
+        self.options: Any = None
+        self.logged: Set[str] = set()
+        self.id_counter = 0
+        self.advance()
+
+    # Token stream
+
+    def advance(self) -> None:
+        self.token = self.buffer.popleft() if self.buffer else next(self.tokens, None)
+
+    def peek(self, offset: int) -> Optional[Token]:
+        while len(self.buffer) < offset:
+            token = next(self.tokens, None)
+            if token is None:
+                return None
+            self.buffer.append(token)
+        return self.buffer[offset - 1]
+
+    def next(self) -> Token:
+        token = self.token
+        if token is None:
+            raise ValueError("Unexpected end of the k6 script")
+        self.previous = token
+        self.advance()
+        return token
+
+    def is_next(self, value: str, kind: str = PUNCTUATOR, offset: int = 0) -> bool:
+        token = self.token if offset == 0 else self.peek(offset)
+        return token is not None and token.value == value and token.kind == kind
+
+    def accept(self, value: str, kind: str = PUNCTUATOR) -> bool:
+        if self.is_next(value, kind):
+            self.next()
+            return True
+        return False
+
+    def expect(self, value: str) -> None:
+        token = self.next()
+        if token.kind != PUNCTUATOR or token.value != value:
+            raise ValueError(f"Expected '{value}' but found '{token.value}' at line {get_line(self.source, token.start)}")
+
+    def start_offset(self) -> int:
+        return self.token.start if self.token else len(self.source)
+
+    def text_from(self, start: int) -> str:
+        return self.source[start:self.previous.end] if self.previous and self.previous.end > start else ""
+
+    # Test plan structure
+
+    def next_id(self) -> str:
+        self.id_counter += 1
+        return f"controller_{self.id_counter}"
+
+    def open_controller(self, name: str) -> None:
+        parent = self.controllers[-1]
+        controller = {
+            "id": self.next_id(),
+            "name": name.replace("&", "and"),
+            "type": "generic_controller" if parent is self.root else "child_generic_controller",
+            "parent": parent["id"],
+            "children": []
+        }
+        parent["children"].append(controller)
+        self.controllers.append(controller)
+
+    def log_expression(self, expression: Any, kept: bool = True) -> None:
+        """Logs an expression of the script the reader does not follow, once per expression."""
+        if not isinstance(expression, Expression) or expression.text in self.logged:
+            return
+        self.logged.add(expression.text)
+        outcome = f"it is kept as the ${{{expression.text}}} placeholder" if kept else "it is left out"
+        logging.warning(f"'{expression.text}' of the k6 script is not followed, {outcome}.")
+
+    def log_placeholders(self, value: Any) -> None:
+        """Logs the expressions of a value the test plan keeps as ${...} placeholders."""
+        if isinstance(value, dict):
+            for item in value.values():
+                self.log_placeholders(item)
+        elif isinstance(value, list):
+            for item in value:
+                self.log_placeholders(item)
+        else:
+            self.log_expression(value)
+
+    def add_request(self, method: Any, url: Any, body: Any, params: Any) -> Dict[str, Any]:
+        self.log_placeholders([method, url, body])
+        if not isinstance(params, dict):
+            self.log_expression(params, kept=False)
+            params = {}
+        tags = params.get("tags")
+        headers = params.get("headers")
+        if isinstance(headers, dict):
+            self.log_placeholders(headers)
+        else:
+            self.log_expression(headers, kept=False)
+        raw_url = to_text(url)
+        name = tags.get("name") if isinstance(tags, dict) and tags.get("name") is not None else raw_url
+        self.log_placeholders(name)
+
+        if isinstance(body, dict):
+            body_mode = URLENCODED_BODY
+            body = [{"key": key, "value": to_text(value)} for key, value in body.items()]
+        elif body is None:
+            body_mode = None
+            body = NO_BODY_CONTENT
+        else:
+            body_mode = RAW_BODY
+            body = to_text(body)
+
+        request = {
+            "id": self.next_id(),
+            "name": to_text(name).replace("&", "and"),
+            "type": "request",
+            "parent": self.controllers[-1]["id"],
+            "method": to_text(method).upper() or "GET",
+            "raw_url": raw_url,
+            "queryParams": extract_query_params(raw_url),
+            "body": body,
+            "body_mode": body_mode,
+            "headers": [{"key": key, "value": to_text(value)} for key, value in headers.items()]
+            if isinstance(headers, dict) else [],
+            "tests": [],
+            "variables": []
+        }
+        self.controllers[-1]["children"].append(request)
+        self.request_count += 1
+        return request
+
+    def add_batch(self, requests: Any) -> Responses:
+        if isinstance(requests, dict):
+            # Named requests, the names tag the requests not tagged otherwise
+            items = []
+            for name, item in requests.items():
+                if isinstance(item, dict):
+                    params = item.get("params") if isinstance(item.get("params"), dict) else {}
+                    tags = params.get("tags") if isinstance(params.get("tags"), dict) else {}
+                    item = dict(item, params=dict(params, tags=dict({"name": name}, **tags)))
+                items.append(item)
+        elif isinstance(requests, list):
+            items = requests
+        else:
+            self.log_expression(requests, kept=False)
+            return Responses([])
+
+        sent = []
+        for item in items:
+            if isinstance(item, list) and item:
+                method, url, body, params = (item + [None, None, None])[:4]
+            elif isinstance(item, dict):
+                method, url, body, params = (item.get("method", "GET"), item.get("url"), item.get("body"),
+                                             item.get("params"))
+            else:
+                method, url, body, params = "GET", item, None, None
+            sent.append(self.add_request(method, url, body, params))
+        return Responses(sent)
+
+    def add_checks(self, target: Any, checks: Any) -> None:
+        # Checks of a response held in a variable apply to the requests of the last http call, or to one of them
+        # for an index such as responses[0]
+        requests = target.requests if isinstance(target, Responses) else self.last_requests
+        index = RESPONSE_INDEX_PATTERN.match(target.text) if isinstance(target, Expression) else None
+        if index and int(index.group(1)) < len(requests):
+            requests = [requests[int(index.group(1))]]
+        if not isinstance(checks, dict):
+            return
+        for name, condition in checks.items():
+            for request in requests:
+                request["tests"].append({"name": name, "script": get_check_script(condition)})
+
+    # Tokens
+
+    def read_program(self) -> Dict[str, Any]:
+        self.read_tokens()
+        if self.token is not None:
+            raise ValueError(f"Unbalanced '{self.token.value}' at line {get_line(self.source, self.token.start)}")
+        return self.root
+
+    def read_tokens(self, in_value: bool = False) -> None:
+        """
+        Reads the tokens up to the closing bracket enclosing them, left to the caller, or the end of the script,
+        reading the calls the reader knows on the way. In a value, a comma or semicolon outside brackets ends it.
+        """
+        closing: List[str] = []
+        while self.token is not None:
+            token = self.token
+            if token.kind != PUNCTUATOR:
+                if token.kind != NAME or self.read_known() is NOT_READ:
+                    self.next()
+                continue
+            if token.value in BRACKETS:
+                closing.append(BRACKETS[token.value])
+            elif token.value in (")", "]", "}"):
+                if not closing:
+                    return
+                if closing.pop() != token.value:
+                    raise ValueError(f"Unbalanced '{token.value}' at line {get_line(self.source, token.start)}")
+            elif in_value and not closing and token.value in (",", ";"):
+                return
+            self.next()
+        if closing:
+            raise ValueError("Unexpected end of the k6 script")
+
+    def read_known(self) -> Any:
+        """
+        Reads the http, group, check and placeholder helper call or the options declaration starting at the
+        current name token.
+
+        Returns:
+            Any: The responses of an http call, the first argument of a helper, NOT_READ for any other tokens.
+        """
+        previous = self.previous
+        if previous is not None and (previous.kind == PUNCTUATOR and previous.value in (".", "?.") or
+                                     previous.kind == NAME and previous.value == "function"):
+            # A property or a function declaration of the same name
+            return NOT_READ
+        name = self.token.value
+        if name == "options" and self.is_next("=", offset=1) and previous is not None and \
+                previous.kind == NAME and previous.value in ("const", "let", "var"):
+            self.next()
+            self.next()
+            options = self.read_literal()
+            if options is NOT_READ:
+                logging.warning("The options of the k6 script are not an object literal, they are left out.")
+            else:
+                self.options = options
+            return None
+        if name == "http" and self.is_next(".", offset=1) and self.is_next("(", offset=3):
+            name = f"http.{self.peek(2).value}"
+            if name not in HTTP_FUNCTIONS and name != "http.batch":
+                return NOT_READ
+            self.next()
+            self.next()
+        elif name not in ("group", "check") + PASS_THROUGH_FUNCTIONS or not self.is_next("(", offset=1):
+            return NOT_READ
+        self.next()
+        self.expect("(")
+
+        if name == "group":
+            # The requests sent by the group function belong to the group controller
+            group_name = self.read_value() if not self.is_next(")") else "group"
+            self.log_placeholders(group_name)
+            self.open_controller(to_text(group_name))
+            if self.accept(","):
+                self.read_tokens()
+            self.expect(")")
+            self.controllers.pop()
+            return None
+
+        arguments = self.read_arguments()
+        first = arguments[0] if arguments else None
+        if name in PASS_THROUGH_FUNCTIONS:
+            return first
+        if name == "check":
+            self.add_checks(first, arguments[1] if len(arguments) > 1 else None)
+            return None
+        if name == "http.batch":
+            responses = self.add_batch(first)
+        else:
+            method = HTTP_FUNCTIONS[name]
+            if method is None:
+                method, arguments = first, arguments[1:]
+            url, body, params = (arguments + [None, None, None])[:3]
+            if name in BODILESS_FUNCTIONS:
+                body, params = None, body
+            responses = Responses([self.add_request(method, url, body, params)])
+        self.last_requests = responses.requests
+        return responses
+
+    # Values
+
+    def read_arguments(self) -> List[Any]:
+        """Reads call arguments up to the closing parenthesis, the opening parenthesis is already read."""
+        arguments = []
+        while not self.accept(")"):
+            arguments.append(self.read_value())
+            if not self.accept(","):
+                self.expect(")")
+                break
+        return arguments
+
+    def read_value(self) -> Any:
+        """Reads an argument, an array element or a property value, an Expression when it is not a literal."""
+        start = self.start_offset()
+        value = self.read_literal()
+        if value is NOT_READ or self.token is not None and not (self.token.kind == PUNCTUATOR and
+                                                                self.token.value in VALUE_ENDS):
+            self.read_tokens(in_value=True)
+            value = Expression(self.text_from(start))
+        return value
+
+    def read_literal(self) -> Any:
+        """Reads a literal, an environment variable, a body of the BODIES array or a known call."""
+        token = self.token
+        if token is None:
+            return NOT_READ
+        if token.kind in (STRING, NUMBER, TEMPLATE):
+            self.next()
+            if token.kind == NUMBER:
+                return parse_number(token.value)
+            return self.read_template(*token.value) if token.kind == TEMPLATE else token.value
+        if token.kind == PUNCTUATOR:
+            if token.value == "[":
+                self.next()
+                return self.read_array()
+            if token.value == "{":
+                self.next()
+                return self.read_object()
+            following = self.peek(1)
+            if token.value == "-" and following is not None and following.kind == NUMBER:
+                value = parse_number(following.value)
+                if is_number(value):
+                    self.next()
+                    self.next()
+                    return -value
+            return NOT_READ
+        if token.kind != NAME:
+            return NOT_READ
+        if token.value in LITERAL_NAMES:
+            self.next()
+            return LITERAL_NAMES[token.value]
+        following = self.peek(2)
+        if token.value == "__ENV" and self.is_next(".", offset=1) and following is not None and \
+                following.kind == NAME:
+            self.next()
+            self.next()
+            return f"${{{self.next().value}}}"
+        if token.value == BODIES_ARRAY and self.is_next("[", offset=1) and self.is_next("]", offset=3) and \
+                following is not None and following.kind == NUMBER:
+            index = parse_number(following.value)
+            if isinstance(index, int) and 0 <= index < len(self.bodies):
+                for _ in range(4):
+                    self.next()
+                return self.bodies[index]
+        return self.read_known()
+
+    def read_array(self) -> List[Any]:
+        values = []
+        while not self.accept("]"):
+            if self.accept(","):
+                values.append(None)
+                continue
+            values.append(self.read_value())
+            if not self.accept(","):
+                self.expect("]")
+                break
+        return values
+
+    def read_object(self) -> Dict[str, Any]:
+        values: Dict[str, Any] = {}
+        while not self.accept("}"):
+            key = self.token
+            if key is not None and key.kind in (NAME, STRING, NUMBER) and self.is_next(":", offset=1):
+                self.next()
+                self.next()
+                values[str(key.value)] = self.read_value()
+            else:
+                # Shorthand, computed, spread and method properties
+                start = self.start_offset()
+                self.read_tokens(in_value=True)
+                text = self.text_from(start)
+                if key is not None and key.kind == NAME and text == key.value:
+                    values[text] = Expression(text)
+                else:
+                    self.log_expression(Expression(text), kept=False)
+            if not self.accept(","):
+                self.expect("}")
+                break
+        return values
+
+    def read_template(self, parts: List[str], substitutions: List[str]) -> str:
+        """Reads a template, its substitutions are kept as ${...} placeholders, __ENV.NAME as ${NAME}."""
+        text = [parts[0]]
+        for substitution, part in zip(substitutions, parts[1:]):
+            variable = ENV_PATTERN.match(substitution)
+            if variable:
+                substitution = variable.group(1)
+            else:
+                self.log_placeholders(Expression(substitution))
+            text.append(f"${{{substitution}}}")
+            text.append(part)
+        return "".join(text)
+
+
+def parse_k6_script(source: str, name: str = "k6 script", bodies: Optional[List[Any]] = None) -> Dict[str, Any]:
+    """
+    Converts a k6 script into the test plan structure consumed by the JMX creator.
+
+    An arrival rate counts iterations, it is multiplied by the requests of the script to give the target
+    throughput of the ThreadGroup.
+
+    Args:
+        source (str): The JavaScript source of the script.
+        name (str): The name of the test plan.
+        bodies (Optional[List[Any]]): The raw bodies the script loads into the BODIES array.
+
+    Returns:
+        Dict[str, Any]: The test plan structure returned by read_postman_collection, with the load_profile
+            read from the script options (None when the script sets none).
+
+    Raises:
+        ValueError: If the script cannot be tokenized or its brackets are unbalanced.
+    """
+    reader = K6ScriptReader(source, bodies)
+    root = reader.read_program()
+    load_profile = read_load_profile(reader.options)
+    if load_profile is not None and load_profile.target_rps and reader.request_count:
+        load_profile = load_profile._replace(target_rps=load_profile.target_rps * reader.request_count)
+    return {
+        "test_plan_name": name.replace("&", "and"),
+        "test_plan_comments": "Converted from a k6 script",
+        "test_fragment_controller": {
+            "name": "Test Fragment",
+            "generic_controllers": root["children"]
+        },
+        "load_profile": load_profile
+    }
+
+
+def read_bodies(file_path: str) -> Optional[List[Any]]:
+    """
+    Reads the data file holding the raw bodies of a k6 script written by the k6 creators.
+
+    Args:
+        file_path (str): The path of the data file.
+
+    Returns:
+        Optional[List[Any]]: The bodies, None when the script has no readable data file.
+    """
+    if not os.path.exists(file_path):
+        return None
+    try:
+        with open_input(file_path, 'r', encoding="utf-8") as bodies_file:
+            bodies = json.load(bodies_file)
+    except (OSError, ValueError) as e:
+        logging.error(f"Could not read the bodies of {file_path}: {e}")
+        return None
+    return bodies if isinstance(bodies, list) else None
+
+
+def read_k6_script(file_path: str) -> Dict[str, Any]:
+    """
+    Reads a k6 script into the test plan structure consumed by the JMX creator.
+
+    Args:
+        file_path (str): The path of the k6 script, its raw bodies are read from "<name>.bodies.json" next to it.
+
+    Returns:
+        Dict[str, Any]: The test plan structure, see parse_k6_script.
+    """
+    with open_input(file_path, 'r', encoding="utf-8") as script_file:
+        source = script_file.read()
+    script_path = strip_compression_extension(file_path)
+    name = os.path.splitext(os.path.basename(script_path))[0]
+    return parse_k6_script(source, name, read_bodies(get_data_file_name(script_path)))
@@ -0,0 +1,227 @@
+import re
+from typing import Any, Iterator, List, NamedTuple, Optional, Tuple
+
+# Token kinds
+NAME = "name"
+NUMBER = "number"
+STRING = "string"
+TEMPLATE = "template"
+REGEX = "regex"
+PUNCTUATOR = "punctuator"
+
+# A token preceded by whitespace and comments, the end of the source matches the "end" group
+TOKEN_PATTERN = re.compile(r"""
+    (?:\s+|//[^\n]*|/\*[\s\S]*?(?:\*/|\Z))*
+    (?:
+        (?P<name>[A-Za-z_$\u00a0-\uffff][\w$\u00a0-\uffff]*)
+      | (?P<number>(?:\d|\.\d)(?:[eE][+-]|[\w.])*)
+      | (?P<string>"(?:[^"\\\n]|\\[\s\S])*"|'(?:[^'\\\n]|\\[\s\S])*')
+      | (?P<template>`)
+      | (?P<punctuator>>>>=?|\.\.\.|===|!==|\*\*=?|<<=?|>>=?|=>|&&=?|\|\|=?|\?\?=?|\?\.(?!\d)|\+\+|--
+                       |[-+*/%&|^<>!=]=?|[{}()\[\];,.:?~@#])
+      | (?P<end>\Z)
+      | (?P<error>[\s\S])
+    )
+""", re.VERBOSE)
+
+# A regular expression literal, only read where an expression may start
+REGEX_PATTERN = re.compile(r"/(?![*/])(?:[^/\\\[\n]|\\.|\[(?:[^\]\\\n]|\\.)*\])+/[A-Za-z]*")
+
+# Literal text of a template up to the next substitution or the closing backtick
+TEMPLATE_TEXT_PATTERN = re.compile(r"(?:[^`\\$]|\\[\s\S]|\$(?!\{))*")
+
+ESCAPE_PATTERN = re.compile(r"\\(u\{[0-9a-fA-F]+\}|u[0-9a-fA-F]{4}|x[0-9a-fA-F]{2}|\r\n|[\s\S])")
+SIMPLE_ESCAPES = {"n": "\n", "t": "\t", "r": "\r", "b": "\b", "f": "\f", "v": "\v", "0": "\0"}
+LINE_CONTINUATIONS = ("\n", "\r\n", "\r", "\u2028", "\u2029")
+
+# Keywords after which a slash starts a regular expression instead of a division
+EXPRESSION_KEYWORDS = frozenset(("return", "typeof", "case", "do", "else", "in", "instanceof", "new", "delete",
+                                 "void", "throw", "yield", "await", "of"))
+
+
+class Token(NamedTuple):
+    """
+    A token of a JavaScript source.
+
+    Attributes:
+        kind (str): NAME, NUMBER, STRING, TEMPLATE, REGEX or PUNCTUATOR.
+        value (Any): The source text of the token, the decoded text of a string, or for a template the
+            (parts, substitutions) pair of its decoded literal parts and the source of its substitutions.
+        start (int): Offset of the token in the source.
+        end (int): Offset following the token.
+    """
+    kind: str
+    value: Any
+    start: int
+    end: int
+
+
+def decode_escapes(text: str) -> str:
+    """
+    Decodes the escape sequences of a JavaScript string or template literal.
+
+    Args:
+        text (str): The literal text between the quotes.
+
+    Returns:
+        str: The string value.
+    """
+    if "\\" not in text:
+        return text
+
+    def replace(match: re.Match) -> str:
+        escape = match.group(1)
+        if escape.startswith("u{"):
+            return chr(int(escape[2:-1], 16))
+        if len(escape) > 1 and escape[0] in "ux":
+            return chr(int(escape[1:], 16))
+        if escape in LINE_CONTINUATIONS:
+            return ""
+        return SIMPLE_ESCAPES.get(escape, escape)
+
+    decoded = ESCAPE_PATTERN.sub(replace, text)
+    # Join the surrogate pairs written as two \u escapes
+    return decoded.encode("utf-16", "surrogatepass").decode("utf-16")
+
+
+def get_line(source: str, offset: int) -> int:
+    """
+    Returns the line number of an offset, for error messages.
+
+    Args:
+        source (str): The JavaScript source.
+        offset (int): An offset in the source.
+
+    Returns:
+        int: The 1-based line number.
+    """
+    return source.count("\n", 0, offset) + 1
+
+
+def is_regex_allowed(previous: Optional[Token]) -> bool:
+    """
+    Tells whether a slash following a token starts a regular expression literal.
+
+    Args:
+        previous (Optional[Token]): The previous token, None at the start of the source.
+
+    Returns:
+        bool: True when an expression may start after the previous token.
+    """
+    if previous is None:
+        return True
+    if previous.kind == PUNCTUATOR:
+        return previous.value not in (")", "]", "}")
+    return previous.kind == NAME and previous.value in EXPRESSION_KEYWORDS
+
+
+def skip_substitution(source: str, position: int) -> int:
+    """
+    Finds the closing brace of a template substitution, skipping nested braces, strings and templates.
+
+    Args:
+        source (str): The JavaScript source.
+        position (int): Offset following the "${" opening the substitution.
+
+    Returns:
+        int: Offset of the closing brace.
+
+    Raises:
+        ValueError: If the substitution is not closed.
+    """
+    depth = 0
+    while True:
+        match = TOKEN_PATTERN.match(source, position)
+        kind = match.lastgroup
+        if kind == "end":
+            break
+        start = match.start(kind)
+        if kind == TEMPLATE:
+            position = read_template(source, start)[2]
+            continue
+        text = match.group(kind)
+        if text == "{":
+            depth += 1
+        elif text == "}":
+            if depth == 0:
+                return start
+            depth -= 1
+        position = match.end()
+    raise ValueError(f"Unterminated template substitution at line {get_line(source, position)}")
+
+
+def read_template(source: str, start: int) -> Tuple[List[str], List[str], int]:
+    """
+    Reads a template literal.
+
+    Args:
+        source (str): The JavaScript source.
+        start (int): Offset of the opening backtick.
+
+    Returns:
+        Tuple[List[str], List[str], int]: The decoded literal parts, the source of the substitutions between
+            them and the offset following the closing backtick.
+
+    Raises:
+        ValueError: If the template is not closed.
+    """
+    parts: List[str] = []
+    substitutions: List[str] = []
+    position = start + 1
+    while True:
+        text_end = TEMPLATE_TEXT_PATTERN.match(source, position).end()
+        if text_end >= len(source):
+            raise ValueError(f"Unterminated template literal at line {get_line(source, start)}")
+        parts.append(decode_escapes(source[position:text_end]))
+        if source[text_end] == "`":
+            return parts, substitutions, text_end + 1
+        substitution_end = skip_substitution(source, text_end + 2)
+        substitutions.append(source[text_end + 2:substitution_end].strip())
+        position = substitution_end + 1
+
+
+def iter_tokens(source: str) -> Iterator[Token]:
+    """
+    Splits a JavaScript source into tokens in a single pass, skipping whitespace and comments.
+
+    This is a tokenizer, not a parser: a slash is read as a regular expression where an expression may start
+    according to the previous token, which holds for the code written by people and code generators alike.
+
+    Args:
+        source (str): The JavaScript source.
+
+    Yields:
+        Token: The tokens, in source order.
+
+    Raises:
+        ValueError: On characters that cannot start a token and on unterminated literals.
+    """
+    position = 0
+    previous = None
+    while True:
+        # Templates and regular expressions are read on their own, the scan resumes after them
+        for match in TOKEN_PATTERN.finditer(source, position):
+            kind = match.lastgroup
+            start = match.start(kind)
+            if kind == PUNCTUATOR and source[start] == "/" and is_regex_allowed(previous):
+                regex = REGEX_PATTERN.match(source, start)
+                if regex:
+                    previous = Token(REGEX, regex.group(), start, regex.end())
+                    yield previous
+                    position = regex.end()
+                    break
+            elif kind == TEMPLATE:
+                parts, substitutions, end = read_template(source, start)
+                previous = Token(TEMPLATE, (parts, substitutions), start, end)
+                yield previous
+                position = end
+                break
+            elif kind == "end":
+                return
+            elif kind == "error":
+                raise ValueError(f"Unexpected character {source[start]!r} at line {get_line(source, start)}")
+            value = match.group(kind)
+            previous = Token(kind, decode_escapes(value[1:-1]) if kind == STRING else value, start, match.end())
+            yield previous
+        else:
+            return
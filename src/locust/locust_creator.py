@@ -0,0 +1,413 @@
+import json
+import keyword
+import os
+import re
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+from src.har.har_reader import read_har
+from src.helper.compression import strip_compression_extension
+from src.helper.importer import load_source
+from src.jmx.jmx_creator import (
+    RAW_BODY,
+    Header,
+    LoadProfile,
+    Origin,
+    find_common_origin,
+    get_body_mode,
+    get_request_headers,
+    resolve_postman_path
+)
+from src.jmx.jmx_reader import get_test_plan, to_generic_controllers
+from src.k6.k6_creator import (
+    BodyFile,
+    BodyStore,
+    find_header_constants,
+    get_data_file_name,
+    get_expected_status,
+    has_raw_bodies
+)
+from src.openapi.openapi_reader import is_openapi_file, read_openapi
+from src.postman.postman_json_reader import read_postman_collection
+
+INDENT = "    "
+# Module-level names of the locustfile, the folder classes get other names
+RESERVED_NAMES = frozenset(("PlanUser", "PlanShape", "Request", "BODIES", "CLIENT_POOL", "ITERATIONS", "PLACEHOLDER",
+                            "FastHttpUser", "LoadTestShape", "SequentialTaskSet", "HTTPClientPool", "StopUser"))
+FORM_CONTENT_TYPE = "application/x-www-form-urlencoded"
+
+# Runtime helpers: placeholders are filled from the variables of the user, which start as the
+# environment variables (tests_url=... locust -f ...) and are updated from the responses.
+HELPERS_PY = r'''PLACEHOLDER = re.compile(r"\$\{([^{}\s]+)\}")
+
+
+def fill(text, variables):
+    """Replaces the ${name} placeholders with the variables of the user, unknown names are kept."""
+    if "${" not in text:
+        return text
+    return PLACEHOLDER.sub(lambda match: str(variables.get(match.group(1), match.group(0))), text)
+
+
+def fill_all(values, variables):
+    return {name: fill(value, variables) for name, value in values.items()}
+
+
+def read_json_path(response, path):
+    """Reads a value of the response JSON from a dotted path such as data.0.token, None when it is missing."""
+    try:
+        value = response.json()
+        for key in path.split("."):
+            value = value[int(key)] if isinstance(value, list) else value[key]
+        return value
+    except (ValueError, KeyError, IndexError, TypeError):
+        return None
+
+
+class Request:
+    """A task sending a request, checking its status and reading the variables set from its response."""
+
+    def __init__(self, method, url, name, body=None, form=None, headers=None, statuses=(), checks="",
+                 variables=()):
+        self.method, self.url, self.name = method, url, name
+        self.body, self.form, self.headers = body, form, headers
+        self.statuses, self.checks, self.variables = statuses, checks, variables
+
+    def __call__(self, taskset):
+        variables = taskset.user.variables
+        data = None
+        if self.body is not None:
+            data = fill(BODIES[self.body], variables)
+        elif self.form is not None:
+            data = urlencode(fill_all(self.form, variables))
+        headers = fill_all(self.headers, variables) if self.headers else None
+        # Only the response of catch_response=True is a context manager, without status tests Locust then
+        # reports it from its status like it does by default
+        with taskset.client.request(self.method, fill(self.url, variables), name=self.name, data=data,
+                                    headers=headers, catch_response=True) as response:
+            if self.statuses:
+                if response.status_code in self.statuses:
+                    response.success()
+                else:
+                    response.failure(f"{self.checks}: got {response.status_code}")
+            for name, path in self.variables:
+                variables[name] = read_json_path(response, path)
+
+
+def leave(taskset):
+    """Last task of a folder, hands control back to the parent folder."""
+    taskset.interrupt()
+'''
+
+# Last task of the plan when the load profile sets a number of loops instead of a duration
+FINISH_ITERATION_PY = '''
+
+def finish_iteration(taskset):
+    """Last task of the plan, stops the user once it ran all its iterations."""
+    taskset.user.iterations += 1
+    if taskset.user.iterations >= ITERATIONS:
+        raise StopUser()
+'''
+
+
+def resolve_locust_output(locust_file: str) -> Tuple[str, str]:
+    """
+    Determines the output directory and file name of the locustfile.
+
+    Args:
+        locust_file (str): A .py file path, or a file name (without .py) written to the out directory.
+
+    Returns:
+        Tuple[str, str]: The output directory and the file name.
+    """
+    if locust_file.endswith('.py'):
+        return os.path.abspath(os.path.join(locust_file, os.pardir)), os.path.basename(locust_file)
+    current_file_dir = os.path.dirname(__file__)
+    return os.path.join(os.path.abspath(os.path.join(current_file_dir, '..', '..')), "out"), f"{locust_file}.py"
+
+
+def to_class_name(name: str, used: Set[str]) -> str:
+    """
+    Derives a unique CamelCase class name from a folder name.
+
+    Args:
+        name (str): The folder name.
+        used (Set[str]): The names taken so far, updated with the new one.
+
+    Returns:
+        str: The class name.
+    """
+    class_name = "".join(word[:1].upper() + word[1:] for word in re.findall(r"[A-Za-z0-9]+", name)) or "Folder"
+    if class_name[0].isdigit() or keyword.iskeyword(class_name):
+        class_name = f"Folder{class_name}"
+    candidate, index = class_name, 1
+    while candidate in used:
+        index += 1
+        candidate = f"{class_name}{index}"
+    used.add(candidate)
+    return candidate
+
+
+def create_task_py(request: Dict[str, Any], header_constants: Dict[Tuple[Header, ...], str],
+                   store_body: BodyStore) -> str:
+    """
+    Creates the task sending a request, a Request built from literals.
+
+    Raw bodies are read from the BODIES list loaded once per process, form bodies are urlencoded at runtime.
+    Status tests become the expected statuses, variables set from the response JSON are read into the
+    variables of the user.
+
+    Args:
+        request (Dict[str, Any]): The request information read from the Postman collection.
+        header_constants (Dict[Tuple[Header, ...], str]): The shared header sets.
+        store_body (BodyStore): Stores a raw body in the data file.
+
+    Returns:
+        str: The Python expression.
+    """
+    arguments = [repr(request['method']), repr(request['raw_url']), repr(request['name'])]
+
+    body_mode = get_body_mode(request)
+    headers = get_request_headers(request)
+    if body_mode == RAW_BODY:
+        arguments.append(f"body={store_body(request['body'])}")
+    elif body_mode:
+        arguments.append(f"form={dict((field['key'], field.get('value', '')) for field in request['body'])!r}")
+        if not any(name.lower() == "content-type" for name, _ in headers):
+            headers = headers + [("Content-Type", FORM_CONTENT_TYPE)]
+    if tuple(headers) in header_constants:
+        arguments.append(f"headers={header_constants[tuple(headers)]}")
+    elif headers:
+        arguments.append(f"headers={dict(headers)!r}")
+
+    checks = [(test['name'], status) for test in request.get('tests', [])
+              for status in [get_expected_status(test.get('script', ''))] if status]
+    if checks:
+        statuses = sorted({int(status) for _, status in checks})
+        arguments.append(f"statuses={tuple(statuses)!r}")
+        arguments.append(f"checks={', '.join(test_name for test_name, _ in checks)!r}")
+    variables = tuple((variable['name'], variable['path']) for variable in request.get('variables', [])
+                      if variable.get('path'))
+    if variables:
+        arguments.append(f"variables={variables!r}")
+    return f"Request({', '.join(arguments)})"
+
+
+def iter_taskset_py(controller: Dict[str, Any], class_name: str, used: Set[str],
+                    header_constants: Dict[Tuple[Header, ...], str], store_body: BodyStore,
+                    last_task: Optional[str] = "leave") -> Iterator[str]:
+    """
+    Generates the SequentialTaskSet running the requests and folders of a folder in order.
+
+    The task sets of the child folders are generated first, the folder lists them among its tasks. A nested
+    task set ends with leave(), which hands control back to its parent once all its tasks ran.
+
+    Args:
+        controller (Dict[str, Any]): The folder, or a root holding the top-level controllers.
+        class_name (str): The name of the class.
+        used (Set[str]): The class names taken so far.
+        header_constants (Dict[Tuple[Header, ...], str]): The shared header sets, from find_header_constants.
+        store_body (BodyStore): Stores a raw body in the data file.
+        last_task (Optional[str]): The task ending the task set, the root task set runs one iteration of the
+            user per pass and only ends to count the iterations.
+
+    Yields:
+        str: The class definitions, one at a time.
+    """
+    tasks: List[str] = []
+    for node in controller.get('children', []):
+        if node['type'] == 'request':
+            tasks.append(create_task_py(node, header_constants, store_body))
+        else:
+            child_class_name = to_class_name(node['name'], used)
+            yield from iter_taskset_py(node, child_class_name, used, header_constants, store_body)
+            tasks.append(child_class_name)
+    if last_task:
+        tasks.append(last_task)
+
+    py = f"class {class_name}(SequentialTaskSet):\n"
+    py += f"{INDENT}{controller['name']!r}\n"
+    py += f"{INDENT}tasks = [\n" + "".join(f"{INDENT * 2}{task},\n" for task in tasks) + f"{INDENT}]\n\n\n"
+    yield py
+
+
+def create_user_py(plan_class_name: str, origin: Optional[Origin], load_profile: Optional[LoadProfile]) -> str:
+    """
+    Creates the FastHttpUser class running the plan, and the load shape of a load profile with a duration.
+    Without duration, the users stop after the loops of the profile.
+
+    All users of a process share one geventhttpclient connection pool, so the number of open connections
+    stays bounded by the pool size instead of growing with the number of users.
+
+    Args:
+        plan_class_name (str): The class of the root task set.
+        origin (Optional[Origin]): The most common origin of the requests, the default host of the users.
+        load_profile (Optional[LoadProfile]): The load to generate, None leaves it to the locust command line.
+
+    Returns:
+        str: The class definitions.
+    """
+    reuse_connections = load_profile is None or load_profile.reuse_connections
+    pool_size = load_profile.threads if load_profile else 100
+
+    py = ""
+    if reuse_connections:
+        py += f"CLIENT_POOL = HTTPClientPool(concurrency={pool_size})\n\n\n"
+    py += "class PlanUser(FastHttpUser):\n"
+    if origin:
+        protocol, host, port = origin
+        py += f"{INDENT}host = {protocol + '://' + host + (':' + port if port else '')!r}\n"
+    if reuse_connections:
+        py += f"{INDENT}client_pool = CLIENT_POOL\n"
+    else:
+        py += f"{INDENT}default_headers = {{'Connection': 'close'}}\n"
+    if load_profile and load_profile.target_rps:
+        # Every task sends one request, the target is shared by the users
+        py += f"{INDENT}wait_time = constant_throughput({load_profile.target_rps / load_profile.threads!r})\n"
+    else:
+        py += f"{INDENT}wait_time = constant(0)\n"
+    py += f"{INDENT}tasks = [{plan_class_name}]\n\n"
+    py += f"{INDENT}def on_start(self):\n"
+    py += f"{INDENT * 2}self.variables = dict(os.environ)\n"
+    if load_profile and not load_profile.duration:
+        py += f"{INDENT * 2}self.iterations = 0\n"
+
+    if load_profile and load_profile.duration:
+        spawn_rate = load_profile.threads / load_profile.ramp_up if load_profile.ramp_up else load_profile.threads
+        py += "\n\nclass PlanShape(LoadTestShape):\n"
+        py += f"{INDENT}users = {load_profile.threads}\n"
+        py += f"{INDENT}spawn_rate = {spawn_rate!r}\n"
+        py += f"{INDENT}duration = {load_profile.duration}\n\n"
+        py += f"{INDENT}def tick(self):\n"
+        py += f"{INDENT * 2}if self.get_run_time() > self.duration:\n"
+        py += f"{INDENT * 3}return None\n"
+        py += f"{INDENT * 2}return self.users, self.spawn_rate\n"
+    return py
+
+
+def iter_locustfile(data: Dict[str, Any], store_body: BodyStore, data_file_name: Optional[str] = None,
+                    load_profile: Optional[LoadProfile] = None) -> Iterator[str]:
+    """
+    Generates a locustfile piece by piece, one top-level folder at a time.
+
+    Every folder becomes a SequentialTaskSet with a task per request, run in collection order by a
+    FastHttpUser. Status tests become response checks, variables set from the response JSON are read into
+    the variables of the user. Header sets used by several requests are declared once as constants, raw
+    bodies are stored with store_body and loaded once per process.
+
+    Args:
+        data (Dict[str, Any]): The test plan structure returned by read_postman_collection.
+        store_body (BodyStore): Stores a raw body in the data file and returns its index.
+        data_file_name (Optional[str]): Path of the data file relative to the locustfile, None when the plan
+            has no raw bodies.
+        load_profile (Optional[LoadProfile]): Generated as a load shape, None leaves the users and run time
+            to the locust command line.
+
+    Yields:
+        str: Consecutive fragments of the locustfile.
+    """
+    controllers = data['test_fragment_controller'].get('generic_controllers', [])
+    header_constants = find_header_constants(controllers)
+    used = set(RESERVED_NAMES) | set(header_constants.values())
+    reuse_connections = load_profile is None or load_profile.reuse_connections
+    counts_iterations = bool(load_profile and not load_profile.duration)
+
+    yield f"# {data['test_plan_name']}\n"
+    yield "import json\nimport os\nimport re\nfrom urllib.parse import urlencode\n\n"
+    if reuse_connections:
+        yield "from geventhttpclient.client import HTTPClientPool\n"
+    yield "from locust import FastHttpUser, LoadTestShape, SequentialTaskSet, constant, constant_throughput\n"
+    yield "from locust.exception import StopUser\n\n" if counts_iterations else "\n"
+    if data_file_name:
+        yield (f"with open(os.path.join(os.path.dirname(os.path.abspath(__file__)), {data_file_name!r}), "
+               f"encoding='utf-8') as bodies_file:\n"
+               f"{INDENT}BODIES = json.load(bodies_file)\n\n")
+    for headers, constant in header_constants.items():
+        yield f"{constant} = {dict(headers)!r}\n"
+    if header_constants:
+        yield "\n"
+    if counts_iterations:
+        yield f"ITERATIONS = {load_profile.loops}\n\n"
+    yield HELPERS_PY + (FINISH_ITERATION_PY if counts_iterations else "") + "\n\n"
+
+    plan_class_name = to_class_name(data['test_plan_name'], used)
+    root = {'name': data['test_plan_name'], 'children': controllers}
+    yield from iter_taskset_py(root, plan_class_name, used, header_constants, store_body,
+                               last_task="finish_iteration" if counts_iterations else None)
+    yield create_user_py(plan_class_name, find_common_origin(controllers), load_profile)
+
+
+def write_locustfile(data: Dict[str, Any], output_path: str, file_name: str,
+                     load_profile: Optional[LoadProfile] = None) -> None:
+    """
+    Streams the locustfile of a test plan to disk, with its raw bodies in a "<name>.bodies.json" data file.
+
+    Args:
+        data (Dict[str, Any]): The test plan structure returned by read_postman_collection.
+        output_path (str): The directory of the locustfile.
+        file_name (str): The file name of the locustfile.
+        load_profile (Optional[LoadProfile]): Generated as a load shape.
+    """
+    os.makedirs(output_path, exist_ok=True)
+    data_file_name = get_data_file_name(file_name) if has_raw_bodies(data) else None
+    body_file = BodyFile(os.path.join(output_path, get_data_file_name(file_name)))
+    try:
+        with open(os.path.join(output_path, file_name), 'w', encoding='utf-8') as locust_file:
+            locust_file.writelines(iter_locustfile(data, body_file.store, data_file_name, load_profile))
+    finally:
+        body_file.close()
+
+
+def read_source(source_file: str) -> Dict[str, Any]:
+    """
+    Reads the test plan structure of a Postman collection, a JMX plan, a HAR recording or an OpenAPI document.
+
+    Args:
+        source_file (str): A .jmx plan, a .har recording, a .yaml OpenAPI document, or a Postman collection path
+            or name in file_to_convert.
+
+    Returns:
+        Dict[str, Any]: The test plan structure of read_postman_collection.
+
+    Raises:
+        FileNotFoundError: If the source does not exist.
+        ValueError: If the JMX plan or the HAR recording cannot be parsed.
+    """
+    source_name = strip_compression_extension(source_file)
+    if source_name.endswith('.har'):
+        return load_source(source_file, ".har", read_har)
+    if is_openapi_file(source_file):
+        return load_source(source_file, ".json", read_openapi)
+    if source_name.endswith('.jmx'):
+        test_plan = get_test_plan(source_file)
+        if 'error' in test_plan:
+            raise ValueError(test_plan['error'])
+        return {
+            'test_plan_name': test_plan['name'],
+            'test_fragment_controller': {'name': 'Test Fragment',
+                                         'generic_controllers': to_generic_controllers(test_plan)}
+        }
+
+    postman_json_path_final = resolve_postman_path(source_file)
+    try:
+        return read_postman_collection(postman_json_path_final)
+    except FileNotFoundError:
+        print(f"Error: File {postman_json_path_final} not found.")
+        raise
+    except json.JSONDecodeError:
+        print("Error: Invalid JSON format in the Postman collection.")
+        raise
+
+
+def create_locustfile(source_file: str, locust_file: str, load_profile: Optional[LoadProfile] = None) -> None:
+    """
+    Creates a Locust FastHttpUser locustfile based on a Postman collection, a JMX plan, a HAR recording or an
+    OpenAPI document.
+
+    Args:
+        source_file (str): The Postman collection, .jmx plan, .har recording or .yaml OpenAPI document to read from.
+        locust_file (str): The file path where the locustfile should be saved.
+        load_profile (Optional[LoadProfile]): Generated as a load shape, None leaves the users and run time
+            to the locust command line.
+    """
+    data = read_source(source_file)
+    output_path, file_name = resolve_locust_output(locust_file)
+    write_locustfile(data, output_path, file_name, load_profile)
@@ -1,5 +1,22 @@
-from src.jmx.jmx_creator import create_jmx_file
-from src.postman.postman_json_creator import generate_postman_collection, save_json
+import argparse
+import sys
+from typing import List, Optional
+
+from src.analyzer import analyze_source, format_stats
+from src.batch import DEFAULT_BACKOFF, DEFAULT_RETRIES, convert_batch
+from src.har.har_importer import create_jmx_file_from_har, create_postman_collection_from_har
+from src.har.har_reader import DEFAULT_GAP
+from src.helper.compression import strip_compression_extension
+from src.jmx.jmx_creator import LoadProfile, create_jmx_file
+from src.k6.k6_creator import create_k6_script
+from src.k6.k6_importer import create_jmx_file_from_k6, create_postman_collection_from_k6
+from src.k6.k6_jmx_creator import create_k6_script_from_jmx
+from src.locust.locust_creator import create_locustfile
+from src.openapi.openapi_importer import create_jmx_file_from_openapi, create_postman_collection_from_openapi
+from src.openapi.openapi_reader import is_openapi_file
+from src.postman.postman_json_creator import create_postman_collection, generate_postman_collection, save_json
+from src.targets.targets_creator import create_targets_file
+from src.watch import DEFAULT_DEBOUNCE, DEFAULT_OUTPUT_DIR, DEFAULT_WATCH_DIR, DEFAULT_WORKERS, watch
 
 # ANSI escape codes for colored text
 YELLOW_TEXT = '\033[93m'
@@ -40,27 +57,264 @@ def convert_jmx_to_postman():
     print(f"{GREEN_TEXT}Conversion from JMX suite to Postman Collection completed successfully!{RESET_TEXT}")
 
 
+def convert_postman_to_k6():
+    """Handles conversion from Postman Collection to a K6 script."""
+    source_file = get_file_name(
+        "Enter the Postman Collection JSON file name (without .json extension) from the file_to_convert folder: ", ".json")
+    destination_file = get_file_name(
+        "Enter the desired K6 script file name (without .js extension) to save in the out folder: ", ".js")
+    create_k6_script(source_file, destination_file)
+    print(f"{GREEN_TEXT}Conversion from Postman Collection to K6 completed successfully!{RESET_TEXT}")
+
+
+def convert_jmx_to_k6():
+    """Handles conversion from JMX to a K6 script."""
+    source_file = get_file_name(
+        "Enter the Jmeter Suite JMX file name (without .jmx extension) from the file_to_convert folder: ", ".jmx")
+    destination_file = get_file_name(
+        "Enter the desired K6 script file name (without .js extension) to save in the out folder: ", ".js")
+    create_k6_script_from_jmx(source_file, destination_file)
+    print(f"{GREEN_TEXT}Conversion from JMX suite to K6 completed successfully!{RESET_TEXT}")
+
+
+def convert_k6_to_postman():
+    """Handles conversion from a K6 script to Postman Collection."""
+    source_file = get_file_name(
+        "Enter the K6 script file name (without .js extension) from the file_to_convert folder: ", ".js")
+    destination_file = get_file_name(
+        "Enter the desired Postman Collection JSON file name (without .json extension) to save in the out folder: ", ".json")
+    create_postman_collection_from_k6(source_file, destination_file)
+    print(f"{GREEN_TEXT}Conversion from K6 to Postman Collection completed successfully!{RESET_TEXT}")
+
+
+def convert_k6_to_jmx():
+    """Handles conversion from a K6 script to JMX."""
+    source_file = get_file_name(
+        "Enter the K6 script file name (without .js extension) from the file_to_convert folder: ", ".js")
+    destination_file = get_file_name(
+        "Enter the desired JMX file name (without .jmx extension) to save in the file_to_convert folder: ", ".jmx")
+    create_jmx_file_from_k6(source_file, destination_file)
+    print(f"{GREEN_TEXT}Conversion from K6 to JMX completed successfully!{RESET_TEXT}")
+
+
 def unsupported_conversion():
     """Displays a message for unsupported conversion types."""
     print(f"{RED_TEXT}This conversion type is not supported yet.{RESET_TEXT}")
 
 
-def main():
-    """Main function to handle conversion based on user input."""
+def create_parser() -> argparse.ArgumentParser:
+    """Creates the parser for the non-interactive commands."""
+    parser = argparse.ArgumentParser(prog="python -m src.main", description="Test Flow X converter")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    convert_parser = commands.add_parser("convert", help="convert a Postman collection (.json), JMX plan (.jmx), "
+                                                               "K6 script (.js), HAR recording (.har) or OpenAPI "
+                                                               "document (.yaml)")
+    convert_parser.add_argument("source", help="source file, the conversion is picked from its extension, gzip, "
+                                               "zstd and xz compressed files are read as they are")
+    convert_parser.add_argument("destination", help="destination file, a .js destination converts a Postman "
+                                                    "collection or JMX plan to a K6 script, a .jmx destination "
+                                                    "converts a K6 script or HAR recording to JMX, a .py "
+                                                    "destination converts a Postman collection, JMX plan or HAR "
+                                                    "recording to a Locust locustfile, a .targets or .lua "
+                                                    "destination flattens them to a vegeta target list or a wrk "
+                                                    "script, a .gz, .zst or .xz suffix compresses a JMX or Postman "
+                                                    "destination")
+    convert_parser.add_argument("--deterministic-ids", action="store_true",
+                                help="derive collection IDs from the content for reproducible output")
+    convert_parser.add_argument("--normalize-bodies", action="store_true",
+                                help="parse and re-format JSON request bodies instead of passing them through")
+    convert_parser.add_argument("--body-threshold", type=int,
+                                help="write request bodies larger than this many bytes to files next to the JMX")
+    convert_parser.add_argument("--shared-defaults", action="store_true",
+                                help="set the most common protocol, host and port once in HTTP Request Defaults")
+    convert_parser.add_argument("--deduplicate", action="store_true",
+                                help="generate repeated requests and folders once and run them via Module Controllers")
+    convert_parser.add_argument("--split", action="store_true",
+                                help="write one JMX per top-level folder and a master plan including them")
+    convert_parser.add_argument("--split-size", type=int,
+                                help="split into JMX files of at most this many samplers (implies --split)")
+    convert_parser.add_argument("--openapi", action="store_true",
+                                help="read a .json source as an OpenAPI 3 document, .yaml and .yml sources always are")
+    convert_parser.add_argument("--har-gap", type=float, default=DEFAULT_GAP,
+                                help="seconds without traffic after which HAR entries start a new controller")
+    convert_parser.add_argument("--keep-static", action="store_true",
+                                help="keep the scripts, stylesheets, images and fonts of a HAR recording")
+    convert_parser.add_argument("--environment",
+                                help="Postman environment or JSON object resolving the variables of a target list, "
+                                     "or set as the User Defined Variables of a JMX plan")
+    convert_parser.add_argument("--globals", help="Postman globals set as User Defined Variables of a JMX plan, "
+                                                  "the --environment variables taking precedence")
+    convert_parser.add_argument("--data", help="Postman iteration data file (.csv or .json) read by a CSV Data Set "
+                                               "of a JMX plan, one row per iteration")
+    load_group = convert_parser.add_argument_group(
+        "load profile", "run the requests in a ThreadGroup instead of a TestFragment, set the K6 script options or "
+        "the Locust load shape (the options of a K6 script source are used by default)")
+    load_group.add_argument("--threads", type=int, help="number of concurrent virtual users")
+    load_group.add_argument("--ramp-up", type=int, default=1, help="seconds taken to start all threads")
+    load_group.add_argument("--duration", type=int, help="seconds the test runs for")
+    load_group.add_argument("--loops", type=int, help="iterations per thread when no duration is set")
+    load_group.add_argument("--rps", type=float, help="target requests per second across all threads")
+    load_group.add_argument("--no-connection-reuse", action="store_true",
+                            help="open a new connection for every request")
+
+    watch_parser = commands.add_parser("watch", help="convert files as they change in the file_to_convert directory")
+    watch_parser.add_argument("--directory", default=DEFAULT_WATCH_DIR, help="directory to watch")
+    watch_parser.add_argument("--output", default=DEFAULT_OUTPUT_DIR, help="directory for converted files")
+    watch_parser.add_argument("--debounce", type=float, default=DEFAULT_DEBOUNCE,
+                              help="seconds a file must stay unchanged before it is converted")
+    watch_parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="number of worker processes")
+    watch_parser.add_argument("--poll", action="store_true", help="poll the directory instead of using inotify")
+
+    batch_parser = commands.add_parser("batch", help="convert all files of the file_to_convert directory, resuming "
+                                                     "an interrupted batch")
+    batch_parser.add_argument("--directory", default=DEFAULT_WATCH_DIR, help="directory of the files to convert")
+    batch_parser.add_argument("--output", default=DEFAULT_OUTPUT_DIR,
+                              help="directory for converted files and the journal of the batch")
+    batch_parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="number of worker processes")
+    batch_parser.add_argument("--retries", type=int, default=DEFAULT_RETRIES, help="retries of a failed file")
+    batch_parser.add_argument("--backoff", type=float, default=DEFAULT_BACKOFF,
+                              help="seconds before the first retry, doubled for every further retry")
+    batch_parser.add_argument("--timeout", type=float, help="seconds a file may take before its worker is killed")
+    batch_parser.add_argument("--memory-limit", type=int, help="address space limit of each worker in MB")
+    batch_parser.add_argument("--largest-first", action="store_true",
+                              help="analyze the files first and start the longest conversions first")
+
+    analyze_parser = commands.add_parser("analyze", help="count the folders, requests, assertions and body bytes "
+                                                         "of Postman collections and JMX plans, and estimate the "
+                                                         "size and time of their conversion")
+    analyze_parser.add_argument("sources", nargs="+", help="Postman collections (.json) and JMX plans (.jmx), "
+                                                           "compressed or not")
+    return parser
+
+
+def build_load_profile(args: argparse.Namespace) -> Optional[LoadProfile]:
+    """Builds the load profile of the convert command, None when no load option is given."""
+    if args.threads is None and args.duration is None and args.loops is None and args.rps is None:
+        return None
+    return LoadProfile(threads=args.threads or 1, ramp_up=args.ramp_up, duration=args.duration,
+                       loops=args.loops or 1, target_rps=args.rps, reuse_connections=not args.no_connection_reuse)
+
+
+def run_convert(args: argparse.Namespace) -> None:
+    """Runs a single conversion, picked from the source file extension, compression extensions aside."""
+    source = strip_compression_extension(args.source)
+    destination = strip_compression_extension(args.destination)
+    if destination.endswith((".targets", ".lua")):
+        count = create_targets_file(args.source, args.destination, environment_file=args.environment)
+        print(f"{GREEN_TEXT}Conversion of {count} requests to a load generator target list completed "
+              f"successfully!{RESET_TEXT}")
+    elif destination.endswith(".py"):
+        create_locustfile(args.source, args.destination, load_profile=build_load_profile(args))
+        print(f"{GREEN_TEXT}Conversion to a Locust locustfile completed successfully!{RESET_TEXT}")
+    elif (args.openapi or is_openapi_file(args.source)) and destination.endswith(".jmx"):
+        create_jmx_file_from_openapi(args.source, args.destination, body_threshold=args.body_threshold,
+                                     shared_defaults=args.shared_defaults, load_profile=build_load_profile(args),
+                                     deduplicate=args.deduplicate, split=args.split, split_size=args.split_size,
+                                     environment_file=args.environment, globals_file=args.globals, data_file=args.data)
+        print(f"{GREEN_TEXT}Conversion from OpenAPI to JMX completed successfully!{RESET_TEXT}")
+    elif args.openapi or is_openapi_file(args.source):
+        create_postman_collection_from_openapi(args.source, args.destination, deterministic_ids=args.deterministic_ids,
+                                               normalize_bodies=args.normalize_bodies)
+        print(f"{GREEN_TEXT}Conversion from OpenAPI to Postman Collection completed successfully!{RESET_TEXT}")
+    elif source.endswith(".har") and destination.endswith(".jmx"):
+        create_jmx_file_from_har(args.source, args.destination, gap=args.har_gap, keep_static=args.keep_static,
+                                 body_threshold=args.body_threshold, shared_defaults=args.shared_defaults,
+                                 load_profile=build_load_profile(args), deduplicate=args.deduplicate,
+                                 split=args.split, split_size=args.split_size,
+                                 environment_file=args.environment, globals_file=args.globals, data_file=args.data)
+        print(f"{GREEN_TEXT}Conversion from HAR to JMX completed successfully!{RESET_TEXT}")
+    elif source.endswith(".har"):
+        create_postman_collection_from_har(args.source, args.destination, gap=args.har_gap,
+                                           keep_static=args.keep_static, deterministic_ids=args.deterministic_ids,
+                                           normalize_bodies=args.normalize_bodies)
+        print(f"{GREEN_TEXT}Conversion from HAR to Postman Collection completed successfully!{RESET_TEXT}")
+    elif source.endswith(".js") and destination.endswith(".jmx"):
+        create_jmx_file_from_k6(args.source, args.destination, body_threshold=args.body_threshold,
+                                shared_defaults=args.shared_defaults, load_profile=build_load_profile(args),
+                                deduplicate=args.deduplicate, split=args.split, split_size=args.split_size,
+                                environment_file=args.environment, globals_file=args.globals, data_file=args.data)
+        print(f"{GREEN_TEXT}Conversion from K6 to JMX completed successfully!{RESET_TEXT}")
+    elif source.endswith(".js"):
+        create_postman_collection_from_k6(args.source, args.destination, deterministic_ids=args.deterministic_ids,
+                                          normalize_bodies=args.normalize_bodies)
+        print(f"{GREEN_TEXT}Conversion from K6 to Postman Collection completed successfully!{RESET_TEXT}")
+    elif source.endswith(".jmx") and destination.endswith(".js"):
+        create_k6_script_from_jmx(args.source, args.destination)
+        print(f"{GREEN_TEXT}Conversion from JMX suite to K6 completed successfully!{RESET_TEXT}")
+    elif source.endswith(".jmx"):
+        create_postman_collection(args.source, args.destination, deterministic_ids=args.deterministic_ids,
+                                  normalize_bodies=args.normalize_bodies)
+        print(f"{GREEN_TEXT}Conversion from JMX suite to Postman Collection completed successfully!{RESET_TEXT}")
+    elif destination.endswith(".js"):
+        create_k6_script(args.source, args.destination, load_profile=build_load_profile(args))
+        print(f"{GREEN_TEXT}Conversion from Postman Collection to K6 completed successfully!{RESET_TEXT}")
+    else:
+        create_jmx_file(args.source, args.destination, body_threshold=args.body_threshold,
+                        shared_defaults=args.shared_defaults, load_profile=build_load_profile(args),
+                        deduplicate=args.deduplicate, split=args.split, split_size=args.split_size,
+                        environment_file=args.environment, globals_file=args.globals, data_file=args.data)
+        print(f"{GREEN_TEXT}Conversion from Postman Collection to JMX completed successfully!{RESET_TEXT}")
+
+
+def run_watch(args: argparse.Namespace) -> None:
+    """Runs the watch mode until interrupted."""
+    print(f"{GREEN_TEXT}Watching {args.directory}, converted files are written to {args.output}{RESET_TEXT}")
+    try:
+        watch(args.directory, args.output, args.debounce, args.workers, use_inotify=False if args.poll else None)
+    except KeyboardInterrupt:
+        pass
+
+
+def run_batch(args: argparse.Namespace) -> None:
+    """Runs a batch conversion, exiting with status 1 when a file failed."""
+    summary = convert_batch(args.directory, args.output, args.workers, args.retries, args.backoff,
+                            timeout=args.timeout, memory_limit=args.memory_limit, largest_first=args.largest_first)
+    color = RED_TEXT if summary["failed"] else GREEN_TEXT
+    print(f"{color}{summary['converted']} converted, {summary['skipped']} skipped, "
+          f"{summary['failed']} failed{RESET_TEXT}")
+    if summary["failed"]:
+        sys.exit(1)
+
+
+def run_analyze(args: argparse.Namespace) -> None:
+    """Prints the statistics and conversion estimates of each source."""
+    for source in args.sources:
+        for line in format_stats(source, analyze_source(source)):
+            print(line)
+
+
+def main(argv: Optional[List[str]] = None):
+    """Main function to handle conversion based on user input, or the command given in argv."""
+    if argv:
+        args = create_parser().parse_args(argv)
+        commands = {
+            'convert': run_convert,
+            'watch': run_watch,
+            'batch': run_batch,
+            'analyze': run_analyze
+        }
+        commands[args.command](args)
+        return
+
     print_hi()
 
     conversion_type = input(f"{YELLOW_TEXT}Please select one of the supported conversion types:\n"
                             "1 -> Postman Collection -> JMX\n"
                             "2 -> JMX -> Postman Collection\n"
-                        #    "3 -> Postman Collection -> K6 (unsupported feature, WIP)\n"
-                        #    "4 -> K6 -> Postman Collection (unsupported feature, WIP)\n"
-                        #    "5 -> JMX -> K6 (unsupported feature, WIP)\n"
-                        #    "6 -> K6 -> JMX (unsupported feature, WIP)\n"
+                            "3 -> Postman Collection -> K6\n"
+                            "4 -> K6 -> Postman Collection\n"
+                            "5 -> JMX -> K6\n"
+                            "6 -> K6 -> JMX\n"
                             f"{RESET_TEXT}{YELLOW_TEXT}>>> {RESET_TEXT}")
 
     conversion_actions = {
         '1': convert_postman_to_jmx,
-        '2': convert_jmx_to_postman
+        '2': convert_jmx_to_postman,
+        '3': convert_postman_to_k6,
+        '4': convert_k6_to_postman,
+        '5': convert_jmx_to_k6,
+        '6': convert_k6_to_jmx
     }
 
     # Call the appropriate conversion function or notify for unsupported types
@@ -68,4 +322,4 @@ def main():
 
 
 if __name__ == '__main__':
-    main()
+    main(sys.argv[1:])
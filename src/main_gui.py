@@ -1,6 +1,9 @@
 import tkinter as tk
 from tkinter import filedialog, messagebox
 from src.jmx.jmx_creator import create_jmx_file
+from src.k6.k6_creator import create_k6_script
+from src.k6.k6_importer import create_jmx_file_from_k6, create_postman_collection_from_k6
+from src.k6.k6_jmx_creator import create_k6_script_from_jmx
 from src.postman.postman_json_creator import create_postman_collection
 import webbrowser
 
@@ -64,15 +67,16 @@ def perform_conversion(conversion_id):
     """
     conversion_mapping = {
         '1': lambda: handle_conversion('json', 'Postman Collection', 'jmx', 'JMX', create_jmx_file),
-        '2': lambda: handle_conversion('jmx', 'JMeter JMX', 'json', 'Postman Collection', create_postman_collection)
+        '2': lambda: handle_conversion('jmx', 'JMeter JMX', 'json', 'Postman Collection', create_postman_collection),
+        '3': lambda: handle_conversion('json', 'Postman Collection', 'js', 'K6 script', create_k6_script),
+        '4': lambda: handle_conversion('js', 'K6 script', 'json', 'Postman Collection',
+                                       create_postman_collection_from_k6),
+        '5': lambda: handle_conversion('jmx', 'JMeter JMX', 'js', 'K6 script', create_k6_script_from_jmx),
+        '6': lambda: handle_conversion('js', 'K6 script', 'jmx', 'JMX', create_jmx_file_from_k6)
     }
 
-    unsupported_conversions = ['3', '4', '5', '6']
-
     if conversion_id in conversion_mapping:
         conversion_mapping[conversion_id]()
-    elif conversion_id in unsupported_conversions:
-        messagebox.showwarning("Feature not ready", "This feature is a WIP and currently unsupported.")
     else:
         messagebox.showerror("Error", "Invalid conversion type selected.")
 
@@ -87,6 +91,10 @@ def create_gui():
     options = [
         "1. Postman Collection => JMX",
         "2. JMX => Postman Collection",
+        "3. Postman Collection => K6",
+        "4. K6 => Postman Collection",
+        "5. JMX => K6",
+        "6. K6 => JMX",
     ]
 
     tk.Label(root, text="Select Conversion Type", font=("Arial", 14)).pack(pady=10)
@@ -125,7 +133,7 @@ def create_gui():
     website_link.pack(pady=5)
     website_link.bind("<Button-1>", lambda e: open_link("https://serhatozdursun.com/"))
 
-    root.geometry("400x250")
+    root.geometry("400x300")
     root.mainloop()
 
 
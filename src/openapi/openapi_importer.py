@@ -0,0 +1,51 @@
+from typing import Any, Dict
+
+from src.helper.importer import load_source, save_postman_collection
+from src.jmx.jmx_creator import write_jmx_file
+from src.openapi.openapi_reader import read_openapi
+
+
+def load_openapi(source_file: str) -> Dict[str, Any]:
+    """
+    Reads the test plan structure of an OpenAPI document.
+
+    Args:
+        source_file (str): An existing file path, or a document name (without .json) in file_to_convert.
+
+    Returns:
+        Dict[str, Any]: The test plan structure returned by read_openapi.
+
+    Raises:
+        FileNotFoundError: If the document does not exist.
+        ValueError: If the document cannot be parsed or is not an OpenAPI 3 document.
+    """
+    return load_source(source_file, ".json", read_openapi)
+
+
+def create_jmx_file_from_openapi(source_file: str, jmx_file: str, **options: Any) -> None:
+    """
+    Creates a JMeter .jmx file with one controller per tag and one sampler per operation of an OpenAPI document.
+
+    See parse_openapi for the mapping of the operations.
+
+    Args:
+        source_file (str): The OpenAPI document, a path or a document name (without .json) in file_to_convert.
+        jmx_file (str): The file path where the JMX file should be saved.
+        **options: The options of write_jmx_file.
+    """
+    write_jmx_file(load_openapi(source_file), jmx_file, **options)
+
+
+def create_postman_collection_from_openapi(source_file: str, output_path: str, deterministic_ids: bool = False,
+                                           normalize_bodies: bool = False) -> None:
+    """
+    Creates a Postman collection with one folder per tag and one request per operation of an OpenAPI document.
+
+    Args:
+        source_file (str): The OpenAPI document, a path or a document name (without .json) in file_to_convert.
+        output_path (str): The path where the Postman collection will be saved, a name without .json is
+            saved in the out directory.
+        deterministic_ids (bool): Derive the collection IDs from its content instead of generating random ones.
+        normalize_bodies (bool): Parse and re-format JSON request bodies instead of passing them through.
+    """
+    save_postman_collection(load_openapi(source_file), output_path, deterministic_ids, normalize_bodies)
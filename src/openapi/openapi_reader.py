@@ -0,0 +1,415 @@
+import json
+import os
+import re
+from typing import Any, Dict, List, Optional, Set, Tuple
+from urllib.parse import unquote
+
+from src.helper.compression import open_input, strip_compression_extension
+from src.jmx.jmx_creator import FORMDATA_BODY, RAW_BODY, URLENCODED_BODY
+from src.postman.postman_json_reader import NO_BODY_CONTENT, extract_query_params
+
+HTTP_METHODS = ("get", "put", "post", "delete", "options", "head", "patch", "trace")
+
+# {name} templates of the paths and server URLs
+PATH_TEMPLATE = re.compile(r"\{([^{}/]+)\}")
+
+# Examples of the string formats, other strings are "string"
+FORMAT_EXAMPLES = {
+    "date-time": "2024-01-01T00:00:00Z",
+    "date": "2024-01-01",
+    "time": "00:00:00",
+    "uuid": "00000000-0000-0000-0000-000000000000",
+    "email": "user@example.com",
+    "uri": "https://example.com",
+    "url": "https://example.com",
+    "hostname": "example.com",
+    "ipv4": "127.0.0.1",
+    "ipv6": "::1",
+    "byte": "c3RyaW5n",
+    "password": "password"
+}
+
+# Depth from which schemas nest no further, for recursive schemas written without $ref
+MAX_EXAMPLE_DEPTH = 32
+
+JSON_CONTENT = re.compile(r"^application/(?:[\w.+-]+\+)?json\b")
+FORM_CONTENT = "application/x-www-form-urlencoded"
+MULTIPART_CONTENT = "multipart/form-data"
+
+UNTAGGED = "default"
+
+
+def is_openapi_file(file_path: str) -> bool:
+    """
+    Tells whether a source is an OpenAPI document from its extension, JSON documents are not told apart from
+    Postman collections.
+
+    Args:
+        file_path (str): The source file.
+
+    Returns:
+        bool: True for .yaml and .yml files.
+    """
+    return strip_compression_extension(file_path).endswith(('.yaml', '.yml'))
+
+
+def load_spec(file_path: str) -> Dict[str, Any]:
+    """
+    Loads an OpenAPI document, JSON or YAML.
+
+    YAML needs PyYAML, which is only imported for .yaml and .yml files.
+
+    Args:
+        file_path (str): Path to the document.
+
+    Returns:
+        Dict[str, Any]: The document.
+
+    Raises:
+        FileNotFoundError: If the file does not exist.
+        ValueError: If the file cannot be parsed, or PyYAML is missing for a YAML document.
+    """
+    with open_input(file_path, 'r', encoding='utf-8-sig') as spec_file:
+        if not is_openapi_file(file_path):
+            return json.load(spec_file)
+        try:
+            import yaml
+        except ImportError:
+            raise ValueError("Reading YAML documents requires PyYAML (pip install pyyaml)") from None
+        try:
+            # The C loader is several times faster when libyaml is available
+            return yaml.load(spec_file, Loader=getattr(yaml, "CSafeLoader", yaml.SafeLoader))
+        except yaml.YAMLError as e:
+            raise ValueError(str(e)) from None
+
+
+class SpecResolver:
+    """
+    Resolves the local $refs of an OpenAPI document and builds the examples of its schemas.
+
+    Both are memoised by reference: a schema reused by many operations, or by other schemas at any depth, is
+    resolved and turned into an example once. Recursive schemas stop at the first repeated reference, which
+    gives None. The JSON bodies serialised from a shared example are memoised as well.
+    """
+
+    def __init__(self, spec: Dict[str, Any]):
+        self.spec = spec
+        self.targets: Dict[str, Any] = {}
+        self.examples: Dict[str, Any] = {}
+        self.building: Set[str] = set()
+        self.bodies: Dict[int, Tuple[Any, str]] = {}
+
+    def resolve(self, node: Any) -> Any:
+        """Follows the $ref of a node, and of the nodes it points to, external references give {}."""
+        seen = set()
+        while isinstance(node, dict) and isinstance(node.get("$ref"), str):
+            ref = node["$ref"]
+            if ref in seen:
+                return {}
+            seen.add(ref)
+            if ref not in self.targets:
+                self.targets[ref] = self.lookup(ref)
+            node = self.targets[ref]
+        return node
+
+    def lookup(self, ref: str) -> Any:
+        if not ref.startswith("#"):
+            return {}
+        node: Any = self.spec
+        for part in ref[1:].split("/")[1:]:
+            part = unquote(part).replace("~1", "/").replace("~0", "~")
+            if isinstance(node, dict):
+                node = node.get(part)
+            elif isinstance(node, list) and part.isdigit() and int(part) < len(node):
+                node = node[int(part)]
+            else:
+                node = None
+            if node is None:
+                return {}
+        return node
+
+    def example(self, schema: Any, depth: int = 0) -> Any:
+        """Builds an example value of a schema, the values it declares taking precedence."""
+        if isinstance(schema, dict) and isinstance(schema.get("$ref"), str):
+            ref = schema["$ref"]
+            if ref in self.examples:
+                return self.examples[ref]
+            if ref in self.building:
+                return None
+            self.building.add(ref)
+            try:
+                value = self.example(self.resolve(schema), depth + 1)
+            finally:
+                self.building.discard(ref)
+            self.examples[ref] = value
+            return value
+        if not isinstance(schema, dict) or depth > MAX_EXAMPLE_DEPTH:
+            return None
+
+        for key in ("example", "default", "const"):
+            if key in schema:
+                return schema[key]
+        if isinstance(schema.get("examples"), list) and schema["examples"]:
+            return schema["examples"][0]
+        if isinstance(schema.get("enum"), list) and schema["enum"]:
+            return schema["enum"][0]
+        if isinstance(schema.get("allOf"), list):
+            merged: Dict[str, Any] = {}
+            for part in [*schema["allOf"], {key: value for key, value in schema.items() if key != "allOf"}]:
+                value = self.example(part, depth + 1)
+                if isinstance(value, dict):
+                    merged.update(value)
+            return merged
+        for key in ("oneOf", "anyOf"):
+            if isinstance(schema.get(key), list) and schema[key]:
+                return self.example(schema[key][0], depth + 1)
+
+        schema_type = schema.get("type")
+        if isinstance(schema_type, list):
+            schema_type = next((item for item in schema_type if item != "null"), None)
+        if schema_type == "object" or (schema_type is None and "properties" in schema):
+            properties = schema.get("properties") if isinstance(schema.get("properties"), dict) else {}
+            return {name: self.example(property_schema, depth + 1) for name, property_schema in properties.items()}
+        if schema_type == "array":
+            item = self.example(schema.get("items"), depth + 1)
+            return [] if item is None else [item]
+        if schema_type == "string":
+            return FORMAT_EXAMPLES.get(schema.get("format"), "string")
+        if schema_type == "integer":
+            return schema.get("minimum", 0)
+        if schema_type == "number":
+            return schema.get("minimum", 0.0)
+        if schema_type == "boolean":
+            return True
+        return None
+
+    def media_example(self, media_type: Dict[str, Any]) -> Any:
+        """Returns the example of a media type, declared or built from its schema."""
+        if "example" in media_type:
+            return media_type["example"]
+        examples = media_type.get("examples")
+        if isinstance(examples, dict) and examples:
+            example = self.resolve(next(iter(examples.values())))
+            if isinstance(example, dict) and "value" in example:
+                return example["value"]
+        return self.example(media_type.get("schema"))
+
+
+def get_base_url(spec: Dict[str, Any]) -> str:
+    """
+    Builds the base URL of the requests from the first server, its variables set to their default.
+
+    Args:
+        spec (Dict[str, Any]): The OpenAPI document.
+
+    Returns:
+        str: The server URL without a trailing slash, relative URLs are kept relative.
+    """
+    servers = spec.get("servers")
+    if not isinstance(servers, list) or not servers or not isinstance(servers[0], dict):
+        return ""
+    server = servers[0]
+    variables = server.get("variables") if isinstance(server.get("variables"), dict) else {}
+    url = PATH_TEMPLATE.sub(lambda match: str((variables.get(match.group(1)) or {}).get("default", "")),
+                            server.get("url", ""))
+    return url.rstrip("/")
+
+
+def merge_parameters(resolver: SpecResolver, *parameter_lists: Any) -> List[Dict[str, Any]]:
+    """
+    Merges the parameters of a path item and of an operation, the operation overriding the path item.
+
+    Args:
+        resolver (SpecResolver): Resolves the $refs.
+        *parameter_lists (Any): The parameters lists, in increasing precedence.
+
+    Returns:
+        List[Dict[str, Any]]: The parameters, by (name, in).
+    """
+    parameters: Dict[Tuple[str, str], Dict[str, Any]] = {}
+    for parameter_list in parameter_lists:
+        for parameter in parameter_list if isinstance(parameter_list, list) else []:
+            parameter = resolver.resolve(parameter)
+            if isinstance(parameter, dict) and "name" in parameter:
+                parameters[(parameter["name"], parameter.get("in", ""))] = parameter
+    return list(parameters.values())
+
+
+def read_request_body(resolver: SpecResolver, request_body: Any) -> Tuple[Any, Optional[str], Optional[str]]:
+    """
+    Builds the example body of an operation, preferring JSON, then form and multipart content.
+
+    Args:
+        resolver (SpecResolver): Resolves the $refs and builds the examples.
+        request_body (Any): The requestBody of the operation.
+
+    Returns:
+        Tuple[Any, Optional[str], Optional[str]]: The body, its mode and content type, NO_BODY_CONTENT and None
+            for operations without a body.
+    """
+    request_body = resolver.resolve(request_body)
+    content = request_body.get("content") if isinstance(request_body, dict) else None
+    if not isinstance(content, dict) or not content:
+        return NO_BODY_CONTENT, None, None
+
+    content_type = next((name for name in content if JSON_CONTENT.match(name)), None) \
+        or next((name for name in content if name in (FORM_CONTENT, MULTIPART_CONTENT)), None) \
+        or next(iter(content))
+    media_type = content[content_type] if isinstance(content[content_type], dict) else {}
+    example = resolver.media_example(media_type)
+    if content_type in (FORM_CONTENT, MULTIPART_CONTENT):
+        fields = example if isinstance(example, dict) else {}
+        body = [{"key": name, "value": value if isinstance(value, str) else json.dumps(value)}
+                for name, value in fields.items()]
+        return body, (FORMDATA_BODY if content_type == MULTIPART_CONTENT else URLENCODED_BODY), content_type
+    if example is None:
+        return NO_BODY_CONTENT, None, content_type
+    if isinstance(example, str):
+        return example, RAW_BODY, content_type
+    # Keyed by identity, the cached example is kept alive so that its id cannot be reused
+    cached = resolver.bodies.get(id(example))
+    if cached is None or cached[0] is not example:
+        cached = resolver.bodies[id(example)] = (example, json.dumps(example, indent=2))
+    return cached[1], RAW_BODY, content_type
+
+
+def get_expected_status(responses: Any) -> Optional[str]:
+    """
+    Finds the first success status an operation documents.
+
+    Args:
+        responses (Any): The responses of the operation.
+
+    Returns:
+        Optional[str]: The status code, None when no 2xx code is documented.
+    """
+    if not isinstance(responses, dict):
+        return None
+    return next((str(code) for code in responses if str(code).isdigit() and str(code).startswith("2")), None)
+
+
+def to_request_node(resolver: SpecResolver, base_url: str, path: str, method: str, operation: Dict[str, Any],
+                    path_parameters: Any, node_id: str, parent_id: str) -> Dict[str, Any]:
+    """
+    Converts an operation into a request of the test plan structure.
+
+    Path, query and header parameters become ${name} placeholders, so the values are set per environment.
+
+    Args:
+        resolver (SpecResolver): Resolves the $refs and builds the examples.
+        base_url (str): The server URL.
+        path (str): The path template of the operation.
+        method (str): The HTTP method, lower case.
+        operation (Dict[str, Any]): The operation.
+        path_parameters (Any): The parameters of the path item.
+        node_id (str): The id of the request.
+        parent_id (str): The id of its controller.
+
+    Returns:
+        Dict[str, Any]: The request, as read by read_postman_collection.
+    """
+    parameters = merge_parameters(resolver, path_parameters, operation.get("parameters"))
+    query = "&".join(f"{parameter['name']}=${{{parameter['name']}}}" for parameter in parameters
+                     if parameter.get("in") == "query")
+    raw_url = base_url + PATH_TEMPLATE.sub(r"${\1}", path) + (f"?{query}" if query else "")
+    headers = [{"key": parameter["name"], "value": f"${{{parameter['name']}}}"} for parameter in parameters
+               if parameter.get("in") == "header"]
+
+    body, body_mode, content_type = read_request_body(resolver, operation.get("requestBody"))
+    if content_type and body_mode != FORMDATA_BODY:
+        headers.append({"key": "Content-Type", "value": content_type})
+    status = get_expected_status(operation.get("responses"))
+    name = operation.get("operationId") or operation.get("summary") or f"{method.upper()} {path}"
+    return {
+        "id": node_id,
+        "name": str(name).replace("&", "and"),
+        "type": "request",
+        "parent": parent_id,
+        "method": method.upper(),
+        "raw_url": raw_url,
+        "queryParams": extract_query_params(raw_url),
+        "body": body,
+        "body_mode": body_mode,
+        "headers": headers,
+        "tests": [{"name": f"Status code is {status}", "script": f"pm.response.to.have.status({status});"}]
+        if status else [],
+        "variables": []
+    }
+
+
+def parse_openapi(spec: Dict[str, Any], name: str = "OpenAPI") -> Dict[str, Any]:
+    """
+    Converts an OpenAPI 3 document into the test plan structure consumed by the JMX creator.
+
+    Every tag becomes a controller holding one request per operation, in the order of the tags declared by the
+    document, then of their first use. An operation is filed under its first tag, untagged operations under
+    "default".
+
+    Args:
+        spec (Dict[str, Any]): The OpenAPI document.
+        name (str): The name of the test plan, the document title takes precedence.
+
+    Returns:
+        Dict[str, Any]: The test plan structure returned by read_postman_collection, without a load profile.
+
+    Raises:
+        ValueError: If the document is not an OpenAPI 3 document.
+    """
+    if not isinstance(spec, dict) or not str(spec.get("openapi", "")).startswith("3"):
+        raise ValueError("Only OpenAPI 3 documents are supported")
+
+    resolver = SpecResolver(spec)
+    base_url = get_base_url(spec)
+    controllers: Dict[str, Dict[str, Any]] = {}
+    node_count = 0
+
+    def get_controller(tag: str) -> Dict[str, Any]:
+        nonlocal node_count
+        if tag not in controllers:
+            node_count += 1
+            controllers[tag] = {"id": f"controller_{node_count}", "name": tag.replace("&", "and"),
+                                "type": "generic_controller", "parent": None, "children": []}
+        return controllers[tag]
+
+    for tag in spec.get("tags") or []:
+        if isinstance(tag, dict) and tag.get("name"):
+            get_controller(str(tag["name"]))
+
+    paths = spec.get("paths") if isinstance(spec.get("paths"), dict) else {}
+    for path, path_item in paths.items():
+        path_item = resolver.resolve(path_item)
+        if not isinstance(path_item, dict):
+            continue
+        for method in HTTP_METHODS:
+            operation = path_item.get(method)
+            if not isinstance(operation, dict):
+                continue
+            tags = operation.get("tags")
+            controller = get_controller(str(tags[0]) if isinstance(tags, list) and tags else UNTAGGED)
+            node_count += 1
+            controller["children"].append(to_request_node(resolver, base_url, path, method, operation,
+                                                          path_item.get("parameters"),
+                                                          f"controller_{node_count}", controller["id"]))
+
+    info = spec.get("info") if isinstance(spec.get("info"), dict) else {}
+    return {
+        "test_plan_name": str(info.get("title") or name).replace("&", "and"),
+        "test_plan_comments": "Converted from an OpenAPI document",
+        "test_fragment_controller": {
+            "name": "Test Fragment",
+            "generic_controllers": [controller for controller in controllers.values() if controller["children"]]
+        }
+    }
+
+
+def read_openapi(file_path: str) -> Dict[str, Any]:
+    """
+    Reads an OpenAPI 3 document, JSON or YAML, into the test plan structure consumed by the JMX creator.
+
+    Args:
+        file_path (str): Path to the document.
+
+    Returns:
+        Dict[str, Any]: The test plan structure, see parse_openapi.
+    """
+    return parse_openapi(load_spec(file_path), os.path.splitext(os.path.basename(strip_compression_extension(file_path)))[0])
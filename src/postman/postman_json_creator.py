@@ -1,9 +1,11 @@
 import os
 import json
 
+from src.helper.compression import strip_compression_extension
 from src.helper.file_utils import file_write
-from src.helper.id_utils import generate_uuid, generate_id
-from src.jmx.jmx_reader import get_test_plan
+from src.helper.placeholder_utils import to_postman_placeholders
+from src.helper.id_utils import generate_uuid, generate_id, content_seed
+from src.jmx.jmx_parallel_reader import get_test_plan_parallel
 import logging
 
 # Constants
@@ -15,71 +17,104 @@ QUERY_KEY = "query"
 logging.basicConfig(level=logging.ERROR)
 
 
-def create_postman_collection(source_file: str, output_path: str) -> None:
+def create_postman_collection(source_file: str, output_path: str, deterministic_ids: bool = False,
+                              normalize_bodies: bool = False) -> None:
     """
     Create a Postman collection by converting a JMX file.
 
     Args:
         source_file (str): The name of the source JMX file.
         output_path (str): The path where the Postman collection will be saved.
+        deterministic_ids (bool): Derive the collection IDs from its content instead of generating random ones.
+        normalize_bodies (bool): Parse and re-format JSON request bodies instead of passing them through.
     """
     current_file_dir = os.path.dirname(__file__)
     parent_folder_path = os.path.abspath(os.path.join(current_file_dir, os.pardir))
     jmeter_jmx_path_final = os.path.join(parent_folder_path, "file_to_convert",
                                          f"{source_file}.jmx") if not os.path.exists(source_file) else source_file
 
-    if not output_path.endswith(".json"):
+    if not strip_compression_extension(output_path).endswith(".json"):
         output_path = os.path.join(parent_folder_path, f"out/{output_path}.json")
 
-    collection = generate_postman_collection(jmeter_jmx_path_final)
+    collection = generate_postman_collection(jmeter_jmx_path_final, deterministic_ids=deterministic_ids,
+                                             normalize_bodies=normalize_bodies)
     save_json(output_path, collection)
 
 
-def generate_postman_collection(file_path: str) -> dict:
+def generate_postman_collection(file_path: str, deterministic_ids: bool = False,
+                                normalize_bodies: bool = False) -> dict:
     """
     Generate a Postman collection from a JMX test plan.
 
+    Uncompressed plans of MIN_PARALLEL_SIZE bytes or more are parsed in a process pool, one batch of
+    top-level controllers per worker, smaller ones sequentially.
+
     Args:
         file_path (str): The path to the JMX file.
+        deterministic_ids (bool): Derive the collection IDs from its content, so the same test plan
+                                  always produces byte-identical output.
+        normalize_bodies (bool): Parse and re-format JSON request bodies instead of passing them through.
+
+    Returns:
+        dict: A dictionary representing the Postman collection.
+    """
+    return build_postman_collection(get_test_plan_parallel(file_path), deterministic_ids, normalize_bodies)
+
+
+def build_postman_collection(jmx_data: dict, deterministic_ids: bool = False, normalize_bodies: bool = False) -> dict:
+    """
+    Build a Postman collection from an already extracted JMX test plan structure.
+
+    Args:
+        jmx_data (dict): The test plan structure returned by get_test_plan.
+        deterministic_ids (bool): Derive the collection IDs from its content instead of generating random ones.
+        normalize_bodies (bool): Parse and re-format JSON request bodies instead of passing them through.
 
     Returns:
         dict: A dictionary representing the Postman collection.
     """
-    jmx_data = get_test_plan(file_path)
-    postman_collection = generate_info(jmx_data)
-    items = extract_items(jmx_data)
+    postman_collection = generate_info(jmx_data, deterministic_ids)
+    items = extract_items(jmx_data, normalize_bodies)
 
     # Adding items to the collection
     postman_collection['item'] = items
     return postman_collection
 
 
-def generate_info(jmx_data: dict) -> dict:
+def generate_info(jmx_data: dict, deterministic_ids: bool = False) -> dict:
     """
     Generate the info section of the Postman collection.
 
     Args:
         jmx_data (dict): The JMX data.
+        deterministic_ids (bool): Derive the IDs from a hash of the JMX data instead of generating random ones.
 
     Returns:
         dict: A dictionary containing the collection info.
     """
+    if deterministic_ids:
+        seed = content_seed(jmx_data)
+        postman_id, exporter_id = generate_uuid(seed), generate_id(seed)
+    else:
+        postman_id, exporter_id = generate_uuid(), generate_id()
+
     return {
         "info": {
-            "_postman_id": generate_uuid(),
+            "_postman_id": postman_id,
             "name": jmx_data["name"],
             "schema": "https://schema.getpostman.com/json/collection/v2.1.0/collection.json",
-            "_exporter_id": generate_id()
+            "_exporter_id": exporter_id
         }
     }
 
 
-def extract_items(jmx_data: dict) -> list:
+def extract_items(jmx_data: dict, normalize_bodies: bool = False) -> list:
     """
     Extract items from JMX data.
 
     Args:
         jmx_data (dict): The JMX data.
+        normalize_bodies (bool): Parse and re-format JSON request bodies instead of passing them through.
 
     Returns:
         list: A list of extracted items for the Postman collection.
@@ -89,18 +124,19 @@ def extract_items(jmx_data: dict) -> list:
         item_data = jmx_item["item"]
         postman_item = {
             "name": item_data["name"],
-            "item": extract_sub_items(item_data)  # Recursively extract sub-controller items
+            "item": extract_sub_items(item_data, normalize_bodies)  # Recursively extract sub-controller items
         }
         items.append(postman_item)
     return items
 
 
-def extract_sub_items(item_data: dict) -> list:
+def extract_sub_items(item_data: dict, normalize_bodies: bool = False) -> list:
     """
     Extract sub-items (requests) from item data and check for duplicates.
 
     Args:
         item_data (dict): The item data containing requests.
+        normalize_bodies (bool): Parse and re-format JSON request bodies instead of passing them through.
 
     Returns:
         list: A list of sub-items (requests) for the Postman collection.
@@ -112,13 +148,15 @@ def extract_sub_items(item_data: dict) -> list:
         for request in item_data["requests"]:
             request_name = request["name"]
 
-            if not add_unique_request_to_collection(request_name, seen_requests, sub_items, request, item_data["name"]):
+            if not add_unique_request_to_collection(request_name, seen_requests, sub_items, request, item_data["name"],
+                                                    normalize_bodies):
                 continue
 
     return sub_items
 
 
-def add_unique_request_to_collection(request_name, seen_requests, sub_items, request, item_name):
+def add_unique_request_to_collection(request_name, seen_requests, sub_items, request, item_name,
+                                     normalize_bodies=False):
     """
     Check for duplicates and add a unique request to the collection.
 
@@ -128,6 +166,7 @@ def add_unique_request_to_collection(request_name, seen_requests, sub_items, req
         sub_items (list): The list of current sub-items (requests) in the collection.
         request (dict): The request data.
         item_name (str): The name of the item the request belongs to.
+        normalize_bodies (bool): Parse and re-format JSON request bodies instead of passing them through.
 
     Returns:
         bool: True if the request is added, False if it is skipped (duplicate).
@@ -136,7 +175,7 @@ def add_unique_request_to_collection(request_name, seen_requests, sub_items, req
         logging.warning(f"Duplicate request '{request_name}' detected in '{item_name}'. Skipping.")
         return False
 
-    body = generate_body(request) if request.get("arguments", {}).get(BODY_KEY) is not None else None
+    body = generate_body(request, normalize_bodies) if request.get("arguments", {}).get(BODY_KEY) is not None else None
     postman_request = {
         "name": request_name,
         "request": {
@@ -223,25 +262,32 @@ def is_special_argument(value: str) -> bool:
     return "\r\n" in value or "\"" in value
 
 
-def generate_body(request: dict) -> dict:
+def generate_body(request: dict, normalize_bodies: bool = False) -> dict:
     """
     Generate the body for POST requests.
 
+    Raw bodies are carried through as text with their placeholders translated, so they are neither
+    parsed nor re-serialized and non-JSON bodies are kept as they are.
+
     Args:
         request (dict): The request data.
+        normalize_bodies (bool): Parse JSON bodies and re-format them with generate_raw_json instead.
 
     Returns:
         dict: A dictionary representing the body for the Postman request.
     """
     arguments = request.get("arguments", {})
     if BODY_KEY in arguments and isinstance(arguments[BODY_KEY], str):
-        body = generate_raw_json(arguments[BODY_KEY])
+        if normalize_bodies:
+            body = generate_raw_json(arguments[BODY_KEY])
+        else:
+            body = replace_placeholders(arguments[BODY_KEY])
         return {
             "mode": "raw",
             "raw": body,
             "options": {
                 "raw": {
-                    "language": "json"
+                    "language": detect_body_language(body)
                 }
             }
         }
@@ -261,6 +307,22 @@ def generate_body(request: dict) -> dict:
     }
 
 
+def detect_body_language(body: str) -> str:
+    """
+    Detect the Postman raw body language from the first character of the body.
+
+    Args:
+        body (str): The raw body.
+
+    Returns:
+        str: "json" for JSON objects and arrays, "xml" for XML documents, "text" otherwise.
+    """
+    first = body.lstrip()[:1]
+    if first in ("{", "["):
+        return "json"
+    return "xml" if first == "<" else "text"
+
+
 def generate_raw_json(body_data) -> str:
     """
     Convert the body data dictionary or list into a formatted JSON string.
@@ -309,7 +371,7 @@ def generate_raw_json(body_data) -> str:
 
 def replace_placeholders(value):
     """
-    Recursively convert placeholders from ${key} to {{key}}.
+    Convert placeholders from ${key} to {{key}}, leaving any other braces untouched.
 
     Args:
         value: The value to process (string, dict, or list).
@@ -317,14 +379,7 @@ def replace_placeholders(value):
     Returns:
         The processed value with placeholders replaced.
     """
-    if isinstance(value, str):
-        return value.replace("${", "{{").replace("}", "}}")
-    elif isinstance(value, dict):
-        return {k: replace_placeholders(v) for k, v in value.items()}
-    elif isinstance(value, list):
-        return [replace_placeholders(item) for item in value]
-    else:
-        return value
+    return to_postman_placeholders(value)
 
 
 def save_json(file_path: str, data: dict) -> None:
@@ -1,12 +1,23 @@
 import json
 import os
 import re
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Set
 from urllib.parse import urlparse, parse_qsl
-from jsonschema import validate, ValidationError
+from jsonschema import validate, validators, ValidationError
+from src.helper.compression import open_input
 from src.helper.file_utils import file_load  # Assuming this function exists and is imported correctly
+from src.helper.placeholder_utils import to_jmeter_placeholders
 from pathlib import Path
 
+# Body of requests without a body (or with an unsupported one)
+NO_BODY_CONTENT = "No body content"
+
+# pm.environment.set("name", value), also for collection, global and local variables
+VARIABLE_SETTER_PATTERN = re.compile(
+    r"pm\.(?:environment|collectionVariables|globals|variables)\.set\(\s*[\"']([^\"']+)[\"']\s*,\s*([^;]+?)\s*\)\s*(?:;|$)")
+# var jsonData = pm.response.json();
+RESPONSE_JSON_HOLDER_PATTERN = re.compile(r"(?:var|let|const)\s+(\w+)\s*=\s*pm\.response\.json\(\)")
+
 
 def get_schema_path(relative_path: str) -> Path:
     """
@@ -20,16 +31,35 @@ def get_schema_path(relative_path: str) -> Path:
     return project_root / relative_path
 
 
-def validate_postman_schema(data: Dict[str, Any], schema_file_path: str = 'data/postman_schema.json') -> None:
+def create_schema_validator(schema_file_path: str = 'data/postman_schema.json') -> Any:
+    """
+    Loads the schema once and builds a reusable validator for it, so long-running processes
+    do not re-read and re-check the schema for every collection.
+
+    :param schema_file_path: Path to the schema file.
+    :return: A jsonschema validator instance for the schema.
+    """
+    schema = json.loads(file_load(str(get_schema_path(schema_file_path))))
+    validator_class = validators.validator_for(schema)
+    validator_class.check_schema(schema)
+    return validator_class(schema)
+
+
+def validate_postman_schema(data: Dict[str, Any], schema_file_path: str = 'data/postman_schema.json',
+                            validator: Any = None) -> None:
     """
     Validates a Postman collection against a JSON schema.
 
     :param data: The Postman collection data to validate.
     :param schema_file_path: Path to the schema file.
+    :param validator: A validator built by create_schema_validator, the schema file is loaded when omitted.
     :raises ValidationError: If the data does not conform to the schema.
     """
+    schema_path = get_schema_path(schema_file_path)
     try:
-        schema_path = get_schema_path(schema_file_path)
+        if validator is not None:
+            validator.validate(data)
+            return
         schema = json.loads(file_load(str(schema_path)))  # Assuming file_load returns JSON content as string
         validate(instance=data, schema=schema)
     except ValidationError as e:
@@ -43,20 +73,35 @@ def validate_postman_schema(data: Dict[str, Any], schema_file_path: str = 'data/
 
 def read_postman_collection(file_path: str) -> Optional[Dict[str, Any]]:
     """
-    Reads a Postman collection from a JSON file and validates it against the schema.
+    Reads a Postman collection from a JSON file, gzip, zstd or xz compressed or not, and validates it against
+    the schema.
     """
     if not os.path.isfile(file_path):
         raise FileNotFoundError(f"Error: The file '{file_path}' does not exist.")
 
     data: Dict[str, Any] = {}
     try:
-        with open(file_path, 'r') as json_file:
+        with open_input(file_path, 'r') as json_file:
             data = json.load(json_file)
     except json.JSONDecodeError as e:
         print(f"Error: Failed to decode JSON - {e}")
         return None
 
-    validate_postman_schema(data)
+    return parse_postman_collection(data)
+
+
+def parse_postman_collection(data: Dict[str, Any], validator: Any = None) -> Dict[str, Any]:
+    """
+    Validates an already decoded Postman collection and converts it into the test plan structure.
+
+    :param data: The decoded Postman collection.
+    :param validator: An optional validator built by create_schema_validator.
+    :return: The test plan structure consumed by the JMX creator.
+    """
+    if validator is None:
+        validate_postman_schema(data)
+    else:
+        validate_postman_schema(data, validator=validator)
 
     info = data.get("info", {})
     test_plan_name = info.get("name", "Unnamed Test Plan").replace("&", "and")
@@ -107,7 +152,7 @@ def extract_request_data(item: Dict[str, Any], controller_id: str, parent_id: Op
     Extracts the relevant data from a request item.
     """
     raw_url = item["request"].get("url", {}).get("raw", "No URL")
-    raw_url = raw_url.replace('{{', '${').replace('}}', '}')
+    raw_url = to_jmeter_placeholders(raw_url)
     name = item.get("name", "Unnamed Request").replace("&", "and")
 
     return {
@@ -118,8 +163,11 @@ def extract_request_data(item: Dict[str, Any], controller_id: str, parent_id: Op
         "method": item["request"].get("method", "GET"),
         "raw_url": raw_url,
         "queryParams": extract_query_params(raw_url),
-        "body": extract_request_body(item["request"]),
-        "tests": extract_tests(item.get("event", []))
+        "body": to_jmeter_placeholders(extract_request_body(item["request"])),
+        "body_mode": extract_body_mode(item["request"]),
+        "headers": extract_headers(item["request"]),
+        "tests": extract_tests(item.get("event", [])),
+        "variables": extract_variables(item.get("event", []))
     }
 
 
@@ -136,12 +184,21 @@ def extract_request_body(request: Dict[str, Any]) -> Any:
     """
     Extracts the body content from a request.
     """
-    if "body" in request and request["body"] is not None and request["body"].get("mode"):
-        mode = request["body"]["mode"]
+    mode = extract_body_mode(request)
+    if mode:
         body_data = request["body"].get(mode, None)
         return process_body_data(mode, body_data)
 
-    return "No body content"
+    return NO_BODY_CONTENT
+
+
+def extract_body_mode(request: Dict[str, Any]) -> Optional[str]:
+    """
+    Extracts the body mode (raw, formdata, urlencoded, file) of a request, None when it has no body.
+    """
+    if "body" in request and request["body"] is not None:
+        return request["body"].get("mode") or None
+    return None
 
 
 def process_body_data(mode: str, body_data: Any) -> Any:
@@ -156,7 +213,18 @@ def process_body_data(mode: str, body_data: Any) -> Any:
         return [{"key": item["key"], "value": item["value"]} for item in body_data] if body_data else []
     elif mode == "file":
         return "File upload not supported in JSON output"
-    return "No body content"
+    return NO_BODY_CONTENT
+
+
+def extract_headers(request: Dict[str, Any]) -> List[Dict[str, str]]:
+    """
+    Extracts the enabled headers of a request, with Postman placeholders converted to JMeter ones.
+    """
+    headers = request.get("header") or []
+    if isinstance(headers, str):
+        return []  # headers given as a single raw string are not supported
+    return [{"key": header["key"], "value": to_jmeter_placeholders(header.get("value", ""))}
+            for header in headers if header.get("key") and not header.get("disabled")]
 
 
 def extract_tests(events: List[Dict[str, Any]]) -> List[Dict[str, str]]:
@@ -177,6 +245,45 @@ def extract_tests(events: List[Dict[str, Any]]) -> List[Dict[str, str]]:
     return test_scripts
 
 
+def extract_variables(events: List[Dict[str, Any]]) -> List[Dict[str, Optional[str]]]:
+    """
+    Extracts the variables set by the test scripts of a request, with the response JSON path they are set from.
+
+    Only values read from the response JSON (pm.response.json().a.b or a variable holding it) get a path,
+    the path is None for any other expression.
+    """
+    variables: List[Dict[str, Optional[str]]] = []
+    json_holders = {"pm.response.json()"}
+
+    for event in events:
+        if event.get("listen") != "test":
+            continue
+        script_lines = event.get("script", {}).get("exec", [])
+        if isinstance(script_lines, str):
+            script_lines = script_lines.splitlines()
+        for line in script_lines:
+            holder = RESPONSE_JSON_HOLDER_PATTERN.search(line)
+            if holder:
+                json_holders.add(holder.group(1))
+            for match in VARIABLE_SETTER_PATTERN.finditer(line):
+                variables.append({"name": match.group(1), "path": extract_json_path(match.group(2), json_holders)})
+
+    return variables
+
+
+def extract_json_path(expression: str, json_holders: Set[str]) -> Optional[str]:
+    """
+    Converts an expression such as jsonData.data[0].token into the path data.0.token, None when the expression
+    does not read the response JSON.
+    """
+    expression = expression.strip()
+    for holder in json_holders:
+        if expression.startswith(holder + ".") or expression.startswith(holder + "["):
+            path = re.sub(r"\[\s*[\"']?([^\]\"']+)[\"']?\s*\]", r".\1", expression[len(holder):])
+            return path.lstrip(".") or None
+    return None
+
+
 def extract_pm_tests(script_lines: List[str]) -> List[Dict[str, str]]:
     """
     Extracts individual tests from Postman test scripts.
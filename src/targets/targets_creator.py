@@ -0,0 +1,525 @@
+import hashlib
+import logging
+import os
+from collections import Counter
+from typing import Any, Dict, FrozenSet, Generator, Iterator, List, NamedTuple, Optional, Set, Tuple
+from urllib.parse import urlencode, urlsplit
+
+from lxml import etree
+
+from src.har.har_reader import read_har
+from src.helper.compression import strip_compression_extension
+from src.helper.importer import load_source
+from src.helper.placeholder_utils import JMETER_PLACEHOLDER
+from src.jmx.jmx_creator import (
+    RAW_BODY,
+    Header,
+    get_body_mode,
+    get_request_headers,
+    iter_requests,
+    resolve_postman_path
+)
+from src.jmx.jmx_reader import extract_http_request_details
+from src.jmx.jmx_stream_reader import CLOSE, OPEN, get_hash_tree, is_enabled, iter_plan_elements
+from src.jmx.jmx_variables import load_environment
+from src.k6.k6_jmx_creator import (
+    BODY_METHODS,
+    CONTAINER_DEPTH,
+    build_url,
+    merge_origin,
+    read_external_body,
+    read_headers,
+    read_origin
+)
+from src.openapi.openapi_reader import is_openapi_file, read_openapi
+from src.postman.postman_json_reader import read_postman_collection
+
+logging.basicConfig(level=logging.ERROR)
+
+# Output formats
+VEGETA_FORMAT = "vegeta"
+WRK_FORMAT = "wrk"
+
+FORM_CONTENT_TYPE = "application/x-www-form-urlencoded"
+
+# Requests per Lua function in the wrk script, LuaJIT allows 65536 constants per function
+WRK_CHUNK_SIZE = 1000
+
+WRK_HEADER_LUA = """\
+local requests = {}
+local chunks = {}
+local bodies = {}
+
+-- Bodies are read once from the files next to the script, paths are relative to the working directory
+local function body(path)
+  if bodies[path] == nil then
+    local file = assert(io.open(path, "rb"))
+    bodies[path] = file:read("*a")
+    file:close()
+  end
+  return bodies[path]
+end
+
+local function add(method, path, headers, body_path)
+  requests[#requests + 1] = wrk.format(method, path, headers, body_path and body(body_path))
+end
+"""
+
+WRK_FOOTER_LUA = """
+init = function(args)
+  for _, chunk in ipairs(chunks) do
+    chunk()
+  end
+  chunks = nil
+end
+
+local index = 0
+
+request = function()
+  index = index % #requests + 1
+  return requests[index]
+end
+"""
+
+
+class Target(NamedTuple):
+    """
+    A request flattened for a load generator, with its placeholders resolved.
+
+    Attributes:
+        name (str): The name of the request in the source.
+        method (str): The HTTP method.
+        url (str): The absolute URL, query string included.
+        headers (List[Header]): The headers, in the order of the source.
+        body (Optional[str]): The body sent, None when the request has none.
+    """
+    name: str
+    method: str
+    url: str
+    headers: List[Header]
+    body: Optional[str]
+
+
+class PlaceholderResolver:
+    """
+    Substitutes the ${name} placeholders of the requests with the values of an environment.
+
+    Unknown names are kept as they are and collected in missing, to be reported once for the whole source
+    instead of once per request.
+    """
+
+    def __init__(self, environment: Optional[Dict[str, str]] = None):
+        self.environment = dict(environment or {})
+        self.defaults: Dict[str, str] = {}
+        self.missing: Set[str] = set()
+
+    def set_default(self, name: str, value: str) -> None:
+        # Variables defined by the source, the supplied environment takes precedence over them
+        self.defaults[name] = value
+
+    def __call__(self, text: str) -> str:
+        if "${" not in text:
+            return text
+        parts = JMETER_PLACEHOLDER.split(text)
+        for index in range(1, len(parts), 2):
+            name = parts[index]
+            if name in self.environment:
+                parts[index] = self.environment[name]
+            elif name in self.defaults:
+                parts[index] = self.defaults[name]
+            else:
+                self.missing.add(name)
+                parts[index] = f"${{{name}}}"
+        return "".join(parts)
+
+
+def iter_postman_targets(data: Dict[str, Any], resolve: PlaceholderResolver) -> Iterator[Target]:
+    """
+    Flattens the requests of a Postman collection, folders included, in document order.
+
+    Form bodies are sent urlencoded, file fields are not supported by the target formats.
+
+    Args:
+        data (Dict[str, Any]): The test plan structure returned by read_postman_collection.
+        resolve (PlaceholderResolver): Substitutes the placeholders.
+
+    Yields:
+        Target: The requests.
+    """
+    for controller in data['test_fragment_controller']['generic_controllers']:
+        for request in iter_requests(controller):
+            headers = [(resolve(name), resolve(value)) for name, value in get_request_headers(request)]
+            body_mode = get_body_mode(request)
+            body = None
+            if body_mode == RAW_BODY:
+                body = resolve(request['body'])
+            elif body_mode:
+                body = urlencode([(resolve(field['key']), resolve(field.get('value') or ''))
+                                  for field in request['body']])
+                if not any(name.lower() == "content-type" for name, _ in headers):
+                    headers.append(("Content-Type", FORM_CONTENT_TYPE))
+            yield Target(request['name'], request['method'], resolve(request['raw_url']), headers, body)
+
+
+def read_variables(element: etree._Element) -> List[Tuple[str, str]]:
+    """
+    Reads the User Defined Variables of a test plan or of an Arguments config element.
+
+    Args:
+        element (etree._Element): The TestPlan or Arguments element.
+
+    Returns:
+        List[Tuple[str, str]]: The (name, value) pairs.
+    """
+    return [(argument.findtext("stringProp[@name='Argument.name']", ""),
+             argument.findtext("stringProp[@name='Argument.value']", ""))
+            for argument in element.iterfind(".//elementProp[@elementType='Argument']")]
+
+
+class JmxTargetReader:
+    """
+    Flattens the samplers of a JMX plan streamed by iter_plan_elements.
+
+    Like in JMeter, headers and HTTP Request Defaults apply to their whole scope, but as the plan is read in a
+    single pass, only to the samplers that follow them. IncludeControllers are followed, disabled elements
+    are skipped.
+    """
+
+    def __init__(self, resolve: PlaceholderResolver, base_dir: str):
+        self.resolve = resolve
+        self.base_dir = base_dir
+        self.scopes: List[Dict[str, Any]] = [{'headers': [], 'origin': ("", "", "")}]
+
+    def iter_targets(self, file_path: str) -> Iterator[Target]:
+        yield from self.iter_file(file_path, frozenset({os.path.abspath(file_path)}))
+
+    def iter_file(self, file_path: str, visited: FrozenSet[str], included: bool = False) -> Iterator[Target]:
+        # Elements of an included file are read as children of the IncludeController, without its test plan
+        # and test fragment
+        skip_depth = None
+        for event, element, depth in iter_plan_elements(file_path):
+            if skip_depth is not None:
+                if event == CLOSE and depth == skip_depth:
+                    skip_depth = None
+                continue
+            if included and depth <= CONTAINER_DEPTH:
+                continue
+            if not is_enabled(element):
+                if event == OPEN:
+                    skip_depth = depth
+                continue
+            if event == OPEN:
+                if element.tag == "TestPlan":
+                    self.add_variables(element)
+                parent = self.scopes[-1]
+                self.scopes.append({'headers': parent['headers'], 'origin': parent['origin']})
+            elif event == CLOSE:
+                self.scopes.pop()
+            else:
+                yield from self.add_element(element, visited)
+
+    def add_variables(self, element: etree._Element) -> None:
+        for name, value in read_variables(element):
+            self.resolve.set_default(name, self.resolve(value))
+
+    def add_element(self, element: etree._Element, visited: FrozenSet[str]) -> Iterator[Target]:
+        scope = self.scopes[-1]
+        if element.tag == "HTTPSamplerProxy":
+            yield self.create_target(element)
+        elif element.tag == "HeaderManager":
+            headers = read_headers(element)
+            names = {name.lower() for name, _ in headers}
+            scope['headers'] = [header for header in scope['headers'] if header[0].lower() not in names] + headers
+        elif element.tag == "ConfigTestElement":
+            scope['origin'] = merge_origin(scope['origin'], read_origin(element))
+        elif element.tag == "Arguments":
+            self.add_variables(element)
+        elif element.tag == "IncludeController":
+            yield from self.include(element, visited)
+
+    def include(self, include: etree._Element, visited: FrozenSet[str]) -> Iterator[Target]:
+        include_path = include.findtext(".//stringProp[@name='IncludeController.includepath']", "")
+        file_path = os.path.abspath(os.path.join(self.base_dir, include_path))
+        if not include_path or file_path in visited:
+            logging.error(f"Skipping include of '{include_path}': missing path or include cycle")
+            return
+        parent = self.scopes[-1]
+        self.scopes.append({'headers': parent['headers'], 'origin': parent['origin']})
+        yield from self.iter_file(file_path, visited | {file_path}, included=True)
+        self.scopes.pop()
+
+    def create_target(self, sampler: etree._Element) -> Target:
+        scope = self.scopes[-1]
+        details = extract_http_request_details(sampler)
+        hash_tree = get_hash_tree(sampler)
+        own_headers = [header for child in (hash_tree if hash_tree is not None else [])
+                       if child.tag == "HeaderManager" and is_enabled(child) for header in read_headers(child)]
+        own_names = {name.lower() for name, _ in own_headers}
+        headers = [header for header in scope['headers'] if header[0].lower() not in own_names] + own_headers
+        headers = [(self.resolve(name), self.resolve(value)) for name, value in headers]
+
+        method = details['method']
+        arguments = details['arguments']
+        url = self.resolve(build_url(details['path'], merge_origin(scope['origin'], read_origin(sampler))))
+        body = None
+        if arguments and sampler.findtext(".//boolProp[@name='HTTPSampler.postBodyRaw']") == "true":
+            body = next(iter(arguments.values()))
+            external_body = read_external_body(body, self.base_dir)
+            body = self.resolve(external_body if external_body is not None else body)
+        elif arguments and method.upper() in BODY_METHODS:
+            body = urlencode([(self.resolve(name), self.resolve(value)) for name, value in arguments.items()])
+            if not any(name.lower() == "content-type" for name, _ in headers):
+                headers.append(("Content-Type", FORM_CONTENT_TYPE))
+        elif arguments:
+            query = urlencode([(self.resolve(name), self.resolve(value)) for name, value in arguments.items()])
+            url += ("&" if "?" in url else "?") + query
+        return Target(details['name'], method, url, headers, body)
+
+
+def iter_source_targets(source_file: str, resolve: PlaceholderResolver) -> Iterator[Target]:
+    """
+    Flattens the requests of a Postman collection, a JMX plan, a HAR recording or an OpenAPI document.
+
+    JMX plans are streamed, collections, HAR recordings and OpenAPI documents are loaded as a whole.
+
+    Args:
+        source_file (str): A .jmx plan, a .har recording, a .yaml OpenAPI document, or a Postman collection path
+            or name in file_to_convert.
+        resolve (PlaceholderResolver): Substitutes the placeholders.
+
+    Yields:
+        Target: The requests, in document order.
+
+    Raises:
+        FileNotFoundError: If the source does not exist.
+    """
+    source_name = strip_compression_extension(source_file)
+    if source_name.endswith('.har'):
+        yield from iter_postman_targets(load_source(source_file, ".har", read_har), resolve)
+        return
+    if is_openapi_file(source_file):
+        yield from iter_postman_targets(load_source(source_file, ".json", read_openapi), resolve)
+        return
+    if source_name.endswith('.jmx'):
+        base_dir = os.path.dirname(os.path.abspath(source_file))
+        yield from JmxTargetReader(resolve, base_dir).iter_targets(source_file)
+        return
+
+    postman_json_path_final = resolve_postman_path(source_file)
+    try:
+        data = read_postman_collection(postman_json_path_final)
+    except FileNotFoundError:
+        logging.error(f"File {postman_json_path_final} not found.")
+        raise
+    yield from iter_postman_targets(data, resolve)
+
+
+def write_body_file(body: str, body_dir: str) -> str:
+    """
+    Writes a body to its own file, named after the content hash so identical bodies share a file.
+
+    The file is created exclusively, which checks whether the body was written in the same system call, so
+    no body is kept in memory however many the source has.
+
+    Args:
+        body (str): The request body.
+        body_dir (str): The existing directory the body file is written to, next to the target list.
+
+    Returns:
+        str: The path of the file relative to the directory of the target list.
+    """
+    content = body.encode('utf-8')
+    file_name = f"body_{hashlib.blake2b(content, digest_size=8).hexdigest()}.txt"
+    try:
+        with open(os.path.join(body_dir, file_name), 'xb') as body_file:
+            body_file.write(content)
+    except FileExistsError:
+        pass
+    return f"{os.path.basename(os.path.normpath(body_dir))}/{file_name}"
+
+
+def is_absolute_url(url: str) -> bool:
+    """
+    Tells whether a URL can be sent, placeholders left unresolved in its origin make it relative.
+
+    Args:
+        url (str): The URL of a target.
+
+    Returns:
+        bool: True for http and https URLs with a host.
+    """
+    parts = urlsplit(url)
+    return parts.scheme in ("http", "https") and bool(parts.netloc) and "${" not in parts.netloc
+
+
+def create_vegeta_target(target: Target, body_path: Optional[str]) -> str:
+    """
+    Creates a target of the vegeta HTTP format: the request line, the headers and the body file.
+
+    Args:
+        target (Target): The request.
+        body_path (Optional[str]): The body file, relative to the target list.
+
+    Returns:
+        str: The target followed by the blank line separating it from the next one.
+    """
+    lines = [f"{target.method} {target.url}"]
+    lines.extend(f"{name}: {value}" for name, value in target.headers)
+    if body_path:
+        lines.append(f"@{body_path}")
+    return "\n".join(lines) + "\n\n"
+
+
+def lua_string(value: str) -> str:
+    """
+    Creates a Lua string literal, control characters are written as decimal escapes.
+
+    Args:
+        value (str): The string, written as UTF-8.
+
+    Returns:
+        str: The quoted literal.
+    """
+    escaped = value.replace("\\", "\\\\").replace('"', '\\"')
+    if any(ord(char) < 32 or ord(char) == 127 for char in escaped):
+        escaped = "".join(f"\\{ord(char):03d}" if ord(char) < 32 or ord(char) == 127 else char for char in escaped)
+    return f'"{escaped}"'
+
+
+def create_wrk_request(target: Target, body_path: Optional[str]) -> str:
+    """
+    Creates the Lua statement adding a request to the wrk request table.
+
+    wrk connects to the host of its command line, the host of the URL is sent in the Host header.
+
+    Args:
+        target (Target): The request.
+        body_path (Optional[str]): The body file, relative to the script.
+
+    Returns:
+        str: The add() call.
+    """
+    parts = urlsplit(target.url)
+    path = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+    headers = [("Host", parts.netloc)] + [header for header in target.headers if header[0].lower() != "host"]
+    headers_lua = ", ".join(f"[{lua_string(name)}] = {lua_string(value)}" for name, value in headers)
+    body_lua = lua_string(body_path) if body_path else "nil"
+    return f"  add({lua_string(target.method)}, {lua_string(path)}, {{ {headers_lua} }}, {body_lua})\n"
+
+
+def iter_target_list(targets: Iterator[Target], target_format: str, body_dir: str) -> Generator[str, None, int]:
+    """
+    Generates a vegeta target list or a wrk script from a stream of requests.
+
+    Requests whose URL is not absolute once resolved are skipped and counted, their number is logged at the
+    end. The wrk script adds its requests in functions of WRK_CHUNK_SIZE requests, run by init().
+
+    Args:
+        targets (Iterator[Target]): The requests.
+        target_format (str): VEGETA_FORMAT or WRK_FORMAT.
+        body_dir (str): The directory the bodies are written to.
+
+    Yields:
+        str: Consecutive fragments of the output.
+
+    Returns:
+        int: The number of requests written, the value of the StopIteration ending the generator.
+    """
+    wrk = target_format == WRK_FORMAT
+    if wrk:
+        yield WRK_HEADER_LUA
+    origins: Counter = Counter()
+    count = skipped = 0
+    for target in targets:
+        if not is_absolute_url(target.url):
+            skipped += 1
+            continue
+        body_path = write_body_file(target.body, body_dir) if target.body else None
+        if wrk:
+            if count % WRK_CHUNK_SIZE == 0:
+                yield "\nchunks[#chunks + 1] = function()\n" if count == 0 else "end\n\nchunks[#chunks + 1] = function()\n"
+            parts = urlsplit(target.url)
+            origins[f"{parts.scheme}://{parts.netloc}"] += 1
+            yield create_wrk_request(target, body_path)
+        else:
+            yield create_vegeta_target(target, body_path)
+        count += 1
+
+    if skipped:
+        logging.error(f"Skipped {skipped} requests without an absolute URL, set their variables in the environment")
+    if wrk:
+        if count:
+            yield "end\n"
+        yield WRK_FOOTER_LUA
+        if len(origins) > 1:
+            logging.error(f"The requests use {len(origins)} origins, wrk sends them all to the one of its "
+                          f"command line")
+        if origins:
+            yield f"\n-- Run with: wrk -s <this script> {origins.most_common(1)[0][0]}\n"
+    return count
+
+
+def resolve_targets_output(targets_file: str) -> Tuple[str, str]:
+    """
+    Determines the output directory and file name of the target list.
+
+    Args:
+        targets_file (str): A file path with an extension, or a name written to the out directory as .targets.
+
+    Returns:
+        Tuple[str, str]: The output directory and the file name.
+    """
+    if os.path.splitext(targets_file)[1]:
+        return os.path.abspath(os.path.join(targets_file, os.pardir)), os.path.basename(targets_file)
+    current_file_dir = os.path.dirname(__file__)
+    return (os.path.join(os.path.abspath(os.path.join(current_file_dir, '..', '..')), "out"),
+            f"{targets_file}.targets")
+
+
+def create_targets_file(source_file: str, targets_file: str, environment_file: Optional[str] = None,
+                        target_format: Optional[str] = None) -> int:
+    """
+    Creates a vegeta target list or a wrk Lua script from a Postman collection, a JMX plan, a HAR recording or
+    an OpenAPI document.
+
+    The requests are streamed to the output, bodies are written to a "<name>_bodies" directory next to it and
+    referenced by relative paths, so vegeta and wrk must run from the output directory. Placeholders are
+    resolved from the environment, then from the User Defined Variables of a JMX plan. The names left
+    unresolved are logged once.
+
+    Args:
+        source_file (str): The Postman collection, .jmx plan, .har recording or .yaml OpenAPI document to read from.
+        targets_file (str): The file path where the target list should be saved.
+        environment_file (Optional[str]): A Postman environment or globals export, or a flat JSON object.
+        target_format (Optional[str]): VEGETA_FORMAT or WRK_FORMAT, defaults to wrk for a .lua file.
+
+    Returns:
+        int: The number of requests written.
+
+    Raises:
+        ValueError: If no request has an absolute URL once resolved, the output is removed instead of being
+            left without targets.
+    """
+    resolve = PlaceholderResolver(load_environment(environment_file) if environment_file else None)
+    output_path, file_name = resolve_targets_output(targets_file)
+    target_format = target_format or (WRK_FORMAT if file_name.endswith(".lua") else VEGETA_FORMAT)
+    body_dir = os.path.join(output_path, f"{os.path.splitext(file_name)[0]}_bodies")
+
+    os.makedirs(body_dir, exist_ok=True)
+    with open(os.path.join(output_path, file_name), 'w', encoding='utf-8', newline='\n') as output:
+        fragments = iter_target_list(iter_source_targets(source_file, resolve), target_format, body_dir)
+        while True:
+            try:
+                output.write(next(fragments))
+            except StopIteration as stop:
+                count = stop.value
+                break
+    if resolve.missing:
+        logging.error(f"Unresolved variables: {', '.join(sorted(resolve.missing))}")
+    if not count:
+        os.remove(os.path.join(output_path, file_name))
+        if not os.listdir(body_dir):
+            os.rmdir(body_dir)
+        missing = f", set {', '.join(sorted(resolve.missing))} in the environment" if resolve.missing else ""
+        raise ValueError(f"No request of {source_file} has an absolute URL{missing}")
+    return count
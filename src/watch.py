@@ -0,0 +1,299 @@
+import ctypes
+import ctypes.util
+import hashlib
+import json
+import logging
+import os
+import select
+import struct
+import sys
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Dict, Optional, Set, Tuple
+
+from src.converter import jmx_file_to_postman, postman_file_to_jmx
+from src.helper.compression import strip_compression_extension
+from src.helper.file_utils import file_write
+
+logging.basicConfig(level=logging.ERROR)
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+DEFAULT_WATCH_DIR = os.path.join(PROJECT_ROOT, "file_to_convert")
+DEFAULT_OUTPUT_DIR = os.path.join(PROJECT_ROOT, "out")
+DEFAULT_DEBOUNCE = 0.5
+DEFAULT_POLL_INTERVAL = 1.0
+DEFAULT_WORKERS = os.cpu_count() or 1
+# Content hashes of the converted files, kept in the output directory so restarts stay incremental
+STATE_FILE_NAME = ".watch_state.json"
+
+# Source extension -> output extension
+OUTPUT_EXTENSIONS = {
+    ".json": ".jmx",
+    ".jmx": ".json"
+}
+
+# inotify constants from <sys/inotify.h>
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_Q_OVERFLOW = 0x00004000
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = 0o2000000
+INOTIFY_EVENT = struct.Struct("iIII")
+
+
+def is_convertible(file_name: str) -> bool:
+    """
+    Checks whether a file in the watched directory is a supported conversion source.
+
+    Args:
+        file_name (str): The file name.
+
+    Returns:
+        bool: True for Postman collections (.json) and JMX plans (.jmx), gzip, zstd or xz compressed or not.
+    """
+    extension = os.path.splitext(strip_compression_extension(file_name))[1]
+    return not file_name.startswith(".") and extension in OUTPUT_EXTENSIONS
+
+
+def hash_file(file_path: str) -> str:
+    """
+    Computes the content hash of a file without loading it at once.
+
+    Args:
+        file_path (str): Path of the file.
+
+    Returns:
+        str: The hex digest of the content.
+    """
+    digest = hashlib.blake2b()
+    with open(file_path, 'rb') as source_file:
+        for block in iter(lambda: source_file.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def convert_file(source_path: str, output_dir: str, known_hash: Optional[str] = None) -> Tuple[str, Optional[str]]:
+    """
+    Converts a single file into the output directory unless its content hash is unchanged.
+
+    Runs in a worker process, so hashing is parallel as well.
+
+    Args:
+        source_path (str): Path of the Postman collection or JMX plan, gzip, zstd or xz compressed or not.
+        output_dir (str): The directory the converted file is written to.
+        known_hash (Optional[str]): The content hash of the last conversion of this file.
+
+    Returns:
+        Tuple[str, Optional[str]]: The content hash and the output file name, None when the content is unchanged.
+    """
+    content_hash = hash_file(source_path)
+    if content_hash == known_hash:
+        return content_hash, None
+
+    # The output is written uncompressed, named after the source without its compression extension
+    stem, extension = os.path.splitext(strip_compression_extension(os.path.basename(source_path)))
+    output_name = stem + OUTPUT_EXTENSIONS[extension]
+    if extension == ".json":
+        file_write(output_dir, output_name, postman_file_to_jmx(source_path))
+    else:
+        file_write(output_dir, output_name, json.dumps(jmx_file_to_postman(source_path), indent=4))
+    return content_hash, output_name
+
+
+class PollingWatcher:
+    """
+    Detects changed files by comparing the size and modification time of the directory entries.
+
+    Only the directory listing is read on each poll, file contents are never read here.
+    """
+
+    def __init__(self, directory: str, interval: float = DEFAULT_POLL_INTERVAL):
+        self.directory = directory
+        self.interval = interval
+        self.signatures: Dict[str, Tuple[int, int]] = {}
+
+    def scan(self) -> Set[str]:
+        changed = set()
+        signatures = {}
+        with os.scandir(self.directory) as entries:
+            for entry in entries:
+                if entry.is_file() and is_convertible(entry.name):
+                    stat = entry.stat()
+                    signatures[entry.path] = (stat.st_mtime_ns, stat.st_size)
+                    if self.signatures.get(entry.path) != signatures[entry.path]:
+                        changed.add(entry.path)
+        self.signatures = signatures
+        return changed
+
+    def poll(self, timeout: float) -> Set[str]:
+        time.sleep(min(timeout, self.interval))
+        return self.scan()
+
+    def close(self) -> None:
+        pass
+
+
+class InotifyWatcher:
+    """
+    Receives change events for the directory from the Linux kernel, so idle directories cost nothing
+    and a change touches only the affected file.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self.fd = self.libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        mask = IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE | IN_MODIFY
+        if self.libc.inotify_add_watch(self.fd, os.fsencode(directory), mask) < 0:
+            os.close(self.fd)
+            raise OSError(ctypes.get_errno(), f"inotify_add_watch failed for {directory}")
+
+    def scan(self) -> Set[str]:
+        with os.scandir(self.directory) as entries:
+            return {entry.path for entry in entries if entry.is_file() and is_convertible(entry.name)}
+
+    def poll(self, timeout: float) -> Set[str]:
+        readable, _, _ = select.select([self.fd], [], [], timeout)
+        if not readable:
+            return set()
+
+        changed = set()
+        buffer = os.read(self.fd, 64 * 1024)
+        offset = 0
+        while offset < len(buffer):
+            _, mask, _, name_length = INOTIFY_EVENT.unpack_from(buffer, offset)
+            offset += INOTIFY_EVENT.size
+            name = os.fsdecode(buffer[offset:offset + name_length].rstrip(b"\0"))
+            offset += name_length
+            if mask & IN_Q_OVERFLOW:
+                return self.scan()  # events were dropped, fall back to a single full scan
+            if is_convertible(name):
+                changed.add(os.path.join(self.directory, name))
+        return changed
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+
+def create_watcher(directory: str, use_inotify: Optional[bool] = None):
+    """
+    Creates an inotify watcher where available, a polling watcher otherwise.
+
+    Args:
+        directory (str): The directory to watch.
+        use_inotify (Optional[bool]): Forces the watcher type, None picks automatically.
+
+    Returns:
+        The watcher.
+    """
+    if use_inotify is False or (use_inotify is None and not sys.platform.startswith("linux")):
+        return PollingWatcher(directory)
+    try:
+        return InotifyWatcher(directory)
+    except (OSError, AttributeError) as e:
+        if use_inotify:
+            raise
+        logging.error(f"inotify is not available, falling back to polling: {e}")
+        return PollingWatcher(directory)
+
+
+def load_state(output_dir: str) -> Dict[str, str]:
+    """
+    Loads the content hashes of previously converted files.
+
+    Args:
+        output_dir (str): The output directory holding the state file.
+
+    Returns:
+        Dict[str, str]: Source path -> content hash.
+    """
+    try:
+        with open(os.path.join(output_dir, STATE_FILE_NAME), 'r') as state_file:
+            return json.load(state_file)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def watch(directory: str = DEFAULT_WATCH_DIR, output_dir: str = DEFAULT_OUTPUT_DIR,
+          debounce: float = DEFAULT_DEBOUNCE, workers: int = DEFAULT_WORKERS, use_inotify: Optional[bool] = None,
+          stop_event: Optional[threading.Event] = None) -> None:
+    """
+    Watches the directory and converts Postman collections and JMX plans into the output directory.
+
+    A file is converted once it has not changed for the debounce period and only when its content hash
+    differs from the last conversion.
+
+    Args:
+        directory (str): The directory to watch.
+        output_dir (str): The directory converted files are written to.
+        debounce (float): Seconds a file must stay unchanged before it is converted.
+        workers (int): Number of worker processes.
+        use_inotify (Optional[bool]): Forces the watcher type, None picks automatically.
+        stop_event (Optional[threading.Event]): Stops watching when set.
+    """
+    if os.path.abspath(directory) == os.path.abspath(output_dir):
+        raise ValueError("The output directory must differ from the watched directory")
+
+    stop_event = stop_event or threading.Event()
+    hashes = load_state(output_dir)
+    watcher = create_watcher(directory, use_inotify)
+    deadlines = {path: 0.0 for path in watcher.scan()}
+    running: Dict[str, Future] = {}
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        try:
+            while not stop_event.is_set():
+                now = time.monotonic()
+                # A due path whose previous conversion still runs waits for it, not for its passed deadline,
+                # it is picked up once the conversion is collected
+                timeout = min([deadline - now for path, deadline in deadlines.items() if path not in running] +
+                              [debounce])
+                for path in watcher.poll(max(timeout, 0.01)):
+                    deadlines[path] = time.monotonic() + debounce
+
+                now = time.monotonic()
+                for path in [path for path, deadline in deadlines.items() if deadline <= now]:
+                    if path in running:
+                        continue  # picked up again after the running conversion finishes
+                    del deadlines[path]
+                    if os.path.isfile(path):
+                        running[path] = executor.submit(convert_file, path, output_dir, hashes.get(path))
+
+                if collect_results(running, hashes):
+                    file_write(output_dir, STATE_FILE_NAME, hashes)
+        finally:
+            watcher.close()
+            executor.shutdown(wait=True)
+            if collect_results(running, hashes):
+                file_write(output_dir, STATE_FILE_NAME, hashes)
+
+
+def collect_results(running: Dict[str, Future], hashes: Dict[str, str]) -> bool:
+    """
+    Records the finished conversions and reports their outcome.
+
+    Args:
+        running (Dict[str, Future]): Source path -> conversion in progress, finished entries are removed.
+        hashes (Dict[str, str]): Source path -> content hash of the last conversion, updated in place.
+
+    Returns:
+        bool: True if a file was converted.
+    """
+    converted = False
+    for path in [path for path, future in running.items() if future.done()]:
+        future = running.pop(path)
+        try:
+            content_hash, output_name = future.result()
+        except Exception as e:
+            logging.error(f"Conversion of {path} failed: {e}")
+            continue
+        hashes[path] = content_hash
+        if output_name:
+            converted = True
+            print(f"Converted {os.path.basename(path)} -> {output_name}")
+    return converted
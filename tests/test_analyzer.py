@@ -0,0 +1,113 @@
+import gzip
+import json
+
+import pytest
+
+from src.analyzer import COST_MODELS, analyze_source, format_stats, get_body_size, scan_jmx, scan_postman
+from src.converter import postman_to_jmx
+
+TEST_EVENT = {"listen": "test", "script": {"exec": [
+    'pm.test("Status code is 200", function () {', "pm.response.to.have.status(200);", "});",
+    'pm.test("Has a token", function () {', "pm.expect(pm.response.json().token).to.be.a('string');", "});"]}}
+
+COLLECTION = {
+    "info": {"name": "Shop", "schema": "https://schema.getpostman.com/json/collection/v2.1.0/collection.json"},
+    "item": [
+        {"name": "Users", "item": [
+            {"name": "Login", "event": [TEST_EVENT], "request": {
+                "method": "POST", "url": {"raw": "https://shop.example.com/login"},
+                "body": {"mode": "raw", "raw": '{"user": "hélène"}'}}},
+            {"name": "Admin", "item": [
+                {"name": "Form", "request": {
+                    "method": "POST", "url": {"raw": "https://shop.example.com/form"},
+                    "body": {"mode": "urlencoded", "urlencoded": [{"key": "a", "value": "bc"}]}}}]}
+        ]},
+        {"name": "Health", "request": {"method": "GET", "url": {"raw": "https://shop.example.com/health"}}}
+    ]
+}
+
+JMX = """<?xml version="1.0" encoding="UTF-8"?>
+<jmeterTestPlan version="1.2"><hashTree>
+  <TestPlan testname="Plan"/><hashTree>
+    <ThreadGroup testname="Users"/><hashTree>
+      <GenericController testname="Enabled"/><hashTree>
+        <HTTPSamplerProxy testname="Post">
+          <elementProp name="HTTPsampler.Arguments" elementType="Arguments"><collectionProp name="Arguments.arguments">
+            <elementProp name="" elementType="HTTPArgument"><stringProp name="Argument.value">body</stringProp></elementProp>
+          </collectionProp></elementProp>
+        </HTTPSamplerProxy><hashTree>
+          <ResponseAssertion testname="Status"/><hashTree/>
+          <JSONPathAssertion testname="Disabled" enabled="false"/><hashTree/>
+        </hashTree>
+        <DurationAssertion testname="Scoped"/><hashTree/>
+      </hashTree>
+      <GenericController testname="Disabled" enabled="false"/><hashTree>
+        <HTTPSamplerProxy testname="Skipped"/><hashTree/>
+      </hashTree>
+    </hashTree>
+  </hashTree>
+</hashTree></jmeterTestPlan>"""
+
+
+@pytest.fixture
+def collection_file(tmp_path):
+    collection_file = tmp_path / "shop.json"
+    collection_file.write_text(json.dumps(COLLECTION, indent=2))
+    return collection_file
+
+
+def test_get_body_size():
+    assert get_body_size(COLLECTION["item"][0]["item"][0]["request"]) == len('{"user": "hélène"}'.encode("utf-8"))
+    assert get_body_size({"body": {"mode": "formdata", "formdata": [{"key": "k", "value": 12}]}}) == 3
+    assert get_body_size({"method": "GET"}) == 0
+    assert get_body_size("https://shop.example.com") == 0
+
+
+def test_scan_postman(collection_file, mocker):
+    expected = {"folders": 2, "requests": 3, "assertions": 2, "body_bytes": 23}
+
+    assert scan_postman(str(collection_file)) == expected
+
+    # Items cut by the end of the buffer are walked instead of decoded at once, with the same counts
+    mocker.patch("src.helper.json_stream.CHUNK_SIZE", 16)
+    assert scan_postman(str(collection_file)) == expected
+
+
+def test_scan_jmx(tmp_path):
+    jmx_path = tmp_path / "plan.jmx"
+    jmx_path.write_text(JMX)
+
+    assert scan_jmx(str(jmx_path)) == {"folders": 1, "requests": 1, "assertions": 2, "body_bytes": 4}
+
+
+def test_scan_jmx_of_converted_collection(tmp_path):
+    jmx_path = tmp_path / "shop.jmx"
+    jmx_path.write_bytes(postman_to_jmx(COLLECTION))
+
+    counts = scan_jmx(str(jmx_path))
+
+    assert counts["folders"] == 2 and counts["requests"] == 3
+
+
+def test_analyze_source(collection_file, tmp_path):
+    compressed = tmp_path / "shop.json.gz"
+    compressed.write_bytes(gzip.compress(collection_file.read_bytes()))
+
+    stats = analyze_source(str(compressed))
+
+    model = COST_MODELS["postman"]
+    assert stats.source_type == "postman" and stats.source_bytes == compressed.stat().st_size
+    assert stats.requests == 3
+    assert stats.estimated_output_bytes == (2 * model.folder_bytes + 3 * model.request_bytes +
+                                            2 * model.assertion_bytes + 23)
+    assert format_stats("shop.json.gz", stats)[-1].startswith("  estimated JMX output: ")
+
+
+def test_analyze_source_errors(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        analyze_source(str(tmp_path / "missing.json"))
+
+    invalid = tmp_path / "invalid.json"
+    invalid.write_text("[1, 2]")
+    with pytest.raises(ValueError):
+        analyze_source(str(invalid))
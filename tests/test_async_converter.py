@@ -0,0 +1,131 @@
+import asyncio
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import pytest
+
+from src.async_converter import (
+    AsyncConverter,
+    create_jmx_file_async,
+    generate_postman_collection_async,
+    jmx_to_postman_async,
+    postman_to_jmx_async,
+    save_json_async
+)
+from src.converter import postman_to_jmx
+
+SAMPLE_COLLECTION = os.path.join(os.path.dirname(__file__), os.pardir, "file_to_convert", "sample_collection.json")
+
+
+def build_collection(folder_count: int, request_count: int) -> dict:
+    """Builds a Postman collection with the given number of folders and requests per folder."""
+    return {
+        "info": {"name": "Large", "schema": "https://schema.getpostman.com/json/collection/v2.1.0/collection.json"},
+        "item": [
+            {"name": f"Folder {folder}", "item": [
+                {"name": f"Request {folder}-{request}",
+                 "request": {"method": "GET", "url": {"raw": f"https://example.com/items/{request}?page=1"}}}
+                for request in range(request_count)
+            ]}
+            for folder in range(folder_count)
+        ]
+    }
+
+
+async def measure_loop_lag(task: asyncio.Future, interval: float = 0.01) -> float:
+    """Returns the largest delay of a periodic timer while the task runs."""
+    max_lag = 0.0
+    while not task.done():
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        max_lag = max(max_lag, time.perf_counter() - start - interval)
+    return max_lag
+
+
+def test_postman_to_jmx_async():
+    with open(SAMPLE_COLLECTION, 'rb') as collection_file:
+        data = collection_file.read()
+
+    result = asyncio.run(postman_to_jmx_async(data))
+
+    assert result == postman_to_jmx(data)
+
+
+def test_jmx_to_postman_async():
+    jmx = postman_to_jmx(build_collection(1, 2))
+
+    collection = asyncio.run(jmx_to_postman_async(jmx))
+
+    assert collection["info"]["name"] == "Large"
+
+
+def test_create_jmx_file_and_generate_postman_collection_async(tmp_path):
+    jmx_path = tmp_path / "sample.jmx"
+    json_path = tmp_path / "sample.json"
+
+    async def convert():
+        await create_jmx_file_async(SAMPLE_COLLECTION, str(jmx_path))
+        collection = await generate_postman_collection_async(str(jmx_path))
+        await save_json_async(str(json_path), collection)
+        return collection
+
+    collection = asyncio.run(convert())
+
+    assert collection["info"]["name"] == "Sample"
+    assert json.loads(json_path.read_text())["info"]["name"] == "Sample"
+
+
+def test_loop_stays_responsive_during_large_conversion():
+    data = json.dumps(build_collection(50, 100))
+
+    async def convert():
+        with ProcessPoolExecutor(max_workers=1) as executor:
+            task = asyncio.ensure_future(postman_to_jmx_async(data, executor))
+            max_lag = await measure_loop_lag(task)
+            return await task, max_lag
+
+    result, max_lag = asyncio.run(convert())
+
+    assert result.count(b"<HTTPSamplerProxy ") == 5000
+    assert max_lag < 0.1
+
+
+def test_async_converter_limits_concurrency(mocker):
+    running = []
+    peak = []
+
+    def slow_conversion(data):
+        running.append(data)
+        peak.append(len(running))
+        time.sleep(0.02)
+        running.pop()
+        return b""
+
+    mocker.patch("src.async_converter.postman_to_jmx", side_effect=slow_conversion)
+
+    async def convert():
+        converter = AsyncConverter(ThreadPoolExecutor(max_workers=8), max_concurrency=2)
+        await asyncio.gather(*(converter.postman_to_jmx(str(index)) for index in range(8)))
+
+    asyncio.run(convert())
+
+    assert max(peak) == 2
+
+
+def test_async_converter_cancellation(mocker):
+    mocker.patch("src.async_converter.postman_to_jmx", side_effect=lambda data: time.sleep(0.05))
+
+    async def convert():
+        converter = AsyncConverter(ThreadPoolExecutor(max_workers=1), max_concurrency=1)
+        first = asyncio.ensure_future(converter.postman_to_jmx("first"))
+        waiting = asyncio.ensure_future(converter.postman_to_jmx("waiting"))
+        await asyncio.sleep(0.01)
+        waiting.cancel()
+        await first
+        with pytest.raises(asyncio.CancelledError):
+            await waiting
+        return converter.semaphore.locked()
+
+    assert asyncio.run(convert()) is False
@@ -0,0 +1,143 @@
+import json
+import os
+import shutil
+import sys
+import time
+
+import pytest
+
+from src.batch import (
+    JOURNAL_FILE_NAME,
+    list_sources,
+    load_journal,
+    convert_batch
+)
+
+SAMPLE_COLLECTION = os.path.join(os.path.dirname(__file__), os.pardir, "file_to_convert", "sample_collection.json")
+
+
+@pytest.fixture
+def source_dir(tmp_path):
+    source_dir = tmp_path / "sources"
+    source_dir.mkdir()
+    shutil.copy(SAMPLE_COLLECTION, source_dir / "first.json")
+    shutil.copy(SAMPLE_COLLECTION, source_dir / "second.json")
+    return source_dir
+
+
+def read_journal(output_dir):
+    with open(os.path.join(output_dir, JOURNAL_FILE_NAME)) as journal_file:
+        return [json.loads(line) for line in journal_file]
+
+
+def test_list_sources(source_dir):
+    (source_dir / "notes.txt").write_text("")
+    (source_dir / ".hidden.json").write_text("{}")
+    (source_dir / "third.jmx.xz").write_bytes(b"")
+
+    assert list_sources(str(source_dir)) == [str(source_dir / "first.json"), str(source_dir / "second.json"),
+                                             str(source_dir / "third.jmx.xz")]
+
+
+def test_load_journal_ignores_cut_lines(tmp_path):
+    journal = tmp_path / JOURNAL_FILE_NAME
+    journal.write_text('{"source": "a.json", "status": "failed"}\n{"source": "a.json", "status": "done"}\n'
+                       '{"source": "b.json", "sta')
+
+    assert load_journal(str(journal)) == {"a.json": {"source": "a.json", "status": "done"}}
+    assert load_journal(str(tmp_path / "missing.jsonl")) == {}
+
+
+def test_convert_batch_resumes(source_dir, tmp_path):
+    output_dir = tmp_path / "out"
+
+    assert convert_batch(str(source_dir), str(output_dir), workers=2) == {"converted": 2, "skipped": 0, "failed": 0}
+    assert (output_dir / "first.jmx").exists() and (output_dir / "second.jmx").exists()
+    assert [record["status"] for record in read_journal(output_dir)] == ["done", "done"]
+
+    # Unchanged files are skipped from the journal, a touched file is hashed again but not converted
+    os.utime(source_dir / "first.json")
+    assert convert_batch(str(source_dir), str(output_dir)) == {"converted": 0, "skipped": 2, "failed": 0}
+    assert read_journal(output_dir)[-1]["output"] == "first.jmx"
+
+
+def test_convert_batch_retries_and_isolates_failures(source_dir, tmp_path):
+    (source_dir / "broken.json").write_text("{")
+    output_dir = tmp_path / "out"
+
+    summary = convert_batch(str(source_dir), str(output_dir), workers=2, retries=2, backoff=0.01)
+
+    assert summary == {"converted": 2, "skipped": 0, "failed": 1}
+    broken = [record for record in read_journal(output_dir) if record["source"].endswith("broken.json")]
+    assert [record["attempt"] for record in broken] == [1, 2, 3]
+    assert all(record["status"] == "failed" and "JSONDecodeError" in record["error"] for record in broken)
+
+    # A failed file is tried again by the next batch
+    (source_dir / "broken.json").write_text(open(SAMPLE_COLLECTION).read())
+    assert convert_batch(str(source_dir), str(output_dir), retries=0) == {"converted": 1, "skipped": 2, "failed": 0}
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="patches the conversion of forked workers")
+def test_convert_batch_kills_crashed_and_slow_workers(source_dir, tmp_path, mocker):
+    # Workers are forked, they run the patched conversion
+    def convert_file(source_path, output_dir, known_hash):
+        if source_path.endswith("first.json"):
+            os._exit(3)
+        time.sleep(30)
+
+    mocker.patch("src.batch.convert_file", side_effect=convert_file)
+    output_dir = tmp_path / "out"
+
+    start = time.monotonic()
+    summary = convert_batch(str(source_dir), str(output_dir), workers=2, retries=0, timeout=0.5)
+
+    assert summary == {"converted": 0, "skipped": 0, "failed": 2}
+    assert time.monotonic() - start < 10
+    errors = {os.path.basename(record["source"]): record["error"] for record in read_journal(output_dir)}
+    assert errors == {"first.json": "worker exited with code 3", "second.json": "timed out"}
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="reads the address space from /proc")
+def test_convert_batch_memory_limit(source_dir, tmp_path, mocker):
+    def convert_file(source_path, output_dir, known_hash):
+        return bytearray(1024 * 1024 * 1024), None
+
+    mocker.patch("src.batch.convert_file", side_effect=convert_file)
+    with open("/proc/self/status") as status:
+        address_space = next(int(line.split()[1]) for line in status if line.startswith("VmSize")) // 1024
+
+    summary = convert_batch(str(source_dir), str(tmp_path / "out"), retries=0, memory_limit=address_space + 256)
+
+    assert summary["failed"] == 2
+    assert "memory limit" in read_journal(tmp_path / "out")[0]["error"]
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="patches the conversion of forked workers")
+def test_convert_batch_source_removed(source_dir, tmp_path, mocker):
+    def convert_file(source_path, output_dir, known_hash):
+        os.remove(source_path)
+        raise FileNotFoundError(source_path)
+
+    mocker.patch("src.batch.convert_file", side_effect=convert_file)
+    output_dir = tmp_path / "out"
+
+    # A file removed during the batch fails once, without retries, and the others go on
+    assert convert_batch(str(source_dir), str(output_dir), retries=2) == {"converted": 0, "skipped": 0, "failed": 2}
+    assert [(record["status"], record["attempt"], record["error"]) for record in read_journal(output_dir)] == [
+        ("failed", 1, "source file removed")] * 2
+
+
+def test_convert_batch_largest_first(source_dir, tmp_path):
+    collection = json.loads(open(SAMPLE_COLLECTION).read())
+    collection["item"] *= 20
+    (source_dir / "large.json").write_text(json.dumps(collection))
+    output_dir = tmp_path / "out"
+
+    convert_batch(str(source_dir), str(output_dir), workers=1, largest_first=True)
+
+    assert os.path.basename(read_journal(output_dir)[0]["source"]) == "large.json"
+
+
+def test_convert_batch_rejects_same_directory(source_dir):
+    with pytest.raises(ValueError):
+        convert_batch(str(source_dir), str(source_dir))
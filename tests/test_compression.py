@@ -0,0 +1,91 @@
+import gzip
+import json
+import lzma
+
+import pytest
+from lxml import etree
+
+from src.helper.compression import (
+    GZIP,
+    XZ,
+    ZSTD,
+    detect_compression,
+    get_output_compression,
+    strip_compression_extension,
+    open_input,
+    open_output
+)
+from src.jmx.jmx_creator import create_jmx_file
+from src.jmx.jmx_reader import get_test_plan
+from src.jmx.jmx_stream_reader import ELEMENT, iter_plan_elements
+from src.postman.postman_json_creator import create_postman_collection
+from src.postman.postman_json_reader import read_postman_collection
+
+COLLECTION = {
+    "info": {"name": "Shop", "schema": "https://schema.getpostman.com/json/collection/v2.1.0/collection.json"},
+    "item": [{"name": "Orders", "item": [
+        {"name": "List", "request": {"method": "GET", "url": {"raw": "https://shop.example.com/orders"}}},
+        {"name": "Create", "request": {"method": "POST", "body": {"mode": "raw", "raw": "{\"id\": 1}"},
+                                       "url": {"raw": "https://shop.example.com/orders"}}}
+    ]}]
+}
+
+
+def test_detect_compression(tmp_path):
+    plain = tmp_path / "plain.json"
+    plain.write_text("{}")
+    (tmp_path / "a.gz").write_bytes(gzip.compress(b"{}"))
+    (tmp_path / "a.xz").write_bytes(lzma.compress(b"{}"))
+
+    # Detected from the content, not the name
+    assert detect_compression(str(tmp_path / "a.gz")) == GZIP
+    assert detect_compression(str(tmp_path / "a.xz")) == XZ
+    assert detect_compression(str(plain)) is None
+    assert detect_compression(str(tmp_path / "missing")) is None
+
+
+def test_output_extensions():
+    assert get_output_compression("out/plan.jmx.gz") == GZIP
+    assert get_output_compression("plan.JMX.XZ") == XZ
+    assert get_output_compression("plan.jmx.zst") == ZSTD
+    assert get_output_compression("plan.jmx") is None
+    assert strip_compression_extension("out/plan.jmx.gz") == "out/plan.jmx"
+    assert strip_compression_extension("plan.jmx") == "plan.jmx"
+
+
+@pytest.mark.parametrize("extension", [".gz", ".xz", ".zst", ""])
+def test_open_round_trip(tmp_path, extension):
+    if extension == ".zst":
+        pytest.importorskip("zstandard")
+    path = str(tmp_path / f"data.json{extension}")
+
+    with open_output(path, 'w', encoding='utf-8') as output:
+        output.write("héllo\n" * 1000)
+
+    with open_input(path, 'r', encoding='utf-8') as source:
+        assert source.read() == "héllo\n" * 1000
+    with open(path, 'rb') as raw:
+        assert (len(raw.read()) < 6000) == bool(extension)
+
+
+def test_compressed_postman_to_jmx(tmp_path):
+    source = tmp_path / "shop.json.xz"
+    source.write_bytes(lzma.compress(json.dumps(COLLECTION).encode()))
+    jmx_path = tmp_path / "shop.jmx.gz"
+
+    assert read_postman_collection(str(source))["test_plan_name"] == "Shop"
+    create_jmx_file(str(source), str(jmx_path), body_threshold=1)
+
+    root = etree.fromstring(gzip.decompress(jmx_path.read_bytes()))
+    assert [sampler.get("testname") for sampler in root.iter("HTTPSamplerProxy")] == ["List", "Create"]
+    # The bodies directory is named after the plan, without the compression extension
+    assert (tmp_path / "shop_bodies").is_dir()
+
+    # Both JMX readers decompress on the fly
+    assert get_test_plan(str(jmx_path))["name"] == "Shop"
+    assert [element.get("testname") for event, element, _ in iter_plan_elements(str(jmx_path))
+            if event == ELEMENT and element.tag == "HTTPSamplerProxy"] == ["List", "Create"]
+
+    output = tmp_path / "shop.postman.json.gz"
+    create_postman_collection(str(jmx_path), str(output))
+    assert json.loads(gzip.decompress(output.read_bytes()))["info"]["name"] == "Shop"
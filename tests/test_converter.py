@@ -0,0 +1,131 @@
+import gzip
+import json
+import os
+
+import pytest
+
+from src.converter import (
+    load_postman_data,
+    load_postman_file,
+    buffer_chunks,
+    postman_to_jmx,
+    postman_file_to_jmx,
+    iter_postman_to_jmx,
+    jmx_to_postman,
+    jmx_file_to_postman,
+    iter_jmx_to_postman
+)
+from src.jmx.jmx_creator import LoadProfile, create_jmx_file
+
+SAMPLE_COLLECTION = os.path.join(os.path.dirname(__file__), os.pardir, "file_to_convert", "sample_collection.json")
+
+
+@pytest.fixture
+def sample_collection_bytes():
+    with open(SAMPLE_COLLECTION, 'rb') as collection_file:
+        return collection_file.read()
+
+
+@pytest.fixture
+def fixed_ids(mocker):
+    mocker.patch('src.postman.postman_json_creator.generate_uuid', return_value='mock_uuid')
+    mocker.patch('src.postman.postman_json_creator.generate_id', return_value='mock_id')
+
+
+def test_load_postman_data():
+    collection = {"info": {"name": "Test"}}
+
+    assert load_postman_data(collection) is collection
+    assert load_postman_data(json.dumps(collection)) == collection
+    assert load_postman_data(json.dumps(collection).encode()) == collection
+
+
+def test_load_postman_data_invalid_json():
+    with pytest.raises(json.JSONDecodeError):
+        load_postman_data(b"{invalid")
+
+
+def test_load_postman_file(sample_collection_bytes, tmp_path):
+    compressed = tmp_path / "sample.json.gz"
+    compressed.write_bytes(gzip.compress(sample_collection_bytes))
+
+    assert load_postman_file(SAMPLE_COLLECTION) == json.loads(sample_collection_bytes)
+    assert load_postman_file(str(compressed)) == json.loads(sample_collection_bytes)
+
+
+def test_buffer_chunks():
+    chunks = list(buffer_chunks(["ab", "cd", "e"], chunk_size=3))
+
+    assert chunks == [b"abcd", b"e"]
+
+
+def test_postman_to_jmx_matches_file_conversion(sample_collection_bytes, tmp_path):
+    output_file = tmp_path / "sample.jmx"
+    create_jmx_file(SAMPLE_COLLECTION, str(output_file))
+
+    jmx = postman_to_jmx(sample_collection_bytes)
+
+    assert jmx == output_file.read_bytes()
+    assert postman_to_jmx(json.loads(sample_collection_bytes)) == jmx
+    assert b"".join(iter_postman_to_jmx(sample_collection_bytes, chunk_size=128)) == jmx
+
+
+def test_postman_to_jmx_options(sample_collection_bytes, tmp_path):
+    environment_file = tmp_path / "staging.json"
+    environment_file.write_text(json.dumps({"values": [{"key": "tests_url", "value": "https://staging.example.com"}]}))
+    options = {"shared_defaults": True, "load_profile": LoadProfile(threads=5), "deduplicate": True,
+               "environment_file": str(environment_file)}
+    output_file = tmp_path / "sample.jmx"
+    create_jmx_file(SAMPLE_COLLECTION, str(output_file), **options)
+
+    jmx = postman_to_jmx(sample_collection_bytes, **options)
+
+    assert jmx == output_file.read_bytes()
+    assert b"https://staging.example.com" in jmx and b"<ThreadGroup" in jmx
+    assert postman_file_to_jmx(SAMPLE_COLLECTION, **options) == jmx
+    assert b"".join(iter_postman_to_jmx(sample_collection_bytes, chunk_size=128, **options)) == jmx
+
+
+def test_postman_to_jmx_rejects_file_options(sample_collection_bytes):
+    with pytest.raises(ValueError, match="body_threshold, data_file write files next to the JMX file"):
+        postman_to_jmx(sample_collection_bytes, body_threshold=0, data_file="data.csv")
+
+    with pytest.raises(TypeError):
+        list(iter_postman_to_jmx(sample_collection_bytes, threads=5))
+
+
+def test_jmx_to_postman(sample_collection_bytes, fixed_ids):
+    jmx = postman_to_jmx(sample_collection_bytes)
+
+    collection = jmx_to_postman(jmx)
+
+    assert collection["info"]["name"] == "Sample"
+    assert collection["info"]["_postman_id"] == "mock_uuid"
+    assert [item["name"] for item in collection["item"]][0] == "Pet"
+
+
+def test_iter_jmx_to_postman(sample_collection_bytes, fixed_ids):
+    jmx = postman_to_jmx(sample_collection_bytes)
+
+    chunks = list(iter_jmx_to_postman(jmx, chunk_size=64))
+
+    assert len(chunks) > 1
+    assert b"".join(chunks).decode("utf-8") == json.dumps(jmx_to_postman(jmx), indent=4)
+
+
+def test_iter_jmx_to_postman_deterministic(sample_collection_bytes):
+    jmx = postman_to_jmx(sample_collection_bytes)
+
+    first = b"".join(iter_jmx_to_postman(jmx, deterministic_ids=True))
+
+    assert first == b"".join(iter_jmx_to_postman(jmx, deterministic_ids=True))
+    assert first != b"".join(iter_jmx_to_postman(jmx))
+
+
+def test_file_conversions_match_bytes_conversions(sample_collection_bytes, tmp_path):
+    jmx = postman_to_jmx(sample_collection_bytes)
+    jmx_path = tmp_path / "sample.jmx.gz"
+    jmx_path.write_bytes(gzip.compress(jmx))
+
+    assert postman_file_to_jmx(SAMPLE_COLLECTION) == jmx
+    assert jmx_file_to_postman(str(jmx_path), deterministic_ids=True) == jmx_to_postman(jmx, deterministic_ids=True)
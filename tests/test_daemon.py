@@ -0,0 +1,108 @@
+import asyncio
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from src.converter import postman_to_jmx
+from src.daemon import (
+    start_server,
+    warm_up_worker,
+    run_conversion,
+    encode_header,
+    convert_with_daemon,
+    connect,
+    main,
+    POSTMAN_TO_JMX,
+    JMX_TO_POSTMAN
+)
+
+SAMPLE_COLLECTION = os.path.join(os.path.dirname(__file__), os.pardir, "file_to_convert", "sample_collection.json")
+
+
+@pytest.fixture
+def sample_collection_bytes():
+    with open(SAMPLE_COLLECTION, 'rb') as collection_file:
+        return collection_file.read()
+
+
+@pytest.fixture
+def daemon_port():
+    """Runs the daemon on a free localhost port in a background thread, with a thread pool as workers."""
+    loop = asyncio.new_event_loop()
+    executor = ThreadPoolExecutor(max_workers=2, initializer=warm_up_worker)
+    server = loop.run_until_complete(start_server(executor, max_jobs=2, port=0))
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+
+    yield server.sockets[0].getsockname()[1]
+
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join()
+    server.close()
+    loop.run_until_complete(server.wait_closed())
+    loop.close()
+    executor.shutdown()
+
+
+def test_run_conversion(sample_collection_bytes):
+    warm_up_worker()
+
+    chunks = run_conversion(POSTMAN_TO_JMX, sample_collection_bytes)
+
+    assert b"".join(chunks) == postman_to_jmx(sample_collection_bytes)
+
+
+def test_encode_header():
+    assert encode_header({"status": "ok"}) == b'{"status": "ok"}\n'
+
+
+def test_convert_with_daemon(daemon_port, sample_collection_bytes):
+    jmx = b"".join(convert_with_daemon(POSTMAN_TO_JMX, sample_collection_bytes, port=daemon_port))
+
+    assert jmx == postman_to_jmx(sample_collection_bytes)
+
+    collection = b"".join(convert_with_daemon(JMX_TO_POSTMAN, jmx, port=daemon_port))
+    assert b'"name": "Sample"' in collection
+
+
+def test_convert_with_daemon_concurrent_jobs(daemon_port, sample_collection_bytes):
+    expected = postman_to_jmx(sample_collection_bytes)
+
+    with ThreadPoolExecutor(max_workers=4) as clients:
+        results = list(clients.map(
+            lambda _: b"".join(convert_with_daemon(POSTMAN_TO_JMX, sample_collection_bytes, port=daemon_port)),
+            range(8)))
+
+    assert results == [expected] * 8
+
+
+def test_convert_with_daemon_error(daemon_port):
+    with pytest.raises(RuntimeError, match="Conversion failed"):
+        list(convert_with_daemon(JMX_TO_POSTMAN, b"<jmeterTestPlan>", port=daemon_port))
+
+    with pytest.raises(RuntimeError, match="Unsupported conversion"):
+        list(convert_with_daemon("k6_to_jmx", b"", port=daemon_port))
+
+
+def test_convert_with_daemon_invalid_size(daemon_port, sample_collection_bytes, mocker):
+    # The payload of an invalid header is not read, the daemon answers and closes the connection
+    with connect(port=daemon_port) as client, client.makefile("rwb") as stream:
+        stream.write(encode_header({"conversion": POSTMAN_TO_JMX, "size": "12"}))
+        stream.flush()
+        assert json.loads(stream.readline()) == {"status": "error", "message": "Invalid payload size: '12'"}
+        assert stream.readline() == b""
+
+    mocker.patch("src.daemon.MAX_PAYLOAD_SIZE", 16)
+    with pytest.raises(RuntimeError, match="is not between 0 and 16 bytes"):
+        list(convert_with_daemon(POSTMAN_TO_JMX, sample_collection_bytes, port=daemon_port))
+
+
+def test_main_convert(daemon_port, sample_collection_bytes, tmp_path):
+    destination = tmp_path / "sample.jmx"
+
+    main(["--port", str(daemon_port), "convert", POSTMAN_TO_JMX, SAMPLE_COLLECTION, str(destination)])
+
+    assert destination.read_bytes() == postman_to_jmx(sample_collection_bytes)
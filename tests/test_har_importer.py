@@ -0,0 +1,67 @@
+import json
+
+import pytest
+from lxml import etree
+
+from src.har.har_importer import create_jmx_file_from_har, create_postman_collection_from_har, load_har
+from src.jmx.jmx_creator import LoadProfile
+
+HAR = {"log": {
+    "version": "1.2",
+    "pages": [{"id": "page_1", "title": "Login"}],
+    "entries": [
+        {"pageref": "page_1", "startedDateTime": "2024-05-01T10:00:00.000Z", "time": 50,
+         "request": {"method": "POST", "url": "https://shop.example.com/login",
+                     "headers": [{"name": "Accept", "value": "application/json"}],
+                     "postData": {"mimeType": "application/json", "text": "{\"user\": \"alice\"}"}},
+         "response": {"status": 200, "content": {"mimeType": "application/json"}}},
+        {"pageref": "page_1", "startedDateTime": "2024-05-01T10:00:01.000Z", "time": 20,
+         "request": {"method": "GET", "url": "https://shop.example.com/logo.png", "headers": []},
+         "response": {"status": 200, "content": {"mimeType": "image/png"}}},
+        {"startedDateTime": "2024-05-01T10:00:02.000Z", "time": 20,
+         "request": {"method": "GET", "url": "https://shop.example.com/ping?verbose=1", "headers": []},
+         "response": {"status": 200, "content": {"mimeType": "text/plain"}}}
+    ]
+}}
+
+
+@pytest.fixture
+def har_file(tmp_path):
+    har_file = tmp_path / "shop.har"
+    har_file.write_text(json.dumps(HAR))
+    return har_file
+
+
+def test_create_jmx_file_from_har(har_file, tmp_path):
+    jmx_path = tmp_path / "shop.jmx"
+
+    create_jmx_file_from_har(str(har_file), str(jmx_path), load_profile=LoadProfile(threads=3, loops=1))
+
+    tree = etree.parse(str(jmx_path))
+    assert tree.find(".//ThreadGroup/stringProp[@name='ThreadGroup.num_threads']").text == "3"
+    assert [sampler.get("testname") for sampler in tree.iter("HTTPSamplerProxy")] == ["POST /login", "GET /ping"]
+    assert [controller.get("testname") for controller in tree.iter("GenericController")] == [
+        "Login", "shop.example.com"]
+    assert tree.find(".//ResponseAssertion") is not None
+
+
+def test_create_postman_collection_from_har(har_file, tmp_path):
+    output = tmp_path / "shop.postman.json"
+
+    create_postman_collection_from_har(str(har_file), str(output), keep_static=True, deterministic_ids=True)
+
+    collection = json.loads(output.read_text())
+    login, ping = collection["item"]
+    assert [item["name"] for item in login["item"]] == ["POST /login", "GET /logo.png"]
+    assert login["item"][0]["request"]["body"]["raw"] == '{"user": "alice"}'
+    assert ping["item"][0]["request"]["url"]["query"] == [{"key": "verbose", "value": "1"}]
+
+
+def test_load_har_errors(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        load_har(str(tmp_path / "missing"))
+
+    broken = tmp_path / "broken.har"
+    broken.write_text("{\"log\": [")
+    with pytest.raises(ValueError):
+        load_har(str(broken))
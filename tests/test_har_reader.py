@@ -0,0 +1,114 @@
+import json
+
+import pytest
+
+from src.har.har_reader import is_static, parse_time, read_body, to_request_node, read_har
+
+
+def entry(url, method="GET", started="2024-05-01T10:00:00.000Z", time=100, pageref=None, status=200,
+          mime_type="application/json", headers=None, post_data=None, **fields):
+    request = {"method": method, "url": url, "headers": headers or []}
+    if post_data:
+        request["postData"] = post_data
+    har_entry = {"startedDateTime": started, "time": time, "request": request,
+                 "response": {"status": status, "content": {"mimeType": mime_type, "text": "x" * 1000}}, **fields}
+    if pageref:
+        har_entry["pageref"] = pageref
+    return har_entry
+
+
+HAR = {"log": {
+    "version": "1.2",
+    "creator": {"name": "WebInspector", "version": "537.36"},
+    "pages": [{"id": "page_1", "title": "Shop & Home", "startedDateTime": "2024-05-01T10:00:00.000Z"},
+              {"id": "page_2", "title": "Checkout"}],
+    "entries": [
+        entry("https://shop.example.com/", pageref="page_1", mime_type="text/html"),
+        entry("https://shop.example.com/app.js", pageref="page_1", _resourceType="script"),
+        entry("https://cdn.example.com/logo.png?v=2", pageref="page_1", mime_type="application/octet-stream"),
+        entry("https://shop.example.com/api/cart", pageref="page_1", started="2024-05-01T10:00:01.000Z"),
+        entry("https://shop.example.com/api/cart", pageref="page_1", started="2024-05-01T10:00:30.000Z"),
+        entry("https://shop.example.com/api/order", "POST", pageref="page_2", started="2024-05-01T10:00:31.000Z",
+              status=201, headers=[{"name": ":authority", "value": "shop.example.com"},
+                                   {"name": "Content-Type", "value": "application/json"},
+                                   {"name": "Content-Length", "value": "12"}],
+              post_data={"mimeType": "application/json", "text": '{"items": 1}'}),
+        entry("https://metrics.example.com/beacon", "POST", started="2024-05-01T10:00:32.000Z", status=204),
+        entry("data:image/png;base64,AAAA", mime_type="text/plain")
+    ]
+}}
+
+
+@pytest.fixture
+def har_file(tmp_path):
+    har_file = tmp_path / "shop.har"
+    har_file.write_text(json.dumps(HAR, indent=2))
+    return har_file
+
+
+def test_is_static():
+    assert is_static(entry("https://a/app", _resourceType="stylesheet"))
+    assert is_static(entry("https://a/font", mime_type="font/woff2"))
+    assert is_static(entry("https://a/img/logo.SVG?v=1", mime_type=""))
+    assert not is_static(entry("https://a/api/items.json"))
+
+
+def test_parse_time():
+    assert parse_time("2024-05-01T10:00:01.000Z") - parse_time("2024-05-01T12:00:00.000+02:00") == 1
+    assert parse_time("yesterday") is None
+    assert parse_time(None) is None
+
+
+def test_read_body():
+    assert read_body(None) == ("No body content", None)
+    assert read_body({"mimeType": "application/json", "text": "{}"}) == ("{}", "raw")
+    assert read_body({"mimeType": "application/x-www-form-urlencoded; charset=UTF-8", "text": "a=1",
+                      "params": [{"name": "a", "value": "1"}]}) == ([{"key": "a", "value": "1"}], "urlencoded")
+    assert read_body({"mimeType": "multipart/form-data; boundary=x", "params": [{"name": "f"}]}) == (
+        [{"key": "f", "value": ""}], "formdata")
+
+
+def test_to_request_node():
+    node = to_request_node(HAR["log"]["entries"][5], "controller_2", "controller_1")
+
+    assert node == {
+        "id": "controller_2", "name": "POST /api/order", "type": "request", "parent": "controller_1",
+        "method": "POST", "raw_url": "https://shop.example.com/api/order",
+        "queryParams": [{"No query parameters": ""}],
+        "body": '{"items": 1}', "body_mode": "raw",
+        "headers": [{"key": "Content-Type", "value": "application/json"}],
+        "tests": [{"name": "Status code is 201", "script": "pm.response.to.have.status(201);"}],
+        "variables": []
+    }
+    assert to_request_node(entry("https://a/", status=302), "r", "c")["tests"] == []
+
+
+def test_read_har(har_file):
+    data = read_har(str(har_file))
+
+    assert data["test_plan_name"] == "shop"
+    controllers = data["test_fragment_controller"]["generic_controllers"]
+    # The pause of 29 s splits the first page, entries outside any page are grouped by host
+    assert [controller["name"] for controller in controllers] == [
+        "Shop and Home", "Shop and Home (2)", "Checkout", "metrics.example.com"]
+    assert [[request["name"] for request in controller["children"]] for controller in controllers] == [
+        ["GET /", "GET /api/cart"], ["GET /api/cart"], ["POST /api/order"], ["POST /beacon"]]
+    assert all(request["parent"] == controller["id"] for controller in controllers
+               for request in controller["children"])
+    assert len({node["id"] for controller in controllers for node in [controller] + controller["children"]}) == 9
+
+
+def test_read_har_options(har_file):
+    data = read_har(str(har_file), gap=60, keep_static=True)
+
+    controllers = data["test_fragment_controller"]["generic_controllers"]
+    assert [controller["name"] for controller in controllers] == ["Shop and Home", "Checkout", "metrics.example.com"]
+    assert len(controllers[0]["children"]) == 5
+
+
+def test_read_har_invalid(tmp_path):
+    broken = tmp_path / "broken.har"
+    broken.write_text('{"log": {"entries": [{"request": ')
+
+    with pytest.raises(ValueError):
+        read_har(str(broken))
@@ -0,0 +1,25 @@
+import uuid
+
+from src.helper.id_utils import generate_uuid, generate_id, content_seed, ID_NAMESPACE
+
+
+def test_generate_uuid_random():
+    assert generate_uuid() != generate_uuid()
+    assert uuid.UUID(generate_uuid()).version == 4
+
+
+def test_generate_uuid_deterministic():
+    assert generate_uuid("seed") == generate_uuid("seed")
+    assert generate_uuid("seed") == str(uuid.uuid5(ID_NAMESPACE, "seed"))
+    assert generate_uuid("seed") != generate_uuid("other seed")
+
+
+def test_generate_id():
+    assert 10000000 <= int(generate_id()) <= 99999999
+    assert generate_id("seed") == generate_id("seed")
+    assert 10000000 <= int(generate_id("seed")) <= 99999999
+
+
+def test_content_seed():
+    assert content_seed({"b": 1, "a": [1, 2]}) == content_seed({"a": [1, 2], "b": 1})
+    assert content_seed({"a": 1}) != content_seed({"a": 2})
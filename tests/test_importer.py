@@ -0,0 +1,53 @@
+import json
+import os
+
+import pytest
+
+from src.helper.importer import PROJECT_DIR, load_source, resolve_source_path, save_postman_collection
+
+PLAN = {
+    "test_plan_name": "Shop",
+    "test_fragment_controller": {"name": "Test Fragment", "generic_controllers": [
+        {"type": "generic_controller", "name": "Auth", "children": [
+            {"type": "request", "name": "Login", "method": "POST", "raw_url": "https://shop.example.com/login?v=1",
+             "body": '{"user": "alice"}', "body_mode": "raw", "headers": [], "tests": [], "variables": []}
+        ]}
+    ]}
+}
+
+
+def test_resolve_source_path(tmp_path):
+    source = tmp_path / "shop.har"
+    source.write_text("{}")
+
+    assert resolve_source_path(str(source), ".har") == str(source)
+    assert resolve_source_path("shop", ".har") == os.path.join(PROJECT_DIR, "file_to_convert", "shop.har")
+
+
+def test_load_source(tmp_path):
+    def read(path, name):
+        if not os.path.exists(path):
+            raise FileNotFoundError(path)
+        raise ValueError(f"{name} is broken")
+
+    with pytest.raises(FileNotFoundError):
+        load_source(str(tmp_path / "missing"), ".har", read, name="missing")
+
+    broken = tmp_path / "broken.har"
+    broken.write_text("")
+    with pytest.raises(ValueError, match="broken.har is broken"):
+        load_source(str(broken), ".har", read, name="broken.har")
+
+    assert load_source(str(broken), ".har", lambda path: {"path": path}) == {"path": str(broken)}
+
+
+def test_save_postman_collection(tmp_path):
+    output = tmp_path / "shop.postman.json"
+
+    save_postman_collection(PLAN, str(output), deterministic_ids=True)
+
+    collection = json.loads(output.read_text())
+    login = collection["item"][0]["item"][0]
+    assert collection["item"][0]["name"] == "Auth"
+    assert login["request"]["body"]["raw"] == '{"user": "alice"}'
+    assert login["request"]["url"]["query"] == [{"key": "v", "value": "1"}]
@@ -3,8 +3,12 @@ import os
 
 import pytest
 
+from lxml import etree
+
 from src.jmx.jmx_creator import create_jmx_file, create_response_assertion, create_http_sampler, \
-    create_generic_controller_xml
+    create_generic_controller_xml, get_body_mode, find_common_headers, find_common_origin, generate_jmx_content, \
+    LoadProfile, split_controllers
+from src.jmx.jmx_reader import get_test_plan
 
 # Mock Postman data
 mocked_postman_data = {'test_plan_name': 'Sample', 'test_plan_comments': 'No description found',
@@ -462,3 +466,243 @@ def test_create_http_sampler_no_query_params_or_tests():
     result = create_http_sampler(request)
 
     assert result.strip() == expected_xml.strip()
+
+
+@pytest.mark.parametrize("body, body_mode, expected", [
+    ('{"id": 1}', "raw", "raw"),
+    ('{"id": 1}', None, "raw"),
+    ("No body content", None, None),
+    ("File upload not supported in JSON output", "file", None),
+    ([{"key": "a", "value": "1"}], "formdata", "formdata"),
+    ([{"key": "a", "value": "1"}], None, "urlencoded"),
+    ([], "urlencoded", None),
+])
+def test_get_body_mode(body, body_mode, expected):
+    assert get_body_mode({"body": body, "body_mode": body_mode}) == expected
+
+
+def test_create_http_sampler_with_raw_body():
+    request = {
+        'name': 'Add Pet',
+        'method': 'POST',
+        'raw_url': 'https://api.example.com/pets?dry_run=true',
+        'body': '{"name": "<doggie> & ${name}"}',
+        'body_mode': 'raw'
+    }
+
+    sampler = etree.fromstring(f"<root>{create_http_sampler(request)}</root>").find("HTTPSamplerProxy")
+
+    assert sampler.findtext("stringProp[@name='HTTPSampler.path']") == "${tests_url}/pets?dry_run=true"
+    assert sampler.findtext("boolProp[@name='HTTPSampler.postBodyRaw']") == "true"
+    arguments = sampler.findall(".//elementProp[@elementType='HTTPArgument']")
+    assert len(arguments) == 1
+    assert arguments[0].findtext("stringProp[@name='Argument.value']") == request['body']
+
+
+def test_create_http_sampler_with_form_body():
+    request = {
+        'name': 'Upload',
+        'method': 'POST',
+        'raw_url': 'https://api.example.com/upload',
+        'body': [{'key': 'name', 'value': 'a&b'}, {'key': 'kind', 'value': 'dog'}],
+        'body_mode': 'formdata'
+    }
+
+    sampler = etree.fromstring(f"<root>{create_http_sampler(request)}</root>").find("HTTPSamplerProxy")
+
+    assert sampler.findtext("boolProp[@name='HTTPSampler.DO_MULTIPART_POST']") == "true"
+    assert sampler.findtext("boolProp[@name='HTTPSampler.postBodyRaw']") == "false"
+    assert [(argument.get("name"), argument.findtext("stringProp[@name='Argument.value']"))
+            for argument in sampler.findall(".//elementProp[@elementType='HTTPArgument']")] == \
+           [("name", "a&b"), ("kind", "dog")]
+
+
+def test_create_http_sampler_externalizes_large_body(tmp_path):
+    body_dir = tmp_path / "plan_bodies"
+    request = {
+        'name': 'Bulk',
+        'method': 'POST',
+        'raw_url': 'https://api.example.com/bulk',
+        'body': '{"owner": "${owner}", "data": "' + "x" * 100 + '"}',
+        'body_mode': 'raw'
+    }
+
+    inline = create_http_sampler(request, body_dir=str(body_dir), body_threshold=1024)
+    external = create_http_sampler(request, body_dir=str(body_dir), body_threshold=64)
+
+    assert "x" * 100 in inline
+    [body_file] = body_dir.iterdir()
+    assert body_file.read_text(encoding="utf-8") == request['body']
+    assert f"${{__eval(${{__FileToString(plan_bodies/{body_file.name},UTF-8,)}})}}" in external
+
+
+def test_create_jmx_file_with_body_threshold(mocker, tmp_path):
+    mocker.patch('src.jmx.jmx_creator.read_postman_collection', return_value=mocked_postman_data)
+    jmx_file = tmp_path / "plan.jmx"
+
+    create_jmx_file("collection.json", str(jmx_file), body_threshold=16)
+
+    assert len(list((tmp_path / "plan_bodies").iterdir())) == 1
+    assert "__FileToString(plan_bodies/body_" in jmx_file.read_text()
+
+
+def header_requests():
+    return [
+        {'type': 'request', 'name': 'Get', 'method': 'GET', 'raw_url': 'https://api.example.com/pets',
+         'headers': [{'key': 'Accept', 'value': 'application/json'}, {'key': 'X-Trace', 'value': '1'}]},
+        {'type': 'request', 'name': 'Delete', 'method': 'DELETE', 'raw_url': 'https://admin.example.com:8443/pets',
+         'headers': [{'key': 'Accept', 'value': 'application/json'}]},
+    ]
+
+
+def test_find_common_headers():
+    controller = {'type': 'generic_controller', 'name': 'Pets', 'children': header_requests()}
+
+    assert find_common_headers([controller]) == [('Accept', 'application/json')]
+    assert find_common_headers([controller, {'type': 'request', 'name': 'Bare'}]) == []
+
+
+def test_find_common_origin():
+    requests = header_requests() + [{'type': 'request', 'raw_url': 'https://api.example.com/owners'},
+                                    {'type': 'request', 'raw_url': '${base_url}/owners'}]
+
+    assert find_common_origin(requests) == ('https', 'api.example.com', '')
+    assert find_common_origin([{'type': 'request', 'raw_url': '/relative'}]) is None
+
+
+def test_generate_jmx_content_hoists_shared_config():
+    data = {'test_plan_name': 'Plan', 'test_fragment_controller': {'name': 'Fragment', 'generic_controllers': [
+        {'type': 'generic_controller', 'name': 'Pets', 'children': header_requests()}]}}
+
+    root = etree.fromstring(generate_jmx_content(data, shared_defaults=True).encode())
+
+    defaults = root.find(".//ConfigTestElement")
+    assert defaults.findtext("stringProp[@name='HTTPSampler.domain']") == "api.example.com"
+    header_managers = root.findall(".//HeaderManager")
+    assert [[header.findtext("stringProp[@name='Header.name']") for header in manager.iter("elementProp")]
+            for manager in header_managers] == [["Accept"], ["X-Trace"]]
+    get, delete = root.iter("HTTPSamplerProxy")
+    assert get.findtext("stringProp[@name='HTTPSampler.path']") == "/pets"
+    assert get.find("stringProp[@name='HTTPSampler.domain']") is None
+    assert delete.findtext("stringProp[@name='HTTPSampler.domain']") == "admin.example.com"
+    assert delete.findtext("stringProp[@name='HTTPSampler.port']") == "8443"
+
+
+def test_generate_jmx_content_keeps_tests_url_without_shared_defaults():
+    data = {'test_plan_name': 'Plan', 'test_fragment_controller': {'name': 'Fragment', 'generic_controllers': [
+        {'type': 'generic_controller', 'name': 'Pets', 'children': header_requests()}]}}
+
+    root = etree.fromstring(generate_jmx_content(data).encode())
+
+    assert root.find(".//ConfigTestElement") is None
+    assert [sampler.findtext("stringProp[@name='HTTPSampler.path']") for sampler in root.iter("HTTPSamplerProxy")] \
+        == ["${tests_url}/pets", "${tests_url}/pets"]
+
+
+def test_generate_jmx_content_with_load_profile():
+    profile = LoadProfile(threads=20, ramp_up=10, duration=300, target_rps=50, reuse_connections=False)
+
+    root = etree.fromstring(generate_jmx_content(mocked_postman_data, load_profile=profile).encode())
+
+    assert root.find(".//TestFragmentController") is None
+    thread_group = root.find(".//ThreadGroup")
+    assert thread_group.get("testname") == "Test Fragment"
+    assert thread_group.findtext("stringProp[@name='ThreadGroup.num_threads']") == "20"
+    assert thread_group.findtext("boolProp[@name='ThreadGroup.scheduler']") == "true"
+    assert thread_group.findtext("stringProp[@name='ThreadGroup.duration']") == "300"
+    assert thread_group.findtext(".//stringProp[@name='LoopController.loops']") == "-1"
+    assert root.findtext(".//ConstantThroughputTimer/doubleProp/value") == "3000.0"
+    assert {sampler.findtext("boolProp[@name='HTTPSampler.use_keepalive']")
+            for sampler in root.iter("HTTPSamplerProxy")} == {"false"}
+
+
+def test_generate_jmx_content_with_iterations():
+    root = etree.fromstring(generate_jmx_content(mocked_postman_data, load_profile=LoadProfile(loops=5)).encode())
+
+    assert root.findtext(".//ThreadGroup/elementProp/stringProp[@name='LoopController.loops']") == "5"
+    assert root.findtext(".//ThreadGroup/boolProp[@name='ThreadGroup.scheduler']") == "false"
+    assert root.find(".//ConstantThroughputTimer") is None
+
+
+def test_generate_jmx_content_deduplicates_into_modules():
+    login = {'type': 'request', 'name': 'Login', 'method': 'POST', 'raw_url': 'https://api.example.com/login',
+             'body': '{}', 'body_mode': 'raw'}
+    data = {'test_plan_name': 'Plan', 'test_fragment_controller': {'name': 'Fragment', 'generic_controllers': [
+        {'type': 'generic_controller', 'name': 'A', 'children': [login]},
+        {'type': 'generic_controller', 'name': 'B', 'children': [dict(login)]}]}}
+
+    root = etree.fromstring(generate_jmx_content(data, deduplicate=True).encode())
+
+    assert len(list(root.iter("HTTPSamplerProxy"))) == 1
+    module_controllers = list(root.iter("ModuleController"))
+    assert len(module_controllers) == 2
+    assert [path.text for path in module_controllers[0].iter("stringProp")] == \
+           ["Test Plan", "Plan", "Shared Modules", "Login"]
+    fragments = [fragment.get("testname") for fragment in root.iter("TestFragmentController")]
+    assert fragments == ["Fragment", "Shared Modules"]
+
+
+def test_split_controllers():
+    controllers = [{'type': 'generic_controller', 'name': name, 'children': [{'type': 'request'}] * size}
+                   for name, size in (("A", 2), ("B", 1), ("C", 5), ("D", 1))]
+
+    assert [[controller['name'] for controller in part] for part in split_controllers(controllers)] == \
+           [["A"], ["B"], ["C"], ["D"]]
+    assert [[controller['name'] for controller in part] for part in split_controllers(controllers, 3)] == \
+           [["A", "B"], ["C"], ["D"]]
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_create_jmx_file_split(mocker, tmp_path, workers):
+    mocker.patch('src.jmx.jmx_creator.read_postman_collection', return_value=mocked_postman_data)
+    jmx_file = tmp_path / "plan.jmx"
+
+    create_jmx_file("collection.json", str(jmx_file), split=True, workers=workers)
+
+    master = etree.parse(str(jmx_file)).getroot()
+    assert [include.findtext("stringProp") for include in master.iter("IncludeController")] == \
+           ["plan_parts/part_001.jmx", "plan_parts/part_002.jmx"]
+    assert master.find(".//HTTPSamplerProxy") is None
+    assert sorted(path.name for path in (tmp_path / "plan_parts").iterdir()) == ["part_001.jmx", "part_002.jmx"]
+
+    # Reading the master plan back follows the includes
+    test_plan = get_test_plan(str(jmx_file))
+    assert test_plan["name"] == "Sample"
+    assert [item["item"]["name"] for item in test_plan["items"]] == ["Test", "Get Test"]
+
+
+def test_create_jmx_file_split_rejects_deduplicate(mocker, tmp_path):
+    mocker.patch('src.jmx.jmx_creator.read_postman_collection', return_value=mocked_postman_data)
+
+    with pytest.raises(ValueError):
+        create_jmx_file("collection.json", str(tmp_path / "plan.jmx"), split_size=10, deduplicate=True)
+
+
+def test_create_jmx_file_with_variables_and_data(mocker, tmp_path):
+    mocker.patch('src.jmx.jmx_creator.read_postman_collection', return_value=mocked_postman_data)
+    globals_file = tmp_path / "globals.json"
+    globals_file.write_text(json.dumps({"values": [{"key": "tests_url", "value": "https://global.example.com"},
+                                                   {"key": "timeout", "value": "30"}]}))
+    environment_file = tmp_path / "staging.json"
+    environment_file.write_text(json.dumps({"values": [{"key": "tests_url", "value": "https://staging.example.com"}]}))
+    data_file = tmp_path / "users.json"
+    data_file.write_text(json.dumps([{"user": "alice"}, {"user": "bob", "age": 30}]))
+    jmx_file = tmp_path / "plan.jmx"
+
+    create_jmx_file("collection.json", str(jmx_file), split=True, workers=1, environment_file=str(environment_file),
+                    globals_file=str(globals_file), data_file=str(data_file))
+
+    master = etree.parse(str(jmx_file)).getroot()
+    arguments = master.findall(".//TestPlan/elementProp/collectionProp/elementProp")
+    assert {argument.findtext("stringProp[@name='Argument.name']"): argument.findtext(
+        "stringProp[@name='Argument.value']") for argument in arguments} == {
+        "tests_url": "https://staging.example.com", "timeout": "30"}
+    data_set = master.find(".//CSVDataSet")
+    assert data_set.findtext("stringProp[@name='filename']") == "plan_data.csv"
+    assert data_set.findtext("stringProp[@name='variableNames']") == "user,age"
+    assert (tmp_path / "plan_data.csv").read_text().splitlines() == ["user,age", "alice,", "bob,30"]
+
+    # The variables and the data set are set once, in the master plan
+    part = etree.parse(str(tmp_path / "plan_parts" / "part_001.jmx")).getroot()
+    assert part.find(".//TestPlan/elementProp/collectionProp/elementProp") is None
+    assert part.find(".//CSVDataSet") is None
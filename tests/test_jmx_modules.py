@@ -0,0 +1,81 @@
+from collections import Counter
+
+from src.jmx.jmx_modules import (
+    compute_structure_keys,
+    count_structures,
+    java_string_hash,
+    deduplicate_test_plan,
+    MODULE_CONTROLLER,
+    SHARED_MODULES_NAME
+)
+
+
+def request(name, url="https://api.example.com/login"):
+    return {'type': 'request', 'name': name, 'method': 'POST', 'raw_url': url, 'body': '{}', 'tests': []}
+
+
+def folder(name, children):
+    return {'type': 'generic_controller', 'name': name, 'children': children}
+
+
+def plan_with(controllers):
+    return {'test_plan_name': 'Plan',
+            'test_fragment_controller': {'name': 'Test Fragment', 'generic_controllers': controllers}}
+
+
+# Test compute_structure_keys ignores object identity but not content
+def test_compute_structure_keys():
+    keys = {}
+    first, second, other = request("Login"), request("Login"), request("Login", "https://api.example.com/other")
+
+    assert compute_structure_keys(first, keys) == compute_structure_keys(second, keys)
+    assert compute_structure_keys(first, keys) != compute_structure_keys(other, keys)
+    assert compute_structure_keys(folder("A", [first]), keys) != compute_structure_keys(folder("B", [second]), keys)
+
+
+# Test count_structures only counts the children of the first occurrence of a structure
+def test_count_structures():
+    keys, counts = {}, Counter()
+    controllers = [folder("Auth", [request("Login")]), folder("Auth", [request("Login")])]
+    for controller in controllers:
+        compute_structure_keys(controller, keys)
+        count_structures(controller, keys, counts)
+
+    assert counts[keys[id(controllers[0])]] == 2
+    assert counts[keys[id(controllers[0]['children'][0])]] == 1
+
+
+def test_java_string_hash():
+    assert java_string_hash("Test Plan") == 764597751
+    assert java_string_hash("") == 0
+    assert java_string_hash("Shared Modules") == 1283890892
+
+
+def test_deduplicate_test_plan_without_repetition():
+    data = plan_with([folder("A", [request("Login")]), folder("B", [request("Logout")])])
+
+    assert deduplicate_test_plan(data) is data
+
+
+def test_deduplicate_test_plan():
+    data = plan_with([
+        folder("A", [request("Login"), request("Get A", "https://api.example.com/a")]),
+        folder("B", [request("Login"), request("Get B", "https://api.example.com/b")]),
+        folder("Auth", [request("Login")]),
+        folder("Auth", [request("Login")]),
+    ])
+
+    result = deduplicate_test_plan(data)
+
+    first, second, third, fourth = result['test_fragment_controller']['generic_controllers']
+    assert first['children'][0]['type'] == MODULE_CONTROLLER
+    assert first['children'][0]['node_path'] == ["Test Plan", "Plan", SHARED_MODULES_NAME, "Login"]
+    assert second['children'][0]['node_path'] == first['children'][0]['node_path']
+    assert first['children'][1]['type'] == 'request'
+    assert third['type'] == fourth['type'] == MODULE_CONTROLLER
+    assert third['node_path'][-1] == "Auth"
+    assert [module['name'] for module in result['shared_modules']] == ["Login", "Auth"]
+    # The repeated folder holds the Login request inline, it is only emitted once
+    assert result['shared_modules'][1]['children'][0]['type'] == MODULE_CONTROLLER
+    # The input structure is left untouched
+    assert data['test_fragment_controller']['generic_controllers'][0]['children'][0]['type'] == 'request'
@@ -0,0 +1,99 @@
+from src.jmx.jmx_parallel_reader import (
+    scan_controller_boundaries,
+    group_ranges,
+    detect_encoding,
+    parse_chunk,
+    get_test_plan_parallel
+)
+from src.jmx.jmx_reader import get_test_plan
+
+
+def build_jmx(controller_count: int) -> str:
+    """Builds a JMX plan with a direct request and the given number of controllers."""
+    controllers = ""
+    for index in range(controller_count):
+        controllers += f"""
+        <!-- controller {index} <hashTree> -->
+        <GenericController guiclass="LogicControllerGui" testclass="GenericController" testname="Controller {index}"/>
+        <hashTree>
+          <HTTPSamplerProxy guiclass="HttpTestSampleGui" testclass="HTTPSamplerProxy" testname="Request {index}">
+            <stringProp name="HTTPSampler.path">/path/{index}</stringProp>
+            <stringProp name="HTTPSampler.method">POST</stringProp>
+          </HTTPSamplerProxy>
+          <hashTree/>
+        </hashTree>"""
+
+    return f"""<?xml version="1.0" encoding="UTF-8"?>
+<jmeterTestPlan version="1.2" properties="5.0" jmeter="5.6.3">
+  <hashTree>
+    <TestPlan guiclass="TestPlanGui" testclass="TestPlan" testname="Parallel Plan"/>
+    <hashTree>
+      <TestFragmentController guiclass="TestFragmentControllerGui" testclass="TestFragmentController" testname="Test Fragment"/>
+      <hashTree>
+        <HTTPSamplerProxy guiclass="HttpTestSampleGui" testclass="HTTPSamplerProxy" testname="Direct Request">
+          <stringProp name="HTTPSampler.path">/direct</stringProp>
+        </HTTPSamplerProxy>
+        <hashTree/>{controllers}
+      </hashTree>
+    </hashTree>
+  </hashTree>
+</jmeterTestPlan>
+"""
+
+
+def test_scan_controller_boundaries():
+    content = build_jmx(3).encode()
+
+    containers = scan_controller_boundaries(content)
+
+    assert len(containers) == 1
+    assert len(containers[0]) == 4
+    assert containers[0][0][1] == containers[0][1][0]
+    assert b"Controller 2" in content[containers[0][3][0]:containers[0][3][1]]
+
+
+def test_group_ranges():
+    containers = [[(0, 10), (10, 20), (20, 30), (30, 40)], [(50, 60)]]
+
+    batches = group_ranges(containers, 3)
+
+    assert batches == [(0, 20), (20, 40), (50, 60)]
+
+
+def test_detect_encoding():
+    assert detect_encoding(b'<?xml version="1.0" encoding="ISO-8859-1"?>') == "ISO-8859-1"
+    assert detect_encoding(b'<jmeterTestPlan/>') == "UTF-8"
+
+
+def test_parse_chunk(tmp_path):
+    jmx_path = tmp_path / "plan.jmx"
+    jmx_path.write_text(build_jmx(2))
+    start, end = scan_controller_boundaries(jmx_path.read_bytes())[0][1]
+
+    chunk = parse_chunk(str(jmx_path), start, end)
+
+    assert chunk["controllers"][0]["item"]["name"] == "Controller 0"
+    assert chunk["direct_requests"] == []
+    assert chunk["sub_controller_names"] == {"Request 0"}
+
+
+def test_get_test_plan_parallel_matches_sequential(tmp_path):
+    jmx_path = tmp_path / "plan.jmx"
+    jmx_path.write_text(build_jmx(40))
+
+    result = get_test_plan_parallel(str(jmx_path), max_workers=2, min_parallel_size=0)
+
+    assert result == get_test_plan(str(jmx_path))
+    assert result["name"] == "Parallel Plan"
+    assert result["items"][-1]["item"]["name"] == "Direct Request"
+
+
+def test_get_test_plan_parallel_small_file_fallback(tmp_path, mocker):
+    jmx_path = tmp_path / "plan.jmx"
+    jmx_path.write_text(build_jmx(1))
+    mock_executor = mocker.patch("src.jmx.jmx_parallel_reader.ProcessPoolExecutor")
+
+    result = get_test_plan_parallel(str(jmx_path))
+
+    mock_executor.assert_not_called()
+    assert result == get_test_plan(str(jmx_path))
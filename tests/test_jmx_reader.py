@@ -10,7 +10,12 @@ from src.jmx.jmx_reader import (
     extract_controller_item,
     extract_controllers,
     extract_test_plan_name,
-    get_test_plan
+    get_test_plan,
+    parse_jmx_bytes,
+    build_test_plan,
+    resolve_includes,
+    to_request_node,
+    to_generic_controllers
 )
 
 # Mocked data for testing
@@ -178,4 +183,75 @@ def test_get_test_plan(mock_jmx_root, mocker):
     test_plan = get_test_plan("mock_file.jmx")
 
     assert test_plan["name"] == "Test Plan"
-    assert len(test_plan["items"]) == 2
\ No newline at end of file
+    assert len(test_plan["items"]) == 2
+
+
+def test_parse_jmx_bytes():
+    """Test the parse_jmx_bytes function."""
+    root = parse_jmx_bytes(mock_jmx_file.encode())
+
+    assert root.tag == "jmeterTestPlan"
+
+
+def test_parse_jmx_bytes_fail():
+    """Test the parse_jmx_bytes function with invalid content."""
+    with pytest.raises(etree.XMLSyntaxError):
+        parse_jmx_bytes(b"<jmeterTestPlan>")
+
+
+def test_build_test_plan_without_root():
+    """Test the build_test_plan function when there is no root element."""
+    assert build_test_plan(None) == {"error": "Failed to parse JMX file"}
+
+
+def write_plan(path, name, body):
+    path.write_text(f"""<jmeterTestPlan><hashTree>
+      <TestPlan testname="{name}"/><hashTree>
+        <TestFragmentController testname="{name}"/><hashTree>{body}</hashTree>
+      </hashTree>
+    </hashTree></jmeterTestPlan>""")
+
+
+def include(path):
+    return f"""<IncludeController testname="{path}">
+      <stringProp name="IncludeController.includepath">{path}</stringProp>
+    </IncludeController><hashTree/>"""
+
+
+def test_resolve_includes(tmp_path):
+    """Test that includes are spliced in place, nested includes are resolved from the main plan directory."""
+    (tmp_path / "parts").mkdir()
+    write_plan(tmp_path / "parts" / "a.jmx", "A", '<GenericController testname="A"/><hashTree/>' + include("parts/b.jmx"))
+    write_plan(tmp_path / "parts" / "b.jmx", "B", '<GenericController testname="B"/><hashTree/>' + include("parts/a.jmx"))
+    write_plan(tmp_path / "main.jmx", "Main", include("parts/a.jmx"))
+
+    root = resolve_includes(parse_jmx_file(str(tmp_path / "main.jmx")), str(tmp_path))
+
+    assert [controller.get("testname") for controller in root.iter("GenericController")] == ["A", "B"]
+    # The include of a.jmx from b.jmx is a cycle and is left unresolved
+    assert [element.get("testname") for element in root.iter("IncludeController")] == ["parts/a.jmx"]
+
+
+def test_to_request_node():
+    """Test that the body argument becomes the raw body and the other arguments the query string."""
+    request = to_request_node({"name": "Search & list", "path": "/items?page=1", "method": "POST",
+                               "arguments": {"body": '{"q": 1}', "sort": "name", "tag": "a&b c", "user": "${user}"}},
+                              "controller_2", "controller_1")
+
+    assert request["name"] == "Search and list"
+    assert request["raw_url"] == "/items?page=1&sort=name&tag=a%26b%20c&user=${user}"
+    assert request["queryParams"] == [{"sort": "name"}, {"tag": "a&b c"}, {"user": "${user}"}]
+    assert (request["body"], request["body_mode"]) == ('{"q": 1}', "raw")
+    assert (request["id"], request["parent"], request["type"]) == ("controller_2", "controller_1", "request")
+
+
+def test_to_generic_controllers(mock_jmx_root):
+    """Test that the test plan items become controllers, items of a single request become requests."""
+    controllers = to_generic_controllers(build_test_plan(mock_jmx_root))
+
+    controller, request = controllers
+    assert (controller["name"], controller["type"]) == ("Controller 1", "generic_controller")
+    assert controller["children"][0]["raw_url"] == "${tests_url}/${tests_url}/v2/pet?arg1=value1"
+    assert controller["children"][0]["parent"] == controller["id"]
+    assert (request["name"], request["type"], request["parent"]) == ("Request 1", "request", None)
+    assert request["body"] == "No body content"
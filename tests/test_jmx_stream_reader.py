@@ -0,0 +1,73 @@
+from lxml import etree
+
+from src.jmx.jmx_stream_reader import CLOSE, ELEMENT, OPEN, get_hash_tree, is_container, is_enabled, iter_plan_elements
+
+PLAN = """<?xml version="1.0" encoding="UTF-8"?>
+<jmeterTestPlan version="1.2" properties="5.0" jmeter="5.6.3">
+  <hashTree>
+    <TestPlan guiclass="TestPlanGui" testclass="TestPlan" testname="Plan"/>
+    <hashTree>
+      <ThreadGroup guiclass="ThreadGroupGui" testclass="ThreadGroup" testname="Users"/>
+      <hashTree>
+        <HeaderManager guiclass="HeaderPanel" testclass="HeaderManager" testname="Headers"/>
+        <hashTree/>
+        <GenericController guiclass="LogicControllerGui" testclass="GenericController" testname="Folder"/>
+        <hashTree>
+          <!-- comments around a sampler -->
+          <HTTPSamplerProxy guiclass="HttpTestSampleGui" testclass="HTTPSamplerProxy" testname="Request"/>
+          <!-- are skipped -->
+          <hashTree>
+            <ResponseAssertion guiclass="AssertionGui" testclass="ResponseAssertion" testname="Status"/>
+            <hashTree/>
+          </hashTree>
+        </hashTree>
+      </hashTree>
+    </hashTree>
+  </hashTree>
+</jmeterTestPlan>
+"""
+
+
+def test_is_container():
+    assert is_container(None)
+    assert is_container(etree.Element("TestPlan"))
+    assert is_container(etree.Element("SetupThreadGroup"))
+    assert is_container(etree.Element("TransactionController"))
+    assert not is_container(etree.Element("IncludeController"))
+    assert not is_container(etree.Element("HTTPSamplerProxy"))
+
+
+def test_is_enabled():
+    assert is_enabled(etree.Element("HTTPSamplerProxy"))
+    assert not is_enabled(etree.Element("HTTPSamplerProxy", enabled="false"))
+
+
+def test_iter_plan_elements(tmp_path):
+    plan = tmp_path / "plan.jmx"
+    plan.write_text(PLAN)
+    events = []
+
+    for event, element, depth in iter_plan_elements(str(plan)):
+        children = [child.tag for child in get_hash_tree(element)] if event == ELEMENT else None
+        events.append((event, element.attrib["testname"], depth, children))
+
+    assert events == [
+        (OPEN, "Plan", 1, None),
+        (OPEN, "Users", 2, None),
+        (ELEMENT, "Headers", 3, []),
+        (OPEN, "Folder", 3, None),
+        (ELEMENT, "Request", 4, ["ResponseAssertion", "hashTree"]),
+        (CLOSE, "Folder", 3, None),
+        (CLOSE, "Users", 2, None),
+        (CLOSE, "Plan", 1, None),
+    ]
+
+
+def test_iter_plan_elements_releases_elements(tmp_path):
+    plan = tmp_path / "plan.jmx"
+    plan.write_text(PLAN)
+
+    for event, element, _ in iter_plan_elements(str(plan)):
+        if event == CLOSE and element.tag == "ThreadGroup":
+            # Everything the thread group held was removed once reported
+            assert len(get_hash_tree(element)) == 0
@@ -0,0 +1,79 @@
+import json
+
+import pytest
+from lxml import etree
+
+from src.jmx.jmx_variables import (
+    load_variables,
+    write_data_set,
+    create_data_set,
+    create_user_defined_variables_xml,
+    create_csv_data_set_xml
+)
+
+
+def test_load_variables(tmp_path):
+    globals_file = tmp_path / "globals.json"
+    globals_file.write_text(json.dumps({"values": [{"key": "host", "value": "global"},
+                                                   {"key": "token", "value": "{{secret}}"},
+                                                   {"key": "off", "value": "x", "enabled": False}]}))
+    environment_file = tmp_path / "staging.json"
+    environment_file.write_text(json.dumps({"host": "staging", "retries": 3}))
+
+    assert load_variables(str(environment_file), str(globals_file)) == {
+        "host": "staging", "token": "${secret}", "retries": "3"}
+    assert load_variables() == {}
+
+
+def test_write_data_set_csv(tmp_path):
+    data_file = tmp_path / "users.csv"
+    data_file.write_text('\ufeffuser,note\nalice,"hello, world"\nbob,\n', encoding="utf-8")
+    csv_path = tmp_path / "out.csv"
+
+    assert write_data_set(str(data_file), str(csv_path)) == ["user", "note"]
+    assert csv_path.read_text().splitlines() == ["user,note", 'alice,"hello, world"', "bob,"]
+
+
+def test_write_data_set_json(tmp_path):
+    data_file = tmp_path / "users.json"
+    data_file.write_text(json.dumps([{"user": "alice", "tags": ["a"]}, "skipped", {"user": None, "id": 2}]))
+    csv_path = tmp_path / "out.csv"
+
+    assert write_data_set(str(data_file), str(csv_path)) == ["user", "tags", "id"]
+    assert csv_path.read_text().splitlines() == ["user,tags,id", 'alice,"[""a""]",', ",,2"]
+
+
+def test_write_data_set_errors(tmp_path):
+    empty = tmp_path / "empty.json"
+    empty.write_text("[]")
+    with pytest.raises(ValueError):
+        write_data_set(str(empty), str(tmp_path / "out.csv"))
+
+    with pytest.raises(FileNotFoundError):
+        write_data_set(str(tmp_path / "missing.csv"), str(tmp_path / "out.csv"))
+
+
+def test_create_data_set(tmp_path):
+    data_file = tmp_path / "users.csv"
+    data_file.write_text("user\nalice\n")
+
+    assert create_data_set(str(data_file), str(tmp_path / "out"), "plan.jmx") == ("plan_data.csv", ["user"])
+    assert (tmp_path / "out" / "plan_data.csv").exists()
+
+
+def test_create_user_defined_variables_xml():
+    assert create_user_defined_variables_xml({}) == """<collectionProp name="Arguments.arguments"/>"""
+
+    collection = etree.fromstring(create_user_defined_variables_xml({"a\"b": "<x & y>"}))
+    argument = collection.find("elementProp")
+    assert argument.get("name") == "a\"b"
+    assert argument.findtext("stringProp[@name='Argument.value']") == "<x & y>"
+
+
+def test_create_csv_data_set_xml():
+    data_set = etree.fromstring(create_csv_data_set_xml("plan_data.csv", ["user", "age"]).split("<hashTree/>")[0])
+
+    assert data_set.findtext("stringProp[@name='filename']") == "plan_data.csv"
+    assert data_set.findtext("stringProp[@name='variableNames']") == "user,age"
+    assert data_set.findtext("boolProp[@name='ignoreFirstLine']") == "true"
+    assert data_set.findtext("stringProp[@name='shareMode']") == "shareMode.all"
@@ -0,0 +1,68 @@
+import io
+import json
+
+import pytest
+
+from src.helper.json_stream import JsonStream
+
+
+def test_iter_object_and_array(mocker):
+    mocker.patch('src.helper.json_stream.CHUNK_SIZE', 3)
+    document = {"log": {"version": "1.2", "entries": [{"a": 1}, {"b": [1, 2, {"c": "x" * 50}]}, 12345, "y"]}}
+    stream = JsonStream(io.StringIO(json.dumps(document, indent=2)))
+
+    items = []
+    for key in stream.iter_object():
+        assert key == "log"
+        for log_key in stream.iter_object():
+            if log_key == "entries":
+                items.extend(stream.iter_array())
+            else:
+                assert stream.read_value() == "1.2"
+
+    assert items == document["log"]["entries"]
+    assert stream.peek() == ""
+
+
+def test_empty_containers():
+    stream = JsonStream(io.StringIO('{"entries": [ ], "pages": {}}'))
+
+    for key in stream.iter_object():
+        if key == "entries":
+            assert list(stream.iter_array()) == []
+        else:
+            assert list(stream.iter_object()) == []
+
+
+def test_iter_items(mocker):
+    mocker.patch('src.helper.json_stream.CHUNK_SIZE', 4)
+    stream = JsonStream(io.StringIO('[{"name": "a", "item": []}, {"name": "b"}, 3]'))
+
+    names = []
+    for _ in stream.iter_items():
+        if stream.peek() != "{":
+            names.append(stream.read_value())
+            continue
+        for key in stream.iter_object():
+            value = stream.read_value()
+            if key == "name":
+                names.append(value)
+
+    assert names == ["a", "b", 3]
+    assert list(JsonStream(io.StringIO("[]")).iter_items()) == []
+
+
+def test_read_value_does_not_cut_numbers(mocker):
+    mocker.patch('src.helper.json_stream.CHUNK_SIZE', 2)
+    stream = JsonStream(io.StringIO("[1234567, 89]"))
+
+    assert list(stream.iter_array()) == [1234567, 89]
+
+
+@pytest.mark.parametrize("document", ['{"a": [1, 2', '{"a" 1}', '[1 2]', '{"a": tru}'])
+def test_invalid_documents(document):
+    stream = JsonStream(io.StringIO(document))
+
+    with pytest.raises(ValueError):
+        for _ in stream.iter_object():
+            list(stream.iter_array())
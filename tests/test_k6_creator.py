@@ -0,0 +1,194 @@
+import json
+
+import pytest
+
+from src.jmx.jmx_creator import LoadProfile
+from src.k6.k6_creator import (
+    resolve_k6_output,
+    js_string,
+    find_request_variables,
+    split_batches,
+    find_header_constants,
+    get_expected_status,
+    create_scenario,
+    create_options_js,
+    iter_k6_script,
+    create_k6_script
+)
+
+ACCEPT_JSON = {'key': 'Accept', 'value': 'application/json'}
+BEARER_TOKEN = {'key': 'Authorization', 'value': 'Bearer ${token}'}
+
+
+def request(name, url, headers=None, body='No body content', body_mode=None, variables=None, tests=None):
+    return {'type': 'request', 'name': name, 'method': 'POST' if body_mode else 'GET', 'raw_url': url,
+            'body': body, 'body_mode': body_mode, 'headers': headers or [], 'variables': variables or [],
+            'tests': tests or []}
+
+
+def plan_with(nodes):
+    return {'test_plan_name': 'Shop', 'test_fragment_controller': {'name': 'Test Fragment',
+                                                                   'generic_controllers': nodes}}
+
+
+LOGIN = request('Login', '${tests_url}/login', [ACCEPT_JSON], '{"user": "${user}"}', 'raw',
+                variables=[{'name': 'token', 'path': 'data.token'}],
+                tests=[{'name': 'Status code is 200', 'script': 'pm.response.to.have.status(200);'}])
+PING = request('Ping', '${tests_url}/ping', [ACCEPT_JSON])
+ME = request('Me', '${tests_url}/me', [BEARER_TOKEN])
+
+
+def test_resolve_k6_output(tmp_path):
+    assert resolve_k6_output(str(tmp_path / "shop.js")) == (str(tmp_path), "shop.js")
+    assert resolve_k6_output("shop")[1] == "shop.js"
+
+
+def test_js_string():
+    assert js_string('https://x.io/"a"') == '"https://x.io/\\"a\\""'
+    assert js_string('${tests_url}/ping') == 'fill("${tests_url}/ping")'
+
+
+def test_find_request_variables():
+    form = request('Form', 'https://x.io/${path}', [BEARER_TOKEN], [{'key': 'a', 'value': '${b}'}], 'urlencoded')
+
+    assert find_request_variables(form) == {'path', 'token', 'b'}
+
+
+def test_split_batches_on_dependencies():
+    batches = split_batches([LOGIN, PING, ME, PING])
+
+    assert [[item['name'] for item in batch] for batch in batches] == [['Login', 'Ping'], ['Me', 'Ping']]
+
+
+def test_find_header_constants():
+    constants = find_header_constants([{'type': 'generic_controller', 'name': 'Auth', 'children': [LOGIN, PING, ME]}])
+
+    assert constants == {(('Accept', 'application/json'),): 'HEADERS_1'}
+
+
+@pytest.mark.parametrize("load_profile, expected", [
+    (LoadProfile(threads=5, duration=60, target_rps=2.5),
+     {'executor': 'constant-arrival-rate', 'rate': 150, 'timeUnit': '1m', 'duration': '60s', 'preAllocatedVUs': 5}),
+    (LoadProfile(threads=5, duration=60, target_rps=3),
+     {'executor': 'constant-arrival-rate', 'rate': 3, 'timeUnit': '1s', 'duration': '60s', 'preAllocatedVUs': 5}),
+    (LoadProfile(threads=5, ramp_up=10, duration=60),
+     {'executor': 'ramping-vus', 'startVUs': 0,
+      'stages': [{'duration': '10s', 'target': 5}, {'duration': '50s', 'target': 5}]}),
+    (LoadProfile(threads=2, loops=3),
+     {'executor': 'per-vu-iterations', 'vus': 2, 'iterations': 3}),
+])
+def test_create_scenario(load_profile, expected):
+    assert create_scenario(load_profile) == expected
+
+
+@pytest.mark.parametrize("requests, rate, time_unit", [(5, 2, '1s'), (20, 30, '1m'), (2000, 18, '1h')])
+def test_create_scenario_requests_per_iteration(requests, rate, time_unit):
+    scenario = create_scenario(LoadProfile(threads=5, duration=60, target_rps=10), requests)
+
+    assert (scenario['rate'], scenario['timeUnit']) == (rate, time_unit)
+
+
+def test_create_options_js():
+    options_js = create_options_js({'default': {'executor': 'per-vu-iterations'}}, reuse_connections=False)
+
+    assert options_js.startswith("export const options = ")
+    assert json.loads(options_js[len("export const options = "):].rstrip().rstrip(";")) == {
+        'scenarios': {'default': {'executor': 'per-vu-iterations'}}, 'noConnectionReuse': True,
+        'noVUConnectionReuse': True}
+
+
+def test_iter_k6_script():
+    bodies = []
+    data = plan_with([{'type': 'generic_controller', 'name': 'Auth', 'children': [
+        LOGIN, PING, ME,
+        {'type': 'child_generic_controller', 'name': 'Sub', 'children': [ME]}
+    ]}, request('Top', 'https://x.io/top')])
+
+    script = "".join(iter_k6_script(data, lambda body: bodies.append(body) or len(bodies) - 1, "shop.bodies.json"))
+
+    assert bodies == ['{"user": "${user}"}']
+    assert "import { SharedArray } from 'k6/data';" in script
+    assert 'open("./shop.bodies.json")' in script
+    assert 'const HEADERS_1 = {"Accept": "application/json"};' in script
+    assert 'const HEADERS_2 = {"Authorization": "Bearer ${token}"};' in script
+    assert 'group("Auth", function () {' in script
+    assert 'group("Sub", function () {' in script
+    # Login and Ping run in parallel, Me waits for the token set from the Login response
+    assert ('responses = http.batch([\n'
+            '            ["POST", fill("${tests_url}/login"), fill(BODIES[0]), '
+            '{ headers: HEADERS_1, tags: { name: "Login" } }],\n'
+            '            ["GET", fill("${tests_url}/ping"), null, { headers: HEADERS_1, tags: { name: "Ping" } }],\n'
+            '        ]);') in script
+    assert 'check(responses[0], { "Status code is 200": (r) => r.status === 200 });' in script
+    assert 'vars["token"] = responses[0].json("data.token");' in script
+    assert ('responses = [http.request("GET", fill("${tests_url}/me"), null, '
+            '{ headers: fillHeaders(HEADERS_2), tags: { name: "Me" } })];') in script
+    assert script.index('vars["token"]') < script.index('tags: { name: "Me" }')
+    assert '    responses = [http.request("GET", "https://x.io/top", null, { tags: { name: "Top" } })];' in script
+    assert "export const options" not in script
+
+
+def test_iter_k6_script_target_rps():
+    data = plan_with([{'type': 'generic_controller', 'name': 'Auth', 'children': [LOGIN, PING, ME]},
+                      request('Top', 'https://x.io/top')])
+
+    script = "".join(iter_k6_script(data, lambda body: 0, load_profile=LoadProfile(threads=5, duration=60,
+                                                                                  target_rps=10)))
+
+    options_start = script.index("export const options = ") + len("export const options = ")
+    scenario = json.loads(script[options_start:script.index("\n};", options_start) + 2])['scenarios']['default']
+    # Every iteration sends the 4 requests, 150 iterations per minute send the 10 requests per second of the plan
+    assert (scenario['rate'], scenario['timeUnit']) == (150, '1m')
+    assert scenario['rate'] * 4 / 60 == 10
+
+
+def test_iter_k6_script_form_body():
+    data = plan_with([request('Form', 'https://x.io/f', body=[{'key': 'a', 'value': '${token}'}],
+                              body_mode='urlencoded')])
+
+    script = "".join(iter_k6_script(data, lambda body: pytest.fail("form bodies are not stored")))
+
+    assert 'http.request("POST", "https://x.io/f", {"a": fill("${token}")}, { tags: { name: "Form" } })' in script
+    assert "SharedArray" not in script
+
+
+@pytest.mark.parametrize("script, expected", [
+    ("pm.response.to.have.status(201);", "201"),
+    ("pm.response.to.have.status( 404 )", "404"),
+    ("pm.response.to.have.status(code);", None),
+    ("pm.expect(true).to.be.true;", None),
+])
+def test_get_expected_status(script, expected):
+    assert get_expected_status(script) == expected
+
+
+def test_create_k6_script(tmp_path):
+    collection = {
+        "info": {"name": "Shop", "schema": "https://schema.getpostman.com/json/collection/v2.1.0/collection.json"},
+        "item": [{"name": "Auth", "item": [{"name": "Login", "request": {
+            "method": "POST", "url": {"raw": "{{tests_url}}/login"},
+            "body": {"mode": "raw", "raw": "{\"user\": \"{{user}}\"}"}}}]}]
+    }
+    source = tmp_path / "shop.json"
+    source.write_text(json.dumps(collection))
+
+    create_k6_script(str(source), str(tmp_path / "out" / "shop.js"), LoadProfile(threads=2, duration=30))
+
+    script = (tmp_path / "out" / "shop.js").read_text()
+    assert "export const options" in script
+    assert 'fill(BODIES[0])' in script
+    assert json.loads((tmp_path / "out" / "shop.bodies.json").read_text()) == ['{"user": "${user}"}']
+
+
+def test_create_k6_script_without_bodies(tmp_path):
+    collection = {
+        "info": {"name": "Shop", "schema": "https://schema.getpostman.com/json/collection/v2.1.0/collection.json"},
+        "item": [{"name": "Ping", "request": {"method": "GET", "url": {"raw": "https://x.io/ping"}}}]
+    }
+    source = tmp_path / "shop.json"
+    source.write_text(json.dumps(collection))
+
+    create_k6_script(str(source), str(tmp_path / "shop.js"))
+
+    assert "SharedArray" not in (tmp_path / "shop.js").read_text()
+    assert not (tmp_path / "shop.bodies.json").exists()
@@ -0,0 +1,79 @@
+import json
+
+import pytest
+from lxml import etree
+
+from src.jmx.jmx_creator import LoadProfile
+from src.k6.k6_creator import create_k6_script
+from src.k6.k6_importer import create_jmx_file_from_k6, create_postman_collection_from_k6, load_k6_script
+
+COLLECTION = {
+    "info": {"name": "Shop", "schema": "https://schema.getpostman.com/json/collection/v2.1.0/collection.json"},
+    "item": [
+        {"name": "Auth", "item": [
+            {"name": "Login",
+             "event": [{"listen": "test", "script": {"exec": [
+                 'pm.test("Status code is 200", function () {', "pm.response.to.have.status(200);", "});"]}}],
+             "request": {"method": "POST", "header": [{"key": "Accept", "value": "application/json"}],
+                         "body": {"mode": "raw", "raw": "{\"user\": \"{{user}}\"}"},
+                         "url": {"raw": "https://shop.example.com/login"}}}
+        ]},
+        {"name": "Ping", "request": {"method": "GET", "url": {"raw": "https://shop.example.com/ping?verbose=1"}}}
+    ]
+}
+
+
+@pytest.fixture
+def k6_script(tmp_path):
+    collection_file = tmp_path / "shop.json"
+    collection_file.write_text(json.dumps(COLLECTION))
+    create_k6_script(str(collection_file), str(tmp_path / "shop.js"), LoadProfile(threads=4, duration=60))
+    return tmp_path / "shop.js"
+
+
+def test_create_jmx_file_from_k6(k6_script, tmp_path):
+    jmx_path = tmp_path / "shop.jmx"
+
+    create_jmx_file_from_k6(str(k6_script), str(jmx_path))
+
+    tree = etree.parse(str(jmx_path))
+    assert tree.find(".//ThreadGroup/stringProp[@name='ThreadGroup.num_threads']").text == "4"
+    assert tree.find(".//ThreadGroup/stringProp[@name='ThreadGroup.duration']").text == "60"
+    assert [sampler.get("testname") for sampler in tree.iter("HTTPSamplerProxy")] == ["Login", "Ping"]
+    assert tree.find(".//GenericController").get("testname") == "Auth"
+    assert tree.find(".//ResponseAssertion") is not None
+
+
+def test_create_jmx_file_from_k6_load_profile(k6_script, tmp_path):
+    jmx_path = tmp_path / "shop.jmx"
+
+    create_jmx_file_from_k6(str(k6_script), str(jmx_path), load_profile=LoadProfile(threads=9, loops=2))
+
+    tree = etree.parse(str(jmx_path))
+    assert tree.find(".//ThreadGroup/stringProp[@name='ThreadGroup.num_threads']").text == "9"
+
+
+def test_create_postman_collection_from_k6(k6_script, tmp_path):
+    output = tmp_path / "shop.postman.json"
+
+    create_postman_collection_from_k6(str(k6_script), str(output), deterministic_ids=True)
+
+    collection = json.loads(output.read_text())
+    auth, ping = collection["item"]
+    assert auth["name"] == "Auth"
+    login = auth["item"][0]
+    assert login["name"] == "Login"
+    assert login["request"]["method"] == "POST"
+    assert login["request"]["body"]["raw"] == '{"user": "{{user}}"}'
+    assert ping["item"][0]["request"]["url"]["raw"] == "https://shop.example.com/ping"
+    assert ping["item"][0]["request"]["url"]["query"] == [{"key": "verbose", "value": "1"}]
+
+
+def test_load_k6_script_errors(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        load_k6_script(str(tmp_path / "missing"))
+
+    broken = tmp_path / "broken.js"
+    broken.write_text("const a = `unterminated")
+    with pytest.raises(ValueError):
+        load_k6_script(str(broken))
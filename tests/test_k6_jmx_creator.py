@@ -0,0 +1,261 @@
+import json
+
+import pytest
+from lxml import etree
+
+from src.jmx.jmx_creator import LoadProfile, create_jmx_file
+from src.k6.k6_creator import BodyFile
+from src.k6.k6_jmx_creator import (
+    read_load_profile,
+    read_target_rps,
+    read_headers,
+    build_url,
+    read_check,
+    read_external_body,
+    iter_jmx_k6_script,
+    create_k6_script_from_jmx
+)
+
+COLLECTION = {
+    "info": {"name": "Shop", "schema": "https://schema.getpostman.com/json/collection/v2.1.0/collection.json"},
+    "item": [
+        {"name": "Auth", "item": [
+            {"name": "Login",
+             "event": [{"listen": "test", "script": {"exec": [
+                 'pm.test("Status code is 200", function () {', "pm.response.to.have.status(200);", "});"]}}],
+             "request": {"method": "POST", "header": [{"key": "Accept", "value": "application/json"}],
+                         "body": {"mode": "raw", "raw": "{\"user\": \"{{user}}\"}"},
+                         "url": {"raw": "https://shop.example.com/login"}}},
+            {"name": "Me", "request": {"method": "GET", "header": [{"key": "Accept", "value": "application/json"}],
+                                       "url": {"raw": "https://shop.example.com/me"}}}
+        ]},
+        {"name": "Ping", "request": {"method": "GET", "url": {"raw": "https://shop.example.com/ping?verbose=1"}}}
+    ]
+}
+
+THREAD_GROUP = """
+<ThreadGroup guiclass="ThreadGroupGui" testclass="ThreadGroup" testname="Users">
+  <elementProp name="ThreadGroup.main_controller" elementType="LoopController">
+    <stringProp name="LoopController.loops">{loops}</stringProp>
+  </elementProp>
+  <stringProp name="ThreadGroup.num_threads">{threads}</stringProp>
+  <stringProp name="ThreadGroup.ramp_time">10</stringProp>
+  <boolProp name="ThreadGroup.scheduler">{scheduler}</boolProp>
+  <stringProp name="ThreadGroup.duration">300</stringProp>
+</ThreadGroup>
+"""
+
+
+def assertion(test_field, test_type, *patterns):
+    strings = "".join(f"<stringProp name=\"{index}\">{pattern}</stringProp>" for index, pattern in enumerate(patterns))
+    return etree.fromstring(f"""
+    <ResponseAssertion testname="Check">
+      <collectionProp name="Assertion.test_strings">{strings}</collectionProp>
+      <stringProp name="Assertion.test_field">{test_field}</stringProp>
+      <intProp name="Assertion.test_type">{test_type}</intProp>
+    </ResponseAssertion>""")
+
+
+@pytest.fixture
+def plan_file(tmp_path):
+    collection_file = tmp_path / "shop.json"
+    collection_file.write_text(json.dumps(COLLECTION))
+    return collection_file
+
+
+def test_read_load_profile():
+    thread_group = etree.fromstring(THREAD_GROUP.format(loops=-1, threads=20, scheduler="true"))
+
+    assert read_load_profile(thread_group) == LoadProfile(threads=20, ramp_up=10, duration=300, loops=1)
+
+
+def test_read_load_profile_loops():
+    thread_group = etree.fromstring(THREAD_GROUP.format(loops=5, threads="${__P(threads,10)}", scheduler="false"))
+
+    assert read_load_profile(thread_group) == LoadProfile(threads=1, ramp_up=10, duration=None, loops=5)
+
+
+@pytest.mark.parametrize("calc_mode, threads, expected", [(2, 10, 3.0), (0, 10, 30.0)])
+def test_read_target_rps(calc_mode, threads, expected):
+    timer = etree.fromstring(f"""
+    <ConstantThroughputTimer>
+      <intProp name="calcMode">{calc_mode}</intProp>
+      <doubleProp><name>throughput</name><value>180.0</value><savedValue>0.0</savedValue></doubleProp>
+    </ConstantThroughputTimer>""")
+
+    assert read_target_rps(timer, threads) == expected
+
+
+def test_read_headers():
+    header_manager = etree.fromstring("""
+    <HeaderManager>
+      <collectionProp name="HeaderManager.headers">
+        <elementProp name="" elementType="Header">
+          <stringProp name="Header.name">Accept</stringProp>
+          <stringProp name="Header.value">application/json</stringProp>
+        </elementProp>
+      </collectionProp>
+    </HeaderManager>""")
+
+    assert read_headers(header_manager) == [("Accept", "application/json")]
+
+
+@pytest.mark.parametrize("path, origin, expected", [
+    ("/login", ("https", "shop.example.com", ""), "https://shop.example.com/login"),
+    ("login", ("", "shop.example.com", "8080"), "http://shop.example.com:8080/login"),
+    ("${tests_url}/login", ("", "", ""), "${tests_url}/login"),
+    ("https://other.example.com/x", ("https", "shop.example.com", ""), "https://other.example.com/x"),
+])
+def test_build_url(path, origin, expected):
+    assert build_url(path, origin) == expected
+
+
+@pytest.mark.parametrize("element, expected", [
+    (assertion("Assertion.response_code", 8, "200"), ("Check", 'String(r.status) === "200"')),
+    (assertion("Assertion.response_data", 16 | 4, "error"), ("Check", '!(r.body.includes("error"))')),
+    (assertion("Assertion.response_code", 1 | 32, "20\\d", "304"),
+     ("Check", 'new RegExp("^(?:20\\\\d)$").test(String(r.status)) || '
+               'new RegExp("^(?:304)$").test(String(r.status))')),
+    (assertion("Assertion.response_headers", 2, "json"), None),
+])
+def test_read_check(element, expected):
+    assert read_check(element) == expected
+
+
+def test_read_external_body(tmp_path):
+    (tmp_path / "plan_bodies").mkdir()
+    (tmp_path / "plan_bodies" / "body_1.txt").write_text('{"user": "${user}"}')
+
+    assert read_external_body("${__FileToString(plan_bodies/body_1.txt,UTF-8,)}", str(tmp_path)) == \
+        '{"user": "${user}"}'
+    assert read_external_body("${__eval(${__FileToString(plan_bodies/body_1.txt,UTF-8,)})}", str(tmp_path)) == \
+        '{"user": "${user}"}'
+    assert read_external_body('{"inline": true}', str(tmp_path)) is None
+
+
+def test_iter_jmx_k6_script_thread_group(plan_file, tmp_path):
+    jmx_path = tmp_path / "shop.jmx"
+    create_jmx_file(str(plan_file), str(jmx_path), load_profile=LoadProfile(threads=5, duration=60, target_rps=3))
+    body_file = BodyFile(str(tmp_path / "shop.bodies.json"))
+
+    script = "".join(iter_jmx_k6_script(str(jmx_path), body_file))
+    body_file.close()
+
+    assert "export function thread_group_1() {" in script
+    assert 'group("Auth", function () {' in script
+    assert 'const headers1 = {"Accept": "application/json"};' in script
+    assert ('check(http.request("POST", fill("${tests_url}/login"), fill(BODIES[0]), '
+            '{ headers: headers1, tags: { name: "Login" } }), '
+            '{ "Response Assertion for Login expected_status: 200": (r) => String(r.status) === "200" });') in script
+    assert 'http.request("GET", fill("${tests_url}/ping?verbose=1"), null, { tags: { name: "Ping" } });' in script
+    options_start = script.index("export const options = ") + len("export const options = ")
+    options = json.loads(script[options_start:script.index("\n};", options_start) + 2])
+    # The 3 requests per second of the timer are 1 iteration per second of the 3 samplers
+    assert options == {"scenarios": {"thread_group_1": {
+        "executor": "constant-arrival-rate", "rate": 1, "timeUnit": "1s", "duration": "60s", "preAllocatedVUs": 5,
+        "exec": "thread_group_1"}}}
+    assert 'open("./shop.bodies.json")' in script
+    assert json.loads((tmp_path / "shop.bodies.json").read_text()) == ['{"user": "${user}"}']
+
+
+def test_create_k6_script_from_jmx_split_plan(plan_file, tmp_path):
+    jmx_path = tmp_path / "shop.jmx"
+    create_jmx_file(str(plan_file), str(jmx_path), body_threshold=0, split=True, workers=1)
+
+    create_k6_script_from_jmx(str(jmx_path), str(tmp_path / "k6" / "shop.js"))
+
+    script = (tmp_path / "k6" / "shop.js").read_text()
+    # The parts are read through the Include Controllers, the bodies through ${__FileToString()}
+    assert "function test_fragment_1() {" in script
+    assert "export default function () {\n    test_fragment_1();\n}" in script
+    assert script.count("group(\"Auth\"") == 1
+    assert 'tags: { name: "Me" }' in script
+    assert "scenarios" not in script
+    assert json.loads((tmp_path / "k6" / "shop.bodies.json").read_text()) == ['{"user": "${user}"}']
+
+
+def test_create_k6_script_from_jmx_skips_disabled(tmp_path):
+    jmx_path = tmp_path / "plan.jmx"
+    jmx_path.write_text("""<jmeterTestPlan><hashTree>
+      <TestPlan testname="Plan"/><hashTree>
+        <TestFragmentController testname="Fragment"/><hashTree>
+          <GenericController testname="Disabled" enabled="false"/><hashTree>
+            <HTTPSamplerProxy testname="Hidden"><stringProp name="HTTPSampler.path">/hidden</stringProp></HTTPSamplerProxy>
+            <hashTree/>
+          </hashTree>
+          <HTTPSamplerProxy testname="Visible"><stringProp name="HTTPSampler.path">/visible</stringProp></HTTPSamplerProxy>
+          <hashTree/>
+        </hashTree>
+      </hashTree>
+    </hashTree></jmeterTestPlan>""")
+
+    create_k6_script_from_jmx(str(jmx_path), str(tmp_path / "plan.js"))
+
+    script = (tmp_path / "plan.js").read_text()
+    assert "Hidden" not in script and "Disabled" not in script
+    assert 'http.request("GET", "/visible", null, { tags: { name: "Visible" } });' in script
+    assert "const BODIES" not in script
+    assert not (tmp_path / "plan.bodies.json").exists()
+
+
+def test_create_k6_script_from_jmx_encodes_query(tmp_path):
+    jmx_path = tmp_path / "plan.jmx"
+    jmx_path.write_text("""<jmeterTestPlan><hashTree>
+      <TestPlan testname="Plan"/><hashTree>
+        <TestFragmentController testname="Fragment"/><hashTree>
+          <HTTPSamplerProxy testname="Search">
+            <stringProp name="HTTPSampler.path">/search?lang=en</stringProp>
+            <elementProp name="HTTPsampler.Arguments" elementType="Arguments">
+              <collectionProp name="Arguments.arguments">
+                <elementProp name="q" elementType="HTTPArgument">
+                  <stringProp name="Argument.name">q</stringProp>
+                  <stringProp name="Argument.value">shoes &amp; socks</stringProp>
+                </elementProp>
+                <elementProp name="user" elementType="HTTPArgument">
+                  <stringProp name="Argument.name">user</stringProp>
+                  <stringProp name="Argument.value">${user}</stringProp>
+                </elementProp>
+              </collectionProp>
+            </elementProp>
+          </HTTPSamplerProxy>
+          <hashTree/>
+        </hashTree>
+      </hashTree>
+    </hashTree></jmeterTestPlan>""")
+
+    create_k6_script_from_jmx(str(jmx_path), str(tmp_path / "plan.js"))
+
+    # Names and values are encoded like encodeURIComponent, the placeholders are filled in when sent
+    assert ('http.request("GET", fill("/search?lang=en&q=shoes%20%26%20socks&user=${user}"), null, '
+            '{ tags: { name: "Search" } });') in (tmp_path / "plan.js").read_text()
+
+
+def test_create_k6_script_from_jmx_target_rps_per_sample(tmp_path):
+    sampler = ('<HTTPSamplerProxy testname="{0}"><stringProp name="HTTPSampler.path">/{0}</stringProp>'
+               '</HTTPSamplerProxy>')
+    jmx_path = tmp_path / "plan.jmx"
+    jmx_path.write_text(f"""<jmeterTestPlan><hashTree>
+      <TestPlan testname="Plan"/><hashTree>
+        {THREAD_GROUP.format(loops=1, threads=5, scheduler="true")}<hashTree>
+          <ConstantThroughputTimer testname="Timer">
+            <intProp name="calcMode">2</intProp>
+            <doubleProp><name>throughput</name><value>600.0</value></doubleProp>
+          </ConstantThroughputTimer><hashTree/>
+          {sampler.format("login")}<hashTree/>
+          <LoopController testname="Pages"><stringProp name="LoopController.loops">3</stringProp></LoopController>
+          <hashTree>
+            {sampler.format("page")}<hashTree/>
+          </hashTree>
+          <HTTPSamplerProxy testname="Off" enabled="false"/><hashTree/>
+        </hashTree>
+      </hashTree>
+    </hashTree></jmeterTestPlan>""")
+
+    create_k6_script_from_jmx(str(jmx_path), str(tmp_path / "plan.js"))
+
+    script = (tmp_path / "plan.js").read_text()
+    options_start = script.index("export const options = ") + len("export const options = ")
+    scenario = json.loads(script[options_start:script.index("\n};", options_start) + 2])["scenarios"]["thread_group_1"]
+    # An iteration sends 4 samples, the login and 3 pages, so 10 samples per second are 2.5 iterations per second
+    assert (scenario["rate"], scenario["timeUnit"]) == (150, "1m")
+    assert scenario["rate"] * 4 / 60 == 10
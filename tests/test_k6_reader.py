@@ -0,0 +1,176 @@
+import json
+
+import pytest
+
+from src.helper.importer import to_test_plan
+from src.jmx.jmx_creator import LoadProfile
+from src.k6.k6_reader import (
+    parse_duration,
+    read_load_profile,
+    get_check_script,
+    parse_k6_script,
+    read_k6_script
+)
+
+SCRIPT = """
+import http from "k6/http";
+import { check, group, sleep } from "k6";
+
+const BASE = __ENV.BASE_URL || "https://shop.example.com";
+
+export const options = {
+    scenarios: {
+        shop: { executor: "ramping-vus", stages: [{ duration: "30s", target: 10 }, { duration: "1m", target: 10 }] }
+    }
+};
+
+function login(user) {
+    const res = http.post(`${__ENV.BASE_URL}/login`, JSON.stringify({ user: user }),
+                          { headers: { "Accept": "application/json" }, tags: { name: "Login" } });
+    check(res, { "status is 200": (r) => r.status === 200 });
+    return res.json("data.token");
+}
+
+export default function () {
+    const token = login("alice");
+    group("Catalog", function () {
+        const responses = http.batch([
+            ["GET", `${__ENV.BASE_URL}/items?page=1`, null, { tags: { name: "Items" } }],
+            { method: "GET", url: BASE + "/items/" + 2 * 3 },
+        ]);
+        check(responses[0], { "has items": (r) => r.body.includes("items") });
+    });
+    check(http.get(`${__ENV.BASE_URL}/me`, { headers: { Authorization: `Bearer ${token}` } }), {
+        "status is 200": (r) => r.status === 200
+    });
+    sleep(1);
+}
+"""
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("1m30s", 90), ("1.5s", 2), ("2h", 7200), (2500, 3), ("soon", None), (True, None), (None, None)])
+def test_parse_duration(value, expected):
+    assert parse_duration(value) == expected
+
+
+@pytest.mark.parametrize("options, expected", [
+    ({"vus": 5, "duration": "1m"}, LoadProfile(threads=5, ramp_up=0, duration=60)),
+    ({"vus": 4, "iterations": 10}, LoadProfile(threads=4, ramp_up=0, loops=3)),
+    ({"stages": [{"duration": "10s", "target": 20}, {"duration": "50s", "target": 20}, {"duration": "5s", "target": 0}]},
+     LoadProfile(threads=20, ramp_up=10, duration=65)),
+    ({"scenarios": {"load": {"executor": "constant-arrival-rate", "rate": 120, "timeUnit": "1m", "duration": "30s",
+                             "preAllocatedVUs": 5, "maxVUs": 8}}},
+     LoadProfile(threads=8, ramp_up=0, duration=30, target_rps=2.0)),
+    ({"scenarios": {"load": {"executor": "per-vu-iterations", "vus": 2, "iterations": 7}}, "noConnectionReuse": True},
+     LoadProfile(threads=2, ramp_up=0, loops=7, reuse_connections=False)),
+    ({"scenarios": {"load": {"executor": "unknown"}}}, None),
+    ({"thresholds": {}}, None),
+])
+def test_read_load_profile(options, expected):
+    assert read_load_profile(options) == expected
+
+
+@pytest.mark.parametrize("script, expected", [
+    ("(r) => r.status === 200", "pm.response.to.have.status(200);"),
+    ('(r) => String(r.status) === "404"', "pm.response.to.have.status(404);"),
+    ('(r) => r.body.includes("ok")', '(r) => r.body.includes("ok")'),
+])
+def test_get_check_script(script, expected):
+    assert get_check_script(script) == expected
+
+
+def test_parse_k6_script(caplog):
+    data = parse_k6_script(SCRIPT, "shop")
+
+    assert data["test_plan_name"] == "shop"
+    assert data["load_profile"] == LoadProfile(threads=10, ramp_up=30, duration=90)
+    login, catalog, me = data["test_fragment_controller"]["generic_controllers"]
+
+    # Requests outside a group are not grouped, whatever function sends them
+    assert (login["type"], login["parent"]) == ("request", None)
+    assert (login["name"], login["method"], login["raw_url"]) == ("Login", "POST", "${BASE_URL}/login")
+    assert login["body"] == "${JSON.stringify({ user: user })}"
+    assert login["headers"] == [{"key": "Accept", "value": "application/json"}]
+    assert login["tests"] == [{"name": "status is 200", "script": "pm.response.to.have.status(200);"}]
+
+    # The checks of a response held in a variable apply to the requests of the last http call, or the indexed one
+    assert catalog["name"] == "Catalog"
+    first, second = catalog["children"]
+    assert (first["name"], first["queryParams"]) == ("Items", [{"page": "1"}])
+    assert first["tests"] == [{"name": "has items", "script": '(r) => r.body.includes("items")'}]
+    assert second["raw_url"] == '${BASE + "/items/" + 2 * 3}'
+    assert (second["body"], second["tests"]) == ("No body content", [])
+
+    assert me["headers"] == [{"key": "Authorization", "value": "Bearer ${token}"}]
+    assert me["tests"] == [{"name": "status is 200", "script": "pm.response.to.have.status(200);"}]
+
+    # The expressions kept as placeholders are logged once
+    placeholders = [record.getMessage() for record in caplog.records if "is not followed" in record.getMessage()]
+    assert len(placeholders) == 3
+    assert "'token' of the k6 script is not followed, it is kept as the ${token} placeholder." in placeholders
+
+
+def test_parse_k6_script_bodies():
+    script = """
+    export default function () {
+        http.request("PUT", "https://api.example.com/items/1", BODIES[0], { tags: { name: "Update" } });
+        http.request("PUT", "https://api.example.com/items/2", fill(BODIES[1]));
+    }
+    const BODIES = new SharedArray("bodies", function () { return JSON.parse(open("./plan.bodies.json")); });
+    """
+
+    data = parse_k6_script(script, bodies=['{"id": 1}'])
+
+    known, unknown = data["test_fragment_controller"]["generic_controllers"]
+    assert (known["name"], known["method"], known["body"]) == ("Update", "PUT", '{"id": 1}')
+    assert unknown["body"] == "${BODIES[1]}"
+
+
+def test_parse_k6_script_target_rps():
+    script = """
+    export const options = { scenarios: { load: { executor: "constant-arrival-rate", rate: 60, timeUnit: "1m",
+                                                  duration: "1m", preAllocatedVUs: 2 } } };
+    export default function () {
+        http.get("https://api.example.com/a");
+        http.get("https://api.example.com/b");
+    }
+    """
+
+    assert parse_k6_script(script)["load_profile"].target_rps == 2.0
+
+
+def test_parse_k6_script_unbalanced():
+    with pytest.raises(ValueError):
+        parse_k6_script('group("a", function () { http.get("https://api.example.com/"); );')
+
+
+def test_parse_k6_script_urlencoded_body():
+    data = parse_k6_script('http.post("https://api.example.com/form", { a: "1", b: "x y" });')
+
+    request = data["test_fragment_controller"]["generic_controllers"][0]
+    assert request["body_mode"] == "urlencoded"
+    assert request["body"] == [{"key": "a", "value": "1"}, {"key": "b", "value": "x y"}]
+    assert request["name"] == "https://api.example.com/form"
+
+
+def test_read_k6_script(tmp_path):
+    script_path = tmp_path / "shop.js"
+    script_path.write_text('http.post("https://shop.example.com/login", BODIES[0]);')
+    (tmp_path / "shop.bodies.json").write_text(json.dumps(['{"user": "alice"}']))
+
+    data = read_k6_script(str(script_path))
+
+    assert data["test_plan_name"] == "shop"
+    assert data["test_plan_comments"] == "Converted from a k6 script"
+    assert data["test_fragment_controller"]["generic_controllers"][0]["body"] == '{"user": "alice"}'
+
+
+def test_to_test_plan():
+    plan = to_test_plan(parse_k6_script(SCRIPT, "shop"))
+
+    assert plan["name"] == "shop"
+    assert [item["item"]["name"] for item in plan["items"]] == ["Login", "Catalog", "${BASE_URL}/me"]
+    assert plan["items"][0]["item"]["requests"] == [{"name": "Login", "path": "${BASE_URL}/login", "method": "POST",
+                                                     "arguments": {"body": "${JSON.stringify({ user: user })}"}}]
+    assert plan["items"][1]["item"]["requests"][0]["arguments"] == {"page": "1"}
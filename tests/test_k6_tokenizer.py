@@ -0,0 +1,64 @@
+import pytest
+
+from src.k6.k6_tokenizer import (
+    NAME,
+    NUMBER,
+    PUNCTUATOR,
+    REGEX,
+    STRING,
+    TEMPLATE,
+    decode_escapes,
+    iter_tokens
+)
+
+
+def kinds_and_values(source):
+    return [(token.kind, token.value) for token in iter_tokens(source)]
+
+
+def test_iter_tokens_skips_comments():
+    assert kinds_and_values("a // line\n/* block\n */ b") == [(NAME, "a"), (NAME, "b")]
+
+
+def test_iter_tokens_regex_or_division():
+    assert kinds_and_values("x = /a\\/b[/]/g.test(y) / 2") == [
+        (NAME, "x"), (PUNCTUATOR, "="), (REGEX, "/a\\/b[/]/g"), (PUNCTUATOR, "."), (NAME, "test"),
+        (PUNCTUATOR, "("), (NAME, "y"), (PUNCTUATOR, ")"), (PUNCTUATOR, "/"), (NUMBER, "2")]
+    assert kinds_and_values("return /x/") == [(NAME, "return"), (REGEX, "/x/")]
+
+
+def test_iter_tokens_punctuators():
+    assert [value for _, value in kinds_and_values("a ?? b?.c => ...d === e >>>= 1")] == [
+        "a", "??", "b", "?.", "c", "=>", "...", "d", "===", "e", ">>>=", "1"]
+
+
+def test_iter_tokens_strings():
+    assert kinds_and_values("'it\\'s' \"a\\tb\"") == [(STRING, "it's"), (STRING, "a\tb")]
+
+
+def test_iter_tokens_template():
+    tokens = list(iter_tokens("`a ${ {b: `c${d}`}.b } e` + 1"))
+
+    assert tokens[0].kind == TEMPLATE
+    assert tokens[0].value == (["a ", " e"], ["{b: `c${d}`}.b"])
+    assert [token.value for token in tokens[1:]] == ["+", "1"]
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("plain", "plain"),
+    ("\\u00e9\\x41\\u{1F600}", "éA\U0001F600"),
+    ("\\ud83d\\ude00", "\U0001F600"),
+    ("line\\\ncontinued", "linecontinued"),
+    ("\\q", "q"),
+])
+def test_decode_escapes(text, expected):
+    assert decode_escapes(text) == expected
+
+
+@pytest.mark.parametrize("source, message", [
+    ("`open ${x}", "Unterminated template"),
+    ("a \\ b", "Unexpected character"),
+])
+def test_iter_tokens_errors(source, message):
+    with pytest.raises(ValueError, match=message):
+        list(iter_tokens(source))
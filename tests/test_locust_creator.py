@@ -0,0 +1,206 @@
+import json
+import re
+from contextlib import contextmanager
+from types import SimpleNamespace
+from urllib.parse import urlencode
+
+import pytest
+
+from src.jmx.jmx_creator import LoadProfile, create_jmx_file
+from src.locust.locust_creator import (
+    HELPERS_PY,
+    resolve_locust_output,
+    to_class_name,
+    create_task_py,
+    create_user_py,
+    iter_locustfile,
+    create_locustfile
+)
+from src.postman.postman_json_reader import parse_postman_collection
+
+ACCEPT_JSON = {'key': 'Accept', 'value': 'application/json'}
+STATUS_TEST = {'name': 'Status code is 200', 'script': 'pm.response.to.have.status(200);'}
+
+COLLECTION = {
+    "info": {"name": "Shop", "schema": "https://schema.getpostman.com/json/collection/v2.1.0/collection.json"},
+    "item": [
+        {"name": "Auth", "item": [
+            {"name": "Login",
+             "event": [{"listen": "test", "script": {"exec": [
+                 'pm.test("Status code is 200", function () {', "pm.response.to.have.status(200);", "});",
+                 "var jsonData = pm.response.json();", 'pm.environment.set("token", jsonData.data.token);']}}],
+             "request": {"method": "POST", "header": [{"key": "Accept", "value": "application/json"}],
+                         "body": {"mode": "raw", "raw": "{\"user\": \"{{user}}\"}"},
+                         "url": {"raw": "https://shop.example.com/login"}}},
+            {"name": "Profile", "item": [
+                {"name": "Me", "request": {"method": "GET",
+                                           "header": [{"key": "Accept", "value": "application/json"},
+                                                      {"key": "Authorization", "value": "Bearer {{token}}"}],
+                                           "url": {"raw": "https://shop.example.com/me"}}}
+            ]}
+        ]},
+        {"name": "Ping", "request": {"method": "GET", "header": [{"key": "Accept", "value": "application/json"}],
+                                     "url": {"raw": "https://shop.example.com/ping"}}}
+    ]
+}
+
+
+def request(**fields):
+    return {'name': 'Login', 'type': 'request', 'method': 'POST', 'raw_url': '${tests_url}/login',
+            'body': 'No body content', 'body_mode': None, 'headers': [], 'tests': [], 'variables': [], **fields}
+
+
+def test_resolve_locust_output(tmp_path):
+    assert resolve_locust_output(str(tmp_path / "shop.py")) == (str(tmp_path), "shop.py")
+    output_path, file_name = resolve_locust_output("shop")
+    assert output_path.endswith("out") and file_name == "shop.py"
+
+
+def test_to_class_name():
+    used = {"Request"}
+
+    assert to_class_name("user login", used) == "UserLogin"
+    assert to_class_name("user-login", used) == "UserLogin2"
+    assert to_class_name("2fa", used) == "Folder2fa"
+    assert to_class_name("request", used) == "Request2"
+    assert to_class_name("***", used) == "Folder"
+
+
+@pytest.mark.parametrize("fields, expected", [
+    ({}, "Request('POST', '${tests_url}/login', 'Login')"),
+    ({'body': '{"a": 1}', 'body_mode': 'raw', 'headers': [ACCEPT_JSON], 'tests': [STATUS_TEST],
+      'variables': [{'name': 'token', 'path': 'data.token'}, {'name': 'other', 'path': None}]},
+     "Request('POST', '${tests_url}/login', 'Login', body=7, headers=HEADERS_1, statuses=(200,), "
+     "checks='Status code is 200', variables=(('token', 'data.token'),))"),
+    ({'body': [{'key': 'user', 'value': '${user}'}], 'body_mode': 'urlencoded'},
+     "Request('POST', '${tests_url}/login', 'Login', form={'user': '${user}'}, "
+     "headers={'Content-Type': 'application/x-www-form-urlencoded'})"),
+])
+def test_create_task_py(fields, expected):
+    header_constants = {(('Accept', 'application/json'),): 'HEADERS_1'}
+
+    assert create_task_py(request(**fields), header_constants, lambda body: 7) == expected
+
+
+class FakeClient:
+    """Fake FastHttpUser client: like Locust, only the response of catch_response=True is a context manager."""
+
+    def __init__(self, response, sent):
+        self.response = response
+        self.sent = sent
+
+    def request(self, method, url, catch_response=False, **kwargs):
+        self.sent.append((method, url, dict(kwargs, catch_response=catch_response)))
+        if not catch_response:
+            return self.response
+
+        @contextmanager
+        def catch():
+            yield self.response
+
+        return catch()
+
+
+def run_request_task(task, response, sent):
+    taskset = SimpleNamespace(user=SimpleNamespace(variables={'user': 'alice', 'tests_url': 'https://x.io'}),
+                              client=FakeClient(response, sent))
+    task(taskset)
+    return taskset.user.variables
+
+
+def test_request_task():
+    """Runs the generated Request task against a fake FastHttpUser client."""
+    namespace = {'re': re, 'urlencode': urlencode, 'BODIES': ['{"user": "${user}"}']}
+    exec(HELPERS_PY, namespace)
+    sent = []
+    response = SimpleNamespace(status_code=500, json=lambda: {'data': {'token': 'abc'}},
+                               success=lambda: sent.append('success'), failure=lambda message: sent.append(message))
+    task = namespace['Request']('POST', '${tests_url}/login', 'Login', body=0, headers={'X-User': '${user}'},
+                                statuses=(200,), checks='Status code is 200', variables=(('token', 'data.token'),))
+
+    variables = run_request_task(task, response, sent)
+
+    assert sent == [('POST', 'https://x.io/login', {'name': 'Login', 'data': '{"user": "alice"}',
+                                                    'headers': {'X-User': 'alice'}, 'catch_response': True}),
+                    'Status code is 200: got 500']
+    assert variables['token'] == 'abc'
+
+
+def test_request_task_without_status_tests():
+    namespace = {'re': re, 'urlencode': urlencode, 'BODIES': []}
+    exec(HELPERS_PY, namespace)
+    sent = []
+    response = SimpleNamespace(status_code=200, success=lambda: sent.append('success'),
+                               failure=lambda message: sent.append(message))
+
+    run_request_task(namespace['Request']('GET', '${tests_url}/pets', 'Pets'), response, sent)
+
+    # The outcome is left to Locust, which reports the response from its status
+    assert sent == [('GET', 'https://x.io/pets', {'name': 'Pets', 'data': None, 'headers': None,
+                                                  'catch_response': True})]
+
+
+def test_create_user_py():
+    user = create_user_py("Shop", ("https", "shop.example.com", "8443"),
+                          LoadProfile(threads=4, ramp_up=2, duration=60, target_rps=8))
+
+    assert "host = 'https://shop.example.com:8443'" in user
+    assert "client_pool = CLIENT_POOL" in user
+    assert "wait_time = constant_throughput(2.0)" in user
+    assert "class PlanShape(LoadTestShape):" in user and "spawn_rate = 2.0" in user
+
+
+def test_create_user_py_without_connection_reuse():
+    user = create_user_py("Shop", None, LoadProfile(threads=4, loops=3, reuse_connections=False))
+
+    assert "CLIENT_POOL" not in user and "host =" not in user
+    assert "default_headers = {'Connection': 'close'}" in user
+    assert "self.iterations = 0" in user
+    assert "PlanShape" not in user
+
+
+def test_iter_locustfile():
+    bodies = []
+    data = parse_postman_collection(COLLECTION)
+
+    locustfile = "".join(iter_locustfile(data, lambda body: bodies.append(body) or len(bodies) - 1,
+                                         "shop.bodies.json", LoadProfile(threads=2, loops=5)))
+
+    compile(locustfile, "shop.py", "exec")
+    assert bodies == ['{"user": "${user}"}']
+    assert "HEADERS_1 = {'Accept': 'application/json'}" in locustfile
+    assert "ITERATIONS = 5" in locustfile
+    # Child folders are declared before the folders running them, nested folders hand control back
+    assert locustfile.index("class Profile(") < locustfile.index("class Auth(") < locustfile.index("class Shop(")
+    auth = locustfile[locustfile.index("class Auth("):locustfile.index("class Shop(")]
+    assert auth.index("'Login'") < auth.index("        Profile,\n") < auth.index("        leave,\n")
+    assert "statuses=(200,)" in auth and "variables=(('token', 'data.token'),)" in auth
+    shop = locustfile[locustfile.index("class Shop("):locustfile.index("class PlanUser(")]
+    assert "        finish_iteration,\n" in shop and "leave" not in shop
+    assert "host = 'https://shop.example.com'" in locustfile
+
+
+def test_create_locustfile_from_postman(tmp_path):
+    source = tmp_path / "shop.json"
+    source.write_text(json.dumps(COLLECTION))
+
+    create_locustfile(str(source), str(tmp_path / "out" / "shop.py"), LoadProfile(threads=2, duration=30))
+
+    locustfile = (tmp_path / "out" / "shop.py").read_text()
+    compile(locustfile, "shop.py", "exec")
+    assert "'shop.bodies.json'" in locustfile
+    assert json.loads((tmp_path / "out" / "shop.bodies.json").read_text()) == ['{"user": "${user}"}']
+
+
+def test_create_locustfile_from_jmx(tmp_path):
+    source = tmp_path / "shop.json"
+    source.write_text(json.dumps(COLLECTION))
+    create_jmx_file(str(source), str(tmp_path / "shop.jmx"))
+
+    create_locustfile(str(tmp_path / "shop.jmx"), str(tmp_path / "shop.py"))
+
+    locustfile = (tmp_path / "shop.py").read_text()
+    compile(locustfile, "shop.py", "exec")
+    assert "class Auth(SequentialTaskSet):" in locustfile
+    assert "'Ping'" in locustfile
+    assert "PlanShape" not in locustfile
@@ -96,14 +96,57 @@ def test_perform_conversion_valid(mock_filedialog, mock_messagebox, mocker):
     mock_showinfo.assert_called_once_with("Success", "Conversion to JMX completed successfully!")
 
 
-# Test perform_conversion for unsupported conversion type
-def test_perform_conversion_unsupported(mock_messagebox):
-    mock_showwarning = mock_messagebox["showwarning"]
+# Test perform_conversion for Postman to K6
+def test_perform_conversion_k6(mock_filedialog, mock_messagebox, mocker):
+    mock_open, mock_save = mock_filedialog
+    mock_open.return_value = "source_file.json"
+    mock_save.return_value = "destination_file.js"
+    mock_create_k6 = mocker.patch("src.main_gui.create_k6_script")
 
-    # Test for an unsupported conversion type
     perform_conversion('3')
 
-    mock_showwarning.assert_called_once_with("Feature not ready", "This feature is a WIP and currently unsupported.")
+    mock_create_k6.assert_called_once_with("source_file.json", "destination_file.js")
+    mock_messagebox["showinfo"].assert_called_once_with("Success", "Conversion to K6 script completed successfully!")
+
+
+# Test perform_conversion for JMX to K6
+def test_perform_conversion_jmx_to_k6(mock_filedialog, mock_messagebox, mocker):
+    mock_open, mock_save = mock_filedialog
+    mock_open.return_value = "source_file.jmx"
+    mock_save.return_value = "destination_file.js"
+    mock_create_k6 = mocker.patch("src.main_gui.create_k6_script_from_jmx")
+
+    perform_conversion('5')
+
+    mock_create_k6.assert_called_once_with("source_file.jmx", "destination_file.js")
+    mock_messagebox["showinfo"].assert_called_once_with("Success", "Conversion to K6 script completed successfully!")
+
+
+# Test perform_conversion for K6 to Postman Collection
+def test_perform_conversion_k6_to_postman(mock_filedialog, mock_messagebox, mocker):
+    mock_open, mock_save = mock_filedialog
+    mock_open.return_value = "source_file.js"
+    mock_save.return_value = "destination_file.json"
+    mock_create_collection = mocker.patch("src.main_gui.create_postman_collection_from_k6")
+
+    perform_conversion('4')
+
+    mock_create_collection.assert_called_once_with("source_file.js", "destination_file.json")
+    mock_messagebox["showinfo"].assert_called_once_with(
+        "Success", "Conversion to Postman Collection completed successfully!")
+
+
+# Test perform_conversion for K6 to JMX
+def test_perform_conversion_k6_to_jmx(mock_filedialog, mock_messagebox, mocker):
+    mock_open, mock_save = mock_filedialog
+    mock_open.return_value = "source_file.js"
+    mock_save.return_value = "destination_file.jmx"
+    mock_create_jmx = mocker.patch("src.main_gui.create_jmx_file_from_k6")
+
+    perform_conversion('6')
+
+    mock_create_jmx.assert_called_once_with("source_file.js", "destination_file.jmx")
+    mock_messagebox["showinfo"].assert_called_once_with("Success", "Conversion to JMX completed successfully!")
 
 
 # Test perform_conversion for invalid conversion type
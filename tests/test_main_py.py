@@ -1,10 +1,15 @@
 import pytest
 
+from src.jmx.jmx_creator import LoadProfile
 from src.main import (
     print_hi,
     get_file_name,
     convert_postman_to_jmx,
     convert_jmx_to_postman,
+    convert_postman_to_k6,
+    convert_jmx_to_k6,
+    convert_k6_to_postman,
+    convert_k6_to_jmx,
     unsupported_conversion,
     main, RED_TEXT
 )
@@ -76,6 +81,56 @@ def test_convert_jmx_to_postman(mocker):
     mock_print.assert_called_once_with(f"{GREEN_TEXT}Conversion from JMX suite to Postman Collection completed successfully!{RESET_TEXT}")
 
 
+# Test for convert_postman_to_k6 function
+def test_convert_postman_to_k6(mocker):
+    mocker.patch('src.main.get_file_name', side_effect=["source_json_file", "destination_js_file"])
+    mock_create_k6_script = mocker.patch('src.main.create_k6_script')
+    mock_print = mocker.patch('builtins.print')
+
+    convert_postman_to_k6()
+
+    mock_create_k6_script.assert_called_once_with("source_json_file", "destination_js_file")
+    mock_print.assert_called_once_with(f"{GREEN_TEXT}Conversion from Postman Collection to K6 completed successfully!{RESET_TEXT}")
+
+
+# Test for convert_jmx_to_k6 function
+def test_convert_jmx_to_k6(mocker):
+    mocker.patch('src.main.get_file_name', side_effect=["source_jmx_file", "destination_js_file"])
+    mock_create_k6_script_from_jmx = mocker.patch('src.main.create_k6_script_from_jmx')
+    mock_print = mocker.patch('builtins.print')
+
+    convert_jmx_to_k6()
+
+    mock_create_k6_script_from_jmx.assert_called_once_with("source_jmx_file", "destination_js_file")
+    mock_print.assert_called_once_with(f"{GREEN_TEXT}Conversion from JMX suite to K6 completed successfully!{RESET_TEXT}")
+
+
+# Test for convert_k6_to_postman function
+def test_convert_k6_to_postman(mocker):
+    mock_get_file_name = mocker.patch('src.main.get_file_name', side_effect=["source_js_file", "destination_json_file"])
+    mock_create_postman_collection_from_k6 = mocker.patch('src.main.create_postman_collection_from_k6')
+    mock_print = mocker.patch('builtins.print')
+
+    convert_k6_to_postman()
+
+    mock_get_file_name.assert_any_call(
+        "Enter the K6 script file name (without .js extension) from the file_to_convert folder: ", ".js")
+    mock_create_postman_collection_from_k6.assert_called_once_with("source_js_file", "destination_json_file")
+    mock_print.assert_called_once_with(f"{GREEN_TEXT}Conversion from K6 to Postman Collection completed successfully!{RESET_TEXT}")
+
+
+# Test for convert_k6_to_jmx function
+def test_convert_k6_to_jmx(mocker):
+    mocker.patch('src.main.get_file_name', side_effect=["source_js_file", "destination_jmx_file"])
+    mock_create_jmx_file_from_k6 = mocker.patch('src.main.create_jmx_file_from_k6')
+    mock_print = mocker.patch('builtins.print')
+
+    convert_k6_to_jmx()
+
+    mock_create_jmx_file_from_k6.assert_called_once_with("source_js_file", "destination_jmx_file")
+    mock_print.assert_called_once_with(f"{GREEN_TEXT}Conversion from K6 to JMX completed successfully!{RESET_TEXT}")
+
+
 # Test for unsupported_conversion function
 def test_unsupported_conversion(mocker):
     mock_print = mocker.patch('builtins.print')
@@ -95,6 +150,10 @@ def test_main_postman_to_jmx(mocker):
     mock_input.assert_called_once_with(f"{YELLOW_TEXT}Please select one of the supported conversion types:\n"
                                        "1 -> Postman Collection -> JMX\n"
                                        "2 -> JMX -> Postman Collection\n"
+                                       "3 -> Postman Collection -> K6\n"
+                                       "4 -> K6 -> Postman Collection\n"
+                                       "5 -> JMX -> K6\n"
+                                       "6 -> K6 -> JMX\n"
                                        f"{RESET_TEXT}{YELLOW_TEXT}>>> {RESET_TEXT}")
     mock_convert_postman_to_jmx.assert_called_once()
 
@@ -111,6 +170,10 @@ def test_main_jmx_to_postman(mocker):
     mock_input.assert_called_once_with(f"{YELLOW_TEXT}Please select one of the supported conversion types:\n"
                                        "1 -> Postman Collection -> JMX\n"
                                        "2 -> JMX -> Postman Collection\n"
+                                       "3 -> Postman Collection -> K6\n"
+                                       "4 -> K6 -> Postman Collection\n"
+                                       "5 -> JMX -> K6\n"
+                                       "6 -> K6 -> JMX\n"
                                        f"{RESET_TEXT}{YELLOW_TEXT}>>> {RESET_TEXT}")
     mock_convert_jmx_to_postman.assert_called_once()
 
@@ -118,7 +181,7 @@ def test_main_jmx_to_postman(mocker):
 # Test for main function with invalid input (unsupported conversion)
 def test_main_unsupported_conversion(mocker):
     mock_print_hi = mocker.patch('src.main.print_hi')
-    mock_input = mocker.patch('builtins.input', return_value='3')
+    mock_input = mocker.patch('builtins.input', return_value='7')
     mock_unsupported_conversion = mocker.patch('src.main.unsupported_conversion')
 
     main()
@@ -127,5 +190,204 @@ def test_main_unsupported_conversion(mocker):
     mock_input.assert_called_once_with(f"{YELLOW_TEXT}Please select one of the supported conversion types:\n"
                                        "1 -> Postman Collection -> JMX\n"
                                        "2 -> JMX -> Postman Collection\n"
+                                       "3 -> Postman Collection -> K6\n"
+                                       "4 -> K6 -> Postman Collection\n"
+                                       "5 -> JMX -> K6\n"
+                                       "6 -> K6 -> JMX\n"
                                        f"{RESET_TEXT}{YELLOW_TEXT}>>> {RESET_TEXT}")
     mock_unsupported_conversion.assert_called_once()
+
+
+# Test for main function with the watch command
+def test_main_watch(mocker):
+    mock_watch = mocker.patch('src.main.watch')
+    mocker.patch('builtins.print')
+
+    main(["watch", "--directory", "source", "--output", "target", "--debounce", "1", "--workers", "2", "--poll"])
+
+    mock_watch.assert_called_once_with("source", "target", 1.0, 2, use_inotify=False)
+
+
+# Test for main function with the batch command
+def test_main_batch(mocker):
+    mock_convert_batch = mocker.patch('src.main.convert_batch', return_value={"converted": 2, "skipped": 1, "failed": 0})
+    mock_print = mocker.patch('builtins.print')
+
+    main(["batch", "--directory", "source", "--output", "target", "--workers", "2", "--retries", "1",
+          "--timeout", "60", "--memory-limit", "2048"])
+
+    mock_convert_batch.assert_called_once_with("source", "target", 2, 1, 1.0, timeout=60.0, memory_limit=2048,
+                                               largest_first=False)
+    mock_print.assert_called_once_with(f"{GREEN_TEXT}2 converted, 1 skipped, 0 failed{RESET_TEXT}")
+
+
+def test_main_batch_failed(mocker):
+    mocker.patch('src.main.convert_batch', return_value={"converted": 0, "skipped": 0, "failed": 1})
+    mocker.patch('builtins.print')
+
+    with pytest.raises(SystemExit):
+        main(["batch"])
+
+
+# Test for main function with the analyze command
+def test_main_analyze(mocker, tmp_path):
+    collection_file = tmp_path / "collection.json"
+    collection_file.write_text('{"info": {"name": "Empty"}, "item": [{"name": "Ping", "request": {"method": "GET"}}]}')
+    mock_print = mocker.patch('builtins.print')
+
+    main(["analyze", str(collection_file)])
+
+    assert mock_print.call_args_list[0].args[0].startswith(f"{collection_file} (Postman collection, ")
+    assert mocker.call("  requests:    1") in mock_print.call_args_list
+
+
+# Test for main function with the convert command
+def test_main_convert_jmx(mocker):
+    mock_create_postman_collection = mocker.patch('src.main.create_postman_collection')
+    mocker.patch('builtins.print')
+
+    main(["convert", "plan.jmx", "collection.json", "--deterministic-ids"])
+
+    mock_create_postman_collection.assert_called_once_with("plan.jmx", "collection.json", deterministic_ids=True,
+                                                           normalize_bodies=False)
+
+
+def test_main_convert_postman(mocker):
+    mock_create_jmx_file = mocker.patch('src.main.create_jmx_file')
+    mocker.patch('builtins.print')
+
+    main(["convert", "collection.json", "plan.jmx", "--body-threshold", "1024", "--shared-defaults",
+          "--environment", "staging.json", "--data", "users.csv"])
+
+    mock_create_jmx_file.assert_called_once_with("collection.json", "plan.jmx", body_threshold=1024,
+                                                 shared_defaults=True, load_profile=None, deduplicate=False,
+                                                 split=False, split_size=None, environment_file="staging.json",
+                                                 globals_file=None, data_file="users.csv")
+
+
+def test_main_convert_postman_to_k6(mocker):
+    mock_create_k6_script = mocker.patch('src.main.create_k6_script')
+    mocker.patch('builtins.print')
+
+    main(["convert", "collection.json", "script.js", "--threads", "10", "--duration", "60"])
+
+    mock_create_k6_script.assert_called_once_with("collection.json", "script.js",
+                                                  load_profile=LoadProfile(threads=10, duration=60))
+
+
+def test_main_convert_jmx_to_k6(mocker):
+    mock_create_k6_script_from_jmx = mocker.patch('src.main.create_k6_script_from_jmx')
+    mock_create_postman_collection = mocker.patch('src.main.create_postman_collection')
+    mocker.patch('builtins.print')
+
+    main(["convert", "plan.jmx", "script.js"])
+
+    mock_create_k6_script_from_jmx.assert_called_once_with("plan.jmx", "script.js")
+    mock_create_postman_collection.assert_not_called()
+
+
+def test_main_convert_k6_to_jmx(mocker):
+    mock_create_jmx_file_from_k6 = mocker.patch('src.main.create_jmx_file_from_k6')
+    mocker.patch('builtins.print')
+
+    main(["convert", "script.js", "plan.jmx", "--threads", "5", "--split"])
+
+    mock_create_jmx_file_from_k6.assert_called_once_with("script.js", "plan.jmx", body_threshold=None,
+                                                         shared_defaults=False, load_profile=LoadProfile(threads=5),
+                                                         deduplicate=False, split=True, split_size=None,
+                                                         environment_file=None, globals_file=None, data_file=None)
+
+
+def test_main_convert_k6_to_postman(mocker):
+    mock_create_postman_collection_from_k6 = mocker.patch('src.main.create_postman_collection_from_k6')
+    mock_create_k6_script = mocker.patch('src.main.create_k6_script')
+    mocker.patch('builtins.print')
+
+    main(["convert", "script.js", "collection.json", "--normalize-bodies"])
+
+    mock_create_postman_collection_from_k6.assert_called_once_with("script.js", "collection.json",
+                                                                   deterministic_ids=False, normalize_bodies=True)
+    mock_create_k6_script.assert_not_called()
+
+
+def test_main_convert_to_locust(mocker):
+    mock_create_locustfile = mocker.patch('src.main.create_locustfile')
+    mocker.patch('builtins.print')
+
+    main(["convert", "plan.jmx", "locustfile.py", "--threads", "20", "--rps", "100", "--duration", "60"])
+
+    mock_create_locustfile.assert_called_once_with(
+        "plan.jmx", "locustfile.py", load_profile=LoadProfile(threads=20, duration=60, target_rps=100.0))
+
+
+def test_main_convert_postman_load_profile(mocker):
+    mock_create_jmx_file = mocker.patch('src.main.create_jmx_file')
+    mocker.patch('builtins.print')
+
+    main(["convert", "collection.json", "plan.jmx", "--threads", "50", "--duration", "600", "--rps", "200"])
+
+    _, kwargs = mock_create_jmx_file.call_args
+    assert kwargs["load_profile"] == LoadProfile(threads=50, ramp_up=1, duration=600, target_rps=200.0)
+
+
+def test_main_convert_to_targets(mocker):
+    mock_create_targets_file = mocker.patch('src.main.create_targets_file', return_value=3)
+    mock_print = mocker.patch('builtins.print')
+
+    main(["convert", "collection.json", "load.lua", "--environment", "staging.json"])
+
+    mock_create_targets_file.assert_called_once_with("collection.json", "load.lua", environment_file="staging.json")
+    assert "Conversion of 3 requests" in mock_print.call_args[0][0]
+
+
+def test_main_convert_to_targets_without_targets(mocker):
+    mocker.patch('src.main.create_targets_file', side_effect=ValueError("No request of plan.jmx has an absolute URL"))
+    mock_print = mocker.patch('builtins.print')
+
+    with pytest.raises(ValueError):
+        main(["convert", "plan.jmx", "load.targets"])
+
+    mock_print.assert_not_called()
+
+
+def test_main_convert_har(mocker):
+    mock_create_jmx_file_from_har = mocker.patch('src.main.create_jmx_file_from_har')
+    mock_create_postman_collection_from_har = mocker.patch('src.main.create_postman_collection_from_har')
+    mocker.patch('builtins.print')
+
+    main(["convert", "traffic.har", "plan.jmx", "--har-gap", "2.5"])
+    main(["convert", "traffic.har", "collection.json", "--keep-static"])
+
+    _, kwargs = mock_create_jmx_file_from_har.call_args
+    assert kwargs["gap"] == 2.5 and kwargs["keep_static"] is False
+    mock_create_postman_collection_from_har.assert_called_once_with(
+        "traffic.har", "collection.json", gap=5.0, keep_static=True, deterministic_ids=False, normalize_bodies=False)
+
+
+def test_main_convert_openapi(mocker):
+    mock_create_jmx_file_from_openapi = mocker.patch('src.main.create_jmx_file_from_openapi')
+    mock_create_postman_collection_from_openapi = mocker.patch('src.main.create_postman_collection_from_openapi')
+    mock_create_jmx_file = mocker.patch('src.main.create_jmx_file')
+    mocker.patch('builtins.print')
+
+    main(["convert", "pets.yaml", "pets.jmx"])
+    main(["convert", "pets.json", "collection.json", "--openapi"])
+
+    mock_create_jmx_file_from_openapi.assert_called_once()
+    assert mock_create_jmx_file_from_openapi.call_args[0] == ("pets.yaml", "pets.jmx")
+    mock_create_postman_collection_from_openapi.assert_called_once_with(
+        "pets.json", "collection.json", deterministic_ids=False, normalize_bodies=False)
+    mock_create_jmx_file.assert_not_called()
+
+
+def test_main_convert_compressed(mocker):
+    mock_create_jmx_file_from_har = mocker.patch('src.main.create_jmx_file_from_har')
+    mock_create_k6_script_from_jmx = mocker.patch('src.main.create_k6_script_from_jmx')
+    mocker.patch('builtins.print')
+
+    main(["convert", "traffic.har.gz", "plan.jmx.zst"])
+    main(["convert", "plan.jmx.xz", "script.js"])
+
+    args, _ = mock_create_jmx_file_from_har.call_args
+    assert args == ("traffic.har.gz", "plan.jmx.zst")
+    mock_create_k6_script_from_jmx.assert_called_once_with("plan.jmx.xz", "script.js")
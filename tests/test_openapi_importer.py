@@ -0,0 +1,74 @@
+import json
+
+import pytest
+from lxml import etree
+
+from src.jmx.jmx_creator import LoadProfile
+from src.openapi.openapi_importer import (
+    create_jmx_file_from_openapi,
+    create_postman_collection_from_openapi,
+    load_openapi
+)
+
+SPEC = {
+    "openapi": "3.1.0",
+    "info": {"title": "Pets", "version": "1.0"},
+    "servers": [{"url": "/api"}],
+    "paths": {
+        "/pets": {
+            "get": {"operationId": "listPets", "tags": ["pets"], "parameters": [{"name": "limit", "in": "query"}],
+                    "responses": {"200": {}}},
+            "post": {"operationId": "createPet", "tags": ["pets"],
+                     "requestBody": {"content": {"application/json": {"schema": {
+                         "type": "object", "properties": {"name": {"type": "string", "example": "Rex"}}}}}},
+                     "responses": {"201": {}}}
+        },
+        "/stores/{storeId}": {"get": {"operationId": "getStore", "tags": ["stores"], "responses": {"200": {}}}}
+    }
+}
+
+
+@pytest.fixture
+def spec_file(tmp_path):
+    spec_file = tmp_path / "pets.json"
+    spec_file.write_text(json.dumps(SPEC))
+    return spec_file
+
+
+def test_create_jmx_file_from_openapi(spec_file, tmp_path):
+    jmx_path = tmp_path / "pets.jmx"
+
+    create_jmx_file_from_openapi(str(spec_file), str(jmx_path), load_profile=LoadProfile(threads=2, loops=1))
+
+    tree = etree.parse(str(jmx_path))
+    assert [controller.get("testname") for controller in tree.iter("GenericController")] == ["pets", "stores"]
+    assert [sampler.get("testname") for sampler in tree.iter("HTTPSamplerProxy")] == [
+        "listPets", "createPet", "getStore"]
+    paths = [sampler.findtext("stringProp[@name='HTTPSampler.path']") for sampler in tree.iter("HTTPSamplerProxy")]
+    # The server URL is relative, the requests keep the ${tests_url} prefix
+    assert paths == ["${tests_url}/api/pets", "${tests_url}/api/pets", "${tests_url}/api/stores/${storeId}"]
+    assert tree.find(".//elementProp[@name='limit']/stringProp[@name='Argument.value']").text == "${limit}"
+    # The JMX creator asserts the 200 statuses
+    assert len(tree.findall(".//ResponseAssertion")) == 2
+
+
+def test_create_postman_collection_from_openapi(spec_file, tmp_path):
+    output = tmp_path / "pets.postman.json"
+
+    create_postman_collection_from_openapi(str(spec_file), str(output), deterministic_ids=True)
+
+    collection = json.loads(output.read_text())
+    pets, stores = collection["item"]
+    assert [item["name"] for item in pets["item"]] == ["listPets", "createPet"]
+    assert json.loads(pets["item"][1]["request"]["body"]["raw"]) == {"name": "Rex"}
+    assert stores["item"][0]["request"]["url"]["raw"] == "/api/stores/${storeId}"
+
+
+def test_load_openapi_errors(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        load_openapi(str(tmp_path / "missing"))
+
+    swagger = tmp_path / "swagger.json"
+    swagger.write_text(json.dumps({"swagger": "2.0"}))
+    with pytest.raises(ValueError):
+        load_openapi(str(swagger))
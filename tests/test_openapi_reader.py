@@ -0,0 +1,162 @@
+import json
+
+import pytest
+
+from src.openapi.openapi_reader import (
+    SpecResolver,
+    is_openapi_file,
+    load_spec,
+    get_base_url,
+    merge_parameters,
+    read_request_body,
+    get_expected_status,
+    parse_openapi,
+    read_openapi
+)
+
+SPEC = {
+    "openapi": "3.0.3",
+    "info": {"title": "Pet Store & Co", "version": "1.0"},
+    "servers": [{"url": "https://{region}.pets.example.com/v1/", "variables": {"region": {"default": "eu"}}}],
+    "tags": [{"name": "users"}, {"name": "pets"}],
+    "paths": {
+        "/pets/{petId}": {
+            "parameters": [{"$ref": "#/components/parameters/PetId"}],
+            "get": {"operationId": "getPet", "tags": ["pets"],
+                    "parameters": [{"name": "fields", "in": "query"}, {"name": "X-Trace", "in": "header"}],
+                    "responses": {"default": {}, "200": {"description": "ok"}}},
+            "put": {"tags": ["pets"], "summary": "Update a pet",
+                    "requestBody": {"$ref": "#/components/requestBodies/Pet"},
+                    "responses": {"204": {"description": "updated"}}}
+        },
+        "/health": {"get": {"responses": {"200": {}}}},
+        "/login": {"post": {"tags": ["auth"], "requestBody": {"content": {
+            "application/x-www-form-urlencoded": {"schema": {"type": "object", "properties": {
+                "user": {"type": "string", "example": "alice"}, "remember": {"type": "boolean"}}}}}}}}
+    },
+    "components": {
+        "parameters": {"PetId": {"name": "petId", "in": "path", "required": True}},
+        "requestBodies": {"Pet": {"content": {
+            "text/plain": {"schema": {"type": "string"}},
+            "application/json": {"schema": {"$ref": "#/components/schemas/Pet"}}}}},
+        "schemas": {
+            "Pet": {"allOf": [{"$ref": "#/components/schemas/Named"},
+                              {"type": "object", "properties": {
+                                  "born": {"type": "string", "format": "date"},
+                                  "tags": {"type": "array", "items": {"type": "string", "enum": ["cute", "old"]}},
+                                  "parent": {"$ref": "#/components/schemas/Pet"},
+                                  "owner": {"oneOf": [{"$ref": "#/components/schemas/Named"}, {"type": "string"}]}}}]},
+            "Named": {"type": "object", "properties": {"id": {"type": "integer", "minimum": 1},
+                                                       "name": {"type": ["string", "null"]}}}
+        }
+    }
+}
+
+
+def test_is_openapi_file():
+    assert is_openapi_file("spec.yaml") and is_openapi_file("spec.yml")
+    assert not is_openapi_file("collection.json")
+
+
+def test_load_spec_yaml(tmp_path):
+    yaml = pytest.importorskip("yaml")
+    spec_file = tmp_path / "spec.yaml"
+    spec_file.write_text(yaml.safe_dump(SPEC))
+
+    assert load_spec(str(spec_file)) == SPEC
+
+    spec_file.write_text("openapi: [3")
+    with pytest.raises(ValueError):
+        load_spec(str(spec_file))
+
+
+def test_resolver_resolve():
+    resolver = SpecResolver({"a": {"$ref": "#/b~1c"}, "b/c": {"value": 1}, "loop": {"$ref": "#/loop"},
+                             "list": [{"x": 1}]})
+
+    assert resolver.resolve({"$ref": "#/a"}) == {"value": 1}
+    assert resolver.resolve({"$ref": "#/list/0"}) == {"x": 1}
+    assert resolver.resolve({"$ref": "#/loop"}) == {}
+    assert resolver.resolve({"$ref": "#/missing"}) == {}
+    assert resolver.resolve({"$ref": "other.yaml#/a"}) == {}
+    assert resolver.targets["#/a"] == {"$ref": "#/b~1c"}
+
+
+def test_resolver_example():
+    resolver = SpecResolver(SPEC)
+
+    example = resolver.example({"$ref": "#/components/schemas/Pet"})
+
+    assert example == {"id": 1, "name": "string", "born": "2024-01-01", "tags": ["cute"], "parent": None,
+                       "owner": {"id": 1, "name": "string"}}
+    # Memoised by reference
+    assert resolver.example({"$ref": "#/components/schemas/Pet"}) is example
+    assert resolver.example({"type": "number", "default": 2.5}) == 2.5
+    assert resolver.example({"type": "array", "items": {"$ref": "#/missing"}}) == []
+
+
+def test_get_base_url():
+    assert get_base_url(SPEC) == "https://eu.pets.example.com/v1"
+    assert get_base_url({"servers": [{"url": "/api"}]}) == "/api"
+    assert get_base_url({}) == ""
+
+
+def test_merge_parameters():
+    resolver = SpecResolver(SPEC)
+
+    parameters = merge_parameters(resolver, [{"name": "a", "in": "query", "x": 1}, {"name": "a", "in": "header"}],
+                                  [{"name": "a", "in": "query", "x": 2}])
+
+    assert parameters == [{"name": "a", "in": "query", "x": 2}, {"name": "a", "in": "header"}]
+
+
+def test_read_request_body():
+    resolver = SpecResolver(SPEC)
+
+    assert read_request_body(resolver, None) == ("No body content", None, None)
+    body, body_mode, content_type = read_request_body(resolver, {"$ref": "#/components/requestBodies/Pet"})
+    assert json.loads(body)["tags"] == ["cute"] and body_mode == "raw" and content_type == "application/json"
+    # The body of a shared schema is serialised once
+    assert read_request_body(resolver, {"$ref": "#/components/requestBodies/Pet"})[0] is body
+    assert read_request_body(resolver, {"content": {"application/json": {"examples": {
+        "first": {"value": {"a": 1}}, "second": {"value": {"a": 2}}}}}}) == (
+        '{\n  "a": 1\n}', "raw", "application/json")
+    assert read_request_body(resolver, {"content": {"multipart/form-data": {"example": {"file": "x", "n": 2}}}}) == (
+        [{"key": "file", "value": "x"}, {"key": "n", "value": "2"}], "formdata", "multipart/form-data")
+
+
+def test_get_expected_status():
+    assert get_expected_status({"default": {}, "404": {}, "201": {}}) == "201"
+    assert get_expected_status({"302": {}}) is None
+
+
+def test_parse_openapi():
+    data = parse_openapi(SPEC)
+
+    assert data["test_plan_name"] == "Pet Store and Co"
+    controllers = data["test_fragment_controller"]["generic_controllers"]
+    # Declared tags first, the empty "users" tag is dropped
+    assert [controller["name"] for controller in controllers] == ["pets", "default", "auth"]
+    get_pet, update_pet = controllers[0]["children"]
+    assert get_pet["name"] == "getPet"
+    assert get_pet["raw_url"] == "https://eu.pets.example.com/v1/pets/${petId}?fields=${fields}"
+    assert get_pet["headers"] == [{"key": "X-Trace", "value": "${X-Trace}"}]
+    assert get_pet["tests"] == [{"name": "Status code is 200", "script": "pm.response.to.have.status(200);"}]
+    assert update_pet["name"] == "Update a pet" and update_pet["method"] == "PUT"
+    assert update_pet["headers"] == [{"key": "Content-Type", "value": "application/json"}]
+    assert controllers[1]["children"][0]["name"] == "GET /health"
+    login = controllers[2]["children"][0]
+    assert login["body"] == [{"key": "user", "value": "alice"}, {"key": "remember", "value": "true"}]
+    assert login["body_mode"] == "urlencoded"
+
+
+def test_parse_openapi_rejects_swagger():
+    with pytest.raises(ValueError):
+        parse_openapi({"swagger": "2.0", "paths": {}})
+
+
+def test_read_openapi(tmp_path):
+    spec_file = tmp_path / "pets.json"
+    spec_file.write_text(json.dumps(dict(SPEC, info={})))
+
+    assert read_openapi(str(spec_file))["test_plan_name"] == "pets"
@@ -0,0 +1,80 @@
+import pytest
+
+from src.helper.placeholder_utils import (
+    encode_query,
+    quote_component,
+    translate_placeholders,
+    to_postman_placeholders,
+    to_jmeter_placeholders,
+    JMETER_TO_POSTMAN
+)
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("${host}/pets", "{{host}}/pets"),
+    ('{"a":1}', '{"a":1}'),
+    ('{"id": "${id}", "nested": {"b": 2}}', '{"id": "{{id}}", "nested": {"b": 2}}'),
+    ("${a}${b}", "{{a}}{{b}}"),
+    ("${ not a placeholder }", "${ not a placeholder }"),
+    ("price: $5 {x}", "price: $5 {x}"),
+])
+def test_to_postman_placeholders(value, expected):
+    assert to_postman_placeholders(value) == expected
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("{{host}}/pets", "${host}/pets"),
+    ('{"a":{"b":1}}', '{"a":{"b":1}}'),
+    ("{{a}}-{{b}}", "${a}-${b}"),
+])
+def test_to_jmeter_placeholders(value, expected):
+    assert to_jmeter_placeholders(value) == expected
+
+
+def test_round_trip():
+    value = 'GET {{base}}/users/{{id}}?q={"x":1}'
+
+    assert to_postman_placeholders(to_jmeter_placeholders(value)) == value
+
+
+def test_translate_nested_structures():
+    value = {"name": "${name}", "tags": ["${tag}", 1, None], "inner": {"id": "${id}"}, "${key}": True}
+
+    result = to_postman_placeholders(value)
+
+    assert result == {"name": "{{name}}", "tags": ["{{tag}}", 1, None], "inner": {"id": "{{id}}"}, "${key}": True}
+    assert value["inner"]["id"] == "${id}"  # the input is not modified
+
+
+def test_translate_deep_nesting():
+    depth = 10000
+    value = "${leaf}"
+    for _ in range(depth):
+        value = [{"child": value}]
+
+    result = translate_placeholders(value, JMETER_TO_POSTMAN)
+
+    for _ in range(depth):
+        result = result[0]["child"]
+    assert result == "{{leaf}}"
+
+
+def test_translate_other_values():
+    assert to_postman_placeholders(42) == 42
+    assert to_postman_placeholders(None) is None
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("shoes & socks", "shoes%20%26%20socks"),
+    ("${user} #1", "${user}%20%231"),
+    ("a=${b}&c=${d}", "a%3D${b}%26c%3D${d}"),
+    ("h\u00e9l\u00e8ne (it's)", "h%C3%A9l%C3%A8ne%20(it's)"),
+    ("${ not a placeholder }", "%24%7B%20not%20a%20placeholder%20%7D"),
+])
+def test_quote_component(value, expected):
+    assert quote_component(value) == expected
+
+
+def test_encode_query():
+    assert encode_query([("q", "a b"), ("${name}", "${value}/x")]) == "q=a%20b&${name}=${value}%2Fx"
+    assert encode_query([]) == ""
@@ -1,3 +1,5 @@
+import json
+
 import pytest
 from src.postman.postman_json_creator import (
     create_postman_collection,
@@ -5,7 +7,8 @@ from src.postman.postman_json_creator import (
     save_json,
     generate_info,
     extract_items,
-    replace_placeholders
+    replace_placeholders,
+    generate_body
 )
 
 
@@ -16,8 +19,8 @@ def mock_os_path(mocker):
 
 
 @pytest.fixture
-def mock_get_test_plan(mocker):
-    return mocker.patch('src.postman.postman_json_creator.get_test_plan')
+def mock_get_test_plan_parallel(mocker):
+    return mocker.patch('src.postman.postman_json_creator.get_test_plan_parallel')
 
 
 @pytest.fixture
@@ -41,7 +44,7 @@ def mock_save_json(mocker):
 
 
 # Test for create_postman_collection
-def test_create_postman_collection(mock_os_path, mock_get_test_plan, mock_file_write, mock_save_json, mocker):
+def test_create_postman_collection(mock_os_path, mock_get_test_plan_parallel, mock_file_write, mock_save_json, mocker):
     # Arrange
     source_file = 'test'
     output_path = 'test_output'
@@ -51,17 +54,18 @@ def test_create_postman_collection(mock_os_path, mock_get_test_plan, mock_file_w
     create_postman_collection(source_file, output_path)
 
     # Assert
-    mock_generate_postman_collection.assert_called_once_with(mocker.ANY)
+    mock_generate_postman_collection.assert_called_once_with(mocker.ANY, deterministic_ids=False,
+                                                             normalize_bodies=False)
     mock_save_json.assert_called_once()
 
 
 # Test for generate_postman_collection
-def test_generate_postman_collection(mock_get_test_plan, mock_generate_uuid, mock_generate_id, mocker):
+def test_generate_postman_collection(mock_get_test_plan_parallel, mock_generate_uuid, mock_generate_id, mocker):
     # Arrange
     file_path = 'test.jmx'
     mock_jmx_data = {'name': 'Test', 'items': [
         {'item': {'name': 'item1', 'requests': [{'name': 'req1', 'method': 'GET', 'path': 'example.com'}]}}]}
-    mock_get_test_plan.return_value = mock_jmx_data
+    mock_get_test_plan_parallel.return_value = mock_jmx_data
     mock_generate_uuid.return_value = 'mock_uuid'
     mock_generate_id.return_value = 'mock_id'
 
@@ -69,6 +73,7 @@ def test_generate_postman_collection(mock_get_test_plan, mock_generate_uuid, moc
     collection = generate_postman_collection(file_path)
 
     # Assert
+    mock_get_test_plan_parallel.assert_called_once_with(file_path)
     assert collection['info']['_postman_id'] == 'mock_uuid'
     assert collection['info']['_exporter_id'] == 'mock_id'
     assert collection['item'][0]['name'] == 'item1'
@@ -138,3 +143,59 @@ def test_replace_placeholders():
 
     # Assert
     assert replaced == '{{example}}'
+
+
+# Test for generate_info with deterministic IDs
+def test_generate_info_deterministic():
+    jmx_data = {'name': 'test_jmx', 'items': []}
+
+    info = generate_info(jmx_data, deterministic_ids=True)
+
+    assert info == generate_info({'name': 'test_jmx', 'items': []}, deterministic_ids=True)
+    assert info != generate_info({'name': 'other_jmx', 'items': []}, deterministic_ids=True)
+    assert len(info['info']['_exporter_id']) == 8
+
+
+# Test that identical input yields byte-identical output with deterministic IDs
+def test_create_postman_collection_deterministic(tmp_path, mocker):
+    jmx_data = {'name': 'Test', 'items': [
+        {'item': {'name': 'item1', 'requests': [{'name': 'req1', 'method': 'GET', 'path': 'example.com'}]}}]}
+    mocker.patch('src.postman.postman_json_creator.get_test_plan_parallel',
+                 side_effect=lambda path: json.loads(json.dumps(jmx_data)))
+    first, second = tmp_path / "first.json", tmp_path / "second.json"
+
+    create_postman_collection('test.jmx', str(first), deterministic_ids=True)
+    create_postman_collection('test.jmx', str(second), deterministic_ids=True)
+
+    assert first.read_bytes() == second.read_bytes()
+
+
+# Test for generate_body passing raw bodies through
+def test_generate_body_pass_through():
+    raw = '{"id": "${id}",\n  "nested": {"a":1}}'
+
+    body = generate_body({'arguments': {'body': raw}})
+
+    assert body['raw'] == '{"id": "{{id}}",\n  "nested": {"a":1}}'
+    assert body['options']['raw']['language'] == 'json'
+
+
+def test_generate_body_pass_through_non_json():
+    body = generate_body({'arguments': {'body': 'name=${name}&age=3'}})
+
+    assert body['raw'] == 'name={{name}}&age=3'
+    assert body['options']['raw']['language'] == 'text'
+
+
+def test_generate_body_pass_through_xml():
+    body = generate_body({'arguments': {'body': '\n  <user><id>${id}</id></user>'}})
+
+    assert body['raw'] == '\n  <user><id>{{id}}</id></user>'
+    assert body['options']['raw']['language'] == 'xml'
+
+
+# Test for generate_body with explicit normalisation
+def test_generate_body_normalized():
+    body = generate_body({'arguments': {'body': '{"id":"${id}"}'}}, normalize_bodies=True)
+
+    assert body['raw'] == json.dumps({"id": "{{id}}"}, indent=4)
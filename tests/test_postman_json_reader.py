@@ -6,11 +6,15 @@ from unittest.mock import patch, mock_open
 from src.postman.postman_json_reader import (
     get_schema_path,
     validate_postman_schema,
+    create_schema_validator,
     read_postman_collection,
+    parse_postman_collection,
     extract_generic_controllers,
     extract_request_data,
+    extract_variables,
     extract_query_params,
     extract_request_body,
+    extract_headers,
     extract_tests
 )
 
@@ -90,6 +94,27 @@ def test_read_postman_collection_valid(mock_open_file, mock_validate_postman_sch
     assert mock_validate_postman_schema.call_args.args[1] == "r"
     mock_is_file.assert_called_once_with(mocker.ANY)
 
+# Test parse_postman_collection for an already decoded collection
+@patch('src.postman.postman_json_reader.validate_postman_schema')
+def test_parse_postman_collection(mock_validate_postman_schema):
+    data = {"info": {"name": "Tom & Jerry"}, "item": [{"name": "Folder", "item": []}]}
+
+    result = parse_postman_collection(data)
+
+    mock_validate_postman_schema.assert_called_once_with(data)
+    assert result["test_plan_name"] == "Tom and Jerry"
+    assert result["test_fragment_controller"]["generic_controllers"][0]["name"] == "Folder"
+
+
+# Test validate_postman_schema with a prebuilt validator
+def test_validate_postman_schema_with_validator():
+    validator = create_schema_validator()
+
+    validate_postman_schema({"info": {"name": "Test", "schema": "s"}, "item": []}, validator=validator)
+    with pytest.raises(ValidationError, match="Schema validation error"):
+        validate_postman_schema({"item": []}, validator=validator)
+
+
 # Test extract_generic_controllers for folder structure
 def test_extract_generic_controllers_folder_structure():
     items = [
@@ -151,6 +176,41 @@ def test_extract_request_body_no_body():
     assert result == "No body content"
 
 
+# Test extract_request_data keeps the body mode and converts body placeholders
+def test_extract_request_data_body():
+    item = {
+        "name": "Login",
+        "request": {
+            "method": "POST",
+            "url": {"raw": "https://example.com/login"},
+            "body": {"mode": "urlencoded", "urlencoded": [{"key": "user", "value": "{{user}}"}]}
+        }
+    }
+
+    result = extract_request_data(item, "controller_1", None)
+
+    assert result["body_mode"] == "urlencoded"
+    assert result["body"] == [{"key": "user", "value": "${user}"}]
+
+
+# Test extract_variables keeps the response JSON path of the variables set by test scripts
+def test_extract_variables():
+    events = [
+        {"listen": "prerequest", "script": {"exec": ['pm.environment.set("ignored", 1);']}},
+        {"listen": "test", "script": {"exec": [
+            'var jsonData = pm.response.json();',
+            'pm.environment.set("token", jsonData.data[0]["token"]);',
+            "pm.collectionVariables.set('id', pm.response.json().id)",
+            'pm.globals.set("now", Date.now());'
+        ]}}
+    ]
+
+    result = extract_variables(events)
+
+    assert result == [{"name": "token", "path": "data.0.token"}, {"name": "id", "path": "id"},
+                      {"name": "now", "path": None}]
+
+
 # Test extract_tests with valid tests
 def test_extract_tests():
     events = [
@@ -162,4 +222,14 @@ def test_extract_tests():
 
     assert len(result) == 2
     assert result[0]["name"] == "Test 1"
-    assert result[1]["name"] == "Test 2"
\ No newline at end of file
+    assert result[1]["name"] == "Test 2"
+
+# Test extract_headers skips disabled headers and converts placeholders
+def test_extract_headers():
+    request = {"header": [
+        {"key": "Authorization", "value": "Bearer {{token}}"},
+        {"key": "X-Debug", "value": "1", "disabled": True}
+    ]}
+
+    assert extract_headers(request) == [{"key": "Authorization", "value": "Bearer ${token}"}]
+    assert extract_headers({}) == []
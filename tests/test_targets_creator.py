@@ -0,0 +1,221 @@
+import json
+import logging
+
+import pytest
+
+from src.jmx.jmx_creator import create_jmx_file
+from src.targets.targets_creator import (
+    WRK_FORMAT,
+    Target,
+    PlaceholderResolver,
+    load_environment,
+    iter_source_targets,
+    write_body_file,
+    lua_string,
+    create_vegeta_target,
+    create_wrk_request,
+    iter_target_list,
+    resolve_targets_output,
+    create_targets_file
+)
+
+COLLECTION = {
+    "info": {"name": "Shop", "schema": "https://schema.getpostman.com/json/collection/v2.1.0/collection.json"},
+    "item": [
+        {"name": "Auth", "item": [
+            {"name": "Login",
+             "request": {"method": "POST", "header": [{"key": "Accept", "value": "application/json"}],
+                         "body": {"mode": "raw", "raw": "{\"user\": \"{{user}}\"}"},
+                         "url": {"raw": "{{base_url}}/login"}}},
+            {"name": "Search",
+             "request": {"method": "POST",
+                         "body": {"mode": "urlencoded", "urlencoded": [{"key": "q", "value": "{{user}} shoes"}]},
+                         "url": {"raw": "{{base_url}}/search"}}}
+        ]},
+        {"name": "Ping", "request": {"method": "GET", "url": {"raw": "{{base_url}}/ping?verbose=1"}}}
+    ]
+}
+
+ENVIRONMENT = {"name": "Staging", "values": [
+    {"key": "base_url", "value": "https://shop.example.com", "enabled": True},
+    {"key": "user", "value": "alice", "enabled": True},
+    {"key": "unused", "value": "x", "enabled": False}
+]}
+
+
+@pytest.fixture
+def collection_file(tmp_path):
+    collection_file = tmp_path / "shop.json"
+    collection_file.write_text(json.dumps(COLLECTION))
+    return collection_file
+
+
+@pytest.fixture
+def environment_file(tmp_path):
+    environment_file = tmp_path / "staging.postman_environment.json"
+    environment_file.write_text(json.dumps(ENVIRONMENT))
+    return environment_file
+
+
+def test_load_environment(environment_file, tmp_path):
+    assert load_environment(str(environment_file)) == {"base_url": "https://shop.example.com", "user": "alice"}
+
+    flat_file = tmp_path / "flat.json"
+    flat_file.write_text(json.dumps({"base_url": "{{scheme}}://shop", "port": 8080}))
+    assert load_environment(str(flat_file)) == {"base_url": "${scheme}://shop", "port": "8080"}
+
+
+def test_placeholder_resolver():
+    resolve = PlaceholderResolver({"user": "alice"})
+    resolve.set_default("user", "bob")
+    resolve.set_default("host", "shop")
+
+    assert resolve("${user}@${host}/${token}") == "alice@shop/${token}"
+    assert resolve("{\"a\": 1}") == "{\"a\": 1}"
+    assert resolve.missing == {"token"}
+
+
+def test_iter_source_targets_postman(collection_file, environment_file):
+    resolve = PlaceholderResolver(load_environment(str(environment_file)))
+
+    targets = list(iter_source_targets(str(collection_file), resolve))
+
+    assert targets == [
+        Target("Login", "POST", "https://shop.example.com/login", [("Accept", "application/json")],
+               '{"user": "alice"}'),
+        Target("Search", "POST", "https://shop.example.com/search",
+               [("Content-Type", "application/x-www-form-urlencoded")], "q=alice+shoes"),
+        Target("Ping", "GET", "https://shop.example.com/ping?verbose=1", [], None)
+    ]
+    assert not resolve.missing
+
+
+def test_iter_source_targets_jmx(tmp_path):
+    collection_file = tmp_path / "shop.json"
+    collection_file.write_text(json.dumps(COLLECTION).replace("{{base_url}}", "http://localhost:8080"))
+    jmx_path = tmp_path / "shop.jmx"
+    create_jmx_file(str(collection_file), str(jmx_path), body_threshold=0, shared_defaults=True)
+
+    targets = list(iter_source_targets(str(jmx_path), PlaceholderResolver({"user": "bob"})))
+
+    assert [(target.name, target.method, target.url) for target in targets] == [
+        ("Login", "POST", "http://localhost:8080/login"),
+        ("Search", "POST", "http://localhost:8080/search"),
+        ("Ping", "GET", "http://localhost:8080/ping?verbose=1")
+    ]
+    # The origin comes from the HTTP Request Defaults, the body written next to the plan from ${__FileToString()}
+    assert targets[0].body == '{"user": "bob"}'
+    assert ("Accept", "application/json") in targets[0].headers
+
+
+def test_iter_source_targets_jmx_variables(tmp_path):
+    jmx_path = tmp_path / "plan.jmx"
+    jmx_path.write_text("""<jmeterTestPlan><hashTree>
+      <TestPlan testname="Plan">
+        <elementProp name="TestPlan.user_defined_variables" elementType="Arguments">
+          <collectionProp name="Arguments.arguments">
+            <elementProp name="host" elementType="Argument">
+              <stringProp name="Argument.name">host</stringProp><stringProp name="Argument.value">api.local</stringProp>
+            </elementProp>
+          </collectionProp>
+        </elementProp>
+      </TestPlan><hashTree>
+        <TestFragmentController testname="Fragment"/><hashTree>
+          <HTTPSamplerProxy testname="Hidden" enabled="false"><stringProp name="HTTPSampler.path">/hidden</stringProp></HTTPSamplerProxy>
+          <hashTree/>
+          <HTTPSamplerProxy testname="Users">
+            <stringProp name="HTTPSampler.domain">${host}</stringProp>
+            <stringProp name="HTTPSampler.path">/users</stringProp>
+            <stringProp name="HTTPSampler.method">GET</stringProp>
+            <elementProp name="HTTPsampler.Arguments" elementType="Arguments">
+              <collectionProp name="Arguments.arguments">
+                <elementProp name="q" elementType="HTTPArgument">
+                  <stringProp name="Argument.name">q</stringProp>
+                  <stringProp name="Argument.value">${host} &amp; co</stringProp>
+                </elementProp>
+              </collectionProp>
+            </elementProp>
+          </HTTPSamplerProxy>
+          <hashTree/>
+        </hashTree>
+      </hashTree>
+    </hashTree></jmeterTestPlan>""")
+
+    targets = list(iter_source_targets(str(jmx_path), PlaceholderResolver()))
+
+    # Query arguments are encoded once resolved
+    assert targets == [Target("Users", "GET", "http://api.local/users?q=api.local+%26+co", [], None)]
+
+
+def test_write_body_file(tmp_path):
+    body_dir = tmp_path / "shop_bodies"
+    body_dir.mkdir()
+
+    first = write_body_file('{"a": 1}', str(body_dir))
+
+    assert first == write_body_file('{"a": 1}', str(body_dir))
+    assert first != write_body_file('{"a": 2}', str(body_dir))
+    assert first.startswith("shop_bodies/body_")
+    assert (tmp_path / first).read_text() == '{"a": 1}'
+    assert len(list(body_dir.iterdir())) == 2
+
+
+def test_create_vegeta_target():
+    target = Target("Login", "POST", "https://shop.example.com/login", [("Accept", "application/json")], "{}")
+
+    assert create_vegeta_target(target, "shop_bodies/body_1.txt") == (
+        "POST https://shop.example.com/login\nAccept: application/json\n@shop_bodies/body_1.txt\n\n")
+
+
+def test_lua_string():
+    assert lua_string('say "hi"\\\n') == '"say \\"hi\\"\\\\\\010"'
+    assert lua_string("café") == '"café"'
+
+
+def test_create_wrk_request():
+    target = Target("Ping", "GET", "https://shop.example.com:8443/ping?verbose=1",
+                    [("host", "ignored"), ("Accept", "*/*")], None)
+
+    assert create_wrk_request(target, None) == (
+        '  add("GET", "/ping?verbose=1", { ["Host"] = "shop.example.com:8443", ["Accept"] = "*/*" }, nil)\n')
+
+
+def test_iter_target_list_wrk_chunks(tmp_path, mocker, caplog):
+    mocker.patch('src.targets.targets_creator.WRK_CHUNK_SIZE', 2)
+    targets = [Target(f"R{index}", "GET", f"http://a/{index}", [], None) for index in range(5)]
+    targets.append(Target("Relative", "GET", "${base_url}/x", [], None))
+
+    with caplog.at_level(logging.ERROR):
+        script = "".join(iter_target_list(iter(targets), WRK_FORMAT, str(tmp_path / "bodies")))
+
+    assert script.count("chunks[#chunks + 1] = function()") == 3
+    assert script.count("  add(") == 5
+    assert "Relative" not in script and "${base_url}" not in script
+    assert "-- Run with: wrk -s <this script> http://a" in script
+    assert "Skipped 1 requests" in caplog.text
+
+
+def test_resolve_targets_output(tmp_path):
+    assert resolve_targets_output(str(tmp_path / "shop.lua")) == (str(tmp_path), "shop.lua")
+    output_path, file_name = resolve_targets_output("shop")
+    assert output_path.endswith("out") and file_name == "shop.targets"
+
+
+def test_create_targets_file(collection_file, environment_file, tmp_path):
+    assert create_targets_file(str(collection_file), str(tmp_path / "out" / "shop.targets"),
+                               environment_file=str(environment_file)) == 3
+
+    targets = (tmp_path / "out" / "shop.targets").read_text().split("\n\n")
+    assert targets[0].startswith("POST https://shop.example.com/login\nAccept: application/json\n@shop_bodies/body_")
+    assert (tmp_path / "out" / targets[0].split("@")[1]).read_text() == '{"user": "alice"}'
+    assert targets[2] == "GET https://shop.example.com/ping?verbose=1"
+
+
+def test_create_targets_file_without_targets(collection_file, tmp_path, caplog):
+    with caplog.at_level(logging.ERROR), pytest.raises(ValueError, match="set base_url, user in the environment"):
+        create_targets_file(str(collection_file), str(tmp_path / "shop.lua"))
+
+    # No unusable script is left behind
+    assert not (tmp_path / "shop.lua").exists() and not (tmp_path / "shop_bodies").exists()
+    assert "Skipped 3 requests" in caplog.text
+    assert "Unresolved variables: base_url, user" in caplog.text
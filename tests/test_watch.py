@@ -0,0 +1,199 @@
+import gzip
+import json
+import lzma
+import os
+import shutil
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from src.watch import (
+    is_convertible,
+    hash_file,
+    convert_file,
+    PollingWatcher,
+    InotifyWatcher,
+    create_watcher,
+    load_state,
+    watch,
+    STATE_FILE_NAME
+)
+
+SAMPLE_COLLECTION = os.path.join(os.path.dirname(__file__), os.pardir, "file_to_convert", "sample_collection.json")
+
+
+def wait_for(condition, timeout: float = 10.0) -> bool:
+    """Waits until the condition is true or the timeout expires."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.02)
+    return False
+
+
+@pytest.mark.parametrize("file_name, expected", [
+    ("collection.json", True),
+    ("plan.jmx", True),
+    ("collection.json.gz", True),
+    ("plan.jmx.xz", True),
+    ("notes.txt", False),
+    ("notes.txt.gz", False),
+    (".watch_state.json", False),
+])
+def test_is_convertible(file_name, expected):
+    assert is_convertible(file_name) is expected
+
+
+def test_hash_file(tmp_path):
+    first = tmp_path / "first.json"
+    second = tmp_path / "second.json"
+    first.write_text("{}")
+    second.write_text("{}")
+
+    assert hash_file(str(first)) == hash_file(str(second))
+
+
+def test_convert_file(tmp_path):
+    source = tmp_path / "sample.json"
+    shutil.copy(SAMPLE_COLLECTION, source)
+    output_dir = tmp_path / "out"
+
+    content_hash, output_name = convert_file(str(source), str(output_dir))
+
+    assert output_name == "sample.jmx"
+    assert (output_dir / "sample.jmx").exists()
+    assert convert_file(str(source), str(output_dir), content_hash) == (content_hash, None)
+
+
+def test_convert_file_compressed(tmp_path):
+    collection = tmp_path / "sample.json.gz"
+    with open(SAMPLE_COLLECTION, 'rb') as source_file:
+        collection.write_bytes(gzip.compress(source_file.read()))
+    output_dir = tmp_path / "out"
+
+    assert convert_file(str(collection), str(output_dir))[1] == "sample.jmx"
+
+    plan = tmp_path / "plan.jmx.xz"
+    plan.write_bytes(lzma.compress((output_dir / "sample.jmx").read_bytes()))
+
+    assert convert_file(str(plan), str(output_dir))[1] == "plan.json"
+    assert json.loads((output_dir / "plan.json").read_text())["item"]
+
+
+def test_polling_watcher(tmp_path):
+    watcher = PollingWatcher(str(tmp_path), interval=0)
+    (tmp_path / "a.json").write_text("{}")
+
+    assert watcher.scan() == {str(tmp_path / "a.json")}
+    assert watcher.poll(0) == set()
+
+    (tmp_path / "a.json").write_text("{\"changed\": true}")
+    assert watcher.poll(0) == {str(tmp_path / "a.json")}
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="inotify is Linux only")
+def test_inotify_watcher(tmp_path):
+    watcher = InotifyWatcher(str(tmp_path))
+    try:
+        assert watcher.poll(0) == set()
+        (tmp_path / "a.jmx").write_text("<jmeterTestPlan/>")
+        (tmp_path / "ignored.txt").write_text("")
+
+        assert watcher.poll(1) == {str(tmp_path / "a.jmx")}
+    finally:
+        watcher.close()
+
+
+def test_create_watcher_polling(tmp_path):
+    assert isinstance(create_watcher(str(tmp_path), use_inotify=False), PollingWatcher)
+
+
+def test_load_state_missing(tmp_path):
+    assert load_state(str(tmp_path)) == {}
+
+
+def test_watch_rejects_same_directory(tmp_path):
+    with pytest.raises(ValueError):
+        watch(str(tmp_path), str(tmp_path))
+
+
+@pytest.mark.parametrize("use_inotify", [False, None])
+def test_watch_converts_changed_files(tmp_path, use_inotify):
+    source_dir = tmp_path / "file_to_convert"
+    output_dir = tmp_path / "out"
+    source_dir.mkdir()
+    shutil.copy(SAMPLE_COLLECTION, source_dir / "existing.json")
+    stop_event = threading.Event()
+    watcher_thread = threading.Thread(target=watch, args=(str(source_dir), str(output_dir)), kwargs={
+        "debounce": 0.05, "workers": 1, "use_inotify": use_inotify, "stop_event": stop_event})
+    watcher_thread.start()
+
+    try:
+        assert wait_for(lambda: (output_dir / "existing.jmx").exists())
+
+        shutil.copy(SAMPLE_COLLECTION, source_dir / "added.json")
+        assert wait_for(lambda: (output_dir / "added.jmx").exists())
+
+        # Rewriting identical content does not convert the file again
+        converted_at = os.stat(output_dir / "existing.jmx").st_mtime_ns
+        shutil.copy(SAMPLE_COLLECTION, source_dir / "existing.json")
+        time.sleep(0.5)
+        assert os.stat(output_dir / "existing.jmx").st_mtime_ns == converted_at
+    finally:
+        stop_event.set()
+        watcher_thread.join()
+
+    state = json.loads((output_dir / STATE_FILE_NAME).read_text())
+    assert set(state) == {str(source_dir / "existing.json"), str(source_dir / "added.json")}
+
+
+def test_watch_waits_for_running_conversion(tmp_path, mocker):
+    source_path = tmp_path / "sample.json"
+    source_path.write_text("{}")
+    release = threading.Event()
+    conversions = []
+
+    def convert_file(path, output_dir, known_hash):
+        conversions.append(path)
+        release.wait()
+        return "hash", None
+
+    class FakeWatcher:
+        def __init__(self):
+            self.timeouts = []
+
+        def scan(self):
+            return {str(source_path)}
+
+        def poll(self, timeout):
+            self.timeouts.append(timeout)
+            time.sleep(timeout)
+            # The file changes again while its first conversion runs
+            return {str(source_path)} if len(self.timeouts) == 2 else set()
+
+        def close(self):
+            pass
+
+    watcher = FakeWatcher()
+    mocker.patch("src.watch.create_watcher", return_value=watcher)
+    mocker.patch("src.watch.convert_file", side_effect=convert_file)
+    mocker.patch("src.watch.ProcessPoolExecutor", ThreadPoolExecutor)
+    stop_event = threading.Event()
+    watcher_thread = threading.Thread(target=watch, args=(str(tmp_path), str(tmp_path / "out")), kwargs={
+        "debounce": 0.1, "workers": 1, "stop_event": stop_event})
+    watcher_thread.start()
+
+    try:
+        time.sleep(0.6)
+        # The passed deadline of the changed file does not make the loop poll without waiting
+        assert len(watcher.timeouts) < 12
+        release.set()
+        assert wait_for(lambda: len(conversions) == 2)
+    finally:
+        release.set()
+        stop_event.set()
+        watcher_thread.join()